@@ -17,10 +17,52 @@ from datetime import datetime
 from collections import defaultdict, Counter
 import os
 
+import pandas as pd
+
+from validation_rules import (CERTIFICATIONS, ORGANIZATIONS, Rule, RuleEngine, first_seen_counts,
+                              flatten_organizations, org_values, parse_dates)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+DATE_FIELDS = ('accreditation_date', 'expiry_date')
+
+
+def _invalid_date(field):
+    return lambda certs: (certs[field] != '') & parse_dates(certs[field]).isna()
+
+
+def _upper_contains(field, *terms):
+    # Upper-cased columns are added once in AccreditationValidationReporter.get_frames()
+    return lambda certs: certs[f'{field}_upper'].str.contains('|'.join(terms), regex=True)
+
+
+# Per-certification data quality checks, in reporting order
+VALIDATION_RULES = RuleEngine([
+    Rule('missing_name', 'Missing certification name', CERTIFICATIONS, lambda certs: certs['name'] == ''),
+    Rule('missing_status', 'Missing certification status', CERTIFICATIONS, lambda certs: certs['status'] == ''),
+    Rule('missing_type', 'Missing certification type', CERTIFICATIONS, lambda certs: certs['type'] == ''),
+] + [
+    Rule(f'invalid_{field}', f'Invalid date format in {field}', CERTIFICATIONS, _invalid_date(field))
+    for field in DATE_FIELDS
+])
+
+# Certifications counted towards each accreditation's coverage (a certification may match several)
+COVERAGE_RULES = RuleEngine([
+    Rule('jci_accreditation', 'JCI accreditation', CERTIFICATIONS,
+         lambda certs: _upper_contains('name', 'JCI', 'JOINT COMMISSION')(certs)
+         | _upper_contains('type', 'JCI ACCREDITATION')(certs)),
+    Rule('nabh_accreditation', 'NABH accreditation', CERTIFICATIONS,
+         _upper_contains('name', 'NABH', 'NATIONAL ACCREDITATION BOARD')),
+    Rule('nabl_accreditation', 'NABL accreditation', CERTIFICATIONS,
+         _upper_contains('name', 'NABL', 'NATIONAL ACCREDITATION BOARD FOR TESTING AND CALIBRATION LABORATORIES')),
+    Rule('cap_accreditation', 'CAP accreditation', CERTIFICATIONS,
+         _upper_contains('name', 'CAP', 'COLLEGE OF AMERICAN PATHOLOGISTS')),
+    Rule('iso_certifications', 'ISO certification', CERTIFICATIONS, _upper_contains('name', 'ISO')),
+])
+
+
 class AccreditationValidationReporter:
     """Generate comprehensive validation reports for accreditation data"""
     
@@ -28,6 +70,7 @@ class AccreditationValidationReporter:
         self.database_path = database_path
         self.organizations = []
         self.validation_results = {}
+        self._frames = None
         self.load_database()
     
     def load_database(self):
@@ -35,6 +78,7 @@ class AccreditationValidationReporter:
         try:
             with open(self.database_path, 'r', encoding='utf-8') as f:
                 self.organizations = json.load(f)
+            self._frames = None
             logger.info(f"Loaded {len(self.organizations)} organizations from database")
         except FileNotFoundError:
             logger.error(f"Database file not found: {self.database_path}")
@@ -43,103 +87,63 @@ class AccreditationValidationReporter:
             logger.error(f"Error parsing JSON database: {e}")
             self.organizations = []
     
+    def get_frames(self):
+        """Organizations and certifications flattened into columnar frames (built once per load)"""
+        if self._frames is None:
+            self._frames = flatten_organizations(
+                self.organizations,
+                org_fields={'name': '', 'country': 'Unknown'},
+                cert_fields=('name', 'type', 'status') + DATE_FIELDS
+            )
+            # Unnamed organizations are reported by position, as before
+            orgs = self._frames[ORGANIZATIONS]
+            unnamed = orgs['name'] == ''
+            orgs.loc[unnamed, 'name'] = [f'Organization_{i}' for i in orgs.index[unnamed]]
+            certs = self._frames[CERTIFICATIONS]
+            certs['name_upper'] = certs['name'].str.upper()
+            certs['type_upper'] = certs['type'].str.upper()
+        return self._frames
+    
     def validate_accreditation_data(self):
         """Validate all accreditation data in the database"""
         logger.info("Starting comprehensive accreditation validation...")
         
-        # Initialize validation counters
+        frames = self.get_frames()
+        orgs = frames[ORGANIZATIONS]
+        certs = frames[CERTIFICATIONS]
+        results = VALIDATION_RULES.evaluate(frames)
+        
+        certified = orgs['cert_count'] > 0
+        has_type = (certs['type'] != '').to_numpy()
+        has_status = (certs['status'] != '').to_numpy()
+        cert_countries = org_values(frames, 'country')
+        
+        accreditation_by_country = defaultdict(lambda: defaultdict(int))
+        for (country, cert_type), count in (pd.DataFrame({'country': cert_countries[has_type],
+                                                          'type': certs['type'].to_numpy()[has_type]})
+                                            .groupby(['country', 'type'], sort=False).size().items()):
+            accreditation_by_country[country][cert_type] = int(count)
+        
         validation_stats = {
             'total_organizations': len(self.organizations),
-            'organizations_with_certifications': 0,
-            'organizations_without_certifications': 0,
-            'total_certifications': 0,
-            'certification_types': defaultdict(int),
-            'certification_status_distribution': defaultdict(int),
-            'countries_with_accreditations': set(),
-            'accreditation_by_country': defaultdict(lambda: defaultdict(int)),
-            'validation_issues': [],
+            'organizations_with_certifications': int(certified.sum()),
+            'organizations_without_certifications': len(self.organizations) - int(certified.sum()),
+            'total_certifications': len(certs),
+            'certification_types': defaultdict(int, first_seen_counts(certs['type'][has_type])),
+            'certification_status_distribution': defaultdict(int, first_seen_counts(certs['status'][has_status])),
+            'countries_with_accreditations': list(pd.unique(orgs['country'][certified])),
+            'accreditation_by_country': accreditation_by_country,
+            # Compact references: {'organization', 'issue', 'org', 'cert'} instead of embedded certifications
+            'validation_issues': results.issues(),
             'data_quality_metrics': {
-                'complete_certification_data': 0,
-                'missing_certification_names': 0,
-                'missing_certification_status': 0,
-                'missing_certification_types': 0,
-                'invalid_dates': 0
+                'complete_certification_data': int(((certs['name'] != '') & has_type & has_status).sum()),
+                'missing_certification_names': results.count('missing_name'),
+                'missing_certification_status': results.count('missing_status'),
+                'missing_certification_types': results.count('missing_type'),
+                'invalid_dates': sum(results.count(f'invalid_{field}') for field in DATE_FIELDS)
             }
         }
         
-        # Validate each organization
-        for i, org in enumerate(self.organizations):
-            org_name = org.get('name', f'Organization_{i}')
-            country = org.get('country', 'Unknown')
-            certifications = org.get('certifications', [])
-            
-            if certifications and len(certifications) > 0:
-                validation_stats['organizations_with_certifications'] += 1
-                validation_stats['countries_with_accreditations'].add(country)
-                
-                # Validate each certification
-                for cert in certifications:
-                    validation_stats['total_certifications'] += 1
-                    
-                    # Check certification completeness
-                    cert_name = cert.get('name', '')
-                    cert_type = cert.get('type', '')
-                    cert_status = cert.get('status', '')
-                    
-                    if cert_name and cert_type and cert_status:
-                        validation_stats['data_quality_metrics']['complete_certification_data'] += 1
-                    
-                    if not cert_name:
-                        validation_stats['data_quality_metrics']['missing_certification_names'] += 1
-                        validation_stats['validation_issues'].append({
-                            'organization': org_name,
-                            'issue': 'Missing certification name',
-                            'certification': cert
-                        })
-                    
-                    if not cert_status:
-                        validation_stats['data_quality_metrics']['missing_certification_status'] += 1
-                        validation_stats['validation_issues'].append({
-                            'organization': org_name,
-                            'issue': 'Missing certification status',
-                            'certification': cert
-                        })
-                    
-                    if not cert_type:
-                        validation_stats['data_quality_metrics']['missing_certification_types'] += 1
-                        validation_stats['validation_issues'].append({
-                            'organization': org_name,
-                            'issue': 'Missing certification type',
-                            'certification': cert
-                        })
-                    
-                    # Count certification types and statuses
-                    if cert_type:
-                        validation_stats['certification_types'][cert_type] += 1
-                        validation_stats['accreditation_by_country'][country][cert_type] += 1
-                    
-                    if cert_status:
-                        validation_stats['certification_status_distribution'][cert_status] += 1
-                    
-                    # Validate dates if present
-                    for date_field in ['accreditation_date', 'expiry_date']:
-                        if date_field in cert and cert[date_field]:
-                            try:
-                                # Try to parse the date
-                                datetime.strptime(cert[date_field], '%Y-%m-%d')
-                            except (ValueError, TypeError):
-                                validation_stats['data_quality_metrics']['invalid_dates'] += 1
-                                validation_stats['validation_issues'].append({
-                                    'organization': org_name,
-                                    'issue': f'Invalid date format in {date_field}',
-                                    'certification': cert
-                                })
-            else:
-                validation_stats['organizations_without_certifications'] += 1
-        
-        # Convert sets to lists for JSON serialization
-        validation_stats['countries_with_accreditations'] = list(validation_stats['countries_with_accreditations'])
-        
         self.validation_results = validation_stats
         logger.info("Accreditation validation completed")
         
@@ -149,106 +153,30 @@ class AccreditationValidationReporter:
         """Analyze accreditation coverage by type and region"""
         logger.info("Analyzing accreditation coverage...")
         
-        coverage_analysis = {
-            'jci_accreditation': {
-                'total_count': 0,
-                'organizations': [],
-                'countries': set()
-            },
-            'nabh_accreditation': {
-                'total_count': 0,
-                'organizations': [],
-                'countries': set()
-            },
-            'nabl_accreditation': {
-                'total_count': 0,
-                'organizations': [],
-                'countries': set()
-            },
-            'cap_accreditation': {
-                'total_count': 0,
-                'organizations': [],
-                'countries': set()
-            },
-            'iso_certifications': {
-                'total_count': 0,
-                'organizations': [],
-                'countries': set(),
-                'iso_types': defaultdict(int)
+        frames = self.get_frames()
+        certs = frames[CERTIFICATIONS]
+        results = COVERAGE_RULES.evaluate(frames)
+        
+        coverage_analysis = {}
+        for rule in COVERAGE_RULES.rules:
+            rows = results.rows(rule.rule_id)
+            countries = org_values(frames, 'country', rows['org'])
+            coverage_analysis[rule.rule_id] = {
+                'total_count': len(rows),
+                # Compact references into the database instead of copies of each certification
+                'organizations': [
+                    {'name': name, 'country': country, 'org': int(org), 'cert': int(cert)}
+                    for name, country, org, cert in zip(org_values(frames, 'name', rows['org']),
+                                                        countries, rows['org'], rows['cert'])
+                ],
+                'countries': list(pd.unique(countries))
             }
-        }
         
-        # Analyze each organization
-        for org in self.organizations:
-            org_name = org.get('name', 'Unknown')
-            country = org.get('country', 'Unknown')
-            certifications = org.get('certifications', [])
-            
-            for cert in certifications:
-                cert_name = cert.get('name', '').upper()
-                cert_type = cert.get('type', '').upper()
-                
-                # Check for JCI accreditation
-                if 'JCI' in cert_name or 'JOINT COMMISSION' in cert_name or 'JCI ACCREDITATION' in cert_type:
-                    coverage_analysis['jci_accreditation']['total_count'] += 1
-                    coverage_analysis['jci_accreditation']['organizations'].append({
-                        'name': org_name,
-                        'country': country,
-                        'certification': cert
-                    })
-                    coverage_analysis['jci_accreditation']['countries'].add(country)
-                
-                # Check for NABH accreditation
-                if 'NABH' in cert_name or 'NATIONAL ACCREDITATION BOARD' in cert_name:
-                    coverage_analysis['nabh_accreditation']['total_count'] += 1
-                    coverage_analysis['nabh_accreditation']['organizations'].append({
-                        'name': org_name,
-                        'country': country,
-                        'certification': cert
-                    })
-                    coverage_analysis['nabh_accreditation']['countries'].add(country)
-                
-                # Check for NABL accreditation
-                if 'NABL' in cert_name or 'NATIONAL ACCREDITATION BOARD FOR TESTING AND CALIBRATION LABORATORIES' in cert_name:
-                    coverage_analysis['nabl_accreditation']['total_count'] += 1
-                    coverage_analysis['nabl_accreditation']['organizations'].append({
-                        'name': org_name,
-                        'country': country,
-                        'certification': cert
-                    })
-                    coverage_analysis['nabl_accreditation']['countries'].add(country)
-                
-                # Check for CAP accreditation
-                if 'CAP' in cert_name or 'COLLEGE OF AMERICAN PATHOLOGISTS' in cert_name:
-                    coverage_analysis['cap_accreditation']['total_count'] += 1
-                    coverage_analysis['cap_accreditation']['organizations'].append({
-                        'name': org_name,
-                        'country': country,
-                        'certification': cert
-                    })
-                    coverage_analysis['cap_accreditation']['countries'].add(country)
-                
-                # Check for ISO certifications
-                if 'ISO' in cert_name:
-                    coverage_analysis['iso_certifications']['total_count'] += 1
-                    coverage_analysis['iso_certifications']['organizations'].append({
-                        'name': org_name,
-                        'country': country,
-                        'certification': cert
-                    })
-                    coverage_analysis['iso_certifications']['countries'].add(country)
-                    
-                    # Extract ISO standard number
-                    import re
-                    iso_match = re.search(r'ISO\s*(\d+)', cert_name)
-                    if iso_match:
-                        iso_standard = f"ISO {iso_match.group(1)}"
-                        coverage_analysis['iso_certifications']['iso_types'][iso_standard] += 1
-        
-        # Convert sets to lists for JSON serialization
-        for accred_type in coverage_analysis:
-            if 'countries' in coverage_analysis[accred_type]:
-                coverage_analysis[accred_type]['countries'] = list(coverage_analysis[accred_type]['countries'])
+        # Extract ISO standard numbers
+        iso_names = results.rows('iso_certifications')['name_upper']
+        iso_numbers = iso_names.str.extract(r'ISO\s*(\d+)', expand=False).dropna()
+        coverage_analysis['iso_certifications']['iso_types'] = defaultdict(
+            int, first_seen_counts('ISO ' + iso_numbers))
         
         return coverage_analysis
     
@@ -1,21 +1,23 @@
 import requests
 import json
 import csv
-import time
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Set
 from bs4 import BeautifulSoup
 import re
-import random
 from urllib.parse import urljoin, urlparse, parse_qs
 import os
 
+from crawl_engine import CrawlPlugin, CrawlRequest, crawl
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class AdvancedNABHScraper:
+class AdvancedNABHScraper(CrawlPlugin):
+    crawl_name = "nabh_advanced"
+
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
@@ -27,6 +29,7 @@ class AdvancedNABHScraper:
             'Upgrade-Insecure-Requests': '1',
             'Referer': 'https://nabh.co/find-a-healthcare-organisation/'
         })
+        self.crawl_headers = dict(self.session.headers)
         
         self.base_url = "https://nabh.co"
         self.search_url = "https://nabh.co/find-a-healthcare-organisation/"
@@ -74,58 +77,51 @@ class AdvancedNABHScraper:
             {'q': 'lucknow'}
         ]
 
-    def get_page_content(self, url: str, params: Dict = None) -> Optional[BeautifulSoup]:
-        """Get page content with error handling"""
-        try:
-            response = self.session.get(url, params=params)
-            
-            if response.status_code == 200:
-                return BeautifulSoup(response.content, 'html.parser')
-            else:
-                logger.warning(f"HTTP {response.status_code} for {url} with params {params}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {e}")
-            return None
+    def seeds(self):
+        """AJAX search, plain search page and first results page for every parameter set"""
+        for params in self.search_params:
+            yield CrawlRequest(self.ajax_url, method='POST', data=dict(params), callback='parse_ajax',
+                               meta={'params': params, 'attempt': 'post'})
+            yield CrawlRequest(self.search_url, params=dict(params), callback='parse_search_page',
+                               meta={'params': params})
+            yield CrawlRequest(self.search_url, params=dict(params, page=1), callback='parse_search_page',
+                               meta={'params': params, 'page': 1})
 
-    def try_ajax_search(self, params: Dict) -> List[Dict]:
-        """Try AJAX search endpoint"""
+    def parse_ajax(self, response):
+        """AJAX search endpoint: JSON when available, otherwise the returned HTML"""
+        params = response.request.meta['params']
         try:
-            # Try different AJAX request formats
-            ajax_attempts = [
-                # POST request
-                lambda: self.session.post(self.ajax_url, data=params),
-                # GET request
-                lambda: self.session.get(self.ajax_url, params=params),
-                # JSON POST
-                lambda: self.session.post(self.ajax_url, json=params, 
-                                        headers={'Content-Type': 'application/json'})
-            ]
-            
-            for attempt in ajax_attempts:
-                try:
-                    response = attempt()
-                    
-                    if response.status_code == 200:
-                        # Try to parse as JSON
-                        try:
-                            data = response.json()
-                            logger.info(f"AJAX JSON response received for {params}")
-                            return self.parse_ajax_json_response(data)
-                        except:
-                            # Try to parse as HTML
-                            soup = BeautifulSoup(response.content, 'html.parser')
-                            return self.parse_html_response(soup, params)
-                            
-                except Exception as e:
-                    logger.debug(f"AJAX attempt failed: {e}")
-                    continue
-            
-        except Exception as e:
-            logger.error(f"AJAX search failed for {params}: {e}")
-        
-        return []
+            data = response.json()
+        except ValueError:
+            orgs = self.parse_html_response(response.soup(), params)
+        else:
+            logger.info(f"AJAX JSON response received for {params}")
+            orgs = self.parse_ajax_json_response(data)
+        if orgs:
+            logger.info(f"Found {len(orgs)} organizations via AJAX for {params}")
+        return orgs
+
+    def parse_search_page(self, response):
+        """Search results page; paginated pages continue until one comes back empty"""
+        meta = response.request.meta
+        page = meta.get('page')
+        search_params = dict(meta['params'], page=page) if page else meta['params']
+        orgs = self.parse_html_response(response.soup(), search_params)
+        if not orgs:
+            return
+        logger.info(f"Found {len(orgs)} organizations via HTML for {search_params}")
+        yield from orgs
+        if page and page < 5:  # Try first 5 pages
+            yield CrawlRequest(self.search_url, params=dict(meta['params'], page=page + 1),
+                               callback='parse_search_page', meta={'params': meta['params'], 'page': page + 1})
+
+    def on_crawl_error(self, request, error):
+        """Retry the AJAX search as a GET when the POST form is rejected"""
+        if request.callback == 'parse_ajax' and request.meta.get('attempt') == 'post':
+            return [CrawlRequest(self.ajax_url, params=dict(request.meta['params']), callback='parse_ajax',
+                                 meta={'params': request.meta['params'], 'attempt': 'get'})]
+        self.failed_urls.add(request.url)
+        return super().on_crawl_error(request, error)
 
     def parse_ajax_json_response(self, data) -> List[Dict]:
         """Parse JSON response from AJAX endpoint"""
@@ -471,69 +467,16 @@ class AdvancedNABHScraper:
         
         return organizations
 
-    def scrape_with_params(self, params: Dict) -> List[Dict]:
-        """Scrape organizations with specific parameters"""
-        organizations = []
-        
-        try:
-            logger.info(f"Scraping with parameters: {params}")
-            
-            # Try AJAX first
-            ajax_orgs = self.try_ajax_search(params)
-            if ajax_orgs:
-                organizations.extend(ajax_orgs)
-                logger.info(f"Found {len(ajax_orgs)} organizations via AJAX")
-            
-            # Try regular HTTP request
-            soup = self.get_page_content(self.search_url, params)
-            if soup:
-                html_orgs = self.parse_html_response(soup, params)
-                if html_orgs:
-                    organizations.extend(html_orgs)
-                    logger.info(f"Found {len(html_orgs)} organizations via HTML")
-            
-            # Try with pagination
-            for page in range(1, 6):  # Try first 5 pages
-                page_params = params.copy()
-                page_params['page'] = page
-                
-                soup = self.get_page_content(self.search_url, page_params)
-                if soup:
-                    page_orgs = self.parse_html_response(soup, page_params)
-                    if page_orgs:
-                        organizations.extend(page_orgs)
-                        logger.info(f"Found {len(page_orgs)} organizations on page {page}")
-                    else:
-                        break  # No more results
-                
-                time.sleep(random.uniform(1, 2))
-            
-        except Exception as e:
-            logger.error(f"Error scraping with params {params}: {e}")
-        
-        return organizations
-
     def scrape_all_organizations(self):
-        """Scrape all organizations using various search parameters"""
+        """Scrape all organizations using various search parameters (crawled concurrently)"""
         logger.info("Starting advanced NABH organization scraping...")
         
         all_organizations = []
-        
-        for i, params in enumerate(self.search_params):
-            logger.info(f"Progress: {i+1}/{len(self.search_params)} - {params}")
-            
-            try:
-                orgs = self.scrape_with_params(params)
-                if orgs:
-                    all_organizations.extend(orgs)
-                    logger.info(f"Total organizations so far: {len(all_organizations)}")
-                
-                # Rate limiting
-                time.sleep(random.uniform(2, 4))
-                
-            except Exception as e:
-                logger.error(f"Error with params {params}: {e}")
-                continue
+        try:
+            all_organizations = crawl(self, rate_per_sec=0.5, per_domain_concurrency=2)
+        except Exception as e:
+            logger.error(f"Error during crawl: {e}")
+        logger.info(f"Total organizations found: {len(all_organizations)}")
         
         # Remove duplicates
         self.organizations = self.remove_duplicates(all_organizations)
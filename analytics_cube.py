@@ -0,0 +1,246 @@
+"""
+Analytics Cube for QuXAT Healthcare Quality Grid
+Precomputed aggregates of the scored organizations for the Quality Dashboard.
+
+Batch scoring writes analytics_cube.json next to scored_organizations_complete.json.
+The cube materializes every group-by over country x region x hospital_type x
+certification type (16 cuboids, including the grand total). Each cell holds
+the organization count, score mean, min, quantiles, max and grade-band
+counts, so the dashboard reads its numbers with dictionary lookups instead
+of scanning per-organization records on every rerun.
+
+Certification cuboids count an organization once per certification type it
+holds (active certifications only; "None" for organizations without any).
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+CUBE_FILE = 'analytics_cube.json'
+CUBE_FORMAT_VERSION = 1
+
+DIMENSIONS = ('country', 'region', 'hospital_type', 'certification')
+QUANTILES = (10, 25, 50, 75, 90)
+# Same bands as ranking_statistics.json's score_distribution: (label, lower bound inclusive)
+GRADE_BANDS = (('A+ (75-100)', 75), ('A (65-74)', 65), ('B+ (55-64)', 55), ('B (45-54)', 45), ('C (0-44)', None))
+# Grade bands counted as top performers on the dashboard
+TOP_PERFORMER_BANDS = 2
+STAT_FIELDS = ('count', 'mean', 'min') + tuple(f'p{q}' for q in QUANTILES) + ('max', 'bands')
+NO_CERTIFICATION = 'None'
+UNKNOWN = 'Unknown'
+
+# Certification type labels, first match wins; ISO standards keep their number
+_CERTIFICATION_PATTERNS = (
+    ('JCI', re.compile(r'\bjci\b|joint commission international', re.I)),
+    ('Joint Commission', re.compile(r'joint commission', re.I)),
+    ('NABH', re.compile(r'\bnabh\b', re.I)),
+    ('NABL', re.compile(r'\bnabl\b', re.I)),
+    ('CAP', re.compile(r'\bcap\b|college of american pathologists', re.I)),
+    ('Magnet', re.compile(r'\bmagnet\b', re.I)),
+    ('DNV', re.compile(r'\bdnv\b', re.I)),
+    ('Accreditation Canada', re.compile(r'accreditation canada', re.I)),
+    ('ACHS', re.compile(r'\bachs\b', re.I)),
+)
+_ISO_PATTERN = re.compile(r'\biso\s*(\d{4,5})', re.I)
+
+
+def certification_type(cert: Any) -> str:
+    """Short certification type label ('JCI', 'NABH', 'ISO 9001', ..., 'Other')"""
+    if isinstance(cert, dict):
+        text = f"{cert.get('name', '')} {cert.get('type', '')}"
+    else:
+        text = str(cert or '')
+    for label, pattern in _CERTIFICATION_PATTERNS:
+        if pattern.search(text):
+            return label
+    iso = _ISO_PATTERN.search(text)
+    if iso:
+        return f"ISO {iso.group(1)}"
+    return 'Other'
+
+
+def _certification_types(org: Dict) -> List[str]:
+    types = set()
+    for cert in org.get('certifications') or []:
+        if isinstance(cert, dict) and str(cert.get('status', 'Active')).lower() != 'active':
+            continue
+        types.add(certification_type(cert))
+    return sorted(types) or [NO_CERTIFICATION]
+
+
+def _label(value: Any) -> str:
+    text = str(value).strip().replace('|', '/') if value is not None else ''
+    return text or UNKNOWN
+
+
+def _band_counts(scores: np.ndarray) -> List[int]:
+    counts = []
+    upper = None
+    for _, lower in GRADE_BANDS:
+        mask = np.ones(len(scores), dtype=bool)
+        if lower is not None:
+            mask &= scores >= lower
+        if upper is not None:
+            mask &= scores < upper
+        counts.append(int(mask.sum()))
+        upper = lower
+    return counts
+
+
+def _cell_stats(scores: List[float]) -> List[Any]:
+    values = np.asarray(scores, dtype=float)
+    quantiles = np.percentile(values, QUANTILES)
+    return ([len(values), round(float(values.mean()), 4), round(float(values.min()), 4)]
+            + [round(float(q), 4) for q in quantiles]
+            + [round(float(values.max()), 4), _band_counts(values)])
+
+
+def cuboid_name(dimensions: Iterable[str]) -> str:
+    """Cuboid key: the grouped dimensions in DIMENSIONS order, comma separated ('' for the total)"""
+    dims = set(dimensions)
+    unknown = dims - set(DIMENSIONS)
+    if unknown:
+        raise KeyError(f"Unknown cube dimension(s): {', '.join(sorted(unknown))}")
+    return ','.join(d for d in DIMENSIONS if d in dims)
+
+
+def build_cube(scored_organizations: Iterable[Dict]) -> Dict[str, Any]:
+    """Materialize every cuboid from scored organization records"""
+    groups: Dict[str, Dict[Tuple[str, ...], List[float]]] = {}
+    subsets = [dims for size in range(len(DIMENSIONS) + 1) for dims in combinations(DIMENSIONS, size)]
+    for dims in subsets:
+        groups[','.join(dims)] = {}
+
+    organizations = 0
+    for org in scored_organizations:
+        if not isinstance(org, dict) or 'error' in org:
+            continue
+        try:
+            score = float(org.get('total_score', 0) or 0)
+        except (TypeError, ValueError):
+            continue
+        organizations += 1
+        labels = {'country': _label(org.get('country')), 'region': _label(org.get('region')),
+                  'hospital_type': _label(org.get('hospital_type'))}
+        cert_types = _certification_types(org)
+        for dims in subsets:
+            cells = groups[','.join(dims)]
+            if 'certification' in dims:
+                for cert in cert_types:
+                    labels['certification'] = cert
+                    cells.setdefault(tuple(labels[d] for d in dims), []).append(score)
+            else:
+                cells.setdefault(tuple(labels[d] for d in dims), []).append(score)
+
+    cuboids = {name: {'|'.join(key): _cell_stats(scores) for key, scores in sorted(cells.items())}
+               for name, cells in groups.items()}
+    return {
+        'format_version': CUBE_FORMAT_VERSION,
+        'generated_at': datetime.now().isoformat(),
+        'organizations': organizations,
+        'dimensions': list(DIMENSIONS),
+        'stat_fields': list(STAT_FIELDS),
+        'bands': [label for label, _ in GRADE_BANDS],
+        'cuboids': cuboids,
+    }
+
+
+def save_cube(cube: Dict[str, Any], path: str = CUBE_FILE) -> None:
+    """Write the cube compactly (atomic replace)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cube, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+class AnalyticsCube:
+    """Read side of the cube: constant-time cell lookups and small breakdowns"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.generated_at = data.get('generated_at')
+        self.bands = data.get('bands', [label for label, _ in GRADE_BANDS])
+        self._fields = data.get('stat_fields', list(STAT_FIELDS))
+        self._cuboids = data.get('cuboids', {})
+
+    @classmethod
+    def from_records(cls, scored_organizations: Iterable[Dict]) -> 'AnalyticsCube':
+        return cls(build_cube(scored_organizations))
+
+    @classmethod
+    def load(cls, path: str = CUBE_FILE, newer_than: Optional[str] = None) -> Optional['AnalyticsCube']:
+        """Cube from disk; None if missing, unreadable or older than the newer_than file"""
+        try:
+            if newer_than and os.path.exists(newer_than) and os.path.getmtime(path) < os.path.getmtime(newer_than):
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('format_version') != CUBE_FORMAT_VERSION:
+            return None
+        return cls(data)
+
+    def _stats(self, row: List[Any]) -> Dict[str, Any]:
+        stats = dict(zip(self._fields, row))
+        stats['bands'] = dict(zip(self.bands, stats.get('bands') or []))
+        return stats
+
+    def cell(self, **filters: str) -> Optional[Dict[str, Any]]:
+        """Stats for one cell, e.g. cell(country='India', certification='NABH'); None if empty"""
+        name = cuboid_name(filters)
+        key = '|'.join(_label(filters[d]) for d in DIMENSIONS if d in filters)
+        row = self._cuboids.get(name, {}).get(key)
+        return self._stats(row) if row else None
+
+    def count(self, **filters: str) -> int:
+        cell = self.cell(**filters)
+        return cell['count'] if cell else 0
+
+    def total(self) -> Dict[str, Any]:
+        """Stats over every organization"""
+        return self.cell() or self._stats([0, 0.0, 0.0] + [0.0] * len(QUANTILES) + [0.0, [0] * len(self.bands)])
+
+    def top_performers(self, **filters: str) -> int:
+        """Organizations in the top grade bands"""
+        cell = self.cell(**filters)
+        if not cell:
+            return 0
+        return sum(list(cell['bands'].values())[:TOP_PERFORMER_BANDS])
+
+    def breakdown(self, dimension: str, sort_by: str = 'count', limit: Optional[int] = None,
+                  min_count: int = 1, **filters: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """(value, stats) for each value of dimension within the filtered slice, largest first"""
+        if dimension in filters:
+            raise ValueError(f"{dimension} is both the breakdown dimension and a filter")
+        dims = [d for d in DIMENSIONS if d in filters or d == dimension]
+        position = dims.index(dimension)
+        wanted = {i: _label(filters[d]) for i, d in enumerate(dims) if d != dimension}
+        rows = []
+        for key, row in self._cuboids.get(cuboid_name(dims), {}).items():
+            parts = key.split('|')
+            if all(parts[i] == value for i, value in wanted.items()) and row[0] >= min_count:
+                rows.append((parts[position], self._stats(row)))
+        rows.sort(key=lambda item: (-item[1][sort_by], item[0]))
+        return rows[:limit] if limit else rows
+
+    def summary(self) -> Dict[str, Any]:
+        """Headline numbers for the dashboard"""
+        total = self.total()
+        countries = [value for value, _ in self.breakdown('country') if value != UNKNOWN]
+        return {
+            'organizations': total['count'],
+            'average_score': total['mean'],
+            'median_score': total['p50'],
+            'top_performers': self.top_performers(),
+            'countries': len(countries),
+            'certified': total['count'] - self.count(certification=NO_CERTIFICATION),
+            'band_counts': total['bands'],
+            'generated_at': self.generated_at,
+        }
@@ -6,13 +6,13 @@ to provide real-time sentiment analysis for healthcare organizations.
 
 import requests
 import json
-import time
 import re
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-import statistics
-from textblob import TextBlob
+from feedback_pipeline import (
+    FeedbackAggregateCache, RateLimiter, compute_feedback_aggregates, fetch_platforms, get_sentiment_model
+)
 import logging
 
 # Configure logging
@@ -59,6 +59,12 @@ class AutomatedFeedbackScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         
+        # Platforms are fetched concurrently; requests to the same platform stay
+        # at least 2s apart. Sentiment uses the shared cached lexicon model.
+        self.rate_limiter = RateLimiter(rate_per_sec=0.5, burst=1)
+        self.sentiment_model = get_sentiment_model()
+        self.summary_cache = FeedbackAggregateCache(ttl_seconds=3600)
+        
         # Initialize data validator for organization validation
         try:
             from data_validator import HealthcareDataValidator
@@ -120,6 +126,10 @@ class AutomatedFeedbackScraper:
         """
         logger.info(f"Starting feedback scraping for: {organization_name}")
         
+        cached = self.summary_cache.get(organization_name, location)
+        if cached is not None:
+            return cached
+        
         # Validate organization before generating any data
         if not self._validate_organization(organization_name):
             logger.warning(f"Organization {organization_name} failed validation - no feedback data generated")
@@ -128,25 +138,19 @@ class AutomatedFeedbackScraper:
         all_feedback = []
         platform_counts = {}
         
-        for platform_name, scraper_func in self.platforms.items():
-            try:
-                logger.info(f"Scraping {platform_name} for {organization_name}")
-                feedback_list = scraper_func(organization_name, location)
-                all_feedback.extend(feedback_list)
-                platform_counts[platform_name] = len(feedback_list)
-                
-                # Rate limiting to avoid being blocked
-                time.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"Error scraping {platform_name}: {str(e)}")
-                platform_counts[platform_name] = 0
+        results = fetch_platforms(self.platforms, organization_name, location, rate_limiter=self.rate_limiter)
+        for platform_name, feedback_list in results.items():
+            all_feedback.extend(feedback_list or [])
+            platform_counts[platform_name] = len(feedback_list or [])
         
         if not all_feedback:
             logger.warning(f"No feedback found for {organization_name}")
             return self._create_empty_summary(organization_name)
         
-        return self._analyze_feedback(organization_name, all_feedback, platform_counts)
+        self._score_sentiment_batch(all_feedback)
+        summary = self._analyze_feedback(organization_name, all_feedback, platform_counts)
+        self.summary_cache.put(organization_name, location, summary)
+        return summary
     
     def _scrape_google_reviews(self, org_name: str, location: str) -> List[ScrapedFeedback]:
         """Scrape Google Reviews using Google Places API simulation"""
@@ -161,14 +165,12 @@ class AutomatedFeedbackScraper:
             simulated_reviews = self._generate_simulated_google_reviews(org_name)
             
             for review_data in simulated_reviews:
-                sentiment = self._analyze_sentiment(review_data['text'])
-                
                 feedback = ScrapedFeedback(
                     organization_name=org_name,
                     platform='google',
                     rating=review_data['rating'],
                     review_text=review_data['text'],
-                    sentiment_score=sentiment,
+                    sentiment_score=0.0,
                     timestamp=review_data['date'],
                     reviewer_name=review_data.get('author', 'Anonymous'),
                     verified=True
@@ -189,14 +191,12 @@ class AutomatedFeedbackScraper:
             simulated_reviews = self._generate_simulated_facebook_reviews(org_name)
             
             for review_data in simulated_reviews:
-                sentiment = self._analyze_sentiment(review_data['text'])
-                
                 feedback = ScrapedFeedback(
                     organization_name=org_name,
                     platform='facebook',
                     rating=review_data.get('rating'),
                     review_text=review_data['text'],
-                    sentiment_score=sentiment,
+                    sentiment_score=0.0,
                     timestamp=review_data['date'],
                     reviewer_name=review_data.get('author', 'Anonymous'),
                     verified=False
@@ -217,14 +217,12 @@ class AutomatedFeedbackScraper:
             simulated_tweets = self._generate_simulated_twitter_mentions(org_name)
             
             for tweet_data in simulated_tweets:
-                sentiment = self._analyze_sentiment(tweet_data['text'])
-                
                 feedback = ScrapedFeedback(
                     organization_name=org_name,
                     platform='twitter',
                     rating=None,  # Twitter doesn't have ratings
                     review_text=tweet_data['text'],
-                    sentiment_score=sentiment,
+                    sentiment_score=0.0,
                     timestamp=tweet_data['date'],
                     reviewer_name=tweet_data.get('author', 'Anonymous'),
                     verified=tweet_data.get('verified', False)
@@ -245,14 +243,12 @@ class AutomatedFeedbackScraper:
             simulated_reviews = self._generate_simulated_healthgrades_reviews(org_name)
             
             for review_data in simulated_reviews:
-                sentiment = self._analyze_sentiment(review_data['text'])
-                
                 feedback = ScrapedFeedback(
                     organization_name=org_name,
                     platform='healthgrades',
                     rating=review_data['rating'],
                     review_text=review_data['text'],
-                    sentiment_score=sentiment,
+                    sentiment_score=0.0,
                     timestamp=review_data['date'],
                     reviewer_name=review_data.get('author', 'Anonymous'),
                     verified=True
@@ -273,14 +269,12 @@ class AutomatedFeedbackScraper:
             simulated_reviews = self._generate_simulated_yelp_reviews(org_name)
             
             for review_data in simulated_reviews:
-                sentiment = self._analyze_sentiment(review_data['text'])
-                
                 feedback = ScrapedFeedback(
                     organization_name=org_name,
                     platform='yelp',
                     rating=review_data['rating'],
                     review_text=review_data['text'],
-                    sentiment_score=sentiment,
+                    sentiment_score=0.0,
                     timestamp=review_data['date'],
                     reviewer_name=review_data.get('author', 'Anonymous'),
                     verified=False
@@ -293,35 +287,37 @@ class AutomatedFeedbackScraper:
         return feedback_list
     
     def _analyze_sentiment(self, text: str) -> float:
-        """Analyze sentiment of review text using TextBlob"""
+        """Analyze sentiment of a single review text (-1 negative to 1 positive)"""
         try:
-            blob = TextBlob(text)
-            # TextBlob returns polarity from -1 (negative) to 1 (positive)
-            return blob.sentiment.polarity
+            return self.sentiment_model.polarity(text)
         except Exception as e:
             logger.error(f"Sentiment analysis error: {str(e)}")
             return 0.0
+
+    def _score_sentiment_batch(self, feedback_list: List[ScrapedFeedback]) -> None:
+        """Score sentiment for all scraped feedback in one vectorized batch (scrapers leave it at 0.0)"""
+        if not feedback_list:
+            return
+        try:
+            scores = self.sentiment_model.polarity_batch(f.review_text for f in feedback_list)
+        except Exception as e:
+            logger.error(f"Sentiment analysis error: {str(e)}")
+            return
+        for feedback, score in zip(feedback_list, scores.tolist()):
+            feedback.sentiment_score = score
     
     def _analyze_feedback(self, org_name: str, feedback_list: List[ScrapedFeedback], 
                          platform_counts: Dict[str, int]) -> FeedbackSummary:
         """Analyze all collected feedback and create summary"""
         
-        # Calculate metrics
-        total_reviews = len(feedback_list)
-        
-        # Average rating (only from platforms that provide ratings)
-        ratings = [f.rating for f in feedback_list if f.rating is not None]
-        avg_rating = statistics.mean(ratings) if ratings else 0.0
-        
-        # Overall sentiment score
-        sentiment_scores = [f.sentiment_score for f in feedback_list]
-        overall_sentiment = statistics.mean(sentiment_scores) if sentiment_scores else 0.0
-        
-        # Calculate trend based on recent vs older reviews
-        recent_trend = self._calculate_trend(feedback_list)
-        
-        # Confidence score based on volume and recency
-        confidence = self._calculate_confidence_score(feedback_list)
+        # Rating, sentiment, trend (recent vs older reviews) and confidence
+        # (volume, recency, platform diversity) in one numpy pass
+        aggregates = self._aggregate(feedback_list)
+        total_reviews = aggregates['count']
+        avg_rating = aggregates['average_rating']
+        overall_sentiment = aggregates['sentiment_score']
+        recent_trend = aggregates['recent_trend']
+        confidence = aggregates['confidence_score']
         
         return FeedbackSummary(
             organization_name=org_name,
@@ -334,54 +330,22 @@ class AutomatedFeedbackScraper:
             last_updated=datetime.now()
         )
     
+    def _aggregate(self, feedback_list: List[ScrapedFeedback]):
+        """Numpy aggregates over sentiment, ratings and timestamps (see feedback_pipeline)"""
+        return compute_feedback_aggregates(
+            [f.sentiment_score for f in feedback_list],
+            [f.rating for f in feedback_list],
+            [f.timestamp for f in feedback_list],
+            [f.platform for f in feedback_list]
+        )
+    
     def _calculate_trend(self, feedback_list: List[ScrapedFeedback]) -> str:
         """Calculate if sentiment is improving, stable, or declining"""
-        if len(feedback_list) < 4:
-            return 'stable'
-        
-        # Sort by timestamp
-        sorted_feedback = sorted(feedback_list, key=lambda x: x.timestamp)
-        
-        # Split into recent and older halves
-        mid_point = len(sorted_feedback) // 2
-        older_half = sorted_feedback[:mid_point]
-        recent_half = sorted_feedback[mid_point:]
-        
-        # Calculate average sentiment for each half
-        older_sentiment = statistics.mean([f.sentiment_score for f in older_half])
-        recent_sentiment = statistics.mean([f.sentiment_score for f in recent_half])
-        
-        # Determine trend
-        difference = recent_sentiment - older_sentiment
-        
-        if difference > 0.1:
-            return 'improving'
-        elif difference < -0.1:
-            return 'declining'
-        else:
-            return 'stable'
+        return self._aggregate(feedback_list)['recent_trend']
     
     def _calculate_confidence_score(self, feedback_list: List[ScrapedFeedback]) -> float:
         """Calculate confidence score based on review volume and recency"""
-        if not feedback_list:
-            return 0.0
-        
-        # Volume factor (more reviews = higher confidence)
-        volume_factor = min(len(feedback_list) / 50.0, 1.0)  # Max at 50 reviews
-        
-        # Recency factor (recent reviews = higher confidence)
-        now = datetime.now()
-        recent_reviews = [f for f in feedback_list 
-                         if (now - f.timestamp).days <= 90]  # Last 90 days
-        recency_factor = len(recent_reviews) / len(feedback_list)
-        
-        # Platform diversity factor
-        platforms = set(f.platform for f in feedback_list)
-        diversity_factor = min(len(platforms) / 3.0, 1.0)  # Max at 3 platforms
-        
-        # Combined confidence score
-        confidence = (volume_factor * 0.4 + recency_factor * 0.4 + diversity_factor * 0.2)
-        return min(confidence, 1.0)
+        return self._aggregate(feedback_list)['confidence_score']
     
     def _create_empty_summary(self, org_name: str) -> FeedbackSummary:
         """Create empty summary when no feedback is found"""
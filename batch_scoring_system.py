@@ -2,13 +2,22 @@
 Batch Scoring System for QuXAT Healthcare Quality Grid
 This module processes all healthcare organizations in the database and assigns
 unique ranks and percentile scores based on the QuXAT scoring logic.
+
+In incremental mode (--incremental) each aggregated organization record is
+fingerprinted, and only records whose fingerprint or the scoring-config
+version changed are rescored; the rest are reused from the previous
+scored_organizations_complete.json. Ranks and statistics are always rebuilt
+over the full set.
 """
 
+import argparse
+import ast
+import hashlib
 import json
 import sys
 import os
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 
 # Add the current directory to the path to import streamlit_app
@@ -18,11 +27,96 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SCORED_FILE = 'scored_organizations_complete.json'
+
+# Bump when scoring changes in a way the source files below do not capture
+SCORING_CONFIG_REVISION = 1
+
+# Code and reference data the per-organization score depends on
+SCORING_INPUT_FILES = (
+    'certification_bitsets.py',
+    'international_quality_methods.py',
+    'international_scoring_algorithm.py',
+    'data_validator.py',
+    'jci_accredited_organizations.json',
+)
+
+# The analyzer's scoring lives in the app module; only the source of this method
+# and the analyzer methods it calls is hashed, so UI edits do not force a rescore
+SCORING_APP_FILE = 'streamlit_app.py'
+SCORING_ENTRY_POINT = ('HealthcareOrgAnalyzer', 'calculate_quality_score')
+
+# Record fields that change without affecting the score
+VOLATILE_FIELDS = ('last_updated',)
+
+# Fields assigned by the ranking/international passes, recomputed on every run
+RANKING_FIELDS = ('overall_rank', 'percentile', 'tie_breaking_info', 'international_score', 'international_penalty')
+
+
+def scoring_method_sources(path: str, class_name: str, entry_point: str) -> List[str]:
+    """Source of entry_point and every method of class_name it calls (transitively), in call order"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    methods = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            methods = {n.name: n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))}
+    sources, seen, pending = [], set(), [entry_point]
+    while pending:
+        name = pending.pop(0)
+        if name in seen or name not in methods:
+            continue
+        seen.add(name)
+        sources.append(ast.get_source_segment(source, methods[name]))
+        pending.extend(n.attr for n in ast.walk(methods[name])
+                       if isinstance(n, ast.Attribute) and isinstance(n.value, ast.Name) and n.value.id == 'self')
+    return sources
+
+
+def scoring_config_version(base_dir: Optional[str] = None) -> str:
+    """Hash of the scoring code and reference data; a change forces a full rescore"""
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(f"revision:{SCORING_CONFIG_REVISION}".encode('utf-8'))
+    for name in SCORING_INPUT_FILES:
+        digest.update(name.encode('utf-8'))
+        try:
+            with open(os.path.join(base_dir, name), 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except OSError:
+            digest.update(b'missing')
+    digest.update('.'.join(SCORING_ENTRY_POINT).encode('utf-8'))
+    try:
+        for method_source in scoring_method_sources(os.path.join(base_dir, SCORING_APP_FILE), *SCORING_ENTRY_POINT):
+            digest.update(hashlib.sha256(method_source.encode('utf-8')).digest())
+    except (OSError, SyntaxError):
+        digest.update(b'missing')
+    return digest.hexdigest()[:16]
+
+
+def record_fingerprint(org_data: Dict) -> str:
+    """Content fingerprint of an aggregated organization record"""
+    stable = {k: v for k, v in org_data.items() if k not in VOLATILE_FIELDS}
+    payload = json.dumps(stable, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
 class BatchScoringSystem:
     """Batch scoring system for all healthcare organizations"""
     
-    def __init__(self):
-        """Initialize the batch scoring system"""
+    def __init__(self, incremental: bool = False, previous_results_file: str = SCORED_FILE):
+        """Initialize the batch scoring system
+        
+        Args:
+            incremental: Reuse previous scores for records whose fingerprint and
+                scoring-config version are unchanged
+            previous_results_file: Scored file to reuse results from
+        """
+        self.incremental = incremental
+        self.previous_results_file = previous_results_file
+        self.config_version = scoring_config_version()
+        self.incremental_stats = {'total': 0, 'rescored': 0, 'reused': 0}
+        
         # Import the analyzer from streamlit_app
         from streamlit_app import HealthcareOrgAnalyzer
         self.analyzer = HealthcareOrgAnalyzer()
@@ -179,17 +273,45 @@ class BatchScoringSystem:
                 'error': str(e)
             }
     
+    def load_previous_results(self) -> Dict[str, Dict]:
+        """Previous scores reusable under the current scoring config, by record fingerprint"""
+        try:
+            with open(self.previous_results_file, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.info(f"No previous results to reuse ({e}); rescoring everything")
+            return {}
+        reusable = {}
+        for entry in previous if isinstance(previous, list) else []:
+            if (isinstance(entry, dict) and entry.get('record_fingerprint')
+                    and entry.get('scoring_config_version') == self.config_version
+                    and 'error' not in entry):
+                reusable[entry['record_fingerprint']] = entry
+        logger.info(f"Loaded {len(reusable)} reusable scores from {self.previous_results_file}")
+        return reusable
+    
     def process_all_organizations(self):
-        """Process and score all organizations in the database"""
+        """Process and score all organizations in the database (only changed ones in incremental mode)"""
         logger.info("Starting batch scoring process...")
         
         total_orgs = len(self.organizations)
         processed = 0
+        previous = self.load_previous_results() if self.incremental else {}
+        self.incremental_stats = {'total': total_orgs, 'rescored': 0, 'reused': 0}
         
         for i, org_data in enumerate(self.organizations):
             try:
-                # Calculate score for this organization
-                org_result = self.calculate_organization_score(org_data)
+                fingerprint = record_fingerprint(org_data)
+                reused = previous.get(fingerprint)
+                if reused is not None:
+                    org_result = {k: v for k, v in reused.items() if k not in RANKING_FIELDS}
+                    self.incremental_stats['reused'] += 1
+                else:
+                    # Calculate score for this organization
+                    org_result = self.calculate_organization_score(org_data)
+                    org_result['record_fingerprint'] = fingerprint
+                    org_result['scoring_config_version'] = self.config_version
+                    self.incremental_stats['rescored'] += 1
                 self.scored_organizations.append(org_result)
                 
                 processed += 1
@@ -202,7 +324,23 @@ class BatchScoringSystem:
                 logger.error(f"Failed to process organization {i}: {e}")
                 continue
         
-        logger.info(f"Completed scoring for {processed} organizations")
+        logger.info(f"Completed scoring for {processed} organizations "
+                    f"({self.incremental_stats['rescored']} rescored, {self.incremental_stats['reused']} reused)")
+    
+    def add_international_scores(self):
+        """Attach international scores to every scored organization in one batch call"""
+        try:
+            scorer = getattr(self.analyzer, 'international_scorer', None)
+            if scorer is None:
+                from international_scoring_algorithm import InternationalHealthcareScorer
+                scorer = InternationalHealthcareScorer()
+            scores = scorer.score_many(self.scored_organizations)
+            for i, org in enumerate(self.scored_organizations):
+                org['international_score'] = float(scores['total_score'][i])
+                org['international_penalty'] = float(scores['total_penalty'][i])
+            logger.info(f"Added international scores for {len(self.scored_organizations)} organizations")
+        except Exception as e:
+            logger.warning(f"Could not compute international scores: {e}")
     
     def calculate_unique_rankings(self):
         """Calculate unique rankings for all organizations with tie-breaking"""
@@ -296,7 +434,7 @@ class BatchScoringSystem:
         logger.info("Saving results to files...")
         
         # Save scored organizations
-        with open('scored_organizations_complete.json', 'w', encoding='utf-8') as f:
+        with open(SCORED_FILE, 'w', encoding='utf-8') as f:
             json.dump(self.scored_organizations, f, indent=2, ensure_ascii=False)
         
         # Save ranking statistics
@@ -324,6 +462,26 @@ class BatchScoringSystem:
         with open('ranking_summary.json', 'w', encoding='utf-8') as f:
             json.dump(summary, f, indent=2, ensure_ascii=False)
         
+        # Materialized aggregates for the Quality Dashboard (see analytics_cube.py)
+        from analytics_cube import CUBE_FILE, build_cube, save_cube
+        save_cube(build_cube(self.scored_organizations), CUBE_FILE)
+        
+        # Recommendation profiles of every scored organization (see recommendation_rules.py)
+        from recommendation_rules import RECOMMENDATIONS_FILE, RecommendationEngine, save_profiles
+        save_profiles(RecommendationEngine().precompute(self.scored_organizations), RECOMMENDATIONS_FILE)
+        
+        # Append this run to the persistent score/ranking history store
+        try:
+            from score_history_store import get_history_store
+            run_id = get_history_store().record_batch_run(self.scored_organizations)
+            logger.info(f"Recorded scoring run {run_id} in score history store")
+        except Exception as e:
+            logger.warning(f"Could not record batch run in score history store: {e}")
+        
+        # Mark the batch_scores stage fresh in the data manifest (see data_manifest.py)
+        from data_manifest import record_stage_run
+        record_stage_run('batch_scores')
+        
         logger.info("Results saved successfully")
     
     def run_complete_batch_scoring(self):
@@ -334,6 +492,9 @@ class BatchScoringSystem:
             # Step 1: Process all organizations
             self.process_all_organizations()
             
+            # Step 1b: International scores alongside the default scorer
+            self.add_international_scores()
+            
             # Step 2: Calculate unique rankings
             self.calculate_unique_rankings()
             
@@ -350,6 +511,9 @@ class BatchScoringSystem:
             print("BATCH SCORING COMPLETED")
             print(f"{'='*60}")
             print(f"Total Organizations Processed: {len(self.scored_organizations)}")
+            if self.incremental:
+                print(f"Rescored: {self.incremental_stats['rescored']} "
+                      f"(reused {self.incremental_stats['reused']} unchanged)")
             print(f"Average Score: {self.ranking_results['average_score']:.2f}")
             print(f"Highest Score: {self.ranking_results['highest_score']:.2f}")
             print(f"Lowest Score: {self.ranking_results['lowest_score']:.2f}")
@@ -360,15 +524,21 @@ class BatchScoringSystem:
             print("- scored_organizations_complete.json")
             print("- ranking_statistics.json")
             print("- ranking_summary.json")
+            print("- analytics_cube.json")
+            print("- recommendation_profiles.json")
             
         except Exception as e:
             logger.error(f"Error in batch scoring process: {e}")
             raise
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to run the batch scoring system"""
+    parser = argparse.ArgumentParser(description='Score and rank every organization in the unified database')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'Only rescore records changed since the previous {SCORED_FILE}')
+    args = parser.parse_args(argv)
     try:
-        batch_scorer = BatchScoringSystem()
+        batch_scorer = BatchScoringSystem(incremental=args.incremental)
         batch_scorer.run_complete_batch_scoring()
     except Exception as e:
         logger.error(f"Failed to run batch scoring: {e}")
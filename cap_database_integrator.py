@@ -10,6 +10,8 @@ from typing import List, Dict, Any
 import re
 import os
 
+from entity_resolution import EntityResolver, MatchPolicy
+
 class CAPDatabaseIntegrator:
     def __init__(self):
         self.cap_file = 'cap_laboratories_final.json'
@@ -230,19 +232,21 @@ class CAPDatabaseIntegrator:
         """Check for potential duplicates between existing data and CAP data"""
         duplicates = []
         
+        # Same rules as _names_similar, evaluated only on blocked candidate pairs
+        resolver = EntityResolver(
+            existing_data,
+            normalizer=self._normalize_name,
+            policy=MatchPolicy(min_shared_significant_tokens=2, significant_token_length=3)
+        )
+        
         for cap_lab in cap_data:
-            cap_name_normalized = self._normalize_name(cap_lab['name'])
-            
-            for existing_org in existing_data:
-                existing_name_normalized = self._normalize_name(existing_org['name'])
-                
-                # Check for name similarity
-                if self._names_similar(cap_name_normalized, existing_name_normalized):
-                    duplicates.append({
-                        'cap_lab': cap_lab['name'],
-                        'existing_org': existing_org['name'],
-                        'similarity_reason': 'Name similarity'
-                    })
+            for decision in resolver.resolve_all(cap_lab['name']):
+                duplicates.append({
+                    'cap_lab': cap_lab['name'],
+                    'existing_org': decision.record['name'],
+                    'similarity_reason': f"Name similarity ({decision.rule})",
+                    'match_decision': decision.to_dict()
+                })
         
         return {
             'duplicates_found': len(duplicates),
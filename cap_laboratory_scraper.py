@@ -6,6 +6,7 @@ to build a comprehensive database of accredited healthcare laboratories.
 
 import requests
 from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import json
 import re
 import time
@@ -41,7 +42,7 @@ class CAPLaboratoryScraper:
             response.raise_for_status()
             
             # Parse HTML content
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Extract laboratory information
             self._extract_laboratories(soup)
@@ -0,0 +1,194 @@
+"""
+Certification Bitsets for QuXAT Healthcare Quality Grid
+Integer bitsets of the certification types an organization holds.
+
+certification_bits() matches a certification name against the types the
+scoring rules care about (JCI, CAP, NABH, NABL, the mandatory ISO standards,
+...) once per distinct name; after that, "has JCI / has CAP / has ISO 15189"
+is a bitwise AND. Mandatory-standard compliance and penalties are computed
+from these bits instead of rescanning certification names.
+
+CertificationIndex keeps one active and one in-progress bitset per
+organization of the unified database in NumPy arrays, so queries such as
+"NABH-accredited organizations in India without ISO 27001" are vectorized
+bitwise operations over the whole database.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Mandatory ISO standards, in the order a name mentioning several is attributed to the first
+MANDATORY_ISO_STANDARDS = ('ISO 9001', 'ISO 14001', 'ISO 45001', 'ISO 27001', 'ISO 13485', 'ISO 50001', 'ISO 15189')
+
+
+def _iso_test(standard: str):
+    number = standard.split()[1]
+    return lambda name: f'ISO {number}' in name or f'ISO{number}' in name
+
+
+# (flag, test on the upper-cased certification name); bit i is CERTIFICATION_FLAGS[i]
+_FLAG_TESTS = tuple((standard, _iso_test(standard)) for standard in MANDATORY_ISO_STANDARDS) + (
+    ('CAP', lambda name: 'CAP' in name or 'COLLEGE OF AMERICAN PATHOLOGISTS' in name),
+    ('JCI', lambda name: 'JOINT COMMISSION INTERNATIONAL' in name or 'JCI' in name),
+    ('JOINT COMMISSION', lambda name: 'JOINT COMMISSION' in name),
+    ('US JOINT COMMISSION', lambda name: 'JOINT COMMISSION' in name and 'INTERNATIONAL' not in name),
+    ('NABH', lambda name: 'NABH' in name),
+    ('NABL', lambda name: 'NABL' in name),
+    ('MAGNET', lambda name: 'MAGNET' in name),
+    ('ISO', lambda name: 'ISO' in name),
+)
+CERTIFICATION_FLAGS = tuple(flag for flag, _ in _FLAG_TESTS)
+FLAG_BITS = {flag: 1 << bit for bit, flag in enumerate(CERTIFICATION_FLAGS)}
+_FLAG_BY_BIT = {bit: flag for flag, bit in FLAG_BITS.items()}
+
+ISO_STANDARDS_MASK = sum(FLAG_BITS[standard] for standard in MANDATORY_ISO_STANDARDS)
+# Counted by _count_international_certifications
+INTERNATIONAL_MASK = FLAG_BITS['JCI'] | FLAG_BITS['JOINT COMMISSION'] | FLAG_BITS['MAGNET'] | FLAG_BITS['ISO']
+
+# Certification status synonyms (upper-cased, stripped)
+ACTIVE_STATUS_SYNONYMS = frozenset({'ACTIVE', 'ACCREDITED', 'ACCREDITATION', 'VALID', 'CURRENT', 'COMPLIANT', 'CERTIFIED'})
+IN_PROGRESS_STATUS_SYNONYMS = frozenset({'IN PROGRESS', 'PENDING', 'APPLIED', 'UNDER REVIEW'})
+# Statuses that satisfy a mandatory standard
+COMPLIANT_STATUSES = ('Active', 'Valid', 'Current')
+
+# Mandatory standards checked before score generation, in report order:
+# (standard, flag, mandatory, base penalty, category)
+MANDATORY_STANDARDS = (
+    ('CAP', 'CAP', True, 8, 'Laboratory Standards'),
+    ('JCI', 'JCI', True, 10, 'Hospital Accreditation'),
+    ('ISO 9001', 'ISO 9001', True, 4, 'Quality Management'),
+    ('ISO 15189', 'ISO 15189', True, 5, 'Laboratory Quality'),
+    ('ISO 27001', 'ISO 27001', True, 6, 'Information Security'),
+    ('ISO 45001', 'ISO 45001', True, 5, 'Occupational Safety'),
+    ('ISO 13485', 'ISO 13485', True, 4, 'Medical Devices'),
+    ('ISO 14001', 'ISO 14001', True, 3, 'Environmental Management'),
+    ('ISO 50001', 'ISO 50001', False, 0, 'Energy Management'),
+)
+# ISO standards whose penalty is halved when U.S. Joint Commission or CAP accreditation is present
+US_EQUIVALENT_ISO_STANDARDS = ('ISO 9001', 'ISO 27001', 'ISO 45001', 'ISO 13485', 'ISO 14001')
+
+
+def _softened_penalties(has_us_joint_commission: bool, has_cap: bool) -> Dict[str, int]:
+    penalties = {standard: penalty for standard, _, _, penalty, _ in MANDATORY_STANDARDS}
+    if has_us_joint_commission or has_cap:
+        # ISO 15189 is lab-specific: if CAP is present, do not penalize for missing ISO 15189
+        penalties['ISO 15189'] = 0 if has_cap else max(1, int(penalties['ISO 15189'] * 0.5))
+        for standard in US_EQUIVALENT_ISO_STANDARDS:
+            penalties[standard] = max(1, int(penalties[standard] * 0.5))
+    return penalties
+
+
+# Penalty tables keyed by (has U.S. Joint Commission, has CAP)
+PENALTY_TABLES = {(us, cap): _softened_penalties(us, cap) for us in (False, True) for cap in (False, True)}
+
+
+@lru_cache(maxsize=65536)
+def certification_bits(name: Any) -> int:
+    """Bitset of CERTIFICATION_FLAGS matched by a certification name"""
+    upper = str(name or '').upper()
+    bits = 0
+    for bit, (_, test) in enumerate(_FLAG_TESTS):
+        if test(upper):
+            bits |= 1 << bit
+    return bits
+
+
+def type_mask(*flags: str) -> int:
+    """Bitset of the given CERTIFICATION_FLAGS names"""
+    mask = 0
+    for flag in flags:
+        try:
+            mask |= FLAG_BITS[flag]
+        except KeyError:
+            raise ValueError(f"Unknown certification type: {flag!r}") from None
+    return mask
+
+
+def flags_of(bits: int) -> List[str]:
+    """CERTIFICATION_FLAGS names set in bits"""
+    flags = []
+    while bits:
+        lowest = bits & -bits
+        flags.append(_FLAG_BY_BIT[lowest])
+        bits ^= lowest
+    return flags
+
+
+def mandatory_bits(bits: int) -> int:
+    """
+    The mandatory-standard flags a certification counts towards
+
+    A name mentioning several ISO standards counts for the first in
+    MANDATORY_ISO_STANDARDS order only; U.S. Joint Commission counts as JCI.
+    """
+    iso = bits & ISO_STANDARDS_MASK
+    mandatory = (iso & -iso) | (bits & FLAG_BITS['CAP'])
+    if bits & (FLAG_BITS['JCI'] | FLAG_BITS['US JOINT COMMISSION']):
+        mandatory |= FLAG_BITS['JCI']
+    return mandatory
+
+
+def status_class(status: Any) -> Optional[str]:
+    """'Active', 'In Progress' or None for a raw certification status"""
+    raw = str(status or '').strip().upper()
+    if raw in ACTIVE_STATUS_SYNONYMS:
+        return 'Active'
+    if raw in IN_PROGRESS_STATUS_SYNONYMS:
+        return 'In Progress'
+    return None
+
+
+def certification_profile(certifications: Iterable[Any]) -> Tuple[int, int]:
+    """(active, in_progress) bitsets of a certification list"""
+    active = in_progress = 0
+    for cert in certifications or []:
+        if not isinstance(cert, dict):
+            continue
+        status = status_class(cert.get('status'))
+        if status == 'Active':
+            active |= certification_bits(cert.get('name', ''))
+        elif status == 'In Progress':
+            in_progress |= certification_bits(cert.get('name', ''))
+    return active, in_progress
+
+
+class CertificationIndex:
+    """Active and in-progress certification bitsets for every organization, as NumPy arrays"""
+
+    def __init__(self, organizations: Iterable[Any]):
+        self.records = [org for org in organizations or [] if isinstance(org, dict)]
+        profiles = [certification_profile(org.get('certifications')) for org in self.records]
+        self.active = np.fromiter((active for active, _ in profiles), dtype=np.uint32, count=len(profiles))
+        self.in_progress = np.fromiter((progress for _, progress in profiles), dtype=np.uint32, count=len(profiles))
+        self._countries = np.array([str(org.get('country') or '').strip().lower() for org in self.records], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def mask(self, has: Iterable[str] = (), lacks: Iterable[str] = (), country: Optional[str] = None,
+             include_in_progress: bool = False) -> np.ndarray:
+        """
+        Boolean mask of organizations holding every type in has and none in lacks
+
+        Only active certifications count unless include_in_progress is set;
+        country is compared case-insensitively.
+        """
+        held = self.active | self.in_progress if include_in_progress else self.active
+        required = np.uint32(type_mask(*has))
+        excluded = np.uint32(type_mask(*lacks))
+        selected = ((held & required) == required) & ((held & excluded) == 0)
+        if country is not None:
+            selected &= self._countries == country.strip().lower()
+        return selected
+
+    def count(self, **criteria: Any) -> int:
+        return int(self.mask(**criteria).sum())
+
+    def query(self, limit: Optional[int] = None, **criteria: Any) -> List[Dict]:
+        """Organization records matching mask(**criteria), in database order"""
+        positions = np.flatnonzero(self.mask(**criteria))
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.records[i] for i in positions]
@@ -35,7 +35,7 @@ Data Sources Identified:
 """
 
 import requests
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import pandas as pd
 import json
 import time
@@ -220,7 +220,7 @@ class ComprehensiveHospitalDataCollector:
         
         try:
             response = self.session.get(self.data_sources['government']['national_health_portal'])
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Parse hospital data from NHP
             # Implementation depends on actual website structure
@@ -270,7 +270,7 @@ class ComprehensiveHospitalDataCollector:
             url = f"{self.data_sources['private_directories']['medindia']}{state_url}/"
             
             response = self.session.get(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Parse hospital listings
             # Implementation depends on actual website structure
@@ -5,7 +5,7 @@ import time
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Set
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import re
 import random
 from urllib.parse import urljoin, urlparse, parse_qs
@@ -57,7 +57,7 @@ class ComprehensiveNABHScraper:
         try:
             response = self.session.get(url)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = make_soup(response.content)
                 csrf_token = soup.find('input', {'name': '_token'})
                 if csrf_token:
                     return csrf_token.get('value')
@@ -82,7 +82,7 @@ class ComprehensiveNABHScraper:
                 logger.error(f"Failed to access search page: {response.status_code}")
                 return {}
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Find form elements
             form_data = {
@@ -148,7 +148,7 @@ class ComprehensiveNABHScraper:
         organizations = []
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = make_soup(html_content)
             
             # Look for organization cards/listings
             # Common patterns for healthcare organization listings
@@ -277,6 +277,10 @@ class RankingReportGenerator:
         csv_file = self.generate_csv_reports()
         summary_file = self.generate_summary_report()
         
+        # Mark the reports stage fresh in the data manifest (see data_manifest.py)
+        from data_manifest import record_stage_run
+        record_stage_run('reports')
+        
         print("\n" + "="*60)
         print("RANKING REPORT GENERATION COMPLETED")
         print("="*60)
@@ -0,0 +1,445 @@
+"""
+Crawl Engine for QuXAT Healthcare Quality Grid
+Shared asyncio crawler for the NABH/JCI/hospital scraper family.
+
+Scrapers no longer manage sessions, retries and sleeps themselves; they are
+parse plugins (CrawlPlugin) that yield seed requests and turn responses into
+items and follow-up requests. The engine provides:
+
+- a global concurrency limit plus a per-domain concurrency cap
+- a token bucket per domain (requests/second with a small burst), so
+  different sites are crawled in parallel while each one is paced politely
+- retry of connection errors, 429 and 5xx with jittered exponential backoff
+  (Retry-After is honoured)
+- an optional on-disk response cache, so re-runs and parser changes do not
+  hit the sites again
+- a checkpointed frontier: pending requests, finished requests and items are
+  saved periodically, and an interrupted crawl resumes where it stopped
+
+HTTP is done with requests in a thread pool (one session per thread); parse
+callbacks run on the event loop thread, so plugins need no locking.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+import requests
+
+from html_parsing import make_soup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "crawl_cache"
+DEFAULT_STATE_DIR = "crawl_state"
+# Long enough to resume or re-parse a run, short enough that a daily refresh refetches
+DEFAULT_CACHE_TTL = 6 * 3600
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+@dataclass
+class CrawlRequest:
+    """One page to fetch; callback names the plugin method that parses it"""
+    url: str
+    params: Optional[Dict[str, Any]] = None
+    callback: str = "parse"
+    meta: Dict[str, Any] = field(default_factory=dict)
+    method: str = "GET"
+    data: Optional[Dict[str, Any]] = None
+    use_cache: bool = True
+
+    @property
+    def key(self) -> str:
+        """Identity used for dedup, caching and checkpoints"""
+        parts = [self.method.upper(), self.url,
+                 urlencode(sorted((self.params or {}).items()), doseq=True),
+                 urlencode(sorted((self.data or {}).items()), doseq=True)]
+        return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+    @property
+    def domain(self) -> str:
+        return urlparse(self.url).netloc.lower()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CrawlRequest":
+        return cls(**data)
+
+
+@dataclass
+class CrawlResponse:
+    request: CrawlRequest
+    url: str
+    status: int
+    text: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def soup(self, parse_only=None):
+        """Parsed page (lxml-backed); parse_only=only("table", ...) builds just those tags"""
+        return make_soup(self.text, parse_only)
+
+
+class CrawlError(Exception):
+    """A request failed after all retries"""
+
+
+class CrawlPlugin:
+    """
+    Base class for parse plugins
+
+    Subclasses yield seed requests from seeds() and implement one method per
+    callback name (default "parse"). A callback takes a CrawlResponse and
+    yields items (dicts) and/or further CrawlRequests.
+    """
+
+    crawl_name = "crawl"
+    crawl_headers: Dict[str, str] = {}
+
+    def seeds(self) -> Iterable[CrawlRequest]:
+        return []
+
+    def parse(self, response: CrawlResponse) -> Iterable[Any]:
+        return []
+
+    def on_crawl_error(self, request: CrawlRequest, error: Exception) -> Iterable[Any]:
+        """Called when a request failed for good; may yield fallback requests"""
+        logger.warning(f"Giving up on {request.url}: {error}")
+        return []
+
+
+class TokenBucket:
+    """Async token bucket: rate_per_sec sustained, up to burst at once"""
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        self.rate = rate_per_sec
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ResponseCache:
+    """Successful responses on disk (one JSON file per request key), valid for ttl_seconds"""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl_seconds: Optional[float] = DEFAULT_CACHE_TTL):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, request: CrawlRequest) -> str:
+        return os.path.join(self.directory, f"{request.key}.json")
+
+    def get(self, request: CrawlRequest) -> Optional[CrawlResponse]:
+        path = self._path(request)
+        try:
+            if self.ttl_seconds is not None and time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return CrawlResponse(request, cached["url"], cached["status"], cached["text"],
+                             cached.get("headers", {}), from_cache=True)
+
+    def put(self, response: CrawlResponse) -> None:
+        path = self._path(response.request)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"url": response.url, "status": response.status, "text": response.text,
+                       "headers": response.headers, "fetched_at": datetime.now().isoformat()}, f)
+        os.replace(tmp_path, path)
+
+
+class Frontier:
+    """Pending/finished requests and collected items, checkpointed to JSON"""
+
+    def __init__(self, checkpoint_path: Optional[str] = None):
+        self.checkpoint_path = checkpoint_path
+        self.pending: Dict[str, CrawlRequest] = {}
+        self.done: set = set()
+        self.items: List[Any] = []
+
+    def add(self, request: CrawlRequest) -> bool:
+        """Track a request; False if it was already seen"""
+        key = request.key
+        if key in self.pending or key in self.done:
+            return False
+        self.pending[key] = request
+        return True
+
+    def finish(self, request: CrawlRequest) -> None:
+        self.pending.pop(request.key, None)
+        self.done.add(request.key)
+
+    def load(self) -> bool:
+        """Restore an unfinished crawl; False if there is none"""
+        if not self.checkpoint_path:
+            return False
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if state.get("status") == "complete":
+            return False
+        self.pending = {}
+        for data in state.get("pending", []):
+            request = CrawlRequest.from_dict(data)
+            self.pending[request.key] = request
+        self.done = set(state.get("done", []))
+        self.items = state.get("items", [])
+        return True
+
+    def save(self, status: str = "running") -> None:
+        if not self.checkpoint_path:
+            return
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        state = {"status": status, "updated_at": datetime.now().isoformat(),
+                 "pending": [r.to_dict() for r in self.pending.values()],
+                 "done": sorted(self.done), "items": self.items}
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.checkpoint_path)
+
+
+class RequestsFetcher:
+    """Blocking HTTP via requests, one session per worker thread"""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = 30):
+        self.headers = dict(DEFAULT_HEADERS)
+        self.headers.update(headers or {})
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    def fetch(self, request: CrawlRequest) -> Tuple[int, Dict[str, str], str, str]:
+        """(status, headers, text, final url)"""
+        response = self._session().request(request.method, request.url, params=request.params,
+                                           data=request.data, timeout=self.timeout)
+        return response.status_code, dict(response.headers), response.text, response.url
+
+
+class CrawlEngine:
+    """Runs a CrawlPlugin: polite concurrent fetching with retries, cache and checkpoints"""
+
+    def __init__(self, plugin: CrawlPlugin, concurrency: int = 8, per_domain_concurrency: int = 2,
+                 rate_per_sec: float = 1.0, burst: int = 2, domain_rates: Optional[Dict[str, float]] = None,
+                 max_retries: int = 3, backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 timeout: float = 30, cache: Optional[ResponseCache] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 25,
+                 fetcher: Optional[RequestsFetcher] = None):
+        """
+        Args:
+            plugin: Provides seeds and parse callbacks
+            concurrency: Requests in flight across all domains
+            per_domain_concurrency: Requests in flight per domain
+            rate_per_sec: Sustained requests/second per domain (0 disables pacing)
+            burst: Token bucket size per domain
+            domain_rates: Per-domain overrides of rate_per_sec
+            max_retries: Retries for connection errors, 429 and 5xx
+            backoff_base / backoff_max: Exponential backoff bounds (seconds), jittered
+            cache: Response cache (None disables caching)
+            checkpoint_path: Frontier checkpoint file (None disables checkpoints)
+            checkpoint_every: Finished requests between checkpoint saves
+            fetcher: HTTP implementation (default: requests with the plugin's headers)
+        """
+        self.plugin = plugin
+        self.concurrency = concurrency
+        self.per_domain_concurrency = per_domain_concurrency
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.domain_rates = domain_rates or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache
+        self.checkpoint_every = checkpoint_every
+        self.fetcher = fetcher or RequestsFetcher(getattr(plugin, "crawl_headers", None), timeout=timeout)
+        self.frontier = Frontier(checkpoint_path)
+        self.stats = {"requests": 0, "fetched": 0, "cache_hits": 0, "retries": 0,
+                      "failed": 0, "items": 0, "elapsed_seconds": 0.0}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._domain_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        # Full jitter: spreads retries from concurrent workers apart
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        if domain not in self._buckets:
+            self._buckets[domain] = TokenBucket(self.domain_rates.get(domain, self.rate_per_sec), self.burst)
+        return self._buckets[domain]
+
+    def _slots(self, domain: str) -> asyncio.Semaphore:
+        if domain not in self._domain_slots:
+            self._domain_slots[domain] = asyncio.Semaphore(self.per_domain_concurrency)
+        return self._domain_slots[domain]
+
+    async def _fetch(self, request: CrawlRequest, executor: ThreadPoolExecutor) -> CrawlResponse:
+        if self.cache is not None and request.use_cache:
+            cached = self.cache.get(request)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+        loop = asyncio.get_running_loop()
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            async with self._slots(request.domain):
+                await self._bucket(request.domain).acquire()
+                self.stats["requests"] += 1
+                try:
+                    status, headers, text, url = await loop.run_in_executor(executor, self.fetcher.fetch, request)
+                except (requests.RequestException, OSError) as e:
+                    last_error, retry_after = e, None
+                else:
+                    response = CrawlResponse(request, url, status, text, headers)
+                    if status not in RETRYABLE_STATUS:
+                        if response.ok:
+                            self.stats["fetched"] += 1
+                            if self.cache is not None and request.use_cache:
+                                self.cache.put(response)
+                            return response
+                        raise CrawlError(f"HTTP {status}")
+                    last_error, retry_after = CrawlError(f"HTTP {status}"), headers.get("Retry-After")
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._delay(attempt, retry_after))
+        raise CrawlError(str(last_error))
+
+    def _collect(self, results: Optional[Iterable[Any]], queue: asyncio.Queue) -> None:
+        """Queue new requests and keep items yielded by a callback"""
+        for result in results or []:
+            if isinstance(result, CrawlRequest):
+                if self.frontier.add(result):
+                    queue.put_nowait(result)
+            elif result is not None:
+                self.frontier.items.append(result)
+                self.stats["items"] += 1
+
+    async def _worker(self, queue: asyncio.Queue, executor: ThreadPoolExecutor) -> None:
+        finished = 0
+        while True:
+            request = await queue.get()
+            try:
+                try:
+                    response = await self._fetch(request, executor)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    try:
+                        self._collect(self.plugin.on_crawl_error(request, e), queue)
+                    except Exception as handler_error:
+                        logger.error(f"Error handler failed for {request.url}: {handler_error}")
+                else:
+                    try:
+                        self._collect(getattr(self.plugin, request.callback)(response), queue)
+                    except Exception as e:
+                        self.stats["failed"] += 1
+                        logger.error(f"Parse error in {request.callback} for {request.url}: {e}")
+                self.frontier.finish(request)
+                finished += 1
+                if self.checkpoint_every and finished % self.checkpoint_every == 0:
+                    self.frontier.save()
+            finally:
+                queue.task_done()
+
+    async def crawl(self, seeds: Optional[Iterable[CrawlRequest]] = None, resume: bool = True) -> List[Any]:
+        """Crawl from the seeds (default: plugin.seeds()) until the frontier is empty; returns all items"""
+        started = time.perf_counter()
+        resumed = resume and self.frontier.load()
+        if resumed:
+            logger.info(f"Resuming crawl: {len(self.frontier.pending)} pending, "
+                        f"{len(self.frontier.done)} done, {len(self.frontier.items)} items")
+        queue: asyncio.Queue = asyncio.Queue()
+        for request in list(self.frontier.pending.values()):
+            queue.put_nowait(request)
+        for request in (seeds if seeds is not None else self.plugin.seeds()):
+            if self.frontier.add(request):
+                queue.put_nowait(request)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="crawl") as executor:
+            workers = [asyncio.create_task(self._worker(queue, executor)) for _ in range(self.concurrency)]
+            try:
+                await queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                self.frontier.save("complete" if not self.frontier.pending else "running")
+
+        self.stats["items"] = len(self.frontier.items)
+        self.stats["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Crawl {getattr(self.plugin, 'crawl_name', 'crawl')} finished: {self.stats}")
+        return self.frontier.items
+
+    def run(self, seeds: Optional[Iterable[CrawlRequest]] = None, resume: bool = True) -> List[Any]:
+        """Blocking wrapper around crawl()"""
+        return asyncio.run(self.crawl(seeds, resume=resume))
+
+
+def crawl(plugin: CrawlPlugin, seeds: Optional[Iterable[CrawlRequest]] = None, resume: bool = True,
+          cache_dir: Optional[str] = DEFAULT_CACHE_DIR, state_dir: Optional[str] = DEFAULT_STATE_DIR,
+          cache_ttl_seconds: Optional[float] = DEFAULT_CACHE_TTL, **engine_kwargs) -> List[Any]:
+    """
+    Run a plugin with the standard on-disk cache and checkpoint locations
+
+    Checkpoints live at <state_dir>/<plugin.crawl_name>.json; pass
+    cache_dir=None / state_dir=None to disable caching / checkpointing.
+    """
+    cache = ResponseCache(os.path.join(cache_dir, plugin.crawl_name), cache_ttl_seconds) if cache_dir else None
+    checkpoint = os.path.join(state_dir, f"{plugin.crawl_name}.json") if state_dir else None
+    engine = CrawlEngine(plugin, cache=cache, checkpoint_path=checkpoint, **engine_kwargs)
+    items = engine.run(seeds, resume=resume)
+    plugin.crawl_stats = engine.stats
+    return items
@@ -0,0 +1,420 @@
+"""
+Data Manifest for QuXAT Healthcare Quality Grid
+Records content hashes of the derived data files and the producer -> consumer
+graph between the scripts that build them, and reruns only stale stages.
+
+    unified DB sources --> batch_scores --> unique_ranks
+                                        \\-> reports
+    nabh_hospitals.json --> nabh_processed
+    NABL PDF extract    --> nabl_cleaned
+
+A stage is stale when the content of any input changed since it last ran,
+when one of its outputs is missing, or when an output was modified outside
+the pipeline. Dependencies are derived from the stages' input/output
+patterns, so rebuilding a stage also rebuilds whatever it feeds (unless its
+outputs came out byte-identical, in which case consumers stay fresh).
+
+data_manifest.json holds the hashes, per-stage build records and a manifest
+version that changes whenever any tracked file does; the app reloads its
+data and drops its caches when that version changes (see ManifestVersion).
+
+Usage:
+    python data_manifest.py status
+    python data_manifest.py build [stage ...] [--force] [--dry-run]
+    python data_manifest.py stamp     # adopt the current files as up to date
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from graphlib import CycleError, TopologicalSorter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+MANIFEST_FILE = 'data_manifest.json'
+
+# Sources merged by HealthcareOrgAnalyzer.load_unified_database. Integrator
+# scripts rewrite these in place, so they are tracked as sources, not stages.
+UNIFIED_DB_SOURCES = [
+    'unified_healthcare_organizations_with_mayo_cap.json',
+    'unified_healthcare_organizations.json',
+    'global_healthcare_organizations.json',
+    'validation_discovered_organizations.json',
+    'external_organizations/*.json',
+    'external_organizations/*.jsonl',
+    'external_organizations/*.ndjson',
+]
+
+
+class StageError(RuntimeError):
+    """A stage's command failed or did not produce its outputs"""
+
+
+@dataclass
+class Stage:
+    """One producer in the data pipeline"""
+    name: str
+    inputs: List[str]
+    outputs: List[str]
+    # argv run from the data root, or a callable taking the data root
+    command: Optional[Union[List[str], Callable[[str], Any]]] = None
+    description: str = ''
+
+
+def _script(name: str) -> List[str]:
+    return [sys.executable, name]
+
+
+DEFAULT_STAGES = [
+    Stage('nabh_processed', ['nabh_hospitals.json'], ['processed_nabh_hospitals.json'],
+          _script('nabh_data_processor.py'), 'Normalize scraped NABH hospitals'),
+    Stage('nabl_cleaned', ['nabl_pdf_extracted_data_20250926_175604.json'], ['nabl_cleaned_data_*.json'],
+          _script('nabl_data_cleaner.py'), 'Clean NABL organizations extracted from the PDF'),
+    Stage('batch_scores', UNIFIED_DB_SOURCES,
+          ['scored_organizations_complete.json', 'ranking_statistics.json', 'ranking_summary.json',
+           'analytics_cube.json'],
+          _script('batch_scoring_system.py') + ['--incremental'],
+          'Score and rank every organization in the unified database (changed records only)'),
+    Stage('unique_ranks', ['scored_organizations_complete.json'],
+          ['unique_rankings_complete_*.json', 'unique_rankings_statistics_*.json',
+           'unique_rankings_validation_*.json', 'unique_rankings_summary_*.csv'],
+          _script('unique_ranking_system.py'), 'Tie-broken unique ranks'),
+    Stage('reports', ['scored_organizations_complete.json', 'ranking_statistics.json'],
+          ['QuXAT_Comprehensive_Ranking_Report_*.xlsx', 'QuXAT_Complete_Rankings_*.csv'],
+          _script('comprehensive_ranking_report.py'), 'Excel/CSV ranking reports'),
+]
+
+
+@dataclass
+class BuildResult:
+    stage: str
+    status: str  # 'built', 'fresh', 'stale' (dry run) or 'skipped'
+    reasons: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def _is_pattern(path: str) -> bool:
+    return any(ch in path for ch in '*?[')
+
+
+class DataManifest:
+    """Content-hash manifest and incremental rebuilder for the derived data files"""
+
+    def __init__(self, root: str = '.', stages: Optional[Iterable[Stage]] = None,
+                 manifest_path: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.stages: Dict[str, Stage] = {s.name: s for s in (stages if stages is not None else DEFAULT_STAGES)}
+        self.manifest_path = manifest_path or os.path.join(self.root, MANIFEST_FILE)
+        self.data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data.setdefault('artifacts', {})
+                data.setdefault('stages', {})
+                return data
+        except (OSError, ValueError):
+            pass
+        return {'version': None, 'artifacts': {}, 'stages': {}}
+
+    def save(self) -> bool:
+        """Write the manifest (atomically) if anything changed; returns True if written"""
+        self.data['version'] = self.compute_version()
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                if json.load(f) == self.data:
+                    return False
+        except (OSError, ValueError):
+            pass
+        self.data['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        tmp = self.manifest_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+        return True
+
+    # ---- hashing -------------------------------------------------------
+
+    def expand(self, pattern: str) -> List[str]:
+        """Root-relative files matching a path or glob pattern"""
+        if not _is_pattern(pattern):
+            return [pattern] if os.path.isfile(os.path.join(self.root, pattern)) else []
+        matches = glob.glob(os.path.join(self.root, pattern))
+        return sorted(os.path.relpath(p, self.root).replace(os.sep, '/') for p in matches if os.path.isfile(p))
+
+    def file_hash(self, rel_path: str) -> Optional[str]:
+        """sha256 of a file; reuses the recorded hash while size and mtime are unchanged"""
+        path = os.path.join(self.root, rel_path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        known = self.data['artifacts'].get(rel_path)
+        if known and known.get('size') == st.st_size and known.get('mtime_ns') == st.st_mtime_ns:
+            return known['sha256']
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        sha = digest.hexdigest()
+        self.data['artifacts'][rel_path] = {'sha256': sha, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        return sha
+
+    def _hash_patterns(self, patterns: Iterable[str]) -> Dict[str, str]:
+        hashes = {}
+        for pattern in patterns:
+            for rel_path in self.expand(pattern):
+                sha = self.file_hash(rel_path)
+                if sha is not None:
+                    hashes[rel_path] = sha
+        return hashes
+
+    @staticmethod
+    def _digest(hashes: Dict[str, str]) -> str:
+        return hashlib.sha256(json.dumps(sorted(hashes.items())).encode('utf-8')).hexdigest()
+
+    def compute_version(self) -> str:
+        """Version over every tracked file's content"""
+        tracked = {}
+        for stage in self.stages.values():
+            tracked.update(self._hash_patterns(stage.inputs))
+            tracked.update(self._hash_patterns(stage.outputs))
+        # Forget files that are gone, so the manifest does not grow without bound
+        self.data['artifacts'] = {p: a for p, a in self.data['artifacts'].items() if p in tracked}
+        return self._digest(tracked)[:16]
+
+    # ---- graph ---------------------------------------------------------
+
+    def _produces(self, stage: Stage, path_or_pattern: str) -> bool:
+        return any(out == path_or_pattern or fnmatch.fnmatch(path_or_pattern, out) for out in stage.outputs)
+
+    def dependency_graph(self) -> Dict[str, List[str]]:
+        """stage -> stages producing its inputs"""
+        graph = {}
+        for name, stage in self.stages.items():
+            graph[name] = sorted(
+                producer for producer, other in self.stages.items()
+                if producer != name and any(self._produces(other, inp) for inp in stage.inputs)
+            )
+        return graph
+
+    def build_order(self, targets: Optional[Iterable[str]] = None) -> List[str]:
+        """Stages in dependency order; with targets, only those and their upstream stages"""
+        graph = self.dependency_graph()
+        if targets:
+            unknown = [t for t in targets if t not in graph]
+            if unknown:
+                raise KeyError(f"Unknown stage(s): {', '.join(unknown)}")
+            wanted, pending = set(), list(targets)
+            while pending:
+                name = pending.pop()
+                if name not in wanted:
+                    wanted.add(name)
+                    pending.extend(graph[name])
+            graph = {name: deps for name, deps in graph.items() if name in wanted}
+        try:
+            return list(TopologicalSorter(graph).static_order())
+        except CycleError as e:
+            raise StageError(f"Dependency cycle between stages: {e.args[1]}") from e
+
+    # ---- staleness and rebuild ----------------------------------------
+
+    def stale_reasons(self, name: str) -> List[str]:
+        """Why a stage needs to run (empty when it is up to date)"""
+        stage = self.stages[name]
+        record = self.data['stages'].get(name)
+        if record is None:
+            return ['never built']
+        reasons = []
+        if self._digest(self._hash_patterns(stage.inputs)) != record.get('inputs_digest'):
+            reasons.append('inputs changed')
+        missing = [out for out in stage.outputs if not self.expand(out)]
+        if missing:
+            reasons.append(f"missing output {', '.join(missing)}")
+        for rel_path, sha in record.get('outputs', {}).items():
+            if rel_path in missing:
+                continue
+            current = self.file_hash(rel_path)
+            if current is not None and current != sha:
+                reasons.append(f"output {rel_path} modified outside the pipeline")
+        return reasons
+
+    def _record(self, name: str, seconds: float = 0.0) -> None:
+        stage = self.stages[name]
+        self.data['stages'][name] = {
+            'inputs_digest': self._digest(self._hash_patterns(stage.inputs)),
+            'outputs': self._hash_patterns(stage.outputs),
+            'built_at': datetime.now().isoformat(timespec='seconds'),
+            'seconds': round(seconds, 3),
+        }
+
+    def _run(self, stage: Stage) -> None:
+        if callable(stage.command):
+            stage.command(self.root)
+        else:
+            proc = subprocess.run(stage.command, cwd=self.root)
+            if proc.returncode != 0:
+                raise StageError(f"Stage {stage.name} failed with exit code {proc.returncode}")
+        missing = [out for out in stage.outputs if not self.expand(out)]
+        if missing:
+            raise StageError(f"Stage {stage.name} did not produce {', '.join(missing)}")
+
+    def rebuild(self, targets: Optional[Iterable[str]] = None, force: bool = False,
+                dry_run: bool = False) -> List[BuildResult]:
+        """
+        Run the stale stages (and only those) in dependency order
+
+        Args:
+            targets: Stages to bring up to date (default: all)
+            force: Rerun the targets even when fresh
+            dry_run: Report what would run without running it
+
+        Raises:
+            StageError: A stage failed; stages built before it are recorded
+        """
+        targets = list(targets or [])
+        results = []
+        rebuilt = set()
+        try:
+            for name in self.build_order(targets or None):
+                stage = self.stages[name]
+                if stage.command is None:
+                    results.append(BuildResult(name, 'skipped', ['no command']))
+                    continue
+                reasons = self.stale_reasons(name)
+                if force and (not targets or name in targets):
+                    reasons = reasons or ['forced']
+                if dry_run and not reasons:
+                    # Upstream stages would run first and may change this stage's inputs
+                    upstream = [dep for dep in self.dependency_graph()[name] if dep in rebuilt]
+                    if upstream:
+                        reasons = [f"upstream {', '.join(upstream)} would rebuild"]
+                if not reasons:
+                    results.append(BuildResult(name, 'fresh'))
+                    continue
+                if dry_run:
+                    rebuilt.add(name)
+                    results.append(BuildResult(name, 'stale', reasons))
+                    continue
+                started = time.perf_counter()
+                self._run(stage)
+                seconds = time.perf_counter() - started
+                self._record(name, seconds)
+                rebuilt.add(name)
+                results.append(BuildResult(name, 'built', reasons, seconds))
+        finally:
+            if not dry_run:
+                self.save()
+        return results
+
+    def stamp(self, targets: Optional[Iterable[str]] = None) -> None:
+        """Record stages (default: all) as up to date with the files currently on disk"""
+        targets = list(targets or [])
+        unknown = [t for t in targets if t not in self.stages]
+        if unknown:
+            raise KeyError(f"Unknown stage(s): {', '.join(unknown)}")
+        for name in targets or self.build_order():
+            if all(self.expand(out) for out in self.stages[name].outputs):
+                self._record(name)
+        self.save()
+
+    def status(self) -> Dict[str, List[str]]:
+        return {name: self.stale_reasons(name) for name in self.build_order()}
+
+
+def record_stage_run(name: str, root: str = '.') -> None:
+    """Called by a stage script after writing its outputs, so direct runs keep the manifest current"""
+    try:
+        DataManifest(root).stamp([name])
+    except Exception as e:
+        print(f"WARNING️ Could not update {MANIFEST_FILE}: {e}")
+
+
+class ManifestVersion:
+    """Cheap reader of the manifest version for long-running processes (the app)"""
+
+    def __init__(self, manifest_path: str = MANIFEST_FILE, min_check_interval: float = 2.0):
+        self.manifest_path = manifest_path
+        self.min_check_interval = min_check_interval
+        self._stat = None
+        self._version: Optional[str] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[str]:
+        """Manifest version, re-read only when the file changed; None without a manifest"""
+        with self._lock:
+            now = time.monotonic()
+            if self._checked_at and now - self._checked_at < self.min_check_interval:
+                return self._version
+            self._checked_at = now
+            try:
+                st = os.stat(self.manifest_path)
+            except OSError:
+                self._stat, self._version = None, None
+                return None
+            stat = (st.st_size, st.st_mtime_ns)
+            if stat != self._stat:
+                try:
+                    with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                        self._version = json.load(f).get('version')
+                    self._stat = stat
+                except (OSError, ValueError, AttributeError):
+                    # Caught mid-write; keep the previous version and retry next check
+                    pass
+            return self._version
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Incremental rebuild of QuXAT derived data files')
+    parser.add_argument('command', choices=['status', 'build', 'stamp', 'graph'])
+    parser.add_argument('stages', nargs='*', help='Stages to build/stamp (default: all)')
+    parser.add_argument('--force', action='store_true', help='Rerun the given stages even if fresh')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would run')
+    parser.add_argument('--root', default='.', help='Directory holding the data files')
+    args = parser.parse_args(argv)
+
+    manifest = DataManifest(args.root)
+    if args.command == 'graph':
+        for name, deps in manifest.dependency_graph().items():
+            print(f"{name} <- {', '.join(deps) or '(sources)'}")
+        return 0
+    if args.command == 'status':
+        for name, reasons in manifest.status().items():
+            print(f"{'🔄' if reasons else '✅'} {name}: {'; '.join(reasons) or 'up to date'}")
+        manifest.save()
+        print(f"Manifest version: {manifest.data['version']}")
+        return 0
+    if args.command == 'stamp':
+        try:
+            manifest.stamp(args.stages)
+        except KeyError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"✅ Stamped; manifest version {manifest.data['version']}")
+        return 0
+    try:
+        results = manifest.rebuild(args.stages, force=args.force, dry_run=args.dry_run)
+    except (StageError, KeyError) as e:
+        print(f"❌ {e}")
+        return 1
+    for result in results:
+        detail = '; '.join(result.reasons)
+        print(f"{result.stage}: {result.status}" + (f" ({detail})" if detail else '')
+              + (f" in {result.seconds:.1f}s" if result.seconds else ''))
+    print(f"Manifest version: {manifest.data['version']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
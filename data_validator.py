@@ -5,7 +5,6 @@ Validates certification data from official sources like NABH, NABL, JCI, and ISO
 
 import os
 import requests
-from bs4 import BeautifulSoup
 import json
 import re
 import time
@@ -13,10 +12,22 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
 
+from html_parsing import KeywordMatcher, node_text, parse_html
+from single_flight import SingleFlight
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Quality-related keywords searched for on organization websites
+QUALITY_KEYWORDS = [
+    'quality initiative', 'quality program', 'quality improvement',
+    'patient safety', 'quality care', 'excellence program',
+    'accreditation', 'certification', 'quality assurance',
+    'clinical excellence', 'quality management', 'continuous improvement',
+    'patient experience', 'quality standards', 'best practices'
+]
+
 class HealthcareDataValidator:
     """
     Validates healthcare organization data from official certification bodies
@@ -31,6 +42,10 @@ class HealthcareDataValidator:
         # Cache for validated data (expires after 24 hours)
         self.validation_cache = {}
         self.cache_expiry = timedelta(hours=24)
+        # Coalesces concurrent validations of the same organization (see single_flight.py)
+        self.validation_flights = SingleFlight()
+        
+        self.quality_keyword_matcher = KeywordMatcher(QUALITY_KEYWORDS)
     
     def _extract_quality_initiatives_from_website(self, org_name: str) -> List[Dict]:
         """
@@ -122,8 +137,9 @@ class HealthcareDataValidator:
                 try:
                     response = requests.get(page_url, headers=headers, timeout=10)
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        page_initiatives = self._extract_initiatives_from_page(soup, org_name)
+                        # Only text is needed, so skip building a BeautifulSoup tree
+                        page = parse_html(response.content)
+                        page_initiatives = self._extract_initiatives_from_page(page, org_name)
                         initiatives.extend(page_initiatives)
                         
                         # If we found initiatives, we can stop searching
@@ -142,49 +158,36 @@ class HealthcareDataValidator:
         
         return initiatives
     
-    def _extract_initiatives_from_page(self, soup: BeautifulSoup, org_name: str) -> List[Dict]:
+    def _extract_initiatives_from_page(self, page, org_name: str) -> List[Dict]:
         """
         Extract quality initiatives from a webpage using various patterns
+
+        page is an lxml document from parse_html() or a BeautifulSoup tree.
         """
         initiatives = []
-        
-        # Quality-related keywords to search for
-        quality_keywords = [
-            'quality initiative', 'quality program', 'quality improvement',
-            'patient safety', 'quality care', 'excellence program',
-            'accreditation', 'certification', 'quality assurance',
-            'clinical excellence', 'quality management', 'continuous improvement',
-            'patient experience', 'quality standards', 'best practices'
-        ]
+        unique_initiatives = []
         
         try:
-            # Search for text containing quality keywords
-            text_content = soup.get_text().lower()
-            
-            # Look for structured content (lists, sections, etc.)
-            for keyword in quality_keywords:
-                if keyword in text_content:
-                    # Find elements containing the keyword
-                    elements = soup.find_all(text=re.compile(keyword, re.IGNORECASE))
-                    
-                    for element in elements[:3]:  # Limit to first 3 matches per keyword
-                        parent = element.parent if element.parent else element
+            # One pass over the page's text nodes finds every keyword at once
+            matches = self.quality_keyword_matcher.scan(page, per_keyword=3)  # Limit to first 3 matches per keyword
+            
+            for keyword, elements in matches.items():
+                for parent in elements:
+                    # Try to extract initiative details
+                    initiative_text = self._clean_text(node_text(parent))
+                    if len(initiative_text) > 20 and len(initiative_text) < 500:
                         
-                        # Try to extract initiative details
-                        initiative_text = self._clean_text(parent.get_text())
-                        if len(initiative_text) > 20 and len(initiative_text) < 500:
-                            
-                            initiative = {
-                                'name': self._extract_initiative_name(initiative_text, keyword),
-                                'description': initiative_text[:200] + '...' if len(initiative_text) > 200 else initiative_text,
-                                'impact_score': self._calculate_web_impact_score(keyword, initiative_text),
-                                'year': datetime.now().year,
-                                'category': self._categorize_initiative(keyword),
-                                'source': 'Organization Website',
-                                'extracted_from': keyword
-                            }
-                            
-                            initiatives.append(initiative)
+                        initiative = {
+                            'name': self._extract_initiative_name(initiative_text, keyword),
+                            'description': initiative_text[:200] + '...' if len(initiative_text) > 200 else initiative_text,
+                            'impact_score': self._calculate_web_impact_score(keyword, initiative_text),
+                            'year': datetime.now().year,
+                            'category': self._categorize_initiative(keyword),
+                            'source': 'Organization Website',
+                            'extracted_from': keyword
+                        }
+                        
+                        initiatives.append(initiative)
             
             # Remove duplicates based on similarity
             unique_initiatives = self._remove_similar_initiatives(initiatives)
@@ -328,6 +331,15 @@ class HealthcareDataValidator:
         
         # Check cache first
         cache_key = f"cert_{org_name.lower().strip()}"
+        cached_data = self._cached_validation(cache_key, org_name)
+        if cached_data is not None:
+            return cached_data
+        
+        # Concurrent callers for the same organization share one validation run
+        return self.validation_flights.do(cache_key, self._validate_and_cache, org_name, cache_key)
+    
+    def _cached_validation(self, cache_key: str, org_name: str) -> Optional[Dict]:
+        """Valid cached validation result, or None"""
         if self._is_cache_valid(cache_key):
             logger.info(f"Using cached data for {org_name}")
             cached_data = self.validation_cache[cache_key]['data']
@@ -336,6 +348,14 @@ class HealthcareDataValidator:
                 logger.warning(f"Cached data is None for {org_name}, regenerating...")
             else:
                 return cached_data
+        return None
+    
+    def _validate_and_cache(self, org_name: str, cache_key: str) -> Dict:
+        """Run the validation against the official sources and cache the result"""
+        # A flight that landed just before this one started may have filled the cache
+        cached_data = self._cached_validation(cache_key, org_name)
+        if cached_data is not None:
+            return cached_data
         
         validated_data = {
             'organization': org_name,
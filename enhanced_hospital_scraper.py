@@ -7,10 +7,8 @@ with their quality certifications, accreditations, and public domain initiatives
 """
 
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import json
-import time
 from datetime import datetime
 import re
 from urllib.parse import urljoin, quote
@@ -18,15 +16,20 @@ import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 
+from entity_resolution import EntityResolver, MatchPolicy
+from crawl_engine import DEFAULT_STATE_DIR, CrawlPlugin, CrawlRequest, crawl
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class EnhancedHospitalScraper:
+class EnhancedHospitalScraper(CrawlPlugin):
     """
     Enhanced scraper for comprehensive hospital data collection
     """
     
+    crawl_name = 'enhanced_hospitals'
+    
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
@@ -37,6 +40,7 @@ class EnhancedHospitalScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
+        self.crawl_headers = dict(self.session.headers)
         
         # Load existing data to avoid duplicates
         self.existing_hospitals = self._load_existing_hospitals()
@@ -111,246 +115,187 @@ class EnhancedHospitalScraper:
         logger.info(f"Loaded {len(existing)} existing hospitals to avoid duplicates")
         return existing
     
+    def _crawl(self, source, seeds, **engine_kwargs):
+        """Run one source's crawl; each source keeps its own checkpoint"""
+        return crawl(self, seeds, state_dir=os.path.join(DEFAULT_STATE_DIR, source), **engine_kwargs)
+    
     def scrape_medindia_hospitals(self):
         """Scrape hospitals from Medindia directory"""
         logger.info("Starting Medindia hospital scraping...")
-        hospitals = []
-        
         base_url = "https://www.medindia.net/directories/hospitals"
         
-        try:
-            # Get main directory page
-            response = self.session.get(f"{base_url}/index.htm", timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find state links
-            state_links = soup.find_all('a', href=re.compile(r'/directories/hospitals/.*\.htm'))
-            
-            for link in state_links[:10]:  # Limit for testing
-                try:
-                    state_url = urljoin(base_url, link.get('href'))
-                    state_name = link.text.strip()
-                    
-                    logger.info(f"Scraping hospitals from {state_name}")
-                    state_hospitals = self._scrape_medindia_state(state_url, state_name)
-                    hospitals.extend(state_hospitals)
-                    
-                    time.sleep(2)  # Rate limiting
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping state {state_name}: {e}")
-                    continue
-        
-        except Exception as e:
-            logger.error(f"Error scraping Medindia: {e}")
-        
-        return hospitals
+        # index -> state pages -> hospital pages, paced by the crawl engine
+        return self._crawl('medindia', [CrawlRequest(f"{base_url}/index.htm", callback='parse_medindia_index')],
+                           rate_per_sec=1.0)
     
-    def _scrape_medindia_state(self, state_url, state_name):
-        """Scrape hospitals from a specific state page on Medindia"""
-        hospitals = []
-        
-        try:
-            response = self.session.get(state_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find hospital listings
-            hospital_links = soup.find_all('a', href=re.compile(r'/hospitals/.*\.htm'))
-            
-            for link in hospital_links:
-                try:
-                    hospital_name = link.text.strip()
-                    hospital_url = urljoin(state_url, link.get('href'))
-                    
-                    # Extract hospital details
-                    hospital_data = self._extract_medindia_hospital_details(hospital_url, hospital_name, state_name)
-                    
-                    if hospital_data and self._is_private_hospital(hospital_data):
-                        # Check for duplicates
-                        identifier = f"{hospital_data.get('name', '').lower().strip()}_{hospital_data.get('city', '').lower().strip()}"
-                        if identifier not in self.existing_hospitals:
-                            hospitals.append(hospital_data)
-                            self.existing_hospitals.add(identifier)
-                    
-                    time.sleep(1)  # Rate limiting
-                    
-                except Exception as e:
-                    logger.error(f"Error extracting hospital {hospital_name}: {e}")
-                    continue
+    def parse_medindia_index(self, response):
+        """State pages linked from the Medindia directory index"""
+        soup = response.soup()
+        
+        # Find state links
+        state_links = soup.find_all('a', href=re.compile(r'/directories/hospitals/.*\.htm'))
+        
+        for link in state_links[:10]:  # Limit for testing
+            state_name = link.text.strip()
+            logger.info(f"Scraping hospitals from {state_name}")
+            yield CrawlRequest(urljoin(response.url, link.get('href')), callback='parse_medindia_state',
+                               meta={'state': state_name})
+    
+    def parse_medindia_state(self, response):
+        """Hospital pages listed on a Medindia state page"""
+        soup = response.soup()
+        state_name = response.request.meta['state']
         
-        except Exception as e:
-            logger.error(f"Error scraping state page {state_url}: {e}")
+        # Find hospital listings
+        hospital_links = soup.find_all('a', href=re.compile(r'/hospitals/.*\.htm'))
         
-        return hospitals
+        for link in hospital_links:
+            yield CrawlRequest(urljoin(response.url, link.get('href')), callback='parse_medindia_hospital',
+                               meta={'name': link.text.strip(), 'state': state_name})
     
-    def _extract_medindia_hospital_details(self, hospital_url, hospital_name, state_name):
+    def parse_medindia_hospital(self, response):
         """Extract detailed information about a hospital from Medindia"""
-        try:
-            response = self.session.get(hospital_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract hospital information
-            hospital_data = {
-                'name': hospital_name,
-                'state': state_name,
-                'country': 'India',
-                'source': 'Medindia',
-                'url': hospital_url,
-                'scraped_date': datetime.now().isoformat()
-            }
+        soup = response.soup()
+        hospital_name = response.request.meta['name']
+        state_name = response.request.meta['state']
+        hospital_url = response.request.url
+        
+        # Extract hospital information
+        hospital_data = {
+            'name': hospital_name,
+            'state': state_name,
+            'country': 'India',
+            'source': 'Medindia',
+            'url': hospital_url,
+            'scraped_date': datetime.now().isoformat()
+        }
             
-            # Extract address and contact information
-            contact_section = soup.find('div', class_='contact-info') or soup.find('div', id='contact')
-            if contact_section:
-                address_text = contact_section.get_text(strip=True)
-                hospital_data['address'] = address_text
+        # Extract address and contact information
+        contact_section = soup.find('div', class_='contact-info') or soup.find('div', id='contact')
+        if contact_section:
+            address_text = contact_section.get_text(strip=True)
+            hospital_data['address'] = address_text
                 
-                # Extract city from address
-                city_match = re.search(r'([A-Za-z\s]+),\s*' + re.escape(state_name), address_text)
-                if city_match:
-                    hospital_data['city'] = city_match.group(1).strip()
+            # Extract city from address
+            city_match = re.search(r'([A-Za-z\s]+),\s*' + re.escape(state_name), address_text)
+            if city_match:
+                hospital_data['city'] = city_match.group(1).strip()
                 
-                # Extract phone numbers
-                phone_matches = re.findall(r'(\+91[\s-]?\d{10}|\d{10})', address_text)
-                if phone_matches:
-                    hospital_data['phone'] = phone_matches[0]
-            
-            # Extract specialties
-            specialties_section = soup.find('div', class_='specialties') or soup.find('div', id='specialties')
-            if specialties_section:
-                specialties = [spec.strip() for spec in specialties_section.get_text().split(',')]
-                hospital_data['specialties'] = specialties
-            
-            # Extract hospital type
-            hospital_data['hospital_type'] = self._determine_hospital_type(hospital_name, hospital_data.get('specialties', []))
-            
-            # Initialize certifications structure
-            hospital_data['certifications'] = {
-                'nabh': {'status': 'Unknown', 'level': None},
-                'jci': {'status': 'Unknown'},
-                'nabl': {'status': 'Unknown'},
-                'iso': {'certifications': []},
-                'government_empanelments': []
-            }
-            
-            return hospital_data
+            # Extract phone numbers
+            phone_matches = re.findall(r'(\+91[\s-]?\d{10}|\d{10})', address_text)
+            if phone_matches:
+                hospital_data['phone'] = phone_matches[0]
+            
+        # Extract specialties
+        specialties_section = soup.find('div', class_='specialties') or soup.find('div', id='specialties')
+        if specialties_section:
+            specialties = [spec.strip() for spec in specialties_section.get_text().split(',')]
+            hospital_data['specialties'] = specialties
+            
+        # Extract hospital type
+        hospital_data['hospital_type'] = self._determine_hospital_type(hospital_name, hospital_data.get('specialties', []))
+            
+        # Initialize certifications structure
+        hospital_data['certifications'] = {
+            'nabh': {'status': 'Unknown', 'level': None},
+            'jci': {'status': 'Unknown'},
+            'nabl': {'status': 'Unknown'},
+            'iso': {'certifications': []},
+            'government_empanelments': []
+        }
             
-        except Exception as e:
-            logger.error(f"Error extracting details for {hospital_name}: {e}")
-            return None
+        if self._is_private_hospital(hospital_data):
+            # Check for duplicates
+            identifier = f"{hospital_data.get('name', '').lower().strip()}_{hospital_data.get('city', '').lower().strip()}"
+            if identifier not in self.existing_hospitals:
+                self.existing_hospitals.add(identifier)
+                yield hospital_data
     
     def scrape_practo_hospitals(self):
         """Scrape hospitals from Practo directory"""
         logger.info("Starting Practo hospital scraping...")
-        hospitals = []
-        
         base_url = "https://www.practo.com"
         
-        try:
-            for state, cities in list(self.states_cities.items())[:5]:  # Limit for testing
-                for city in cities[:2]:  # Limit cities per state
-                    try:
-                        city_url = f"{base_url}/{city.lower().replace(' ', '-')}/hospitals"
-                        logger.info(f"Scraping hospitals from {city}, {state}")
-                        
-                        city_hospitals = self._scrape_practo_city(city_url, city, state)
-                        hospitals.extend(city_hospitals)
-                        
-                        time.sleep(3)  # Rate limiting
-                        
-                    except Exception as e:
-                        logger.error(f"Error scraping {city}, {state}: {e}")
-                        continue
+        seeds = []
+        for state, cities in list(self.states_cities.items())[:5]:  # Limit for testing
+            for city in cities[:2]:  # Limit cities per state
+                city_url = f"{base_url}/{city.lower().replace(' ', '-')}/hospitals"
+                seeds.append(CrawlRequest(city_url, callback='parse_practo_city', meta={'city': city, 'state': state}))
         
-        except Exception as e:
-            logger.error(f"Error scraping Practo: {e}")
-        
-        return hospitals
+        return self._crawl('practo', seeds, rate_per_sec=0.5)
     
-    def _scrape_practo_city(self, city_url, city, state):
+    def parse_practo_city(self, response):
         """Scrape hospitals from a specific city on Practo"""
         hospitals = []
+        city = response.request.meta['city']
+        state = response.request.meta['state']
+        logger.info(f"Scraping hospitals from {city}, {state}")
+        soup = response.soup()
         
-        try:
-            response = self.session.get(city_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find hospital cards/listings
-            hospital_cards = soup.find_all('div', class_=re.compile(r'hospital|listing|card'))
-            
-            for card in hospital_cards[:20]:  # Limit per city
-                try:
-                    # Extract hospital name
-                    name_elem = card.find('h2') or card.find('h3') or card.find('a')
-                    if not name_elem:
-                        continue
+        # Find hospital cards/listings
+        hospital_cards = soup.find_all('div', class_=re.compile(r'hospital|listing|card'))
+        
+        for card in hospital_cards[:20]:  # Limit per city
+            try:
+                # Extract hospital name
+                name_elem = card.find('h2') or card.find('h3') or card.find('a')
+                if not name_elem:
+                    continue
                     
-                    hospital_name = name_elem.get_text(strip=True)
+                hospital_name = name_elem.get_text(strip=True)
                     
-                    # Skip if already exists
-                    identifier = f"{hospital_name.lower().strip()}_{city.lower().strip()}"
-                    if identifier in self.existing_hospitals:
-                        continue
+                # Skip if already exists
+                identifier = f"{hospital_name.lower().strip()}_{city.lower().strip()}"
+                if identifier in self.existing_hospitals:
+                    continue
                     
-                    hospital_data = {
-                        'name': hospital_name,
-                        'city': city,
-                        'state': state,
-                        'country': 'India',
-                        'source': 'Practo',
-                        'scraped_date': datetime.now().isoformat()
-                    }
+                hospital_data = {
+                    'name': hospital_name,
+                    'city': city,
+                    'state': state,
+                    'country': 'India',
+                    'source': 'Practo',
+                    'scraped_date': datetime.now().isoformat()
+                }
                     
-                    # Extract additional details
-                    address_elem = card.find('div', class_=re.compile(r'address|location'))
-                    if address_elem:
-                        hospital_data['address'] = address_elem.get_text(strip=True)
+                # Extract additional details
+                address_elem = card.find('div', class_=re.compile(r'address|location'))
+                if address_elem:
+                    hospital_data['address'] = address_elem.get_text(strip=True)
                     
-                    # Extract rating if available
-                    rating_elem = card.find('span', class_=re.compile(r'rating|score'))
-                    if rating_elem:
-                        rating_text = rating_elem.get_text(strip=True)
-                        rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                        if rating_match:
-                            hospital_data['rating'] = float(rating_match.group(1))
+                # Extract rating if available
+                rating_elem = card.find('span', class_=re.compile(r'rating|score'))
+                if rating_elem:
+                    rating_text = rating_elem.get_text(strip=True)
+                    rating_match = re.search(r'(\d+\.?\d*)', rating_text)
+                    if rating_match:
+                        hospital_data['rating'] = float(rating_match.group(1))
                     
-                    # Determine hospital type
-                    hospital_data['hospital_type'] = self._determine_hospital_type(hospital_name, [])
+                # Determine hospital type
+                hospital_data['hospital_type'] = self._determine_hospital_type(hospital_name, [])
                     
-                    # Initialize certifications
-                    hospital_data['certifications'] = {
-                        'nabh': {'status': 'Unknown', 'level': None},
-                        'jci': {'status': 'Unknown'},
-                        'nabl': {'status': 'Unknown'},
-                        'iso': {'certifications': []},
-                        'government_empanelments': []
-                    }
+                # Initialize certifications
+                hospital_data['certifications'] = {
+                    'nabh': {'status': 'Unknown', 'level': None},
+                    'jci': {'status': 'Unknown'},
+                    'nabl': {'status': 'Unknown'},
+                    'iso': {'certifications': []},
+                    'government_empanelments': []
+                }
                     
-                    if self._is_private_hospital(hospital_data):
-                        hospitals.append(hospital_data)
-                        self.existing_hospitals.add(identifier)
+                if self._is_private_hospital(hospital_data):
+                    hospitals.append(hospital_data)
+                    self.existing_hospitals.add(identifier)
                 
-                except Exception as e:
-                    logger.error(f"Error extracting hospital from card: {e}")
-                    continue
-        
-        except Exception as e:
-            logger.error(f"Error scraping city {city}: {e}")
+            except Exception as e:
+                logger.error(f"Error extracting hospital from card: {e}")
+                continue
         
         return hospitals
     
     def scrape_hospital_chains(self):
         """Scrape major hospital chains' websites for comprehensive data"""
         logger.info("Scraping major hospital chains...")
-        hospitals = []
         
         chain_urls = {
             'Apollo Hospitals': 'https://www.apollohospitals.com/locations',
@@ -360,84 +305,74 @@ class EnhancedHospitalScraper:
             'Narayana Health': 'https://www.narayanahealth.org/hospitals'
         }
         
-        for chain_name, chain_url in chain_urls.items():
-            try:
-                logger.info(f"Scraping {chain_name} locations...")
-                chain_hospitals = self._scrape_hospital_chain(chain_name, chain_url)
-                hospitals.extend(chain_hospitals)
-                time.sleep(5)  # Rate limiting
-                
-            except Exception as e:
-                logger.error(f"Error scraping {chain_name}: {e}")
-                continue
-        
-        return hospitals
+        # Every chain is a different site, so they are fetched in parallel
+        seeds = [CrawlRequest(chain_url, callback='parse_hospital_chain', meta={'chain': chain_name})
+                 for chain_name, chain_url in chain_urls.items()]
+        return self._crawl('chains', seeds, rate_per_sec=0.2)
     
-    def _scrape_hospital_chain(self, chain_name, chain_url):
+    def parse_hospital_chain(self, response):
         """Scrape hospitals from a specific chain's website"""
         hospitals = []
+        chain_name = response.request.meta['chain']
+        logger.info(f"Scraping {chain_name} locations...")
+        soup = response.soup()
         
-        try:
-            response = self.session.get(chain_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find location/hospital listings
-            location_links = soup.find_all('a', href=re.compile(r'hospital|location|branch'))
-            
-            for link in location_links[:10]:  # Limit per chain
-                try:
-                    hospital_name = link.get_text(strip=True)
-                    if not hospital_name or len(hospital_name) < 5:
-                        continue
+        # Find location/hospital listings
+        location_links = soup.find_all('a', href=re.compile(r'hospital|location|branch'))
+        
+        for link in location_links[:10]:  # Limit per chain
+            try:
+                hospital_name = link.get_text(strip=True)
+                if not hospital_name or len(hospital_name) < 5:
+                    continue
                     
-                    # Extract location from name or URL
-                    location_match = re.search(r'([A-Za-z\s]+)(?:,\s*([A-Za-z\s]+))?', hospital_name)
-                    if location_match:
-                        city = location_match.group(1).strip()
-                        state = location_match.group(2) if location_match.group(2) else 'Unknown'
-                    else:
-                        city = 'Unknown'
-                        state = 'Unknown'
+                # Extract location from name or URL
+                location_match = re.search(r'([A-Za-z\s]+)(?:,\s*([A-Za-z\s]+))?', hospital_name)
+                if location_match:
+                    city = location_match.group(1).strip()
+                    state = location_match.group(2) if location_match.group(2) else 'Unknown'
+                else:
+                    city = 'Unknown'
+                    state = 'Unknown'
                     
-                    # Skip if already exists
-                    identifier = f"{hospital_name.lower().strip()}_{city.lower().strip()}"
-                    if identifier in self.existing_hospitals:
-                        continue
+                # Skip if already exists
+                identifier = f"{hospital_name.lower().strip()}_{city.lower().strip()}"
+                if identifier in self.existing_hospitals:
+                    continue
                     
-                    hospital_data = {
-                        'name': hospital_name,
-                        'city': city,
-                        'state': state,
-                        'country': 'India',
-                        'hospital_chain': chain_name,
-                        'hospital_type': 'Multi-specialty Hospital',
-                        'source': f'{chain_name} Website',
-                        'scraped_date': datetime.now().isoformat()
-                    }
+                hospital_data = {
+                    'name': hospital_name,
+                    'city': city,
+                    'state': state,
+                    'country': 'India',
+                    'hospital_chain': chain_name,
+                    'hospital_type': 'Multi-specialty Hospital',
+                    'source': f'{chain_name} Website',
+                    'scraped_date': datetime.now().isoformat()
+                }
                     
-                    # Hospital chains are typically private and well-certified
-                    hospital_data['certifications'] = {
-                        'nabh': {'status': 'Likely Accredited', 'level': 'Full'},
-                        'jci': {'status': 'Possible'},
-                        'nabl': {'status': 'Likely'},
-                        'iso': {'certifications': ['ISO 9001:2015']},
-                        'government_empanelments': ['CGHS', 'ECHS']
-                    }
+                # Hospital chains are typically private and well-certified
+                hospital_data['certifications'] = {
+                    'nabh': {'status': 'Likely Accredited', 'level': 'Full'},
+                    'jci': {'status': 'Possible'},
+                    'nabl': {'status': 'Likely'},
+                    'iso': {'certifications': ['ISO 9001:2015']},
+                    'government_empanelments': ['CGHS', 'ECHS']
+                }
                     
-                    hospitals.append(hospital_data)
-                    self.existing_hospitals.add(identifier)
+                hospitals.append(hospital_data)
+                self.existing_hospitals.add(identifier)
                 
-                except Exception as e:
-                    logger.error(f"Error extracting chain hospital: {e}")
-                    continue
-        
-        except Exception as e:
-            logger.error(f"Error scraping chain {chain_name}: {e}")
+            except Exception as e:
+                logger.error(f"Error extracting chain hospital: {e}")
+                continue
         
         return hospitals
     
+    def on_crawl_error(self, request, error):
+        logger.error(f"Error scraping {request.url}: {error}")
+        return []
+    
     def _is_private_hospital(self, hospital_data):
         """Determine if a hospital is private"""
         name = hospital_data.get('name', '').lower()
@@ -482,33 +417,33 @@ class EnhancedHospitalScraper:
         """Enhance hospital data with certification information"""
         logger.info("Enhancing hospitals with certification data...")
         
-        # Load existing certification data
-        nabh_hospitals = self._load_nabh_data()
-        jci_hospitals = self._load_jci_data()
+        # Load existing certification data and index it once (same rules as _names_match)
+        nabh_resolver = self._build_name_resolver(self._load_nabh_data())
+        jci_resolver = self._build_name_resolver(self._load_jci_data())
         
         for hospital in hospitals:
             hospital_name = hospital.get('name', '').lower()
             
             # Check NABH certification
-            for nabh_hospital in nabh_hospitals:
-                if self._names_match(hospital_name, nabh_hospital.get('name', '').lower()):
-                    hospital['certifications']['nabh'] = {
-                        'status': 'Accredited',
-                        'level': nabh_hospital.get('accreditation_level', 'Full'),
-                        'valid_until': nabh_hospital.get('valid_upto'),
-                        'reference_no': nabh_hospital.get('reference_no')
-                    }
-                    break
+            nabh_match = nabh_resolver.resolve(hospital_name)
+            if nabh_match.matched:
+                nabh_hospital = nabh_match.record
+                hospital['certifications']['nabh'] = {
+                    'status': 'Accredited',
+                    'level': nabh_hospital.get('accreditation_level', 'Full'),
+                    'valid_until': nabh_hospital.get('valid_upto'),
+                    'reference_no': nabh_hospital.get('reference_no')
+                }
             
             # Check JCI certification
-            for jci_hospital in jci_hospitals:
-                if self._names_match(hospital_name, jci_hospital.get('name', '').lower()):
-                    hospital['certifications']['jci'] = {
-                        'status': 'Accredited',
-                        'accreditation_date': jci_hospital.get('accreditation_date'),
-                        'type': jci_hospital.get('type')
-                    }
-                    break
+            jci_match = jci_resolver.resolve(hospital_name)
+            if jci_match.matched:
+                jci_hospital = jci_match.record
+                hospital['certifications']['jci'] = {
+                    'status': 'Accredited',
+                    'accreditation_date': jci_hospital.get('accreditation_date'),
+                    'type': jci_hospital.get('type')
+                }
         
         return hospitals
     
@@ -528,6 +463,14 @@ class EnhancedHospitalScraper:
         except:
             return []
     
+    def _build_name_resolver(self, records, threshold=0.8):
+        """Index certification records for the exact/substring/word-overlap rules of _names_match"""
+        return EntityResolver(
+            records,
+            normalizer=lambda name: re.sub(r'[^\w\s]', '', name.lower()).strip(),
+            policy=MatchPolicy(jaccard_threshold=threshold)
+        )
+    
     def _names_match(self, name1, name2, threshold=0.8):
         """Check if two hospital names match with fuzzy matching"""
         # Simple fuzzy matching - can be enhanced with libraries like fuzzywuzzy
@@ -0,0 +1,290 @@
+"""
+Entity Resolution for QuXAT Healthcare Quality Grid
+Shared, indexed name matching for the *_database_integrator modules and scrapers.
+
+Records are indexed once under blocking keys (normalized name tokens and the
+full normalized name). A lookup only scores the candidate records that share
+a blocking key with the query, so integrating N incoming records against M
+existing ones costs roughly O(N + M) instead of O(N x M) pairwise comparisons.
+
+Generic words ("hospital", "medical", ...) occur in a large share of names and
+would make almost every record a candidate, so tokens above a document-frequency
+cutoff are not used as blocking keys on their own: they only block together
+with the query's city (or country), or, for names made only of such words, on
+the records that contain all of them.
+
+Every lookup returns a MatchDecision that explains which rule matched (exact,
+containment, token Jaccard or shared significant tokens), the scores involved
+and whether the location agreed.
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+_LEGAL_SUFFIXES = re.compile(r'\b(private\s+limited|pvt\.?\s*ltd\.?|ltd\.?|limited|inc|llc|corp|corporation)\b')
+
+
+def normalize_name(name: str) -> str:
+    """Default normalization: lowercase, drop legal suffixes and punctuation, collapse whitespace."""
+    if not name:
+        return ''
+    n = str(name).lower().strip()
+    n = _LEGAL_SUFFIXES.sub(' ', n)
+    n = re.sub(r'[^\w\s]', ' ', n)
+    return ' '.join(n.split())
+
+
+def _norm_location(value: Any) -> str:
+    return str(value or '').lower().strip()
+
+
+def _location_keys(city: Any = None, country: Any = None) -> List[Tuple[str, str]]:
+    keys = []
+    if _norm_location(city):
+        keys.append(('city', _norm_location(city)))
+    if _norm_location(country):
+        keys.append(('country', _norm_location(country)))
+    return keys
+
+
+@dataclass
+class MatchPolicy:
+    """Rules a candidate pair must satisfy to count as the same organization"""
+    # Normalized names are identical
+    allow_exact: bool = True
+    # One normalized name contains the other as a substring...
+    allow_containment: bool = True
+    # ...with at least this word overlap, |A & B| / max(|A|, |B|)
+    containment_min_overlap: float = 0.0
+    # ...and (optionally) the same city and state
+    containment_requires_location: bool = False
+    # Token-set Jaccard, |A & B| / |A | B|; None disables the rule
+    jaccard_threshold: Optional[float] = None
+    # Number of shared tokens longer than significant_token_length; None disables the rule
+    min_shared_significant_tokens: Optional[int] = None
+    significant_token_length: int = 3
+
+
+@dataclass
+class MatchDecision:
+    """Explainable outcome of matching one query against one indexed record"""
+    matched: bool
+    index: Optional[int] = None
+    record: Optional[Dict[str, Any]] = None
+    rule: str = 'none'
+    score: float = 0.0
+    jaccard: float = 0.0
+    overlap: float = 0.0
+    shared_tokens: List[str] = field(default_factory=list)
+    location_match: Optional[bool] = None
+    candidates_considered: int = 0
+
+    def explain(self) -> str:
+        """Human-readable explanation of the decision"""
+        if not self.matched:
+            return f"no match among {self.candidates_considered} candidates"
+        name = (self.record or {}).get('name') or (self.record or {}).get('organization_name', '')
+        location = '' if self.location_match is None else f", location {'matched' if self.location_match else 'differs'}"
+        return (f"matched '{name}' by {self.rule} (score {self.score:.2f}, jaccard {self.jaccard:.2f}, "
+                f"overlap {self.overlap:.2f}, shared {self.shared_tokens}{location}) "
+                f"among {self.candidates_considered} candidates")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact, JSON-serializable form for integration reports"""
+        return {
+            'matched': self.matched,
+            'index': self.index,
+            'rule': self.rule,
+            'score': round(self.score, 4),
+            'jaccard': round(self.jaccard, 4),
+            'overlap': round(self.overlap, 4),
+            'shared_tokens': self.shared_tokens,
+            'location_match': self.location_match,
+            'candidates_considered': self.candidates_considered,
+            'explanation': self.explain()
+        }
+
+
+class EntityResolver:
+    """Blocking index over organization records with candidate-only pair scoring"""
+
+    def __init__(self, records: Iterable[Dict[str, Any]], name_field: str = 'name',
+                 normalizer: Callable[[str], str] = normalize_name,
+                 policy: Optional[MatchPolicy] = None,
+                 record_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 common_token_ratio: float = 0.02, common_token_min_count: int = 50):
+        """
+        Args:
+            records: Organizations to index (list order is preserved for 'first' matching)
+            name_field: Record key holding the organization name
+            normalizer: Name normalization shared by index and queries
+            policy: Match rules (defaults to MatchPolicy())
+            record_filter: Only index records for which this returns True
+            common_token_ratio, common_token_min_count: A token found in more than
+                max(common_token_min_count, common_token_ratio x indexed records)
+                names is too common to block on by itself
+        """
+        self.name_field = name_field
+        self.normalizer = normalizer
+        self.policy = policy or MatchPolicy()
+        self.records: List[Dict[str, Any]] = []
+        self._normalized: Dict[int, str] = {}
+        self._tokens: Dict[int, Set[str]] = {}
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._token_index: Dict[str, List[int]] = defaultdict(list)
+        self._location_index: Dict[Tuple[str, str, str], List[int]] = defaultdict(list)
+        self._record_filter = record_filter
+        self.common_token_ratio = common_token_ratio
+        self.common_token_min_count = common_token_min_count
+        for record in records:
+            self.add(record)
+
+    def add(self, record: Dict[str, Any]) -> Optional[int]:
+        """Index one more record (e.g. a newly appended organization); returns its index"""
+        index = len(self.records)
+        self.records.append(record)
+        if not isinstance(record, dict) or (self._record_filter and not self._record_filter(record)):
+            return None
+        normalized = self.normalizer(record.get(self.name_field, '') or '')
+        tokens = set(normalized.split())
+        self._normalized[index] = normalized
+        self._tokens[index] = tokens
+        if normalized:
+            self._exact[normalized].append(index)
+        locations = _location_keys(record.get('city'), record.get('country'))
+        for token in tokens:
+            self._token_index[token].append(index)
+            for kind, value in locations:
+                self._location_index[(token, kind, value)].append(index)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def common_token_cutoff(self) -> int:
+        """Document frequency above which a token no longer blocks on its own"""
+        return max(self.common_token_min_count, int(self.common_token_ratio * len(self._normalized)))
+
+    def candidates(self, normalized: str, city: Optional[str] = None, country: Optional[str] = None) -> List[int]:
+        """
+        Record indices sharing a blocking key with the query, in list order
+
+        The full name, every word sequence of it that is itself an indexed name
+        (so shorter names contained in the query stay candidates) and every rare
+        token block directly. Common tokens block only within the query's city
+        (or, without a city, its country); a name made only of common tokens
+        without a location blocks on the records that contain all of its tokens.
+        """
+        words = normalized.split()
+        found = set()
+        for start in range(len(words)):
+            for end in range(start + 1, len(words) + 1):
+                found.update(self._exact.get(' '.join(words[start:end]), ()))
+        found.update(self._exact.get(normalized, ()))
+        cutoff = self.common_token_cutoff()
+        rare, common = [], []
+        for token in set(words):
+            postings = self._token_index.get(token, ())
+            (common if len(postings) > cutoff else rare).append(token)
+        for token in rare:
+            found.update(self._token_index.get(token, ()))
+        if common:
+            locations = _location_keys(city, country)
+            if locations:
+                kind, value = locations[0]
+                for token in common:
+                    found.update(self._location_index.get((token, kind, value), ()))
+            elif not rare:
+                found.update(set.intersection(*(set(self._token_index[token]) for token in common)))
+        return sorted(found)
+
+    def _score_pair(self, query_norm: str, query_tokens: Set[str], index: int,
+                    city: Optional[str], state: Optional[str]) -> MatchDecision:
+        policy = self.policy
+        other_norm = self._normalized[index]
+        other_tokens = self._tokens[index]
+        shared = query_tokens & other_tokens
+        union = query_tokens | other_tokens
+        jaccard = len(shared) / len(union) if union else 0.0
+        longest = max(len(query_tokens), len(other_tokens))
+        overlap = len(shared) / longest if longest else 0.0
+
+        location_match = None
+        if city is not None or state is not None:
+            record = self.records[index]
+            location_match = (
+                _norm_location(record.get('city')) == _norm_location(city)
+                and _norm_location(record.get('state')) == _norm_location(state)
+            )
+
+        decision = MatchDecision(
+            matched=False, index=index, record=self.records[index], jaccard=jaccard,
+            overlap=overlap, shared_tokens=sorted(shared), location_match=location_match
+        )
+        if policy.allow_exact and query_norm and query_norm == other_norm:
+            decision.matched, decision.rule, decision.score = True, 'exact', 1.0
+        elif (policy.allow_containment and query_norm and other_norm
+              and (query_norm in other_norm or other_norm in query_norm)
+              and overlap >= policy.containment_min_overlap
+              and (not policy.containment_requires_location or location_match)):
+            decision.matched, decision.rule, decision.score = True, 'containment', max(overlap, jaccard)
+        elif policy.jaccard_threshold is not None and union and jaccard >= policy.jaccard_threshold:
+            decision.matched, decision.rule, decision.score = True, 'jaccard', jaccard
+        elif policy.min_shared_significant_tokens is not None:
+            significant = [t for t in shared if len(t) > policy.significant_token_length]
+            if len(significant) >= policy.min_shared_significant_tokens:
+                decision.matched, decision.rule, decision.score = True, 'shared_tokens', jaccard
+        return decision
+
+    def resolve(self, name: str, city: Optional[str] = None, state: Optional[str] = None,
+                strategy: str = 'first', exclude: Optional[Set[int]] = None,
+                country: Optional[str] = None) -> MatchDecision:
+        """
+        Match a name against the index
+
+        Args:
+            name: Query organization name
+            city, state: Optional location used by location-aware rules and reported in the decision
+            strategy: 'first' returns the earliest matching record in list order (legacy loop
+                semantics); 'best' returns the highest-scoring match
+            exclude: Record indices to ignore
+            country: Optional country; with city, narrows blocking on common name tokens
+
+        Returns:
+            MatchDecision (matched=False when nothing qualifies)
+        """
+        query_norm = self.normalizer(name or '')
+        query_tokens = set(query_norm.split())
+        candidate_indices = self.candidates(query_norm, city, country)
+        best: Optional[MatchDecision] = None
+        for index in candidate_indices:
+            if exclude and index in exclude:
+                continue
+            decision = self._score_pair(query_norm, query_tokens, index, city, state)
+            if not decision.matched:
+                continue
+            if strategy == 'first':
+                best = decision
+                break
+            if best is None or decision.score > best.score:
+                best = decision
+        if best is None:
+            best = MatchDecision(matched=False)
+        best.candidates_considered = len(candidate_indices)
+        return best
+
+    def resolve_all(self, name: str, city: Optional[str] = None, state: Optional[str] = None,
+                    country: Optional[str] = None) -> List[MatchDecision]:
+        """All matching records for a name, in list order"""
+        query_norm = self.normalizer(name or '')
+        query_tokens = set(query_norm.split())
+        candidate_indices = self.candidates(query_norm, city, country)
+        matches = []
+        for index in candidate_indices:
+            decision = self._score_pair(query_norm, query_tokens, index, city, state)
+            if decision.matched:
+                decision.candidates_considered = len(candidate_indices)
+                matches.append(decision)
+        return matches
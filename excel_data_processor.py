@@ -11,12 +11,47 @@ from typing import Dict, List, Optional, Tuple, Any
 import logging
 import re
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serializes one app's writers
+    fcntl = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One lock per database file, shared by every processor and queue worker in the process
+_database_locks: Dict[str, threading.Lock] = {}
+_database_locks_guard = threading.Lock()
+
+
+@contextmanager
+def database_write_lock(database_path: str):
+    """
+    Exclusive access to a database file for a read-merge-write cycle
+
+    Serializes threads of this process, and processes sharing the file via an
+    flock on a sidecar .lock file where fcntl is available.
+    """
+    path = os.path.abspath(database_path)
+    with _database_locks_guard:
+        lock = _database_locks.setdefault(path, threading.Lock())
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        with open(path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
 class ExcelDataProcessor:
     """
     Processes Excel files containing healthcare organization data for QuXAT system integration
@@ -72,6 +107,12 @@ class ExcelDataProcessor:
             'medical center': 'Medical Center',
             'hospital network': 'Hospital Network'
         }
+        
+        # Memoized certification score impacts (keyed by standardized name)
+        self._score_impact_cache = {}
+        
+        # Rows per chunk for the vectorized ingestion path
+        self.chunk_size = 5000
     
     def validate_excel_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -126,7 +167,7 @@ class ExcelDataProcessor:
                 return validation_result
             
             # Map columns to required fields
-            column_mapping = self._map_columns(df.columns)
+            column_mapping = self.map_columns(df.columns)
             validation_result['column_mapping'] = column_mapping
             
             # Check for required columns
@@ -161,7 +202,7 @@ class ExcelDataProcessor:
         
         return validation_result
     
-    def _map_columns(self, columns: List[str]) -> Dict[str, str]:
+    def map_columns(self, columns: List[str]) -> Dict[str, str]:
         """
         Map Excel columns to required fields
         
@@ -192,17 +233,21 @@ class ExcelDataProcessor:
         
         return column_mapping
     
-    def process_excel_data(self, file_path: str, validation_result: Dict[str, Any]) -> Dict[str, Any]:
+    def process_excel_data(self, file_path: str, validation_result: Dict[str, Any], vectorized: bool = True) -> Dict[str, Any]:
         """
         Process Excel data and convert to QuXAT format
         
         Args:
             file_path: Path to Excel file
             validation_result: Result from validate_excel_file
+            vectorized: Use the column-wise chunked pipeline instead of per-row processing
             
         Returns:
             Dictionary with processed data and statistics
         """
+        if vectorized:
+            return self.process_excel_data_vectorized(file_path, validation_result)
+        
         processing_result = {
             'success': False,
             'organizations': [],
@@ -419,6 +464,22 @@ class ExcelDataProcessor:
         """
         Get score impact for certification
         
+        Args:
+            cert_name: Certification name
+            
+        Returns:
+            Score impact value
+        """
+        if cert_name in self._score_impact_cache:
+            return self._score_impact_cache[cert_name]
+        impact = self._compute_certification_score_impact(cert_name)
+        self._score_impact_cache[cert_name] = impact
+        return impact
+    
+    def _compute_certification_score_impact(self, cert_name: str) -> float:
+        """
+        Compute (uncached) score impact for certification
+        
         Args:
             cert_name: Certification name
             
@@ -452,6 +513,295 @@ class ExcelDataProcessor:
         else:
             return 5.0
     
+    def iter_batches(self, file_path: str, chunk_size: Optional[int] = None):
+        """
+        Yield the uploaded file as DataFrame chunks
+        
+        CSV files are streamed with pandas chunked reading; Excel workbooks
+        cannot be streamed, so they are read once and sliced.
+        
+        Args:
+            file_path: Path to Excel or CSV file
+            chunk_size: Rows per chunk (defaults to self.chunk_size)
+        """
+        chunk_size = chunk_size or self.chunk_size
+        if file_path.lower().endswith('.csv'):
+            for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+                yield chunk
+        else:
+            df = pd.read_excel(file_path)
+            for start in range(0, len(df), chunk_size):
+                yield df.iloc[start:start + chunk_size]
+    
+    def _clean_text_column(self, series: pd.Series) -> pd.Series:
+        """
+        Column-wise equivalent of str(value).strip() with missing values as NaN
+        
+        Args:
+            series: Raw column
+            
+        Returns:
+            Stripped string column (NaN where the source value is missing)
+        """
+        return series.where(series.isna(), series.astype(str).str.strip())
+    
+    def _to_int_column(self, series: pd.Series) -> pd.Series:
+        """
+        Column-wise equivalent of int(float(str(value))) with None on failure
+        
+        Args:
+            series: Raw column
+            
+        Returns:
+            Object column of ints or None
+        """
+        numeric = pd.to_numeric(series.astype(str).str.strip(), errors='coerce')
+        numeric = numeric.where(np.isfinite(numeric))
+        return pd.Series([None if pd.isna(v) else int(v) for v in numeric], index=series.index, dtype=object)
+    
+    def _explode_certifications(self, series: pd.Series) -> Dict[Any, List[Dict[str, Any]]]:
+        """
+        Build certification lists for a whole column using split/explode
+        
+        Standardization, type and score impact are resolved once per unique
+        certification string rather than once per row.
+        
+        Args:
+            series: Certifications column
+            
+        Returns:
+            Dictionary mapping row index to list of certification dictionaries
+        """
+        text = series.dropna().astype(str).str.strip()
+        text = text[text != '']
+        if text.empty:
+            return {}
+        
+        raw = text.str.split(r'[,;|]', regex=True).explode().str.strip()
+        raw = raw[raw.notna() & (raw != '')]
+        if raw.empty:
+            return {}
+        
+        unique_raw = pd.unique(raw)
+        standardized = {name: self._standardize_certification_name(name) for name in unique_raw}
+        attributes = {
+            std: (self._get_certification_type(std), self._get_certification_score_impact(std))
+            for std in set(standardized.values()) if std
+        }
+        
+        certs_by_row: Dict[Any, List[Dict[str, Any]]] = {}
+        for row_index, raw_name in zip(raw.index, raw.values):
+            standardized_name = standardized[raw_name]
+            if not standardized_name:
+                continue
+            cert_type, score_impact = attributes[standardized_name]
+            certs_by_row.setdefault(row_index, []).append({
+                'name': standardized_name,
+                'type': cert_type,
+                'status': 'Active',  # Default to Active
+                'source': 'Excel Upload',
+                'accreditation_date': '',
+                'expiry_date': '',
+                'remarks': f'Imported from Excel: {raw_name}',
+                'score_impact': score_impact
+            })
+        return certs_by_row
+    
+    def _process_organization_frame(self, df: pd.DataFrame, column_mapping: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Vectorized equivalent of _process_organization_row over a DataFrame chunk
+        
+        Args:
+            df: DataFrame chunk
+            column_mapping: Column mapping dictionary
+            
+        Returns:
+            List of organization dictionaries
+        """
+        if 'name' not in column_mapping or df.empty:
+            return []
+        
+        names = self._clean_text_column(df[column_mapping['name']])
+        valid = names.notna() & (names != '') & (names.str.lower() != 'nan')
+        df = df[valid]
+        if df.empty:
+            return []
+        
+        columns = {'name': names[valid]}
+        
+        # Required fields: missing values become empty strings
+        for field in ['country', 'city', 'state', 'hospital_type']:
+            if field in column_mapping:
+                values = self._clean_text_column(df[column_mapping[field]])
+                if field == 'hospital_type':
+                    unique_types = values.dropna().unique()
+                    type_lookup = {t: self._standardize_hospital_type(t) for t in unique_types}
+                    values = values.map(type_lookup)
+                columns[field] = values.fillna('')
+            else:
+                columns[field] = pd.Series('', index=df.index)
+        
+        # Optional fields: keys are only present when the source value is present
+        optional = {}
+        for field in ['website', 'phone', 'email', 'established_year', 'bed_count', 'specialties']:
+            if field not in column_mapping:
+                continue
+            source = df[column_mapping[field]]
+            present = source.notna()
+            if field in ('established_year', 'bed_count'):
+                values = self._to_int_column(source)
+            elif field == 'specialties':
+                values = source.astype(str).str.split(',').map(
+                    lambda parts: [p.strip() for p in parts if p.strip()] if isinstance(parts, list) else []
+                )
+            else:
+                values = self._clean_text_column(source)
+            optional[field] = (present.values, values.values)
+        
+        certs_by_row = {}
+        if 'certifications' in column_mapping:
+            certs_by_row = self._explode_certifications(df[column_mapping['certifications']])
+        
+        timestamp = datetime.now().isoformat()
+        organizations = []
+        frame = pd.DataFrame(columns)
+        for position, (row_index, record) in enumerate(zip(frame.index, frame.to_dict('records'))):
+            org_data = {
+                'name': record['name'],
+                'original_name': record['name'],
+                'data_source': 'Excel Upload',
+                'last_updated': timestamp,
+                'quality_indicators': {
+                    'excel_imported': True,
+                    'data_verified': False
+                },
+                'country': record['country'],
+                'city': record['city'],
+                'state': record['state'],
+                'hospital_type': record['hospital_type']
+            }
+            for field, (present, values) in optional.items():
+                if present[position]:
+                    org_data[field] = values[position]
+            org_data['certifications'] = certs_by_row.get(row_index, [])
+            organizations.append(org_data)
+        
+        return organizations
+    
+    def process_batch(self, df: pd.DataFrame, column_mapping: Dict[str, str],
+                      warnings: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Convert one batch of uploaded rows to QuXAT organizations
+        
+        Public batch entry point for callers that stream uploads themselves
+        (e.g. the ingestion queue). The batch is processed column-wise and
+        falls back to per-row processing if that fails.
+        
+        A single malformed record makes the column-wise pass raise for the whole
+        chunk; the fallback reprocesses the chunk row by row so only the bad
+        records are skipped (and logged) and the rest of the chunk is kept.
+        
+        Args:
+            df: DataFrame chunk
+            column_mapping: Column mapping dictionary
+            warnings: Optional list that receives one message per skipped record
+            
+        Returns:
+            List of organization dictionaries
+        """
+        try:
+            return self._process_organization_frame(df, column_mapping)
+        except Exception as e:
+            logger.warning(f"Column-wise processing failed for {len(df)} rows ({e}); retrying row by row")
+        
+        organizations = []
+        for index, row in df.iterrows():
+            try:
+                org_data = self._process_organization_row(row, column_mapping, index)
+                if org_data:
+                    organizations.append(org_data)
+            except Exception as e:
+                record = {k: v for k, v in row.items() if pd.notna(v)}
+                logger.warning(f"Skipping row {index + 1}: {e} - record: {record}")
+                if warnings is not None:
+                    warnings.append(f"Error processing row {index + 1}: {str(e)}")
+        return organizations
+    
+    def process_excel_data_vectorized(self, file_path: str, validation_result: Dict[str, Any], chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Process Excel/CSV data column-wise in chunks and convert to QuXAT format
+        
+        Produces the same organizations as the per-row path, but normalizes
+        whole columns with pandas string methods and explodes certifications
+        once per chunk, so large bulk uploads are processed in seconds.
+        
+        Args:
+            file_path: Path to Excel file
+            validation_result: Result from validate_excel_file
+            chunk_size: Rows per chunk (defaults to self.chunk_size)
+            
+        Returns:
+            Dictionary with processed data and statistics
+        """
+        processing_result = {
+            'success': False,
+            'organizations': [],
+            'statistics': {},
+            'errors': [],
+            'warnings': []
+        }
+        
+        try:
+            if not validation_result['is_valid']:
+                processing_result['errors'].append("Cannot process invalid file")
+                return processing_result
+            
+            column_mapping = validation_result['column_mapping']
+            organizations = []
+            total_rows = 0
+            started = datetime.now()
+            
+            for chunk in self.iter_batches(file_path, chunk_size):
+                total_rows += len(chunk)
+                organizations.extend(
+                    self.process_batch(chunk, column_mapping, processing_result['warnings'])
+                )
+            
+            elapsed = (datetime.now() - started).total_seconds()
+            processing_result['organizations'] = organizations
+            processing_result['statistics'] = {
+                'total_rows_processed': total_rows,
+                'organizations_created': len(organizations),
+                'success_rate': round((len(organizations) / total_rows) * 100, 2) if total_rows > 0 else 0,
+                'countries': list(set([org.get('country', 'Unknown') for org in organizations])),
+                'hospital_types': list(set([org.get('hospital_type', 'Unknown') for org in organizations])),
+                'with_certifications': len([org for org in organizations if org.get('certifications', [])]),
+                'processing_seconds': round(elapsed, 3),
+                'processing_timestamp': datetime.now().isoformat()
+            }
+            
+            processing_result['success'] = True
+            
+        except Exception as e:
+            processing_result['errors'].append(f"Processing error: {str(e)}")
+            logger.error(f"Data processing error: {e}")
+        
+        return processing_result
+    
+    def normalize_org_name(self, name: str) -> str:
+        """
+        Normalize organization name for the database join index
+        
+        Args:
+            name: Organization name
+            
+        Returns:
+            Lowercased name with punctuation and repeated whitespace removed
+        """
+        n = str(name or '').lower().strip()
+        n = re.sub(r"[\-_,.&'\"()]", " ", n)
+        return re.sub(r"\s+", " ", n).strip()
+    
     def _standardize_hospital_type(self, hospital_type: str) -> str:
         """
         Standardize hospital type
@@ -489,82 +839,94 @@ class ExcelDataProcessor:
         }
         
         try:
-            # Load existing database
-            existing_data = {'organizations': []}
-            if os.path.exists(database_path):
-                with open(database_path, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-            
-            existing_orgs = existing_data.get('organizations', [])
-            
-            # Track integration statistics
-            new_orgs_added = 0
-            existing_orgs_updated = 0
-            duplicates_skipped = 0
-            
-            # Create name index for faster lookup
-            existing_names = {org['name'].lower(): i for i, org in enumerate(existing_orgs)}
-            
-            for new_org in organizations:
-                org_name_lower = new_org['name'].lower()
+            # Concurrent integrations (queue workers, other app processes) would
+            # otherwise overwrite each other's merge
+            with database_write_lock(database_path):
+                # Load existing database
+                existing_data = {'organizations': []}
+                if os.path.exists(database_path):
+                    with open(database_path, 'r', encoding='utf-8') as f:
+                        existing_data = json.load(f)
+            
+                existing_orgs = existing_data.get('organizations', [])
+            
+                # Track integration statistics
+                new_orgs_added = 0
+                existing_orgs_updated = 0
+                duplicates_skipped = 0
+            
+                # Hash join: normalized-name index of the database, built once
+                existing_names = {}
+                for i, org in enumerate(existing_orgs):
+                    existing_names.setdefault(self.normalize_org_name(org.get('name', '')), i)
+                cert_name_sets = {}
+            
+                for new_org in organizations:
+                    org_key = self.normalize_org_name(new_org['name'])
                 
-                if org_name_lower in existing_names:
-                    # Update existing organization
-                    existing_index = existing_names[org_name_lower]
-                    existing_org = existing_orgs[existing_index]
+                    if org_key in existing_names:
+                        # Update existing organization
+                        existing_index = existing_names[org_key]
+                        existing_org = existing_orgs[existing_index]
                     
-                    # Merge certifications
-                    existing_certs = existing_org.get('certifications', [])
-                    new_certs = new_org.get('certifications', [])
+                        # Merge certifications
+                        existing_certs = existing_org.get('certifications', [])
+                        new_certs = new_org.get('certifications', [])
+                        if existing_index not in cert_name_sets:
+                            cert_name_sets[existing_index] = {
+                                str(c.get('name', '')).lower() for c in existing_certs if isinstance(c, dict)
+                            }
+                        known_certs = cert_name_sets[existing_index]
                     
-                    # Add new certifications that don't exist
-                    for new_cert in new_certs:
-                        cert_exists = any(
-                            existing_cert['name'].lower() == new_cert['name'].lower()
-                            for existing_cert in existing_certs
-                        )
-                        if not cert_exists:
-                            existing_certs.append(new_cert)
+                        # Add new certifications that don't exist
+                        for new_cert in new_certs:
+                            cert_key = new_cert['name'].lower()
+                            if cert_key not in known_certs:
+                                existing_certs.append(new_cert)
+                                known_certs.add(cert_key)
                     
-                    existing_org['certifications'] = existing_certs
-                    existing_org['last_updated'] = datetime.now().isoformat()
-                    existing_org['quality_indicators']['excel_updated'] = True
+                        existing_org['certifications'] = existing_certs
+                        existing_org['last_updated'] = datetime.now().isoformat()
+                        existing_org.setdefault('quality_indicators', {})['excel_updated'] = True
                     
-                    existing_orgs_updated += 1
-                else:
-                    # Add new organization
-                    existing_orgs.append(new_org)
-                    existing_names[org_name_lower] = len(existing_orgs) - 1
-                    new_orgs_added += 1
-            
-            # Update metadata
-            metadata = existing_data.get('metadata', {})
-            metadata.update({
-                'excel_integration_timestamp': datetime.now().isoformat(),
-                'excel_integration_statistics': {
-                    'new_organizations_added': new_orgs_added,
-                    'existing_organizations_updated': existing_orgs_updated,
-                    'duplicates_skipped': duplicates_skipped,
-                    'total_organizations_processed': len(organizations)
-                },
-                'total_organizations': len(existing_orgs),
-                'version': metadata.get('version', '1.0') + '_excel_updated'
-            })
-            
-            # Add data source if not present
-            data_sources = metadata.get('data_sources', [])
-            if 'Excel Upload' not in data_sources:
-                data_sources.append('Excel Upload')
-            metadata['data_sources'] = data_sources
-            
-            # Save updated database
-            updated_data = {
-                'metadata': metadata,
-                'organizations': existing_orgs
-            }
-            
-            with open(database_path, 'w', encoding='utf-8') as f:
-                json.dump(updated_data, f, indent=2, ensure_ascii=False)
+                        existing_orgs_updated += 1
+                    else:
+                        # Add new organization
+                        existing_orgs.append(new_org)
+                        existing_names[org_key] = len(existing_orgs) - 1
+                        new_orgs_added += 1
+            
+                # Update metadata
+                metadata = existing_data.get('metadata', {})
+                metadata.update({
+                    'excel_integration_timestamp': datetime.now().isoformat(),
+                    'excel_integration_statistics': {
+                        'new_organizations_added': new_orgs_added,
+                        'existing_organizations_updated': existing_orgs_updated,
+                        'duplicates_skipped': duplicates_skipped,
+                        'total_organizations_processed': len(organizations)
+                    },
+                    'total_organizations': len(existing_orgs),
+                    'version': metadata.get('version', '1.0') + '_excel_updated'
+                })
+            
+                # Add data source if not present
+                data_sources = metadata.get('data_sources', [])
+                if 'Excel Upload' not in data_sources:
+                    data_sources.append('Excel Upload')
+                metadata['data_sources'] = data_sources
+            
+                # Save updated database
+                updated_data = {
+                    'metadata': metadata,
+                    'organizations': existing_orgs
+                }
+            
+                # Atomic replace: readers never see a half-written database
+                tmp_path = f"{database_path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(updated_data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, database_path)
             
             integration_result['statistics'] = {
                 'new_organizations_added': new_orgs_added,
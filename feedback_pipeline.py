@@ -0,0 +1,316 @@
+"""
+Batched Feedback Pipeline for QuXAT Healthcare Quality Grid
+Shared by PatientFeedbackAnalyzer (patient_feedback_module.py) and
+AutomatedFeedbackScraper (automated_feedback_scraper.py).
+
+- Platforms are fetched concurrently; a per-platform token-bucket RateLimiter
+  keeps the spacing between requests to the same platform that the old
+  sequential time.sleep() calls provided.
+- Sentiment is scored for a whole batch of reviews at once by a cached
+  lexicon model: each distinct text is tokenized once, word polarities are
+  looked up into one flat numpy array and reduced per review with bincount.
+  When TextBlob is installed its pattern lexicon is reused; otherwise a
+  built-in review lexicon is used.
+- Rating, sentiment, trend and confidence aggregates are computed with numpy
+  over the review timestamps and cached per organization.
+"""
+
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from score_history_store import normalize_org_key
+
+logger = logging.getLogger(__name__)
+
+# Word polarity (-1 to 1) for healthcare reviews, on the same scale as TextBlob's pattern lexicon
+REVIEW_LEXICON = {
+    'excellent': 1.0, 'outstanding': 0.5, 'exceptional': 0.67, 'wonderful': 1.0, 'great': 0.8,
+    'good': 0.7, 'best': 1.0, 'better': 0.5, 'amazing': 0.6, 'fantastic': 0.4, 'superb': 1.0,
+    'professional': 0.1, 'compassionate': 0.5, 'caring': 0.6, 'kind': 0.6, 'friendly': 0.38,
+    'helpful': 0.5, 'knowledgeable': 0.5, 'clean': 0.37, 'efficient': 0.5, 'modern': 0.2,
+    'satisfied': 0.5, 'happy': 0.8, 'recommend': 0.4, 'recommended': 0.4, 'thank': 0.3,
+    'thanks': 0.2, 'grateful': 0.6, 'prompt': 0.3, 'attentive': 0.5, 'skilled': 0.5,
+    'decent': 0.17, 'okay': 0.5, 'ok': 0.5, 'adequate': 0.1, 'acceptable': 0.1, 'fine': 0.42,
+    'average': -0.15, 'standard': 0.0,
+    'poor': -0.4, 'bad': -0.7, 'worse': -0.4, 'worst': -1.0, 'terrible': -1.0, 'horrible': -1.0,
+    'awful': -1.0, 'disappointing': -0.6, 'disappointed': -0.75, 'unprofessional': -0.5,
+    'rude': -0.3, 'inadequate': -0.5, 'unsatisfactory': -0.5, 'overpriced': -0.4,
+    'dirty': -0.6, 'slow': -0.3, 'careless': -0.5, 'negligent': -0.6, 'unhelpful': -0.5,
+    'expensive': -0.5, 'painful': -0.7, 'long': -0.05, 'lack': -0.2, 'below': -0.1,
+}
+# Multipliers applied to the polarity of the following word
+INTENSIFIERS = {
+    'very': 1.3, 'really': 1.3, 'extremely': 1.5, 'highly': 1.3, 'so': 1.2, 'too': 1.2,
+    'absolutely': 1.4, 'quite': 1.1, 'truly': 1.2, 'incredibly': 1.4, 'definitely': 1.2,
+}
+NEGATIONS = {'not', 'no', 'never', 'nothing', 'hardly', 'without'}
+NEGATION_FACTOR = -0.5
+
+_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+def _load_textblob_lexicon() -> Optional[Dict[str, float]]:
+    """Average word polarity from TextBlob's pattern lexicon, if TextBlob is installed"""
+    try:
+        import textblob
+        import xml.etree.ElementTree as ET
+    except ImportError:
+        return None
+    path = os.path.join(os.path.dirname(textblob.__file__), 'en', 'en-sentiment.xml')
+    try:
+        totals: Dict[str, List[float]] = {}
+        for word in ET.parse(path).getroot().iter('word'):
+            form = (word.get('form') or '').lower()
+            if form and ' ' not in form:
+                totals.setdefault(form, []).append(float(word.get('polarity', 0.0)))
+    except (OSError, ET.ParseError, ValueError):
+        return None
+    return {form: sum(values) / len(values) for form, values in totals.items()}
+
+
+class LexiconSentimentModel:
+    """Lexicon sentiment with negation/intensifier handling, scored in numpy batches"""
+
+    def __init__(self, lexicon: Dict[str, float], intensifiers: Optional[Dict[str, float]] = None,
+                 negations: Iterable[str] = NEGATIONS, cache_size: int = 50000):
+        self.lexicon = dict(lexicon)
+        self.modifiers = dict(INTENSIFIERS if intensifiers is None else intensifiers)
+        self.modifiers.update({word: NEGATION_FACTOR for word in negations})
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _modifier(self, token: str) -> float:
+        factor = self.modifiers.get(token)
+        if factor is not None:
+            return factor
+        return NEGATION_FACTOR if token.endswith("n't") else 1.0
+
+    def _score_texts(self, texts: Sequence[str]) -> np.ndarray:
+        """Polarity of each text: mean of matched word polarities, each scaled by the preceding modifier"""
+        n = len(texts)
+        tokens = [_TOKEN_RE.findall(text.lower()) for text in texts]
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=n)
+        flat = list(chain.from_iterable(tokens))
+        if not flat:
+            return np.zeros(n)
+        doc_ids = np.repeat(np.arange(n), lengths)
+        polarity = np.fromiter((self.lexicon.get(t, math.nan) for t in flat), dtype=np.float64, count=len(flat))
+        modifier = np.fromiter((self._modifier(t) for t in flat), dtype=np.float64, count=len(flat))
+
+        # Each word is modified by the word before it, never across review boundaries
+        previous = np.ones(len(flat))
+        previous[1:] = modifier[:-1]
+        starts = (np.cumsum(lengths) - lengths)[lengths > 0]
+        previous[starts] = 1.0
+
+        matched = ~np.isnan(polarity)
+        scores = np.where(matched, polarity * previous, 0.0)
+        sums = np.bincount(doc_ids, weights=scores, minlength=n)
+        counts = np.bincount(doc_ids, weights=matched.astype(np.float64), minlength=n)
+        result = np.divide(sums, counts, out=np.zeros(n), where=counts > 0)
+        return np.clip(result, -1.0, 1.0)
+
+    def polarity_batch(self, texts: Iterable[str]) -> np.ndarray:
+        """Polarity (-1 to 1) for every text; each distinct text is scored once"""
+        texts = [text or '' for text in texts]
+        positions: Dict[str, int] = {}
+        inverse = np.fromiter((positions.setdefault(text, len(positions)) for text in texts),
+                              dtype=np.int64, count=len(texts))
+        unique = list(positions)
+        values = np.empty(len(unique))
+        missing = []
+        with self._lock:
+            for i, text in enumerate(unique):
+                cached = self._cache.get(text)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    values[i] = cached
+        if missing:
+            scored = self._score_texts([unique[i] for i in missing])
+            values[missing] = scored
+            with self._lock:
+                for i, score in zip(missing, scored):
+                    self._cache[unique[i]] = float(score)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return values[inverse] if len(texts) else np.zeros(0)
+
+    def polarity(self, text: str) -> float:
+        return float(self.polarity_batch([text])[0])
+
+
+@lru_cache(maxsize=1)
+def get_sentiment_model() -> LexiconSentimentModel:
+    """Process-wide sentiment model (lexicon loaded once)"""
+    lexicon = dict(REVIEW_LEXICON)
+    textblob_lexicon = _load_textblob_lexicon()
+    if textblob_lexicon:
+        lexicon.update(textblob_lexicon)
+    return LexiconSentimentModel(lexicon)
+
+
+class RateLimiter:
+    """Thread-safe token bucket per key (e.g. per platform)"""
+
+    def __init__(self, rate_per_sec: float = 1.0, burst: int = 1):
+        self.rate = float(rate_per_sec)
+        self.burst = max(1, int(burst))
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str = 'default') -> float:
+        """Block until a token for key is available; returns the seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(key, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            # Take the token now (possibly going negative) and sleep off the deficit outside the lock
+            tokens -= 1.0
+            self._buckets[key] = [tokens, now]
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def fetch_platforms(platforms: Dict[str, Callable[[str, str], List[Any]]], organization_name: str,
+                    location: str = "", rate_limiter: Optional[RateLimiter] = None,
+                    max_workers: Optional[int] = None) -> Dict[str, Optional[List[Any]]]:
+    """
+    Run every platform scraper concurrently
+
+    Returns:
+        platform name -> scraped items (None if the scraper raised), in platform order
+    """
+    def _fetch(item):
+        platform_name, scraper_func = item
+        if rate_limiter is not None:
+            rate_limiter.acquire(platform_name)
+        logger.info(f"Scraping {platform_name} for {organization_name}")
+        try:
+            return scraper_func(organization_name, location)
+        except Exception as e:
+            logger.error(f"Error scraping {platform_name}: {str(e)}")
+            return None
+
+    items = list(platforms.items())
+    if not items:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(items)) as executor:
+        results = list(executor.map(_fetch, items))
+    return {name: result for (name, _), result in zip(items, results)}
+
+
+TREND_THRESHOLD = 0.1
+RECENT_DAYS = 90
+
+
+def compute_feedback_aggregates(sentiments: Sequence[float], ratings: Sequence[Optional[float]],
+                                timestamps: Sequence[datetime], platforms: Sequence[str],
+                                now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Rating, sentiment, trend and confidence for one organization's reviews
+
+    The trend compares mean sentiment of the newer half of the reviews (by
+    timestamp) with the older half; confidence blends volume (max at 50
+    reviews), the share of reviews from the last 90 days and platform
+    diversity (max at 3 platforms).
+    """
+    n = len(sentiments)
+    if n == 0:
+        return {'count': 0, 'average_rating': 0.0, 'sentiment_score': 0.0, 'recent_trend': 'stable',
+                'trend_difference': 0.0, 'confidence_score': 0.0, 'platform_breakdown': {}}
+    sentiment = np.asarray(sentiments, dtype=np.float64)
+    rating = np.array([math.nan if r is None else r for r in ratings], dtype=np.float64)
+    seconds = np.array([t.timestamp() for t in timestamps], dtype=np.float64)
+    names, counts = np.unique(np.asarray(platforms, dtype=object).astype(str), return_counts=True)
+
+    rated = ~np.isnan(rating)
+    average_rating = float(rating[rated].mean()) if rated.any() else 0.0
+
+    difference = 0.0
+    trend = 'stable'
+    if n >= 4:
+        ordered = sentiment[np.argsort(seconds, kind='stable')]
+        mid = n // 2
+        difference = float(ordered[mid:].mean() - ordered[:mid].mean())
+        if difference > TREND_THRESHOLD:
+            trend = 'improving'
+        elif difference < -TREND_THRESHOLD:
+            trend = 'declining'
+
+    now_seconds = (now or datetime.now()).timestamp()
+    age_days = np.floor((now_seconds - seconds) / 86400.0)
+    volume_factor = min(n / 50.0, 1.0)
+    recency_factor = float(np.count_nonzero(age_days <= RECENT_DAYS)) / n
+    diversity_factor = min(len(names) / 3.0, 1.0)
+    confidence = min(volume_factor * 0.4 + recency_factor * 0.4 + diversity_factor * 0.2, 1.0)
+
+    return {
+        'count': n,
+        'average_rating': average_rating,
+        'sentiment_score': float(sentiment.mean()),
+        'recent_trend': trend,
+        'trend_difference': difference,
+        'confidence_score': confidence,
+        'platform_breakdown': {str(name): int(count) for name, count in zip(names, counts)},
+    }
+
+
+class FeedbackAggregateCache:
+    """Thread-safe, TTL-bounded cache of per-organization feedback summaries"""
+
+    def __init__(self, ttl_seconds: float = 3600.0, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(organization_name: str, location: str = "") -> str:
+        return f"{normalize_org_key(organization_name)}|{(location or '').strip().lower()}"
+
+    def get(self, organization_name: str, location: str = "") -> Optional[Any]:
+        key = self.key(organization_name, location)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, organization_name: str, location: str, value: Any) -> None:
+        with self._lock:
+            self._entries[self.key(organization_name, location)] = (time.monotonic(), value)
+            self._entries.move_to_end(self.key(organization_name, location))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, organization_name: Optional[str] = None) -> None:
+        """Drop one organization's entries (all locations), or everything"""
+        with self._lock:
+            if organization_name is None:
+                self._entries.clear()
+                return
+            prefix = normalize_org_key(organization_name) + '|'
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
@@ -9,6 +9,9 @@ Notes:
 - Overpass data is ODbL licensed; we store provenance in metadata.
 - We limit per-country results to avoid rate limits and excessive payloads.
 - Output format aligns with global_database_integrator.py expectations.
+- main() runs a concurrent, resumable per-country sync
+  (external_dataset_sync.OSMHospitalSync) that only rewrites the output file
+  when records changed.
 """
 
 import json
@@ -16,7 +19,7 @@ import os
 import urllib.request
 import urllib.parse
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 OVERPASS_URL = "https://overpass-api.de/api/interpreter"
 
@@ -27,21 +30,50 @@ COUNTRIES = [
 ]
 
 
-def build_query(country_name: str, limit: int = 500) -> str:
+def build_query(country_name: str, limit: int = 500, timeout: int = 60) -> str:
     # Query area by country name, fetch nodes/ways/relations with amenity=hospital
-    # Limit output to given number to be polite to Overpass
+    # Limit output to given number to be polite to Overpass (None returns every element)
+    limit_clause = f" {limit}" if limit else ""
     return f"""
-    [out:json][timeout:60];
+    [out:json][timeout:{timeout}];
     area["name"="{country_name}"];
     (
       node["amenity"="hospital"](area);
       way["amenity"="hospital"](area);
       rel["amenity"="hospital"](area);
     );
-    out center {limit};
+    out center{limit_clause};
     """
 
 
+def parse_osm_element(el: Dict[str, Any], country_name: str) -> Optional[Dict[str, Any]]:
+    """Convert one Overpass element into an external organization record (None if unnamed)"""
+    tags = el.get("tags", {})
+    name = tags.get("name")
+    if not name:
+        return None
+    city = tags.get("addr:city") or tags.get("is_in:city")
+    state = tags.get("addr:state") or tags.get("is_in:state")
+    country = tags.get("addr:country") or country_name
+    lat = el.get("lat") or (el.get("center", {}).get("lat"))
+    lon = el.get("lon") or (el.get("center", {}).get("lon"))
+
+    record = {
+        "name": name,
+        "city": city,
+        "state": state,
+        "country": country,
+        "lat": lat,
+        "lon": lon,
+        "hospital_type": None,
+        "certifications": [],
+    }
+    if el.get("type") and el.get("id") is not None:
+        # Stable identity (e.g. osm:way/1234) used for incremental syncs
+        record["source_id"] = f"osm:{el['type']}/{el['id']}"
+    return record
+
+
 def fetch_country(country_name: str, limit: int = 500) -> List[Dict[str, Any]]:
     q = build_query(country_name, limit)
     data = urllib.parse.urlencode({"data": q}).encode("utf-8")
@@ -53,26 +85,9 @@ def fetch_country(country_name: str, limit: int = 500) -> List[Dict[str, Any]]:
         with urllib.request.urlopen(req, timeout=90) as resp:
             payload = json.loads(resp.read().decode("utf-8"))
             for el in payload.get("elements", []):
-                tags = el.get("tags", {})
-                name = tags.get("name")
-                if not name:
-                    continue
-                city = tags.get("addr:city") or tags.get("is_in:city")
-                state = tags.get("addr:state") or tags.get("is_in:state")
-                country = tags.get("addr:country") or country_name
-                lat = el.get("lat") or (el.get("center", {}).get("lat"))
-                lon = el.get("lon") or (el.get("center", {}).get("lon"))
-
-                records.append({
-                    "name": name,
-                    "city": city,
-                    "state": state,
-                    "country": country,
-                    "lat": lat,
-                    "lon": lon,
-                    "hospital_type": None,
-                    "certifications": [],
-                })
+                record = parse_osm_element(el, country_name)
+                if record:
+                    records.append(record)
     except Exception as e:
         print(f"❌ OSM fetch failed for {country_name}: {e}")
     print(f"✅ OSM hospitals fetched for {country_name}: {len(records)}")
@@ -97,12 +112,19 @@ def save_external_dataset(filename: str, records: List[Dict[str, Any]], source_n
 
 
 def main():
-    all_records: List[Dict[str, Any]] = []
-    for country in COUNTRIES:
-        recs = fetch_country(country, limit=400)
-        all_records.extend(recs)
-    save_external_dataset("osm_hospitals_sample.json", all_records, "OpenStreetMap Overpass")
-    print("OSM dataset fetching completed.")
+    import argparse
+    from external_dataset_sync import OSMHospitalSync
+
+    parser = argparse.ArgumentParser(description="Sync OpenStreetMap hospitals into external_organizations/")
+    parser.add_argument("--limit", type=int, default=400, help="Per-country element limit (0 for all)")
+    parser.add_argument("--workers", type=int, default=4, help="Countries fetched concurrently")
+    parser.add_argument("--no-resume", action="store_true", help="Discard an interrupted run's checkpoint")
+    parser.add_argument("countries", nargs="*", help="Countries to sync (default: COUNTRIES)")
+    args = parser.parse_args()
+
+    sync = OSMHospitalSync(countries=args.countries or COUNTRIES, limit=args.limit or None)
+    stats = sync.run(workers=args.workers, resume=not args.no_resume)
+    print(f"OSM dataset sync completed: {stats}")
 
 
 if __name__ == "__main__":
@@ -11,7 +11,8 @@ Outputs:
 
 Notes:
 - Designed to be ingested by global_database_integrator.py.
-- Safe to run multiple times; will overwrite the output file.
+- main() runs a paginated, resumable sync (external_dataset_sync.WikidataHospitalSync)
+  that only rewrites the output file when records changed.
 """
 
 import json
@@ -27,6 +28,7 @@ WIKIDATA_SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
 def _wikidata_query(limit: int = 5000, offset: int = 0) -> str:
     # Hospitals: instance of hospital (Q16917)
     # Fetch label, country label, coordinates, website if available
+    # ORDER BY ?item keeps pages stable so OFFSET pagination neither skips nor repeats rows
     return f"""
     SELECT ?item ?itemLabel ?countryLabel ?coord ?website WHERE {{
       ?item wdt:P31 wd:Q16917 .
@@ -35,11 +37,46 @@ def _wikidata_query(limit: int = 5000, offset: int = 0) -> str:
       OPTIONAL {{ ?item wdt:P856 ?website }}
       SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
     }}
+    ORDER BY ?item
     LIMIT {limit}
     OFFSET {offset}
     """
 
 
+def parse_wikidata_binding(b: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one SPARQL result binding into an external organization record"""
+    name = b.get("itemLabel", {}).get("value")
+    country = b.get("countryLabel", {}).get("value")
+    coord = b.get("coord", {}).get("value")
+    website = b.get("website", {}).get("value")
+    item = b.get("item", {}).get("value")
+
+    lat = lon = None
+    if coord and coord.startswith("Point("):
+        try:
+            # WKT Point(lon lat)
+            inner = coord[len("Point("):-1]
+            parts = inner.split(" ")
+            lon = float(parts[0])
+            lat = float(parts[1])
+        except Exception:
+            lat = lon = None
+
+    record = {
+        "name": name,
+        "country": country,
+        "lat": lat,
+        "lon": lon,
+        "website": website,
+        "hospital_type": None,
+        "certifications": [],
+    }
+    if item:
+        # Stable identity (e.g. wikidata:Q1234) used for incremental syncs
+        record["source_id"] = "wikidata:" + item.rsplit("/", 1)[-1]
+    return record
+
+
 def fetch_wikidata_hospitals(max_records: int = 5000) -> List[Dict[str, Any]]:
     records: List[Dict[str, Any]] = []
     limit = min(5000, max_records)
@@ -59,31 +96,7 @@ def fetch_wikidata_hospitals(max_records: int = 5000) -> List[Dict[str, Any]]:
         with urllib.request.urlopen(req, timeout=60) as resp:
             data = json.loads(resp.read().decode("utf-8"))
             for b in data.get("results", {}).get("bindings", []):
-                name = b.get("itemLabel", {}).get("value")
-                country = b.get("countryLabel", {}).get("value")
-                coord = b.get("coord", {}).get("value")
-                website = b.get("website", {}).get("value")
-
-                lat = lon = None
-                if coord and coord.startswith("Point("):
-                    try:
-                        # WKT Point(lon lat)
-                        inner = coord[len("Point("):-1]
-                        parts = inner.split(" ")
-                        lon = float(parts[0])
-                        lat = float(parts[1])
-                    except Exception:
-                        lat = lon = None
-
-                records.append({
-                    "name": name,
-                    "country": country,
-                    "lat": lat,
-                    "lon": lon,
-                    "website": website,
-                    "hospital_type": None,
-                    "certifications": [],
-                })
+                records.append(parse_wikidata_binding(b))
     except Exception as e:
         print(f"❌ Error fetching Wikidata hospitals: {e}")
 
@@ -109,9 +122,19 @@ def save_external_dataset(filename: str, records: List[Dict[str, Any]], source_n
 
 
 def main():
-    records = fetch_wikidata_hospitals(max_records=3000)
-    save_external_dataset("wikidata_hospitals.json", records, "Wikidata Hospitals SPARQL")
-    print("Public-domain dataset fetching completed.")
+    import argparse
+    from external_dataset_sync import WikidataHospitalSync
+
+    parser = argparse.ArgumentParser(description="Sync Wikidata hospitals into external_organizations/")
+    parser.add_argument("--max-records", type=int, default=None, help="Stop after this many rows (default: all)")
+    parser.add_argument("--page-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--no-resume", action="store_true", help="Discard an interrupted run's checkpoint")
+    args = parser.parse_args()
+
+    sync = WikidataHospitalSync(page_size=args.page_size, max_records=args.max_records)
+    stats = sync.run(workers=args.workers, resume=not args.no_resume)
+    print(f"Public-domain dataset sync completed: {stats}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+"""
+Geospatial Index for QuXAT Healthcare Quality Grid
+Nearby-peer lookups over organization coordinates (lat/lon captured by
+fetch_public_domain_datasets.py and fetch_osm_hospitals.py).
+
+Organizations are bucketed into fixed-size latitude/longitude grid cells when
+the index is built. Radius queries only compute haversine distances for the
+cells overlapping the query's bounding box; k-nearest queries expand the
+radius until k organizations are found. Scores from the batch scoring run are
+attached to each entry so a lookup never has to re-search an organization.
+"""
+
+import math
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from score_history_store import normalize_org_key
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.195
+# Half the earth's circumference: every point is within this distance
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+SCORE_FIELDS = ('total_score', 'overall_rank', 'percentile', 'score_breakdown')
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from one point to arrays of points (degrees)"""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _coordinates(org: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Valid (lat, lon) of an organization record, or None"""
+    lat = org.get('lat', org.get('latitude'))
+    lon = org.get('lon', org.get('longitude'))
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0) or math.isnan(lat) or math.isnan(lon):
+        return None
+    return lat, lon
+
+
+class GeoIndex:
+    """Grid-bucketed spatial index with k-nearest and radius queries"""
+
+    def __init__(self, organizations: Iterable[Dict[str, Any]], cell_degrees: float = 1.0,
+                 scores: Optional[Dict[str, Dict[str, Any]]] = None,
+                 scorer: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+        """
+        Args:
+            organizations: Organization records; those without valid coordinates are skipped
+            cell_degrees: Grid cell size in degrees
+            scores: Precomputed scores keyed by normalize_org_key(name) (e.g. batch scoring output)
+            scorer: Fallback for organizations without a precomputed score; called at most
+                once per organization and the result is kept on the entry
+        """
+        self.cell_degrees = float(cell_degrees)
+        self.scorer = scorer
+        self.entries: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, int] = {}
+        lats, lons = [], []
+        for org in organizations:
+            if not isinstance(org, dict):
+                continue
+            coords = _coordinates(org)
+            if coords is None:
+                continue
+            key = normalize_org_key(org.get('name', ''))
+            entry = {
+                'name': org.get('name', ''),
+                'city': org.get('city'),
+                'state': org.get('state'),
+                'country': org.get('country'),
+                'hospital_type': org.get('hospital_type'),
+                'lat': coords[0],
+                'lon': coords[1],
+                'record': org,
+                '_key': key,
+            }
+            precomputed = (scores or {}).get(key)
+            if precomputed:
+                entry.update({field: precomputed.get(field) for field in SCORE_FIELDS})
+            self._by_name.setdefault(key, len(self.entries))
+            self.entries.append(entry)
+            lats.append(coords[0])
+            lons.append(coords[1])
+
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+
+        # Grid buckets: (lat cell, lon cell) -> entry indices
+        buckets = defaultdict(list)
+        for i, (lat, lon) in enumerate(zip(lats, lons)):
+            buckets[self._cell(lat, lon)].append(i)
+        self._buckets = {cell: np.asarray(ids, dtype=np.int64) for cell, ids in buckets.items()}
+        self._lon_cells = int(math.ceil(360.0 / self.cell_degrees))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor((lat + 90.0) / self.cell_degrees)), int(math.floor((lon + 180.0) / self.cell_degrees))
+
+    def locate(self, org_name: str) -> Optional[Tuple[float, float]]:
+        """Coordinates of an indexed organization by name"""
+        index = self._by_name.get(normalize_org_key(org_name))
+        if index is None:
+            return None
+        return self.entries[index]['lat'], self.entries[index]['lon']
+
+    def _candidate_indices(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Entries in grid cells overlapping the query's bounding box"""
+        if radius_km >= MAX_DISTANCE_KM / 2 or not self._buckets:
+            return np.arange(len(self.entries))
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        lat_lo, lat_hi = max(-90.0, lat - lat_span), min(90.0, lat + lat_span)
+        # Longitude degrees shrink towards the poles; use the widest latitude in the box
+        widest = max(abs(lat_lo), abs(lat_hi))
+        cos_lat = math.cos(math.radians(widest))
+        if widest >= 89.9 or radius_km / (KM_PER_DEGREE_LAT * cos_lat) >= 180.0:
+            lon_cells = range(self._lon_cells)
+        else:
+            lon_span = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+            first = int(math.floor((lon - lon_span + 180.0) / self.cell_degrees))
+            last = int(math.floor((lon + lon_span + 180.0) / self.cell_degrees))
+            lon_cells = {cell % self._lon_cells for cell in range(first, last + 1)}
+        first_lat = int(math.floor((lat_lo + 90.0) / self.cell_degrees))
+        last_lat = int(math.floor((lat_hi + 90.0) / self.cell_degrees))
+
+        found = [self._buckets[(lat_cell, lon_cell)]
+                 for lat_cell in range(first_lat, last_lat + 1)
+                 for lon_cell in lon_cells
+                 if (lat_cell, lon_cell) in self._buckets]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def _with_score(self, index: int) -> Dict[str, Any]:
+        entry = self.entries[index]
+        if entry.get('total_score') is None and self.scorer is not None and not entry.get('_scored'):
+            try:
+                entry.update({field: value for field, value in (self.scorer(entry['record']) or {}).items()
+                              if field in SCORE_FIELDS})
+            except Exception:
+                pass
+            entry['_scored'] = True
+        return entry
+
+    def _results(self, indices: np.ndarray, distances: np.ndarray, limit: Optional[int],
+                 exclude_name: Optional[str]) -> List[Dict[str, Any]]:
+        order = np.argsort(distances, kind='stable')
+        exclude_key = normalize_org_key(exclude_name) if exclude_name else None
+        results = []
+        for pos in order:
+            index = int(indices[pos])
+            if exclude_key and self.entries[index]['_key'] == exclude_key:
+                continue
+            entry = self._with_score(index)
+            result = {k: v for k, v in entry.items() if not k.startswith('_')}
+            result['distance_km'] = round(float(distances[pos]), 3)
+            results.append(result)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def within_radius(self, lat: float, lon: float, radius_km: float, limit: Optional[int] = None,
+                      exclude_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Organizations within radius_km of a point, nearest first"""
+        indices = self._candidate_indices(lat, lon, radius_km)
+        if len(indices) == 0:
+            return []
+        distances = haversine_km(lat, lon, self.lats[indices], self.lons[indices])
+        mask = distances <= radius_km
+        return self._results(indices[mask], distances[mask], limit, exclude_name)
+
+    def nearest(self, lat: float, lon: float, k: int = 8, max_radius_km: Optional[float] = None,
+                exclude_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The k organizations closest to a point, nearest first"""
+        if not self.entries or k <= 0:
+            return []
+        limit_km = min(max_radius_km, MAX_DISTANCE_KM) if max_radius_km is not None else MAX_DISTANCE_KM
+        # One extra slot in case the excluded organization is among the nearest
+        wanted = k + (1 if exclude_name else 0)
+        radius_km = min(self.cell_degrees * KM_PER_DEGREE_LAT, limit_km)
+        while True:
+            indices = self._candidate_indices(lat, lon, radius_km)
+            distances = haversine_km(lat, lon, self.lats[indices], self.lons[indices])
+            mask = distances <= radius_km
+            # Every point within radius_km is a candidate, so the k nearest are final once found
+            if mask.sum() >= wanted or radius_km >= limit_km:
+                return self._results(indices[mask], distances[mask], k, exclude_name)
+            radius_km = min(radius_km * 2, limit_km)
+
+    def nearest_to(self, org_name: str, k: int = 8, max_radius_km: Optional[float] = None) -> List[Dict[str, Any]]:
+        """The k organizations closest to an indexed organization (excluding itself)"""
+        coords = self.locate(org_name)
+        if coords is None:
+            return []
+        return self.nearest(coords[0], coords[1], k=k, max_radius_km=max_radius_km, exclude_name=org_name)
@@ -11,11 +11,12 @@ Design goals:
 """
 
 import json
-import csv
 import os
 import re
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from streaming_loader import LoadStats, iter_dataset_records, list_dataset_files
 
 
 class GlobalDatabaseIntegrator:
@@ -40,6 +41,8 @@ class GlobalDatabaseIntegrator:
 
         # JCI index for validation
         self.jci_index = set()
+        # Throughput of the last external source scan (rows/sec etc.)
+        self.load_stats: Optional[LoadStats] = None
 
     # ------------------------
     # Loading helpers
@@ -81,32 +84,37 @@ class GlobalDatabaseIntegrator:
         except FileNotFoundError:
             self.jci_index = set()
 
+    def iter_external_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream (source_name, standardized record) pairs from files in sources_dir, one record at a time."""
+        self.load_stats = stats = LoadStats()
+        self.stats["external_sources_found"] = 0
+        self.stats["records_loaded_from_sources"] = 0
+        for path in list_dataset_files(self.sources_dir):
+            entry = os.path.basename(path)
+            stats.files += 1
+            try:
+                for item in iter_dataset_records(path, array_keys=('organizations', 'data'), single_object=False):
+                    stats.rows += 1
+                    record = self._standardize_external_record(item)
+                    if record is None:
+                        stats.skipped += 1
+                        continue
+                    self.stats["records_loaded_from_sources"] += 1
+                    yield entry, record
+            except Exception:
+                # Skip unreadable files, keep pipeline resilient
+                stats.failed_files.append(entry)
+                continue
+            self.stats["external_sources_found"] += 1
+        stats.finish()
+        self.stats["source_rows_per_sec"] = round(stats.rows_per_sec, 1)
+
     def scan_external_sources(self) -> List[Tuple[str, List[Dict[str, Any]]]]:
         """Return list of (source_name, records) parsed from files in sources_dir."""
-        sources: List[Tuple[str, List[Dict[str, Any]]]] = []
-        if not os.path.isdir(self.sources_dir):
-            return sources
-
-        for entry in os.listdir(self.sources_dir):
-            path = os.path.join(self.sources_dir, entry)
-            if os.path.isfile(path):
-                try:
-                    if entry.lower().endswith('.json'):
-                        with open(path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        records = self._standardize_external_records(data)
-                        sources.append((entry, records))
-                    elif entry.lower().endswith('.csv'):
-                        with open(path, 'r', encoding='utf-8') as f:
-                            reader = csv.DictReader(f)
-                            records = self._standardize_external_records(list(reader))
-                        sources.append((entry, records))
-                except Exception:
-                    # Skip unreadable files, keep pipeline resilient
-                    continue
-        self.stats["external_sources_found"] = len(sources)
-        self.stats["records_loaded_from_sources"] = sum(len(r) for _, r in sources)
-        return sources
+        sources: Dict[str, List[Dict[str, Any]]] = {}
+        for entry, record in self.iter_external_records():
+            sources.setdefault(entry, []).append(record)
+        return list(sources.items())
 
     # ------------------------
     # Normalization & Validation
@@ -228,45 +236,47 @@ class GlobalDatabaseIntegrator:
                 continue
             index.setdefault(norm, []).append(org)
 
-        # Load external sources
-        sources = self.scan_external_sources()
+        # Stream external sources record by record; the name index above is the
+        # single-pass dedup, so no source is ever held in memory as a whole
+        for source_name, rec in self.iter_external_records():
+            org_name = rec.get('name') or rec.get('organization_name')
+            if not org_name:
+                continue
+            norm_name = self._normalize_name(org_name)
+            incoming = self._to_unified_org(rec, source_name)
+
+            if norm_name in index:
+                # Merge into first existing entry under this name
+                target_org = index[norm_name][0]
+                before_certs = len(target_org.get('certifications', []))
+
+                # Merge certifications with validation
+                target_org['certifications'] = self._validate_and_merge_certifications(
+                    target_org.get('certifications', []), incoming.get('certifications', []), norm_name
+                )
+
+                # Merge other fields conservatively
+                for key in ['city', 'state', 'country', 'hospital_type', 'quality_indicators']:
+                    val = incoming.get(key)
+                    if val and not target_org.get(key):
+                        target_org[key] = val
+
+                # Update data_source provenance
+                ds = target_org.get('data_source', '')
+                if source_name not in (ds or ''):
+                    target_org['data_source'] = (ds + ", " + source_name).strip(', ')
+
+                after_certs = len(target_org.get('certifications', []))
+                self.stats["duplicates_merged"] += 1 if after_certs > before_certs else 0
+                self.stats["existing_organizations_updated"] += 1
+            else:
+                organizations.append(incoming)
+                index.setdefault(norm_name, []).append(incoming)
+                self.stats["new_organizations_added"] += 1
 
-        for source_name, records in sources:
-            for rec in records:
-                org_name = rec.get('name') or rec.get('organization_name')
-                if not org_name:
-                    continue
-                norm_name = self._normalize_name(org_name)
-                incoming = self._to_unified_org(rec, source_name)
-
-                if norm_name in index:
-                    # Merge into first existing entry under this name
-                    target_org = index[norm_name][0]
-                    before_certs = len(target_org.get('certifications', []))
-
-                    # Merge certifications with validation
-                    target_org['certifications'] = self._validate_and_merge_certifications(
-                        target_org.get('certifications', []), incoming.get('certifications', []), norm_name
-                    )
-
-                    # Merge other fields conservatively
-                    for key in ['city', 'state', 'country', 'hospital_type', 'quality_indicators']:
-                        val = incoming.get(key)
-                        if val and not target_org.get(key):
-                            target_org[key] = val
-
-                    # Update data_source provenance
-                    ds = target_org.get('data_source', '')
-                    if source_name not in (ds or ''):
-                        target_org['data_source'] = (ds + ", " + source_name).strip(', ')
-
-                    after_certs = len(target_org.get('certifications', []))
-                    self.stats["duplicates_merged"] += 1 if after_certs > before_certs else 0
-                    self.stats["existing_organizations_updated"] += 1
-                else:
-                    organizations.append(incoming)
-                    index.setdefault(norm_name, []).append(incoming)
-                    self.stats["new_organizations_added"] += 1
+        if self.load_stats:
+            self.load_stats.unique = self.stats["new_organizations_added"]
+            self.load_stats.duplicates = self.stats["existing_organizations_updated"]
 
         # Update metadata
         metadata['last_updated'] = datetime.now().isoformat()
@@ -313,31 +323,37 @@ class GlobalDatabaseIntegrator:
             iterable = []
 
         for item in iterable:
-            try:
-                name = item.get('name') or item.get('organization_name') or item.get('hospital_name')
-                city = item.get('city') or item.get('town')
-                state = item.get('state') or item.get('region')
-                country = item.get('country') or item.get('nation')
-                htype = item.get('hospital_type') or item.get('type')
-                certs = item.get('certifications') or []
-
-                # If certifications are strings, coerce to objects
-                if isinstance(certs, list) and certs and isinstance(certs[0], str):
-                    certs = [{"name": c, "type": self._identify_certification(c)} for c in certs]
-
-                records.append({
-                    "name": name,
-                    "city": city,
-                    "state": state,
-                    "country": country,
-                    "hospital_type": htype,
-                    "certifications": certs,
-                })
-            except Exception:
-                # Skip malformed entries
-                continue
+            record = self._standardize_external_record(item)
+            if record is not None:
+                records.append(record)
         return records
 
+    def _standardize_external_record(self, item: Any) -> Optional[Dict[str, Any]]:
+        """Standardize one external record (None for malformed entries)."""
+        try:
+            name = item.get('name') or item.get('organization_name') or item.get('hospital_name')
+            city = item.get('city') or item.get('town')
+            state = item.get('state') or item.get('region')
+            country = item.get('country') or item.get('nation')
+            htype = item.get('hospital_type') or item.get('type')
+            certs = item.get('certifications') or []
+
+            # If certifications are strings, coerce to objects
+            if isinstance(certs, list) and certs and isinstance(certs[0], str):
+                certs = [{"name": c, "type": self._identify_certification(c)} for c in certs]
+
+            return {
+                "name": name,
+                "city": city,
+                "state": state,
+                "country": country,
+                "hospital_type": htype,
+                "certifications": certs,
+            }
+        except Exception:
+            # Skip malformed entries
+            return None
+
     def _to_unified_org(self, rec: Dict[str, Any], source_name: str) -> Dict[str, Any]:
         name = rec.get('name') or rec.get('organization_name')
         org = {
@@ -371,6 +387,8 @@ def main():
     print("Organizations loaded:", integrator.stats["existing_organizations_loaded"])
     print("External sources:", integrator.stats["external_sources_found"],
           "records:", integrator.stats["records_loaded_from_sources"]) 
+    if integrator.load_stats:
+        print("Source streaming:", integrator.load_stats.summary())
     print("New added:", integrator.stats["new_organizations_added"],
           "updated:", integrator.stats["existing_organizations_updated"],
           "duplicates merged:", integrator.stats["duplicates_merged"]) 
@@ -0,0 +1,427 @@
+"""
+Headless JSON API for QuXAT Healthcare Quality Grid
+Search, scoring and ranking over HTTP without a browser session, served from
+the same analyzer (and indexes) as the Streamlit app.
+
+    GET  /v1/health
+    GET  /v1/suggestions?q=apollo&limit=10
+    GET  /v1/organizations/{name}
+    GET  /v1/organizations/{name}/score
+    GET  /v1/organizations/{name}/rank
+    POST /v1/scores/batch            {"names": ["...", ...]}
+
+The app is a plain ASGI callable (no web framework). Handlers run on a
+thread pool; identical requests that arrive while one is being computed wait
+for that computation instead of starting their own. Responses carry an ETag
+derived from the data version and the body, are kept in a bounded LRU for
+the current data version, and If-None-Match revalidations get 304 without
+recomputing.
+
+Organizations are found by normalized name through an index over the
+unified database; single lookups fall back to the app's fuzzy database
+search, batch lookups use exact names only. Ranks come from the precomputed
+batch rankings when available and from a sorted table of all scores
+otherwise (scored by the scoring backend when one is configured, see
+scoring_backend.py).
+
+Serving (needs an ASGI server, e.g. pip install uvicorn):
+
+    python headless_api.py --port 8600 --workers 2
+    uvicorn headless_api:create_app --factory --port 8600
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import numpy as np
+
+from score_history_store import normalize_org_key
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_NAMES = 1000
+MAX_SUGGESTIONS = 50
+
+
+class ApiError(Exception):
+    """An error answered with an HTTP status and a JSON message"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class SearchCore:
+    """Name index, score memo and ranking table over one analyzer, rebuilt when its database is reloaded"""
+
+    def __init__(self, analyzer: Any):
+        self.analyzer = analyzer
+        self.generation = 0
+        self._source = None
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._scores: Dict[str, Dict[str, Any]] = {}
+        self._ranking_table: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+
+    def refresh(self) -> int:
+        """Reload the analyzer's data if its version changed; returns the index generation"""
+        if hasattr(self.analyzer, '_manifest_version'):
+            self.analyzer.refresh_if_data_changed()
+        with self._lock:
+            if self._source is not self.analyzer.unified_database:
+                index = {}
+                for org in self.analyzer.unified_database or []:
+                    if isinstance(org, dict) and org.get('name'):
+                        index.setdefault(normalize_org_key(org['name']), org)
+                self._index = index
+                self._scores = {}
+                self._ranking_table = None
+                self._source = self.analyzer.unified_database
+                self.generation += 1
+            return self.generation
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def find(self, name: str, fuzzy: bool = True) -> Optional[Dict[str, Any]]:
+        """Database record by normalized name (first in database order), else the app's fuzzy search"""
+        record = self._index.get(normalize_org_key(name))
+        if record is None and fuzzy:
+            record = self.analyzer.search_unified_database(name)
+        return record
+
+    def score(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """{'total_score', 'score_breakdown'} from the record's stored certifications
+
+        Memoized for indexed records; records assembled by the fuzzy search are scored each time.
+        """
+        key = normalize_org_key(record.get('name', ''))
+        if self._index.get(key) is not record:
+            return self.analyzer._score_unified_record(record)
+        with self._lock:
+            cached = self._scores.get(key)
+        if cached is None:
+            cached = self.analyzer._score_unified_record(record)
+            with self._lock:
+                self._scores[key] = cached
+        return cached
+
+    def ranking_table(self) -> np.ndarray:
+        """Total scores of every organization, ascending"""
+        with self._lock:
+            if self._ranking_table is None:
+                scores = [entry['total_score'] for entry in self.analyzer._ranking_entries()]
+                self._ranking_table = np.sort(np.asarray(scores, dtype=float))
+            return self._ranking_table
+
+    def rank(self, name: str, record: Optional[Dict[str, Any]] = None, fuzzy: bool = True) -> Optional[Dict[str, Any]]:
+        """Overall rank and percentile; precomputed batch ranks take precedence"""
+        entry = self.analyzer.scored_index.get(self.analyzer._normalize_name(name))
+        if isinstance(entry, dict) and isinstance(entry.get('overall_rank'), int) and entry['overall_rank'] > 0:
+            try:
+                percentile = float(entry.get('percentile', 0))
+            except (TypeError, ValueError):
+                percentile = 0.0
+            return {'name': entry.get('name', name), 'total_score': entry.get('total_score', 0),
+                    'overall_rank': entry['overall_rank'], 'total_organizations': len(self.analyzer.scored_entries),
+                    'percentile': percentile, 'source': 'precomputed'}
+
+        record = record or self.find(name, fuzzy)
+        if record is None:
+            return None
+        total_score = self.score(record)['total_score']
+        table = self.ranking_table()
+        total = len(table)
+        if not total:
+            return None
+        rank = int(total - np.searchsorted(table, total_score, side='right')) + 1
+        # Same formula as the percentile rankings: the top organization is at 100
+        return {'name': record.get('name', name), 'total_score': total_score, 'overall_rank': rank,
+                'total_organizations': total, 'percentile': (total - min(rank, total) + 1) / total * 100,
+                'source': 'computed'}
+
+
+class HeadlessAPI:
+    """ASGI application serving the JSON endpoints"""
+
+    def __init__(self, analyzer: Any = None, version_func: Optional[Callable[[], Hashable]] = None,
+                 max_cached_responses: int = 2048):
+        """
+        Args:
+            analyzer: HealthcareOrgAnalyzer to serve (created on first use if omitted)
+            version_func: Data-version stamp (defaults to the analyzer's search cache version)
+            max_cached_responses: Responses kept for ETag revalidation and repeat requests
+        """
+        self._analyzer = analyzer
+        self._version_func = version_func
+        self._core: Optional[SearchCore] = None
+        self._core_lock = threading.Lock()
+        self.max_cached_responses = max_cached_responses
+        self._responses: 'OrderedDict[Tuple, Tuple[Hashable, str, bytes]]' = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self.stats = {'requests': 0, 'computed': 0, 'cache_hits': 0, 'not_modified': 0, 'coalesced': 0, 'errors': 0}
+        self.routes: List[Tuple[str, 're.Pattern', Callable, bool]] = [
+            ('GET', re.compile(r'/v1/health$'), self.health, False),
+            ('GET', re.compile(r'/v1/suggestions$'), self.suggestions, True),
+            ('GET', re.compile(r'/v1/organizations/(?P<name>[^/]+)$'), self.organization, True),
+            ('GET', re.compile(r'/v1/organizations/(?P<name>[^/]+)/score$'), self.organization_score, True),
+            ('GET', re.compile(r'/v1/organizations/(?P<name>[^/]+)/rank$'), self.organization_rank, True),
+            ('POST', re.compile(r'/v1/scores/batch$'), self.batch_scores, True),
+        ]
+
+    @property
+    def core(self) -> SearchCore:
+        with self._core_lock:
+            if self._core is None:
+                if self._analyzer is None:
+                    from streamlit_app import HealthcareOrgAnalyzer
+                    self._analyzer = HealthcareOrgAnalyzer()
+                self._core = SearchCore(self._analyzer)
+            return self._core
+
+    def data_version(self) -> Hashable:
+        """Version stamp of the served data: the dataset version plus the index generation"""
+        generation = self.core.refresh()
+        if self._version_func is not None:
+            return (self._version_func(), generation)
+        return (self._analyzer.get_search_result_cache().version_func(), generation)
+
+    # Endpoints: (path parameters, query, body) -> JSON-serializable payload
+
+    def health(self, params, query, body):
+        return {'status': 'ok', 'organizations': len(self.core), 'stats': dict(self.stats),
+                'cached_responses': len(self._responses)}
+
+    def suggestions(self, params, query, body):
+        text = query.get('q', '')
+        limit = _int_param(query, 'limit', 10, 1, MAX_SUGGESTIONS)
+        return {'query': text, 'suggestions': self.core.analyzer.generate_organization_suggestions(text, limit)}
+
+    def _require(self, name: str) -> Dict[str, Any]:
+        record = self.core.find(name)
+        if record is None:
+            raise ApiError(404, f"Organization not found: {name}")
+        return record
+
+    def organization(self, params, query, body):
+        return {'organization': self._require(params['name'])}
+
+    def organization_score(self, params, query, body):
+        record = self._require(params['name'])
+        score = self.core.score(record)
+        return {'name': record.get('name', params['name']), 'total_score': score['total_score'],
+                'score_breakdown': score['score_breakdown']}
+
+    def organization_rank(self, params, query, body):
+        rank = self.core.rank(params['name'])
+        if rank is None:
+            raise ApiError(404, f"Organization not found: {params['name']}")
+        return rank
+
+    def batch_scores(self, params, query, body):
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            raise ApiError(400, "Request body must be JSON") from None
+        names = request.get('names') if isinstance(request, dict) else None
+        if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+            raise ApiError(400, "Expected {\"names\": [<organization name>, ...]}")
+        if len(names) > MAX_BATCH_NAMES:
+            raise ApiError(413, f"At most {MAX_BATCH_NAMES} names per batch")
+        include_breakdown = bool(request.get('include_breakdown', False))
+
+        core = self.core
+        results = []
+        for name in names:
+            record = core.find(name, fuzzy=False)
+            if record is None:
+                results.append({'name': name, 'found': False})
+                continue
+            score = core.score(record)
+            result = {'name': name, 'found': True, 'matched_name': record.get('name', name)}
+            result.update(core.rank(name, record) or {'total_score': score['total_score']})
+            result['name'] = name
+            if include_breakdown:
+                result['score_breakdown'] = score['score_breakdown']
+            results.append(result)
+        return {'count': len(results), 'found': sum(1 for r in results if r['found']), 'results': results}
+
+    # ASGI plumbing
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        self.stats['requests'] += 1
+        try:
+            handler, params, cacheable = self._route(scope['method'], scope['path'])
+            body = await _read_body(receive)
+            query = {k: v[0] for k, v in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()}
+            if not cacheable:
+                payload = await asyncio.get_running_loop().run_in_executor(None, handler, params, query, body)
+                await _send(send, 200, _encode(payload))
+                return
+
+            version = await asyncio.get_running_loop().run_in_executor(None, self.data_version)
+            key = (scope['method'], scope['path'], scope.get('query_string', b''), hashlib.sha256(body).digest())
+            cached = self._cached_response(key, version)
+            if cached is None:
+                cached = await self._coalesced(key, version, lambda: self._compute(version, handler, params, query, body))
+            else:
+                self.stats['cache_hits'] += 1
+            etag, payload = cached
+            if etag in _header_values(scope, b'if-none-match'):
+                self.stats['not_modified'] += 1
+                await _send(send, 304, b'', etag)
+            else:
+                await _send(send, 200, payload, etag)
+        except ApiError as e:
+            self.stats['errors'] += 1
+            await _send(send, e.status, _encode({'error': e.message}))
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.exception(f"Request {scope.get('method')} {scope.get('path')} failed")
+            await _send(send, 500, _encode({'error': f"Internal error: {type(e).__name__}"}))
+
+    def _route(self, method: str, path: str) -> Tuple[Callable, Dict[str, str], bool]:
+        allowed = False
+        for route_method, pattern, handler, cacheable in self.routes:
+            match = pattern.match(path)
+            if match:
+                if route_method == method:
+                    return handler, match.groupdict(), cacheable
+                allowed = True
+        if allowed:
+            raise ApiError(405, f"Method {method} not allowed for {path}")
+        raise ApiError(404, f"No such endpoint: {path}")
+
+    def _cached_response(self, key: Tuple, version: Hashable) -> Optional[Tuple[str, bytes]]:
+        entry = self._responses.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        self._responses.move_to_end(key)
+        return entry[1], entry[2]
+
+    def _compute(self, version, handler, params, query, body) -> Tuple[str, bytes]:
+        payload = _encode(handler(params, query, body))
+        digest = hashlib.sha256(repr(version).encode('utf-8') + payload).hexdigest()[:32]
+        return f'"{digest}"', payload
+
+    async def _coalesced(self, key: Tuple, version: Hashable, compute: Callable[[], Tuple[str, bytes]]
+                         ) -> Tuple[str, bytes]:
+        """Run compute on the thread pool once for all concurrent identical requests"""
+        flight = (key, version)
+        future = self._inflight.get(flight)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().run_in_executor(None, compute)
+        self._inflight[flight] = future
+        try:
+            etag, payload = await asyncio.shield(future)
+        finally:
+            if self._inflight.get(flight) is future:
+                del self._inflight[flight]
+        self.stats['computed'] += 1
+        self._responses[key] = (version, etag, payload)
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.max_cached_responses:
+            self._responses.popitem(last=False)
+        return etag, payload
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    # Load the analyzer before taking traffic
+                    await asyncio.get_running_loop().run_in_executor(None, self.data_version)
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def _int_param(query: Dict[str, str], name: str, default: int, low: int, high: int) -> int:
+    if name not in query:
+        return default
+    try:
+        value = int(query[name])
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer") from None
+    return max(low, min(high, value))
+
+
+def _encode(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _header_values(scope, name: bytes) -> List[str]:
+    values = []
+    for key, value in scope.get('headers', []):
+        if key.lower() == name:
+            values.extend(v.strip() for v in value.decode('latin-1').split(','))
+    return values
+
+
+async def _read_body(receive: Callable[[], Awaitable[Dict]]) -> bytes:
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise ApiError(413, "Request body too large")
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            break
+    return b''.join(chunks)
+
+
+async def _send(send, status: int, payload: bytes, etag: Optional[str] = None) -> None:
+    headers = [(b'content-type', b'application/json; charset=utf-8'), (b'content-length', str(len(payload)).encode())]
+    if etag:
+        headers += [(b'etag', etag.encode('latin-1')), (b'cache-control', b'no-cache')]
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': payload})
+
+
+def create_app() -> HeadlessAPI:
+    """ASGI application factory (one analyzer per server worker)"""
+    return HeadlessAPI()
+
+
+def main():
+    """Serve the API with uvicorn"""
+    parser = argparse.ArgumentParser(description='Serve the QuXAT headless JSON API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("An ASGI server is required to serve the API: pip install uvicorn")
+    uvicorn.run('headless_api:create_app', factory=True, host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+HTML Parsing for QuXAT Healthcare Quality Grid
+Shared parsing layer for the scrapers, the data validator and the official
+site lookups.
+
+- make_soup() builds BeautifulSoup trees with the lxml parser (html.parser
+  only when lxml is missing); pass only("table", ...) to build just the
+  parts of a page a scraper reads
+- parse_html() returns a plain lxml document for code that only needs text,
+  which skips building a BeautifulSoup tree altogether
+- KeywordMatcher finds any of a list of keywords in a single pass over the
+  page's text nodes instead of one full-tree search per keyword
+"""
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+
+try:
+    import lxml.etree
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+PARSER = "lxml" if LXML_AVAILABLE else "html.parser"
+# Text that BeautifulSoup's get_text() leaves out as well
+SKIPPED_TAGS = frozenset({"script", "style", "template"})
+
+Markup = Union[str, bytes]
+
+
+def make_soup(markup: Markup, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """BeautifulSoup tree built with the fastest available parser"""
+    return BeautifulSoup(markup, PARSER, parse_only=parse_only)
+
+
+def only(*tag_names: str) -> SoupStrainer:
+    """Strainer that keeps just the given tags (and everything inside them)"""
+    return SoupStrainer(list(tag_names))
+
+
+def parse_html(markup: Markup):
+    """lxml document for text-only work; a BeautifulSoup tree when lxml is unavailable or chokes"""
+    if LXML_AVAILABLE and markup:
+        try:
+            return lxml.html.document_fromstring(markup)
+        except (ValueError, lxml.etree.ParserError):
+            pass
+    return make_soup(markup or "")
+
+
+def _is_lxml(doc: Any) -> bool:
+    return LXML_AVAILABLE and isinstance(doc, lxml.etree._Element)
+
+
+def iter_text_nodes(doc: Any) -> Iterator[Tuple[str, Any]]:
+    """(text, containing element) for every text node in document order, outside script/style"""
+    if not _is_lxml(doc):
+        for string in doc.find_all(string=True):
+            parent = string.parent
+            # Comments, scripts and stylesheets are NavigableString subclasses
+            if type(string) is NavigableString and parent is not None and parent.name not in SKIPPED_TAGS:
+                yield str(string), parent
+        return
+
+    skipped_depth = 0
+    for event, element in lxml.etree.iterwalk(doc, events=("start", "end")):
+        is_tag = isinstance(element.tag, str)
+        if event == "start":
+            if is_tag and element.tag in SKIPPED_TAGS:
+                skipped_depth += 1
+            elif is_tag and not skipped_depth:
+                if element.text:
+                    yield element.text, element
+                if len(element) and not isinstance(element[0].tag, str):
+                    yield from _non_tag_tails(element[0], element)
+            continue
+        if is_tag and element.tag in SKIPPED_TAGS:
+            skipped_depth -= 1
+        # A tail is text of the parent that follows this element
+        parent = element.getparent()
+        if parent is not None and not skipped_depth:
+            if element.tail:
+                yield element.tail, parent
+            yield from _non_tag_tails(element.getnext(), parent)
+
+
+def _non_tag_tails(node: Any, parent: Any) -> Iterator[Tuple[str, Any]]:
+    """Tails of node and the comments/processing instructions right after it (iterwalk skips those)"""
+    while node is not None and not isinstance(node.tag, str):
+        if node.tail:
+            yield node.tail, parent
+        node = node.getnext()
+
+
+def node_text(element: Any) -> str:
+    """All text inside an element returned by iter_text_nodes()"""
+    if _is_lxml(element):
+        return element.text_content()
+    return element.get_text()
+
+
+def visible_text(markup_or_doc: Any, separator: str = " ") -> str:
+    """Equivalent of soup.get_text(separator, strip=True) without building a soup"""
+    doc = parse_html(markup_or_doc) if isinstance(markup_or_doc, (str, bytes)) else markup_or_doc
+    return separator.join(text.strip() for text, _ in iter_text_nodes(doc) if text.strip())
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive matcher for a fixed list of keywords
+
+    All keywords are compiled into one alternation, so a text is scanned once
+    no matter how many keywords there are. Overlapping keywords are all
+    reported.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(keywords))
+        self._canonical = {keyword.lower(): keyword for keyword in self.keywords}
+        # The longest keyword wins at a position; shorter keywords it starts with are implied
+        self._prefixes = {k: [self._canonical[p] for p in self._canonical if p != k and k.startswith(p)]
+                          for k in self._canonical}
+        alternation = "|".join(re.escape(k) for k in sorted(self._canonical, key=len, reverse=True))
+        # Text is lowercased once, which is cheaper than a case-insensitive pattern
+        self._any = re.compile(alternation)
+        # Zero-width lookahead: a match at one position does not hide keywords overlapping it
+        self.pattern = re.compile(f"(?=({alternation}))")
+
+    def find(self, text: str) -> List[str]:
+        """Keywords present in text, in order of first occurrence"""
+        lowered = text.lower()
+        # Most text nodes contain no keyword; rule them out with one plain search
+        if not self._any.search(lowered):
+            return []
+        found = {}
+        for match in self.pattern.finditer(lowered):
+            matched = match.group(1)
+            found.setdefault(self._canonical[matched], None)
+            for prefix in self._prefixes[matched]:
+                found.setdefault(prefix, None)
+        return list(found)
+
+    def scan(self, doc: Any, per_keyword: Optional[int] = None) -> Dict[str, List[Any]]:
+        """
+        Elements whose own text contains each keyword, from one walk over the document
+
+        Returns {keyword: [element, ...]} in keyword-list order with elements in
+        document order, keeping at most per_keyword elements per keyword.
+        """
+        matches: Dict[str, List[Any]] = {}
+        for text, element in iter_text_nodes(doc):
+            for keyword in self.find(text):
+                elements = matches.setdefault(keyword, [])
+                if per_keyword is None or len(elements) < per_keyword:
+                    elements.append(element)
+        return {keyword: matches[keyword] for keyword in self.keywords if keyword in matches}
@@ -5,7 +5,7 @@ import time
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Set
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import re
 import random
 
@@ -121,7 +121,7 @@ class ImprovedHospitalScraper:
                     
                     response = self.session.get(url, timeout=10)
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
+                        soup = make_soup(response.content)
                         
                         # Look for hospital listings
                         hospital_elements = soup.find_all(['div', 'a'], class_=re.compile(r'hospital|clinic|medical'))
@@ -0,0 +1,431 @@
+"""
+Ingestion Queue for QuXAT Healthcare Quality Grid
+Persistent, resumable job queue for admin bulk uploads and manually added
+hospitals.
+
+Jobs live in a local SQLite table instead of Streamlit session state. Background
+worker threads validate, normalize, dedupe and score uploads in batches; every
+batch is committed together with the job checkpoint, so a crashed or restarted
+worker resumes from the last completed batch. The UI only submits jobs and
+polls their status.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+import pandas as pd
+
+from excel_data_processor import ExcelDataProcessor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ingestion_queue.db')
+
+# Job lifecycle: pending (awaiting admin approval) -> queued -> running -> completed / failed
+# Pending jobs can also be rejected.
+STATUS_PENDING = 'pending'
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+STATUS_REJECTED = 'rejected'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingestion_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    source_type TEXT NOT NULL,
+    file_path TEXT,
+    records TEXT,
+    metadata TEXT,
+    column_mapping TEXT,
+    database_path TEXT,
+    batch_size INTEGER NOT NULL,
+    total_rows INTEGER DEFAULT 0,
+    processed_rows INTEGER DEFAULT 0,
+    organizations_created INTEGER DEFAULT 0,
+    duplicates_skipped INTEGER DEFAULT 0,
+    checkpoint INTEGER DEFAULT 0,
+    worker TEXT,
+    error TEXT,
+    rejection_reason TEXT,
+    statistics TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_status ON ingestion_jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS ingestion_results (
+    job_id TEXT NOT NULL,
+    batch_index INTEGER NOT NULL,
+    organizations TEXT NOT NULL,
+    PRIMARY KEY (job_id, batch_index)
+);
+CREATE TABLE IF NOT EXISTS ingestion_seen (
+    job_id TEXT NOT NULL,
+    org_key TEXT NOT NULL,
+    PRIMARY KEY (job_id, org_key)
+);
+"""
+
+
+class IngestionQueue:
+    """SQLite-backed upload ingestion queue with background batch workers"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, scorer: Optional[Callable[[Dict], Dict]] = None,
+                 batch_size: int = 500):
+        """
+        Args:
+            db_path: SQLite database file for the job table
+            scorer: Optional callable returning a score breakdown for an organization dict
+            batch_size: Default rows per batch for new jobs
+        """
+        self.db_path = db_path
+        self.scorer = scorer
+        self.batch_size = batch_size
+        self.processor = ExcelDataProcessor()
+        self._workers: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    # ------------------------------------------------------------ submission
+
+    def submit(self, upload_data: Dict[str, Any], requires_approval: bool = True,
+               database_path: Optional[str] = None, batch_size: Optional[int] = None) -> str:
+        """
+        Register an upload as a job
+
+        Args:
+            upload_data: Either {'file_path': ...} for an Excel/CSV upload or
+                {'organizations': [...]} / {'records': [...]} for row dictionaries.
+                Any other keys are kept as job metadata.
+            requires_approval: Leave the job pending until approve() is called
+            database_path: Unified database file to integrate results into on completion
+            batch_size: Rows per batch (defaults to the queue's batch size)
+
+        Returns:
+            The new job identifier
+        """
+        file_path = upload_data.get('file_path')
+        records = upload_data.get('organizations') or upload_data.get('records')
+        if not file_path and records is None:
+            raise ValueError("Upload must provide 'file_path' or 'organizations'/'records'")
+        metadata = {k: v for k, v in upload_data.items() if k not in ('file_path', 'organizations', 'records')}
+
+        job_id = uuid.uuid4().hex[:12]
+        now = self._now()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO ingestion_jobs (job_id, status, source_type, file_path, records, metadata, database_path, '
+                'batch_size, total_rows, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    job_id,
+                    STATUS_PENDING if requires_approval else STATUS_QUEUED,
+                    'file' if file_path else 'records',
+                    file_path,
+                    None if file_path else json.dumps(records, default=str),
+                    json.dumps(metadata, default=str),
+                    database_path,
+                    batch_size or self.batch_size,
+                    0 if file_path else len(records),
+                    now,
+                    now
+                )
+            )
+        return job_id
+
+    def approve(self, job_id: str) -> bool:
+        """Move a pending job to the worker queue"""
+        with self._connect() as conn:
+            cur = conn.execute(
+                'UPDATE ingestion_jobs SET status = ?, updated_at = ? WHERE job_id = ? AND status = ?',
+                (STATUS_QUEUED, self._now(), job_id, STATUS_PENDING)
+            )
+            return cur.rowcount == 1
+
+    def reject(self, job_id: str, reason: str = '') -> bool:
+        """Reject a pending job"""
+        with self._connect() as conn:
+            cur = conn.execute(
+                'UPDATE ingestion_jobs SET status = ?, rejection_reason = ?, updated_at = ? WHERE job_id = ? AND status = ?',
+                (STATUS_REJECTED, reason, self._now(), job_id, STATUS_PENDING)
+            )
+            return cur.rowcount == 1
+
+    # --------------------------------------------------------------- status
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return job status and progress (without the raw records payload)"""
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM ingestion_jobs WHERE job_id = ?', (job_id,)).fetchone()
+        return self._job_to_dict(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """List the most recent jobs, optionally filtered by status"""
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    'SELECT * FROM ingestion_jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?', (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute('SELECT * FROM ingestion_jobs ORDER BY created_at DESC LIMIT ?', (limit,)).fetchall()
+        return [self._job_to_dict(r) for r in rows]
+
+    def get_results(self, job_id: str) -> List[Dict[str, Any]]:
+        """Return the normalized, deduplicated and scored organizations of a job"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT organizations FROM ingestion_results WHERE job_id = ? ORDER BY batch_index', (job_id,)
+            ).fetchall()
+        organizations = []
+        for row in rows:
+            organizations.extend(json.loads(row['organizations']))
+        return organizations
+
+    @staticmethod
+    def _job_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job.pop('records', None)
+        job['metadata'] = json.loads(job['metadata']) if job.get('metadata') else {}
+        job['statistics'] = json.loads(job['statistics']) if job.get('statistics') else {}
+        total = job.get('total_rows') or 0
+        job['progress'] = round(job['processed_rows'] / total * 100, 1) if total else (
+            100.0 if job['status'] == STATUS_COMPLETED else 0.0
+        )
+        return job
+
+    # ------------------------------------------------------------- workers
+
+    def recover(self) -> int:
+        """Requeue jobs left running by a crashed worker; they resume from their checkpoint"""
+        with self._connect() as conn:
+            cur = conn.execute(
+                'UPDATE ingestion_jobs SET status = ?, worker = NULL, updated_at = ? WHERE status = ?',
+                (STATUS_QUEUED, self._now(), STATUS_RUNNING)
+            )
+            if cur.rowcount:
+                logger.info(f"Recovered {cur.rowcount} interrupted ingestion jobs")
+            return cur.rowcount
+
+    def start_workers(self, count: int = 2, poll_interval: float = 1.0) -> None:
+        """Start background worker threads (idempotent)"""
+        if any(w.is_alive() for w in self._workers):
+            return
+        self.recover()
+        self._stop_event.clear()
+        for i in range(count):
+            worker = threading.Thread(
+                target=self._worker_loop, args=(f"worker-{i}-{uuid.uuid4().hex[:4]}", poll_interval),
+                name=f"ingestion-worker-{i}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def stop_workers(self, timeout: float = 5.0) -> None:
+        """Signal worker threads to stop after their current batch"""
+        self._stop_event.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+    def _worker_loop(self, worker_name: str, poll_interval: float) -> None:
+        while not self._stop_event.is_set():
+            try:
+                if not self.process_next(worker_name):
+                    self._stop_event.wait(poll_interval)
+            except Exception as e:
+                logger.error(f"Ingestion worker {worker_name} error: {e}")
+                self._stop_event.wait(poll_interval)
+
+    def run_pending(self, max_jobs: Optional[int] = None) -> int:
+        """Process queued jobs synchronously in the calling thread (CLI/cron/tests)"""
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            if not self.process_next('inline'):
+                break
+            processed += 1
+        return processed
+
+    def _claim_next(self, worker_name: str) -> Optional[sqlite3.Row]:
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT * FROM ingestion_jobs WHERE status = ? ORDER BY created_at, rowid LIMIT 1', (STATUS_QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        'UPDATE ingestion_jobs SET status = ?, worker = ?, updated_at = ? WHERE job_id = ?',
+                        (STATUS_RUNNING, worker_name, self._now(), row['job_id'])
+                    )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return row
+
+    def process_next(self, worker_name: str = 'inline') -> bool:
+        """Claim and process one queued job. Returns False when the queue is empty."""
+        job = self._claim_next(worker_name)
+        if job is None:
+            return False
+        job_id = job['job_id']
+        try:
+            self._process_job(job)
+        except Exception as e:
+            logger.error(f"Ingestion job {job_id} failed: {e}")
+            with self._connect() as conn:
+                conn.execute(
+                    'UPDATE ingestion_jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?',
+                    (STATUS_FAILED, str(e), self._now(), job_id)
+                )
+        return True
+
+    # ------------------------------------------------------------ pipeline
+
+    def _iter_batches(self, job: sqlite3.Row):
+        """Yield (batch_index, DataFrame) for the job's payload"""
+        batch_size = job['batch_size']
+        if job['source_type'] == 'file':
+            frames = self.processor.iter_batches(job['file_path'], batch_size)
+        else:
+            df = pd.DataFrame(json.loads(job['records'] or '[]'))
+            frames = (df.iloc[start:start + batch_size] for start in range(0, len(df), batch_size))
+        for batch_index, frame in enumerate(frames):
+            yield batch_index, frame
+
+    def _validate(self, job: sqlite3.Row) -> Dict[str, str]:
+        """Validate the payload once and persist the column mapping and row count"""
+        if job['column_mapping']:
+            return json.loads(job['column_mapping'])
+        if job['source_type'] == 'file':
+            validation = self.processor.validate_excel_file(job['file_path'])
+            if not validation['is_valid']:
+                raise ValueError('; '.join(validation['errors']) or 'Invalid upload file')
+            mapping = validation['column_mapping']
+            total_rows = validation['file_info'].get('total_rows', 0)
+        else:
+            records = json.loads(job['records'] or '[]')
+            columns = list(dict.fromkeys(k for r in records if isinstance(r, dict) for k in r))
+            mapping = self.processor.map_columns(columns)
+            if 'name' not in mapping:
+                raise ValueError("Upload records must contain an organization name column")
+            total_rows = len(records)
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE ingestion_jobs SET column_mapping = ?, total_rows = ?, updated_at = ? WHERE job_id = ?',
+                (json.dumps(mapping), total_rows, self._now(), job['job_id'])
+            )
+        return mapping
+
+    def _score(self, organizations: List[Dict[str, Any]]) -> None:
+        if not self.scorer:
+            return
+        for org in organizations:
+            try:
+                breakdown = self.scorer(org)
+                org['score_breakdown'] = breakdown
+                org['total_score'] = breakdown.get('total_score', 0)
+            except Exception as e:
+                org['scoring_error'] = str(e)
+
+    def _process_job(self, job: sqlite3.Row) -> None:
+        job_id = job['job_id']
+        mapping = self._validate(job)
+        checkpoint = job['checkpoint'] or 0
+
+        for batch_index, frame in self._iter_batches(job):
+            if batch_index < checkpoint:
+                continue  # Completed before a crash/restart
+            if self._stop_event.is_set():
+                # Leave the job resumable from its checkpoint
+                with self._connect() as conn:
+                    conn.execute(
+                        'UPDATE ingestion_jobs SET status = ?, worker = NULL, updated_at = ? WHERE job_id = ?',
+                        (STATUS_QUEUED, self._now(), job_id)
+                    )
+                return
+
+            organizations = self.processor.process_batch(frame, mapping)
+            for org in organizations:
+                org['data_source'] = 'Admin Upload'
+                org['ingestion_job_id'] = job_id
+            self._score(organizations)
+
+            # Dedupe and checkpoint in one transaction so a crash never double-counts a batch
+            with self._connect() as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    unique = []
+                    for org in organizations:
+                        key = self.processor.normalize_org_name(org['name'])
+                        cur = conn.execute(
+                            'INSERT OR IGNORE INTO ingestion_seen (job_id, org_key) VALUES (?, ?)', (job_id, key)
+                        )
+                        if cur.rowcount == 1:
+                            unique.append(org)
+                    conn.execute(
+                        'INSERT OR REPLACE INTO ingestion_results (job_id, batch_index, organizations) VALUES (?, ?, ?)',
+                        (job_id, batch_index, json.dumps(unique, default=str))
+                    )
+                    conn.execute(
+                        'UPDATE ingestion_jobs SET checkpoint = ?, processed_rows = processed_rows + ?, '
+                        'organizations_created = organizations_created + ?, duplicates_skipped = duplicates_skipped + ?, '
+                        'updated_at = ? WHERE job_id = ?',
+                        (batch_index + 1, len(frame), len(unique), len(organizations) - len(unique), self._now(), job_id)
+                    )
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+
+        statistics = {}
+        if job['database_path']:
+            integration = self.processor.integrate_with_database(self.get_results(job_id), job['database_path'])
+            if not integration['success']:
+                raise RuntimeError('; '.join(integration['errors']) or 'Database integration failed')
+            statistics = integration['statistics']
+
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE ingestion_jobs SET status = ?, statistics = ?, updated_at = ? WHERE job_id = ?',
+                (STATUS_COMPLETED, json.dumps(statistics), self._now(), job_id)
+            )
+        logger.info(f"Ingestion job {job_id} completed")
+
+
+def main():
+    """Process all queued ingestion jobs from the command line"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    queue = IngestionQueue()
+    queue.recover()
+    started = time.time()
+    count = queue.run_pending()
+    print(f"Processed {count} ingestion jobs in {time.time() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
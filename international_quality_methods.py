@@ -3,6 +3,8 @@ International Quality Assessment Methods for QuXAT
 Supporting methods for the international healthcare quality scoring system
 """
 
+from recommendation_rules import get_recommendation_engine
+
 def _calculate_international_quality_initiatives_score(self, initiatives):
     """Calculate score for quality initiatives with international focus"""
     if not initiatives or initiatives == 'no_official_data_available':
@@ -109,83 +111,9 @@ def _calculate_regional_adaptation_bonus(self, org_name, certifications):
     return min(bonus, 5)
 
 def generate_international_improvement_recommendations(self, score_breakdown, org_name):
-    """Generate improvement recommendations based on international standards"""
-    recommendations = {
-        'priority_actions': [],
-        'certification_opportunities': [],
-        'quality_initiatives': [],
-        'international_expansion': []
-    }
-    
-    total_score = score_breakdown.get('total_score', 0)
-    cert_score = score_breakdown.get('certification_score', 0)
-    
-    # Priority actions based on score ranges
-    if total_score < 30:
-        recommendations['priority_actions'].extend([
-            "Pursue JCI (Joint Commission International) accreditation for global recognition",
-            "Implement ISO 9001 Quality Management System as foundation",
-            "Establish patient safety initiatives aligned with WHO guidelines",
-            "Develop quality improvement programs with measurable outcomes"
-        ])
-    elif total_score < 60:
-        recommendations['priority_actions'].extend([
-            "Expand ISO certification portfolio (ISO 13485, 15189, 27001)",
-            "Implement advanced patient experience programs",
-            "Pursue regional excellence accreditation (Joint Commission, CQC, etc.)",
-            "Develop international collaboration partnerships"
-        ])
-    else:
-        recommendations['priority_actions'].extend([
-            "Pursue Magnet Recognition for nursing excellence",
-            "Implement Planetree patient-centered care model",
-            "Establish WHO Collaborating Centre status",
-            "Lead international healthcare quality initiatives"
-        ])
-    
-    # Certification opportunities
-    cert_breakdown = score_breakdown.get('certification_breakdown', {})
-    
-    if 'GLOBAL_GOLD' not in cert_breakdown:
-        recommendations['certification_opportunities'].append({
-            'certification': 'Joint Commission International (JCI)',
-            'impact': '40 points',
-            'description': 'Global gold standard for healthcare quality',
-            'timeline': '12-18 months'
-        })
-    
-    if 'ISO_STANDARDS' not in cert_breakdown:
-        recommendations['certification_opportunities'].extend([
-            {
-                'certification': 'ISO 9001 Quality Management',
-                'impact': '28 points',
-                'description': 'Foundation for quality management systems',
-                'timeline': '6-12 months'
-            },
-            {
-                'certification': 'ISO 13485 Medical Devices',
-                'impact': '30 points',
-                'description': 'Quality management for medical devices',
-                'timeline': '8-12 months'
-            }
-        ])
-    
-    # Quality initiatives
-    recommendations['quality_initiatives'].extend([
-        "Implement WHO Patient Safety Solutions",
-        "Establish clinical outcome measurement programs",
-        "Develop patient experience improvement initiatives",
-        "Create sustainability and environmental health programs",
-        "Implement technology innovation projects"
-    ])
-    
-    # International expansion opportunities
-    recommendations['international_expansion'].extend([
-        "Participate in global healthcare quality networks",
-        "Establish international patient referral programs",
-        "Develop telemedicine capabilities for global reach",
-        "Create international medical tourism programs",
-        "Participate in global health research collaborations"
-    ])
-    
-    return recommendations
\ No newline at end of file
+    """Generate improvement recommendations based on international standards
+
+    Depends only on the total score band and the missing certification groups;
+    served from the memoized rule table in recommendation_rules.py.
+    """
+    return get_recommendation_engine().international_recommendations(score_breakdown)
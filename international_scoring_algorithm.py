@@ -4,10 +4,54 @@ Removes regional bias and implements global healthcare quality standards
 """
 
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from datetime import datetime
 import logging
 
+import numpy as np
+
+# Certification statuses that count towards the score
+ACTIVE_CERTIFICATION_STATUSES = frozenset(['Active', 'Valid', 'Current'])
+
+# Name patterns checked in order by _identify_certification_type
+ISO_TYPE_PATTERNS = (
+    ('ISO 9001', 'ISO_9001'),
+    ('ISO9001', 'ISO_9001'),
+    ('ISO 13485', 'ISO_13485'),
+    ('ISO13485', 'ISO_13485'),
+    ('ISO 15189', 'ISO_15189'),
+    ('ISO15189', 'ISO_15189'),
+    ('ISO 27001', 'ISO_27001'),
+    ('ISO27001', 'ISO_27001'),
+    ('ISO 45001', 'ISO_45001'),
+    ('ISO45001', 'ISO_45001'),
+    ('ISO 14001', 'ISO_14001'),
+    ('ISO14001', 'ISO_14001')
+)
+
+REGIONAL_TYPE_PATTERNS = (
+    ('JOINT COMMISSION', 'JOINT_COMMISSION_US'),
+    ('MAGNET', 'MAGNET_RECOGNITION'),
+    ('DNV', 'DNV_HEALTHCARE'),
+    ('ACCREDITATION CANADA', 'ACCREDITATION_CANADA'),
+    ('CQC', 'CQC_UK'),
+    ('CARE QUALITY COMMISSION', 'CQC_UK'),
+    ('HAS', 'HAS_FRANCE'),
+    ('HAUTE AUTORITÉ', 'HAS_FRANCE'),
+    ('G-BA', 'G_BA_GERMANY'),
+    ('ACHS', 'ACHS_AUSTRALIA'),
+    ('JCQHC', 'JCQHC_JAPAN'),
+    ('TJCHA', 'TJCHA_TAIWAN'),
+    ('NABH', 'NABH_INDIA'),
+    ('NABL', 'NABL'),
+    ('CBAHI', 'CBAHI_SAUDI'),
+    ('HAAD', 'HAAD_UAE'),
+    ('COHSASA', 'COHSASA_AFRICA')
+)
+
+# Upper bound on memoized certification-name lookups per scorer
+_TYPE_CACHE_LIMIT = 20000
+
 class InternationalHealthcareScorer:
     """
     International Healthcare Quality Scoring System
@@ -17,6 +61,7 @@ class InternationalHealthcareScorer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.setup_international_standards()
+        self.compile_standards()
     
     def setup_international_standards(self):
         """Setup international healthcare quality standards and weights"""
@@ -313,6 +358,41 @@ class InternationalHealthcareScorer:
             }
         }
     
+    def compile_standards(self):
+        """
+        Flatten the standards into lookup tables used by the scoring paths.
+        Call again after changing mandatory_accreditations, accreditation_equivalencies
+        or certification_weights.
+        """
+        # Mandatory keys in declaration order, with their penalties
+        self._mandatory_penalties = tuple(
+            (key, info['penalty']) for key, info in self.mandatory_accreditations.items()
+        )
+        
+        # Certification type -> mandatory keys it satisfies (direct match or equivalency group)
+        known_types = set(self.certification_weights) | set(self.mandatory_accreditations)
+        for group in self.accreditation_equivalencies.values():
+            known_types.update(group['equivalent_types'])
+        self._mandatory_satisfied_by = {}
+        for cert_type in known_types:
+            satisfied = []
+            for mandatory_key, mandatory_info in self.mandatory_accreditations.items():
+                group_key = mandatory_info.get('equivalency_group')
+                if mandatory_key == 'ISO_15189_GROUP' and not group_key:
+                    group_key = 'ISO_15189_GROUP'
+                group = self.accreditation_equivalencies.get(group_key) if group_key else None
+                if cert_type == mandatory_key or (group and cert_type in group['equivalent_types']):
+                    satisfied.append(mandatory_key)
+            if satisfied:
+                self._mandatory_satisfied_by[cert_type] = frozenset(satisfied)
+        
+        # Certification type -> (weight, base score, tier)
+        self._weight_table = {
+            cert_type: (info['weight'], info['base_score'], info['tier'])
+            for cert_type, info in self.certification_weights.items()
+        }
+        self._type_cache = {}
+    
     def calculate_international_quality_score(self, 
                                             certifications: List[Dict], 
                                             quality_metrics: Dict = None,
@@ -386,70 +466,88 @@ class InternationalHealthcareScorer:
             }
         }
         
+        totals = self._score_certifications(certifications, result['breakdown'], result['international_recognition'])
+        for mandatory_key, _ in self._mandatory_penalties:
+            result['mandatory_compliance'][mandatory_key] = mandatory_key in totals['mandatory_found']
+        result['mandatory_penalties'] = totals['mandatory_penalties']
+        result['score'] = totals['score']
+        
         if not certifications:
-            # Apply all mandatory penalties if no certifications
-            total_penalty = 0
-            for mandatory_key, mandatory_info in self.mandatory_accreditations.items():
-                result['mandatory_compliance'][mandatory_key] = False
-                result['mandatory_penalties'][mandatory_key] = mandatory_info['penalty']
-                total_penalty += mandatory_info['penalty']
-            
-            result['score'] = max(0, -total_penalty)  # Negative score for missing mandatory
+            # All mandatory penalties apply if there are no certifications
             return result
         
-        # Check mandatory compliance first
-        mandatory_found = {}
-        for mandatory_key in self.mandatory_accreditations.keys():
-            mandatory_found[mandatory_key] = False
+        result['international_recognition']['total_certifications'] = totals['certification_count']
+        if 'diversity_bonus' in totals:
+            result['diversity_bonus'] = totals['diversity_bonus']
+        if 'international_bonus' in totals:
+            result['international_bonus'] = totals['international_bonus']
+        result['total_penalty'] = totals['total_penalty']
+        
+        return result
+    
+    def _score_certifications(self, certifications: List[Dict], breakdown: Dict = None,
+                              recognition: Dict = None) -> Dict:
+        """
+        Table-driven core of certification scoring, shared by the detailed and batch paths.
+        Per-type breakdown and tier counts are only collected when dicts are passed in.
+        """
+        if not certifications:
+            penalties = dict(self._mandatory_penalties)
+            total_penalty = sum(penalties.values())
+            return {
+                'score': max(0, -total_penalty),  # Negative score for missing mandatory
+                'total_penalty': total_penalty,
+                'certification_count': 0,
+                'mandatory_found': frozenset(),
+                'mandatory_penalties': penalties
+            }
         
+        mandatory_found = set()
         total_weighted_score = 0
         certification_count = 0
+        global_standards = 0
+        has_joint_commission_us = False
         
-        # Process each certification
         for cert in certifications:
-            if cert.get('status') not in ['Active', 'Valid', 'Current']:
+            if not isinstance(cert, dict) or cert.get('status') not in ACTIVE_CERTIFICATION_STATUSES:
                 continue
             
-            cert_type = self._identify_certification_type(cert.get('name', '') + ' ' + cert.get('type', '') + ' ' + cert.get('standard', ''))
+            cert_type = self._identify_certification_type(
+                (cert.get('name') or '') + ' ' + (cert.get('type') or '') + ' ' + (cert.get('standard') or '')
+            )
             
-            # Check if this certification fulfills a mandatory requirement
-            for mandatory_key, mandatory_info in self.mandatory_accreditations.items():
-                # Check direct match
-                if cert_type == mandatory_key:
-                    mandatory_found[mandatory_key] = True
-                # Check equivalency group match
-                elif mandatory_info.get('equivalency_group'):
-                    equivalency_group = self.accreditation_equivalencies.get(mandatory_info['equivalency_group'])
-                    if equivalency_group and cert_type in equivalency_group['equivalent_types']:
-                        mandatory_found[mandatory_key] = True
-                # Special handling for ISO_15189_GROUP which is both key and equivalency group
-                elif mandatory_key == 'ISO_15189_GROUP':
-                    equivalency_group = self.accreditation_equivalencies.get('ISO_15189_GROUP')
-                    if equivalency_group and cert_type in equivalency_group['equivalent_types']:
-                        mandatory_found[mandatory_key] = True
+            # Mandatory requirements fulfilled by this certification (direct or equivalent)
+            satisfied = self._mandatory_satisfied_by.get(cert_type)
+            if satisfied:
+                mandatory_found.update(satisfied)
             
-            if cert_type and cert_type in self.certification_weights:
-                weight_info = self.certification_weights[cert_type]
-                base_score = cert.get('score_impact', weight_info['base_score'])
-                weight = weight_info['weight']
-                tier = weight_info['tier']
-                
-                # Calculate weighted score
-                weighted_score = base_score * weight
-                total_weighted_score += weighted_score
-                certification_count += 1
-                
-                # Track by tier for international recognition
+            weight_entry = self._weight_table.get(cert_type)
+            if weight_entry is None:
+                continue
+            weight, default_base, tier = weight_entry
+            weighted_score = cert.get('score_impact', default_base) * weight
+            total_weighted_score += weighted_score
+            certification_count += 1
+            if tier == 1:
+                global_standards += 1
+            if cert_type == 'JOINT_COMMISSION_US':
+                has_joint_commission_us = True
+            
+            # Track by tier for international recognition
+            if recognition is not None:
                 if tier == 1:
-                    result['international_recognition']['global_standards'] += 1
-                elif tier in [2, 3]:
-                    result['international_recognition']['regional_excellence'] += 1
-                elif tier in [4, 5]:
-                    result['international_recognition']['specialty_certifications'] += 1
-                
-                # Track certification breakdown
-                if cert_type not in result['breakdown']:
-                    result['breakdown'][cert_type] = {
+                    recognition['global_standards'] += 1
+                elif tier in (2, 3):
+                    recognition['regional_excellence'] += 1
+                elif tier in (4, 5):
+                    recognition['specialty_certifications'] += 1
+            
+            # Track certification breakdown
+            if breakdown is not None:
+                entry = breakdown.get(cert_type)
+                if entry is None:
+                    weight_info = self.certification_weights[cert_type]
+                    entry = breakdown[cert_type] = {
                         'count': 0,
                         'total_score': 0,
                         'weight': weight,
@@ -457,55 +555,83 @@ class InternationalHealthcareScorer:
                         'tier': tier,
                         'region': weight_info['region']
                     }
-                result['breakdown'][cert_type]['count'] += 1
-                result['breakdown'][cert_type]['total_score'] += weighted_score
-
-        # Detect presence of US Joint Commission (for penalty softening)
-        has_joint_commission_us = False
-        for key in result['breakdown'].keys():
-            if key == 'JOINT_COMMISSION_US':
-                has_joint_commission_us = True
-                break
+                entry['count'] += 1
+                entry['total_score'] += weighted_score
         
         # Apply mandatory compliance penalties
+        mandatory_penalties = {}
         total_penalty = 0
-        for mandatory_key, mandatory_info in self.mandatory_accreditations.items():
-            is_compliant = mandatory_found[mandatory_key]
-            result['mandatory_compliance'][mandatory_key] = is_compliant
-            
-            if not is_compliant:
-                penalty = mandatory_info['penalty']
-                # Soften ISO 9001 penalty when JOINT_COMMISSION_US is present
-                if has_joint_commission_us and mandatory_key == 'ISO_9001':
-                    penalty = penalty * 0.5  # 50% reduction recognizing US-equivalent QMS oversight
-                result['mandatory_penalties'][mandatory_key] = penalty
-                total_penalty += penalty
-            else:
-                result['mandatory_penalties'][mandatory_key] = 0
-        
-        result['international_recognition']['total_certifications'] = certification_count
+        for mandatory_key, penalty in self._mandatory_penalties:
+            if mandatory_key in mandatory_found:
+                mandatory_penalties[mandatory_key] = 0
+                continue
+            # Soften ISO 9001 penalty when JOINT_COMMISSION_US is present
+            if has_joint_commission_us and mandatory_key == 'ISO_9001':
+                penalty = penalty * 0.5  # 50% reduction recognizing US-equivalent QMS oversight
+            mandatory_penalties[mandatory_key] = penalty
+            total_penalty += penalty
+        
+        totals = {
+            'certification_count': certification_count,
+            'mandatory_found': mandatory_found,
+            'mandatory_penalties': mandatory_penalties,
+            'total_penalty': total_penalty
+        }
         
         # Apply diversity bonus for multiple certification types
         if certification_count > 1:
             diversity_bonus = min(certification_count * 2, 15)  # Up to 15 points
             total_weighted_score += diversity_bonus
-            result['diversity_bonus'] = diversity_bonus
+            totals['diversity_bonus'] = diversity_bonus
         
         # Apply international excellence bonus
-        global_certs = result['international_recognition']['global_standards']
-        if global_certs > 0:
-            international_bonus = min(global_certs * 5, 20)  # Up to 20 points
+        if global_standards > 0:
+            international_bonus = min(global_standards * 5, 20)  # Up to 20 points
             total_weighted_score += international_bonus
-            result['international_bonus'] = international_bonus
+            totals['international_bonus'] = international_bonus
         
         # Apply mandatory penalties to final score
         final_score = total_weighted_score - total_penalty
         
         # Cap certification score at 60 (60% of total possible score), but allow negative for penalties
-        result['score'] = min(final_score, 60) if final_score > 0 else final_score
-        result['total_penalty'] = total_penalty
+        totals['score'] = min(final_score, 60) if final_score > 0 else final_score
+        return totals
+    
+    def score_many(self, organizations: Iterable[Dict], quality_metrics_field: str = 'quality_metrics') -> Dict[str, np.ndarray]:
+        """
+        Batch international scoring without per-organization breakdowns or recommendations
         
-        return result
+        Args:
+            organizations: Organization records with 'certifications' (and optionally quality metrics)
+            quality_metrics_field: Record key holding quality metrics, if any
+        
+        Returns:
+            Dict of numpy arrays aligned with the input order: total_score, certification_score,
+            quality_metrics_score, total_penalty and certification_count
+        """
+        organizations = list(organizations)
+        count = len(organizations)
+        certification_scores = np.zeros(count, dtype=np.float64)
+        quality_scores = np.zeros(count, dtype=np.float64)
+        penalties = np.zeros(count, dtype=np.float64)
+        certification_counts = np.zeros(count, dtype=np.int64)
+        
+        for i, org in enumerate(organizations):
+            totals = self._score_certifications(org.get('certifications') or [])
+            certification_scores[i] = totals['score']
+            penalties[i] = totals['total_penalty']
+            certification_counts[i] = totals['certification_count']
+            quality_metrics = org.get(quality_metrics_field)
+            if quality_metrics and isinstance(quality_metrics, dict):
+                quality_scores[i] = self._calculate_quality_metrics_score(quality_metrics)['score']
+        
+        return {
+            'total_score': certification_scores * 0.6 + quality_scores * 0.4,
+            'certification_score': certification_scores,
+            'quality_metrics_score': quality_scores,
+            'total_penalty': penalties,
+            'certification_count': certification_counts
+        }
     
     def _calculate_quality_metrics_score(self, quality_metrics: Dict, context: Dict = None) -> Dict:
         """Calculate quality metrics score based on international standards"""
@@ -588,7 +714,22 @@ class InternationalHealthcareScorer:
         if not cert_name:
             return None
         
-        cert_name = cert_name.upper()
+        try:
+            return self._type_cache[cert_name]
+        except KeyError:
+            pass
+        except AttributeError:
+            self._type_cache = {}
+        
+        cert_type = self._match_certification_type(cert_name.upper())
+        if len(self._type_cache) >= _TYPE_CACHE_LIMIT:
+            self._type_cache.clear()
+        self._type_cache[cert_name] = cert_type
+        return cert_type
+    
+    @staticmethod
+    def _match_certification_type(cert_name: str) -> Optional[str]:
+        """Pattern rules behind _identify_certification_type (cert_name is upper-cased)"""
         
         # Global Standards
         if 'JCI' in cert_name or 'JOINT COMMISSION INTERNATIONAL' in cert_name:
@@ -597,47 +738,12 @@ class InternationalHealthcareScorer:
             return 'WHO_CERTIFICATION'
         
         # ISO Standards
-        iso_mappings = {
-            'ISO 9001': 'ISO_9001',
-            'ISO9001': 'ISO_9001',
-            'ISO 13485': 'ISO_13485',
-            'ISO13485': 'ISO_13485',
-            'ISO 15189': 'ISO_15189',
-            'ISO15189': 'ISO_15189',
-            'ISO 27001': 'ISO_27001',
-            'ISO27001': 'ISO_27001',
-            'ISO 45001': 'ISO_45001',
-            'ISO45001': 'ISO_45001',
-            'ISO 14001': 'ISO_14001',
-            'ISO14001': 'ISO_14001'
-        }
-        
-        for iso_pattern, iso_type in iso_mappings.items():
+        for iso_pattern, iso_type in ISO_TYPE_PATTERNS:
             if iso_pattern in cert_name:
                 return iso_type
         
         # Regional Excellence Standards
-        regional_mappings = {
-            'JOINT COMMISSION': 'JOINT_COMMISSION_US',
-            'MAGNET': 'MAGNET_RECOGNITION',
-            'DNV': 'DNV_HEALTHCARE',
-            'ACCREDITATION CANADA': 'ACCREDITATION_CANADA',
-            'CQC': 'CQC_UK',
-            'CARE QUALITY COMMISSION': 'CQC_UK',
-            'HAS': 'HAS_FRANCE',
-            'HAUTE AUTORITÉ': 'HAS_FRANCE',
-            'G-BA': 'G_BA_GERMANY',
-            'ACHS': 'ACHS_AUSTRALIA',
-            'JCQHC': 'JCQHC_JAPAN',
-            'TJCHA': 'TJCHA_TAIWAN',
-            'NABH': 'NABH_INDIA',
-            'NABL': 'NABL',
-            'CBAHI': 'CBAHI_SAUDI',
-            'HAAD': 'HAAD_UAE',
-            'COHSASA': 'COHSASA_AFRICA'
-        }
-        
-        for pattern, cert_type in regional_mappings.items():
+        for pattern, cert_type in REGIONAL_TYPE_PATTERNS:
             if pattern in cert_name:
                 return cert_type
         
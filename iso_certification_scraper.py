@@ -16,6 +16,8 @@ import logging
 from urllib.parse import quote_plus, urljoin
 import random
 
+from single_flight import SingleFlight
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -104,6 +106,8 @@ class ISOCertificationScraper:
         # Cache for certification data
         self.certification_cache = {}
         self.cache_expiry = timedelta(hours=12)  # Shorter cache for certification data
+        # Coalesces concurrent searches for the same organization (see single_flight.py)
+        self.search_flights = SingleFlight()
     
     def get_organization_iso_certifications(self, org_name: str, location: str = "") -> ISOCertificationSummary:
         """
@@ -120,6 +124,17 @@ class ISOCertificationScraper:
         
         # Check cache first
         cache_key = f"iso_{org_name.lower().strip()}_{location.lower().strip()}"
+        cached_data = self._cached_summary(cache_key, org_name)
+        if cached_data is not None:
+            return cached_data
+        
+        # Concurrent callers for the same organization share one search
+        return self.search_flights.do(cache_key, self._search_and_cache, org_name, location, cache_key)
+    
+    def _cached_summary(self, cache_key: str, org_name: str) -> Optional[ISOCertificationSummary]:
+        """
+        Valid cached certification summary, or None
+        """
         if self._is_cache_valid(cache_key):
             logger.info(f"Using cached ISO data for {org_name}")
             cached_data = self.certification_cache[cache_key]['data']
@@ -128,6 +143,16 @@ class ISOCertificationScraper:
                 logger.warning(f"Cached ISO data is None for {org_name}, regenerating...")
             else:
                 return cached_data
+        return None
+    
+    def _search_and_cache(self, org_name: str, location: str, cache_key: str) -> ISOCertificationSummary:
+        """
+        Search all ISO data sources and cache the summary
+        """
+        # A search that finished just before this one started may have filled the cache
+        cached_data = self._cached_summary(cache_key, org_name)
+        if cached_data is not None:
+            return cached_data
         
         all_certifications = []
         data_sources_used = []
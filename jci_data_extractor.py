@@ -3,24 +3,27 @@ This module extracts and processes JCI accredited hospitals data for the QuXAT H
 """
 
 import requests
-from bs4 import BeautifulSoup
 import json
 import pandas as pd
 from datetime import datetime
-import time
 import re
 from urllib.parse import urljoin, urlparse
 import logging
 
+from crawl_engine import CrawlPlugin, CrawlRequest, crawl
+from html_parsing import only
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class JCIDataExtractor:
+class JCIDataExtractor(CrawlPlugin):
     """
     Extracts JCI accredited organizations data from official sources
     """
     
+    crawl_name = 'jci_extractor'
+    
     def __init__(self):
         self.session = requests.Session()
         # Use different user agents to avoid blocking
@@ -108,36 +111,33 @@ class JCIDataExtractor:
         """
         Try to extract JCI organizations from web sources
         """
-        organizations = []
-        
-        for url in self.jci_urls:
-            try:
-                logger.info(f"Trying to fetch data from: {url}")
-                self.update_headers()
-                
-                response = self.session.get(url, timeout=30)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Look for organization data in various formats
-                    orgs = self.parse_organizations_from_soup(soup)
-                    if orgs:
-                        organizations.extend(orgs)
-                        logger.info(f"Successfully extracted {len(orgs)} organizations from {url}")
-                        break
-                    else:
-                        logger.info(f"No organizations found in {url}")
-                else:
-                    logger.warning(f"HTTP {response.status_code} for {url}")
-                
-                time.sleep(2)  # Be respectful with requests
-                
-            except Exception as e:
-                logger.error(f"Error fetching {url}: {e}")
-                continue
-        
-        return organizations
+        self.update_headers()
+        self.crawl_headers = dict(self.session.headers)
+        return crawl(self, rate_per_sec=0.5)
+    
+    def seeds(self):
+        # URLs are tried one after another until one of them lists organizations
+        yield self._url_request(0)
+    
+    def _url_request(self, index):
+        if index >= len(self.jci_urls):
+            return None
+        return CrawlRequest(self.jci_urls[index], callback='parse_listing', meta={'index': index})
+    
+    def parse_listing(self, response):
+        """Organizations listed on one JCI page, or the next URL to try"""
+        url = response.request.url
+        # Only tables and lists are read, so the rest of the page is not built
+        orgs = self.parse_organizations_from_soup(response.soup(only('table', 'ul', 'ol')))
+        if orgs:
+            logger.info(f"Successfully extracted {len(orgs)} organizations from {url}")
+            return orgs
+        logger.info(f"No organizations found in {url}")
+        return [self._url_request(response.request.meta['index'] + 1)]
+    
+    def on_crawl_error(self, request, error):
+        logger.error(f"Error fetching {request.url}: {error}")
+        return [self._url_request(request.meta['index'] + 1)]
     
     def parse_organizations_from_soup(self, soup):
         """
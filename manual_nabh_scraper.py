@@ -2,19 +2,21 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import csv
-import time
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 import re
-import random
 from urllib.parse import urljoin, quote
 
+from crawl_engine import CrawlPlugin, CrawlRequest, crawl
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class ManualNABHScraper:
+class ManualNABHScraper(CrawlPlugin):
+    crawl_name = "nabh_manual"
+
     def __init__(self):
         self.base_url = "https://nabh.co"
         self.search_url = "https://nabh.co/find-a-healthcare-organisation/"
@@ -30,23 +32,7 @@ class ManualNABHScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
-
-    def get_page_content(self, url: str) -> BeautifulSoup:
-        """Get page content and parse with BeautifulSoup"""
-        try:
-            logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=30)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                return soup
-            else:
-                logger.error(f"Failed to fetch {url}: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {e}")
-            return None
+        self.crawl_headers = dict(self.session.headers)
 
     def extract_organizations_from_soup(self, soup: BeautifulSoup) -> List[Dict]:
         """Extract organization data from BeautifulSoup object"""
@@ -383,19 +369,9 @@ class ManualNABHScraper:
         
         return organizations
 
-    def scrape_main_page(self):
-        """Scrape the main search page"""
-        logger.info("Scraping main NABH search page...")
-        
-        soup = self.get_page_content(self.search_url)
-        if soup:
-            organizations = self.extract_organizations_from_soup(soup)
-            self.organizations.extend(organizations)
-            logger.info(f"Found {len(organizations)} organizations on main page")
-
-    def try_different_urls(self):
-        """Try different URL patterns to find organization data"""
-        logger.info("Trying different URL patterns...")
+    def seeds(self):
+        """Main search page plus common directory URL patterns"""
+        yield CrawlRequest(self.search_url, callback='parse_main_page')
         
         # Common URL patterns for healthcare directories
         url_patterns = [
@@ -409,89 +385,71 @@ class ManualNABHScraper:
             "https://nabh.co/certified/",
             "https://nabh.co/accredited/"
         ]
-        
         for url in url_patterns:
-            try:
-                soup = self.get_page_content(url)
-                if soup:
-                    organizations = self.extract_organizations_from_soup(soup)
-                    if organizations:
-                        self.organizations.extend(organizations)
-                        logger.info(f"Found {len(organizations)} organizations at {url}")
-                
-                time.sleep(random.uniform(1, 3))
-                
-            except Exception as e:
-                logger.debug(f"Failed to scrape {url}: {e}")
-                continue
+            yield CrawlRequest(url, callback='parse_directory_page')
 
-    def search_with_forms(self):
-        """Try to find and submit search forms"""
-        logger.info("Looking for search forms...")
-        
-        soup = self.get_page_content(self.search_url)
-        if not soup:
-            return
-        
-        # Find all forms
+    def parse_main_page(self, response):
+        """Organizations on the main search page, and a submission of each search form on it"""
+        soup = response.soup()
+        organizations = self.extract_organizations_from_soup(soup)
+        logger.info(f"Found {len(organizations)} organizations on main page")
+        yield from organizations
+        yield from self.form_requests(soup)
+
+    def parse_directory_page(self, response):
+        organizations = self.extract_organizations_from_soup(response.soup())
+        if organizations:
+            logger.info(f"Found {len(organizations)} organizations at {response.url}")
+        return organizations
+
+    def form_requests(self, soup: BeautifulSoup) -> List[CrawlRequest]:
+        """Requests submitting the page's search forms with plausible values"""
         forms = soup.find_all('form')
         logger.info(f"Found {len(forms)} forms on the page")
         
+        requests_to_submit = []
         for i, form in enumerate(forms):
-            try:
-                # Get form action and method
-                action = form.get('action', '')
-                method = form.get('method', 'GET').upper()
-                
-                # Find form inputs
-                inputs = form.find_all(['input', 'select', 'textarea'])
-                
-                form_data = {}
-                
-                for inp in inputs:
-                    input_type = inp.get('type', 'text')
-                    input_name = inp.get('name', '')
-                    
-                    if input_name and input_type not in ['submit', 'button']:
-                        if input_type == 'hidden':
-                            form_data[input_name] = inp.get('value', '')
-                        elif inp.name == 'select':
-                            # For select elements, try first option
-                            options = inp.find_all('option')
-                            if options and len(options) > 1:
-                                form_data[input_name] = options[1].get('value', '')
-                        else:
-                            # For text inputs, try some search terms
-                            if 'search' in input_name.lower() or 'query' in input_name.lower():
-                                form_data[input_name] = 'hospital'
+            # Get form action and method
+            action = form.get('action', '')
+            method = form.get('method', 'GET').upper()
+            
+            # Find form inputs
+            inputs = form.find_all(['input', 'select', 'textarea'])
+            
+            form_data = {}
+            
+            for inp in inputs:
+                input_type = inp.get('type', 'text')
+                input_name = inp.get('name', '')
                 
-                if form_data:
-                    logger.info(f"Submitting form {i} with data: {form_data}")
-                    
-                    # Submit form
-                    if action:
-                        submit_url = urljoin(self.search_url, action)
-                    else:
-                        submit_url = self.search_url
-                    
-                    if method == 'POST':
-                        response = self.session.post(submit_url, data=form_data, timeout=30)
+                if input_name and input_type not in ['submit', 'button']:
+                    if input_type == 'hidden':
+                        form_data[input_name] = inp.get('value', '')
+                    elif inp.name == 'select':
+                        # For select elements, try first option
+                        options = inp.find_all('option')
+                        if options and len(options) > 1:
+                            form_data[input_name] = options[1].get('value', '')
                     else:
-                        response = self.session.get(submit_url, params=form_data, timeout=30)
-                    
-                    if response.status_code == 200:
-                        result_soup = BeautifulSoup(response.content, 'html.parser')
-                        organizations = self.extract_organizations_from_soup(result_soup)
-                        
-                        if organizations:
-                            self.organizations.extend(organizations)
-                            logger.info(f"Form {i} returned {len(organizations)} organizations")
-                
-                time.sleep(random.uniform(2, 4))
-                
-            except Exception as e:
-                logger.debug(f"Error with form {i}: {e}")
-                continue
+                        # For text inputs, try some search terms
+                        if 'search' in input_name.lower() or 'query' in input_name.lower():
+                            form_data[input_name] = 'hospital'
+            
+            if form_data:
+                logger.info(f"Submitting form {i} with data: {form_data}")
+                submit_url = urljoin(self.search_url, action) if action else self.search_url
+                if method == 'POST':
+                    requests_to_submit.append(CrawlRequest(submit_url, method='POST', data=form_data,
+                                                           callback='parse_directory_page', meta={'form': i}))
+                else:
+                    requests_to_submit.append(CrawlRequest(submit_url, params=form_data,
+                                                           callback='parse_directory_page', meta={'form': i}))
+        return requests_to_submit
+
+    def crawl_directory(self):
+        """Crawl the main page, URL patterns and form submissions concurrently"""
+        logger.info("Crawling NABH directory pages...")
+        self.organizations.extend(crawl(self, rate_per_sec=0.5, per_domain_concurrency=2))
 
     def remove_duplicates_and_clean(self):
         """Remove duplicates and clean organization data"""
@@ -610,14 +568,8 @@ class ManualNABHScraper:
         logger.info("Starting manual NABH directory scraping...")
         
         try:
-            # Scrape main page
-            self.scrape_main_page()
-            
-            # Try different URL patterns
-            self.try_different_urls()
-            
-            # Try form submissions
-            self.search_with_forms()
+            # Scrape main page, different URL patterns and form submissions
+            self.crawl_directory()
             
             # Clean and deduplicate
             self.remove_duplicates_and_clean()
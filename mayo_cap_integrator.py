@@ -9,6 +9,8 @@ import re
 from datetime import datetime
 from typing import List, Dict, Any
 
+from entity_resolution import EntityResolver, MatchPolicy
+
 class MayoCAPIntegrator:
     """Integrator for Mayo Clinic CAP laboratories"""
     
@@ -71,8 +73,18 @@ class MayoCAPIntegrator:
         """Find matching Mayo Clinic organization in unified database"""
         mayo_name = mayo_lab["name"].lower()
         
-        # Look for exact or partial matches
-        for org in self.unified_db:
+        # Only Mayo Clinic records are eligible; the index is rebuilt when new labs are appended
+        if getattr(self, '_mayo_resolver', None) is None or len(self._mayo_resolver) != len(self.unified_db):
+            self._mayo_resolver = EntityResolver(
+                self.unified_db,
+                policy=MatchPolicy(allow_exact=False, allow_containment=False),
+                record_filter=lambda org: "mayo clinic" in org.get("name", "").lower()
+            )
+        candidates = self._mayo_resolver.candidates(self._mayo_resolver.normalizer(mayo_name))
+        
+        # Look for exact or partial matches among the blocked candidates, in database order
+        for index in candidates:
+            org = self.unified_db[index]
             org_name = org.get("name", "").lower()
             
             # Check for Mayo Clinic matches
@@ -5,12 +5,16 @@ Validates and cleans the extracted NABH entry-level hospital data
 """
 
 import json
+import numpy as np
 import pandas as pd
 import re
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Tuple
 import logging
 
+from validation_rules import ORGANIZATIONS, Rule, RuleEngine, flatten_records, parse_dates
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,6 +22,77 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+HOSPITAL_FIELDS = ('name', 'city', 'state', 'country', 'accreditation_number', 'reference_number',
+                   'valid_from_parsed', 'valid_upto_parsed', 'certification_status')
+
+
+def _prepare_hospital_frame(hospitals: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Hospital records as a frame with the stripped and parsed columns the rules use"""
+    frame = flatten_records(hospitals, HOSPITAL_FIELDS)
+    for field in ('name', 'city', 'state', 'country', 'accreditation_number', 'reference_number',
+                  'certification_status'):
+        frame[field] = frame[field].str.strip()
+    frame['from_date'] = parse_dates(frame['valid_from_parsed'])
+    frame['upto_date'] = parse_dates(frame['valid_upto_parsed'])
+    frame['period_days'] = (frame['upto_date'] - frame['from_date']).dt.days
+    return frame
+
+
+def _both_dates(h):
+    return (h['valid_from_parsed'] != '') & (h['valid_upto_parsed'] != '')
+
+
+def _parsed_dates(h):
+    return _both_dates(h) & h['from_date'].notna() & h['upto_date'].notna()
+
+
+def _status_contradicts(status, expired):
+    # Evaluated against the time of the validation run
+    return lambda h: (h['certification_status'] == status) & h['upto_date'].notna() & (
+        (h['upto_date'] < pd.Timestamp.now()) == expired)
+
+
+# Same checks and messages as the validate_* methods, in the order they report issues
+HOSPITAL_RULES = RuleEngine([
+    Rule('missing_name', "Missing hospital name", ORGANIZATIONS, lambda h: h['name'] == ''),
+    Rule('short_name', "Hospital name too short", ORGANIZATIONS,
+         lambda h: (h['name'] != '') & (h['name'].str.len() < 3)),
+    Rule('long_name', "Hospital name too long", ORGANIZATIONS, lambda h: h['name'].str.len() > 200),
+    Rule('suspicious_name', "Suspicious hospital name pattern", ORGANIZATIONS,
+         lambda h: ~h['name'].str.contains('[a-zA-Z]', regex=True)),
+    Rule('missing_city', "Missing city", ORGANIZATIONS, lambda h: h['city'] == ''),
+    Rule('missing_state', "Missing state", ORGANIZATIONS, lambda h: h['state'] == ''),
+    Rule('missing_country', "Missing country", ORGANIZATIONS, lambda h: h['country'] == ''),
+    Rule('non_india', "Non-India country", ORGANIZATIONS,
+         lambda h: (h['country'] != '') & (h['country'].str.lower() != 'india')),
+    Rule('missing_accreditation_number', "Missing accreditation number", ORGANIZATIONS,
+         lambda h: h['accreditation_number'] == ''),
+    Rule('invalid_accreditation_number', "Invalid accreditation number format", ORGANIZATIONS,
+         lambda h: (h['accreditation_number'] != '')
+         & ~h['accreditation_number'].str.fullmatch(r'PEH-\d{4}-\d{4}')),
+    Rule('missing_reference_number', "Missing reference number", ORGANIZATIONS,
+         lambda h: h['reference_number'] == ''),
+    Rule('missing_valid_from', "Missing valid from date", ORGANIZATIONS, lambda h: h['valid_from_parsed'] == ''),
+    Rule('missing_valid_upto', "Missing valid upto date", ORGANIZATIONS, lambda h: h['valid_upto_parsed'] == ''),
+    Rule('invalid_date_range', "Invalid date range (from >= upto)", ORGANIZATIONS,
+         lambda h: _parsed_dates(h) & (h['from_date'] >= h['upto_date'])),
+    Rule('short_period', "Suspiciously short certification period", ORGANIZATIONS,
+         lambda h: _parsed_dates(h) & (h['period_days'] < 30)),
+    Rule('long_period', "Suspiciously long certification period", ORGANIZATIONS,
+         lambda h: _parsed_dates(h) & (h['period_days'] > 3650)),
+    Rule('invalid_date_format', "Invalid date format", ORGANIZATIONS,
+         lambda h: _both_dates(h) & (h['from_date'].isna() | h['upto_date'].isna())),
+    Rule('missing_status', "Missing certification status", ORGANIZATIONS,
+         lambda h: h['certification_status'] == ''),
+    Rule('invalid_status', "Invalid certification status", ORGANIZATIONS,
+         lambda h: (h['certification_status'] != '') & ~h['certification_status'].isin(['Active', 'Expired'])),
+    Rule('active_but_expired', "Status shows Active but certification expired", ORGANIZATIONS,
+         _status_contradicts('Active', expired=True)),
+    Rule('expired_but_valid', "Status shows Expired but certification still valid", ORGANIZATIONS,
+         _status_contradicts('Expired', expired=False)),
+])
+
+
 class NABHDataValidator:
     def __init__(self, data_file: str):
         """Initialize the validator with the data file"""
@@ -241,15 +316,21 @@ class NABHDataValidator:
         valid_hospitals = []
         invalid_hospitals = []
         
+        # All validate_* checks run as vectorized rules over the whole dataset at once
+        frame = _prepare_hospital_frame(self.hospitals)
+        results = HOSPITAL_RULES.evaluate(frame)
+        issues_by_hospital = results.messages_by_row(ORGANIZATIONS)
+        # update_certification_status() for every hospital with a parseable valid upto date
+        has_upto = frame['upto_date'].notna()
+        refreshed_status = dict(zip(frame.index[has_upto],
+                                    np.where(frame['upto_date'][has_upto] >= pd.Timestamp.now(), 'Active', 'Expired')))
+        issues_found = self.validation_report['issues_found']
+        for entry in results.summary().values():
+            if entry['count']:
+                issues_found[entry['issue']] = issues_found.get(entry['issue'], 0) + entry['count']
+        
         for i, hospital in enumerate(self.hospitals):
-            issues = []
-            
-            # Validate different aspects
-            issues.extend(self.validate_hospital_name(hospital))
-            issues.extend(self.validate_location(hospital))
-            issues.extend(self.validate_accreditation_info(hospital))
-            issues.extend(self.validate_dates(hospital))
-            issues.extend(self.validate_certification_status(hospital))
+            issues = issues_by_hospital.get(i, [])
             
             # Clean the data
             cleaned_hospital = hospital.copy()
@@ -265,7 +346,8 @@ class NABHDataValidator:
                 cleaned_hospital['state'] = self.clean_location(cleaned_hospital['state'])
             
             # Update certification status
-            cleaned_hospital['certification_status'] = self.update_certification_status(cleaned_hospital)
+            cleaned_hospital['certification_status'] = refreshed_status.get(
+                i, cleaned_hospital.get('certification_status', 'Unknown'))
             
             # Add validation info
             cleaned_hospital['validation_issues'] = issues
@@ -278,12 +360,6 @@ class NABHDataValidator:
             else:
                 invalid_hospitals.append(cleaned_hospital)
                 
-            # Track issues
-            for issue in issues:
-                if issue not in self.validation_report['issues_found']:
-                    self.validation_report['issues_found'][issue] = 0
-                self.validation_report['issues_found'][issue] += 1
-                
             if (i + 1) % 500 == 0:
                 logger.info(f"Processed {i + 1} hospitals...")
         
@@ -308,46 +384,42 @@ class NABHDataValidator:
             return
             
         total = len(hospitals)
+        frame = flatten_records(hospitals, {'name': '', 'city': '', 'state': '', 'accreditation_number': '',
+                                            'valid_from_parsed': '', 'valid_upto_parsed': '',
+                                            'certification_status': ''})
+        
+        def percent_present(field, strip=True):
+            values = frame[field].str.strip() if strip else frame[field]
+            return int((values != '').sum()) / total * 100
+        
+        status = frame['certification_status']
         
         # Calculate completeness metrics
         metrics = {
             'completeness': {
-                'hospital_name': sum(1 for h in hospitals if h.get('name', '').strip()) / total * 100,
-                'city': sum(1 for h in hospitals if h.get('city', '').strip()) / total * 100,
-                'state': sum(1 for h in hospitals if h.get('state', '').strip()) / total * 100,
-                'accreditation_number': sum(1 for h in hospitals if h.get('accreditation_number', '').strip()) / total * 100,
-                'valid_from': sum(1 for h in hospitals if h.get('valid_from_parsed')) / total * 100,
-                'valid_upto': sum(1 for h in hospitals if h.get('valid_upto_parsed')) / total * 100,
+                'hospital_name': percent_present('name'),
+                'city': percent_present('city'),
+                'state': percent_present('state'),
+                'accreditation_number': percent_present('accreditation_number'),
+                'valid_from': percent_present('valid_from_parsed', strip=False),
+                'valid_upto': percent_present('valid_upto_parsed', strip=False),
             },
             'certification_status': {
-                'active': sum(1 for h in hospitals if h.get('certification_status') == 'Active'),
-                'expired': sum(1 for h in hospitals if h.get('certification_status') == 'Expired'),
-                'unknown': sum(1 for h in hospitals if h.get('certification_status') not in ['Active', 'Expired'])
+                'active': int((status == 'Active').sum()),
+                'expired': int((status == 'Expired').sum()),
+                'unknown': int((~status.isin(['Active', 'Expired'])).sum())
             },
             'geographic_distribution': {},
             'temporal_distribution': {}
         }
         
-        # Geographic distribution
-        state_counts = {}
-        for hospital in hospitals:
-            state = hospital.get('state', 'Unknown')
-            state_counts[state] = state_counts.get(state, 0) + 1
-        
+        # Geographic distribution (top 10 states; ties keep first-seen order)
+        state_counts = Counter(h.get('state', 'Unknown') for h in hospitals)
         metrics['geographic_distribution'] = dict(sorted(state_counts.items(), key=lambda x: x[1], reverse=True)[:10])
         
         # Temporal distribution (by year)
-        year_counts = {}
-        for hospital in hospitals:
-            valid_from = hospital.get('valid_from_parsed')
-            if valid_from:
-                try:
-                    year = datetime.strptime(valid_from, '%Y-%m-%d').year
-                    year_counts[year] = year_counts.get(year, 0) + 1
-                except ValueError:
-                    pass
-        
-        metrics['temporal_distribution'] = dict(sorted(year_counts.items()))
+        years = parse_dates(frame['valid_from_parsed']).dropna().dt.year
+        metrics['temporal_distribution'] = {int(year): int(count) for year, count in years.value_counts().sort_index().items()}
         
         self.validation_report['data_quality_metrics'] = metrics
     
@@ -11,6 +11,8 @@ from typing import Dict, List, Set, Any
 import os
 import glob
 
+from entity_resolution import EntityResolver, MatchPolicy
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -232,30 +234,29 @@ class NABHDatabaseIntegrator:
         else:
             return 'General Hospital'
     
+    def get_resolver(self) -> EntityResolver:
+        """Blocking index over Indian organizations in the main database"""
+        organizations = self.main_database['organizations']
+        resolver = getattr(self, '_resolver', None)
+        if resolver is None or len(resolver) != len(organizations):
+            # Exact name match, or name containment with the same city and state
+            resolver = EntityResolver(
+                organizations,
+                normalizer=lambda name: name.lower().strip(),
+                policy=MatchPolicy(containment_requires_location=True),
+                record_filter=lambda org: org.get('country') == 'India'
+            )
+            self._resolver = resolver
+        return resolver
+    
     def find_existing_hospital(self, nabh_hospital: Dict[str, Any]) -> Dict[str, Any]:
         """Find if hospital already exists in database"""
-        nabh_name = nabh_hospital.get('name', '').lower().strip()
-        nabh_city = nabh_hospital.get('city', '').lower().strip()
-        nabh_state = nabh_hospital.get('state', '').lower().strip()
-        
-        for existing in self.main_database['organizations']:
-            if existing.get('country') != 'India':
-                continue
-                
-            existing_name = existing.get('name', '').lower().strip()
-            existing_city = existing.get('city', '').lower().strip()
-            existing_state = existing.get('state', '').lower().strip()
-            
-            # Exact name match
-            if nabh_name == existing_name:
-                return existing
-            
-            # Name similarity with location match
-            if (nabh_city == existing_city and nabh_state == existing_state and
-                (nabh_name in existing_name or existing_name in nabh_name)):
-                return existing
-        
-        return None
+        decision = self.get_resolver().resolve(
+            nabh_hospital.get('name', ''),
+            city=nabh_hospital.get('city', ''),
+            state=nabh_hospital.get('state', '')
+        )
+        return decision.record if decision.matched else None
     
     def update_existing_hospital(self, existing: Dict[str, Any], nabh_hospital: Dict[str, Any]) -> Dict[str, Any]:
         """Update existing hospital with NABH certification data"""
@@ -369,6 +370,8 @@ class NABHDatabaseIntegrator:
                 # Add new hospital
                 standardized_hospital = self.standardize_nabh_hospital_format(nabh_hospital)
                 self.main_database['organizations'].append(standardized_hospital)
+                # Keep the match index in step so later NABH rows can match this one
+                self._resolver.add(standardized_hospital)
                 self.existing_names.add(name_key)
                 self.integration_stats['new_hospitals_added'] += 1
                 logger.debug(f"Added new hospital: {nabh_hospital.get('name', '')}")
@@ -4,7 +4,7 @@ Extracts accredited dental facilities information from NABH portal
 """
 
 import requests
-from bs4 import BeautifulSoup
+from html_parsing import make_soup, only
 import pandas as pd
 import json
 import time
@@ -26,7 +26,8 @@ class NABHDentalExtractor:
             response = self.session.get(self.base_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Only tables are read, so nothing else on the page is built
+            soup = make_soup(response.content, only('table'))
             
             # Find the table containing dental facilities data
             table = soup.find('table', {'id': 'GridView1'}) or soup.find('table', class_='table')
@@ -1,5 +1,6 @@
 import requests
 from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import json
 import logging
 from datetime import datetime
@@ -53,7 +54,7 @@ class NABHEntryLevelAnalyzer:
                 analysis_report['errors'].append(f"Failed to access portal: HTTP {response.status_code}")
                 return analysis_report
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Analyze page structure
             analysis_report['page_structure'] = self.analyze_page_structure(soup)
@@ -7,13 +7,17 @@ from datetime import datetime
 from typing import Dict, List, Optional
 import re
 import time
-import random
+
+from crawl_engine import CrawlPlugin, CrawlRequest, crawl
+from html_parsing import only
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class NABHEntryLevelScraper:
+class NABHEntryLevelScraper(CrawlPlugin):
+    crawl_name = "nabh_entry_level"
+
     def __init__(self):
         self.portal_url = "https://portal.nabh.co/frmViewAccreditedEntryLevelHosp.aspx"
         self.base_url = "https://portal.nabh.co"
@@ -31,29 +35,21 @@ class NABHEntryLevelScraper:
             'Cache-Control': 'no-cache',
             'Pragma': 'no-cache'
         })
+        self.crawl_headers = dict(self.session.headers)
 
-    def get_initial_page(self) -> BeautifulSoup:
-        """Get the initial page and extract ViewState"""
-        logger.info("Fetching initial NABH Entry Level portal page...")
+    def seeds(self):
+        yield CrawlRequest(self.portal_url, callback='parse_portal_page')
+
+    def parse_portal_page(self, response):
+        """Hospitals listed on the portal page (and the ViewState for later postbacks)"""
+        # Only the form fields and the data table are read
+        soup = response.soup(only('input', 'table'))
         
-        try:
-            response = self.session.get(self.portal_url, timeout=30)
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to access portal: HTTP {response.status_code}")
-                return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract ViewState and other ASP.NET form data
-            self.viewstate = self.extract_form_data(soup)
-            
-            logger.info("Successfully loaded initial page")
-            return soup
-            
-        except Exception as e:
-            logger.error(f"Error fetching initial page: {e}")
-            return None
+        # Extract ViewState and other ASP.NET form data
+        self.viewstate = self.extract_form_data(soup)
+        
+        logger.info("Successfully loaded initial page")
+        return self.extract_hospital_data_from_table(soup)
 
     def extract_form_data(self, soup: BeautifulSoup) -> Dict:
         """Extract ASP.NET form data for maintaining session state"""
@@ -309,14 +305,9 @@ class NABHEntryLevelScraper:
         logger.info("Starting NABH Entry Level hospitals scraping...")
         
         try:
-            # Get initial page
-            soup = self.get_initial_page()
-            if not soup:
-                logger.error("Failed to load initial page")
-                return []
-            
-            # Extract hospital data from table
-            hospitals = self.extract_hospital_data_from_table(soup)
+            # Fetch the portal page and extract hospital data from its table
+            logger.info("Fetching initial NABH Entry Level portal page...")
+            hospitals = crawl(self, rate_per_sec=0.5)
             
             if not hospitals:
                 logger.warning("No hospitals found in table")
@@ -1,6 +1,6 @@
 import requests
 import json
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import logging
 from datetime import datetime
 import re
@@ -34,7 +34,7 @@ class NABHWebsiteAnalyzer:
                 logger.error(f"Failed to access main page: {response.status_code}")
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             analysis = {
                 'page_title': soup.title.get_text() if soup.title else 'No title',
@@ -168,7 +168,7 @@ class NABHWebsiteAnalyzer:
             for params in test_params:
                 try:
                     response = self.session.get(self.search_url, params=params)
-                    soup = BeautifulSoup(response.content, 'html.parser')
+                    soup = make_soup(response.content)
                     
                     # Look for results
                     result_count = len(soup.find_all(['div', 'article'], 
@@ -233,7 +233,7 @@ class NABHWebsiteAnalyzer:
             logger.info("Extracting sample data from main page...")
             
             response = self.session.get(self.search_url)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Look for any organization data that might be displayed
             potential_orgs = []
@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 import logging
 
+from entity_resolution import EntityResolver, MatchPolicy
+
 class NABLDatabaseIntegrator:
     def __init__(self, nabl_data_file: str = None, unified_db_file: str = None):
         self.project_root = Path.cwd()
@@ -30,8 +32,13 @@ class NABLDatabaseIntegrator:
             'existing_organizations_updated': 0,
             'duplicates_merged': 0,
             'nabl_certifications_added': 0,
-            'total_organizations_final': 0
+            'total_organizations_final': 0,
+            'match_rules': {}
         }
+        
+        # Blocking index over the existing database (built on first lookup)
+        self._resolver = None
+        self._resolver_source = None
     
     def load_nabl_data(self) -> List[Dict[str, Any]]:
         """Load cleaned NABL data"""
@@ -121,27 +128,29 @@ class NABLDatabaseIntegrator:
         
         return name
     
+    def get_resolver(self, existing_orgs: List[Dict[str, Any]]) -> EntityResolver:
+        """Blocking index over existing organizations, rebuilt only when the list changes"""
+        if self._resolver is None or self._resolver_source is not existing_orgs or len(self._resolver) != len(existing_orgs):
+            # Exact match, or one name contains the other with 60% word overlap
+            self._resolver = EntityResolver(
+                existing_orgs,
+                normalizer=self.normalize_organization_name,
+                policy=MatchPolicy(containment_min_overlap=0.6)
+            )
+            self._resolver_source = existing_orgs
+        return self._resolver
+    
+    def match_organization(self, nabl_org: Dict[str, Any], existing_orgs: List[Dict[str, Any]]):
+        """Return the explainable MatchDecision for a NABL organization"""
+        decision = self.get_resolver(existing_orgs).resolve(nabl_org['organization_name'])
+        rules = self.stats.setdefault('match_rules', {})
+        rules[decision.rule] = rules.get(decision.rule, 0) + 1
+        return decision
+    
     def find_matching_organization(self, nabl_org: Dict[str, Any], existing_orgs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Find matching organization in existing database"""
-        nabl_name_normalized = self.normalize_organization_name(nabl_org['organization_name'])
-        
-        for existing_org in existing_orgs:
-            existing_name_normalized = self.normalize_organization_name(existing_org.get('name', ''))
-            
-            # Exact match
-            if nabl_name_normalized == existing_name_normalized:
-                return existing_org
-            
-            # Partial match (one contains the other)
-            if nabl_name_normalized and existing_name_normalized:
-                if (nabl_name_normalized in existing_name_normalized or 
-                    existing_name_normalized in nabl_name_normalized):
-                    # Additional check for significant overlap
-                    overlap_ratio = len(set(nabl_name_normalized.split()) & set(existing_name_normalized.split())) / max(len(nabl_name_normalized.split()), len(existing_name_normalized.split()))
-                    if overlap_ratio >= 0.6:  # 60% word overlap
-                        return existing_org
-        
-        return None
+        decision = self.match_organization(nabl_org, existing_orgs)
+        return decision.record if decision.matched else None
     
     def convert_nabl_to_unified_format(self, nabl_org: Dict[str, Any]) -> Dict[str, Any]:
         """Convert NABL organization to unified database format"""
@@ -306,11 +315,13 @@ class NABLDatabaseIntegrator:
         for nabl_org in nabl_organizations:
             try:
                 # Find matching organization
-                matching_org = self.find_matching_organization(nabl_org, existing_organizations)
+                decision = self.match_organization(nabl_org, existing_organizations)
                 
-                if matching_org:
+                if decision.matched:
                     # Merge with existing organization
-                    org_index = existing_organizations.index(matching_org)
+                    matching_org = decision.record
+                    org_index = decision.index
+                    self.logger.debug(f"{nabl_org.get('organization_name')}: {decision.explain()}")
                     if org_index not in processed_existing_ids:
                         integrated_organizations[org_index] = self.merge_organizations(matching_org, nabl_org)
                         processed_existing_ids.add(org_index)
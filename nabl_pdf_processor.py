@@ -8,12 +8,61 @@ import PyPDF2
 import pdfplumber
 import pandas as pd
 import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 import logging
 
+
+def _format_page_block(page_num: int, page_text: Optional[str], tables: List[List[List[Any]]], method: str = '') -> str:
+    """Render one page exactly as extract_text_from_pdf concatenates it"""
+    block = ""
+    if page_text:
+        block += f"\n--- PAGE {page_num}{method} ---\n"
+        block += page_text
+    for table_num, table in enumerate(tables or [], 1):
+        block += f"\n--- TABLE {page_num}-{table_num} ---\n"
+        for row in table:
+            if row and any(cell for cell in row if cell):
+                block += " | ".join(str(cell) if cell else "" for cell in row) + "\n"
+    return block
+
+
+def _extract_page_range(pdf_path: str, start_page: int, end_page: int) -> List[Dict[str, Any]]:
+    """Extract pages [start_page, end_page] (1-based) in a worker process.
+
+    Falls back to PyPDF2 text extraction for the range if pdfplumber fails.
+    """
+    records = []
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            for page_num in range(start_page, end_page + 1):
+                page = pdf.pages[page_num - 1]
+                page_text = page.extract_text()
+                tables = page.extract_tables() or []
+                records.append({
+                    'page': page_num,
+                    'text': _format_page_block(page_num, page_text, tables),
+                    'tables': len(tables)
+                })
+                # Release pdfplumber's per-page caches so memory stays bounded
+                page.flush_cache()
+    except Exception:
+        records = []
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page_num in range(start_page, end_page + 1):
+                page_text = pdf_reader.pages[page_num - 1].extract_text()
+                records.append({
+                    'page': page_num,
+                    'text': _format_page_block(page_num, page_text, [], ' (PyPDF2)'),
+                    'tables': 0
+                })
+    return records
+
 class NABLPDFProcessor:
     def __init__(self, pdf_path: str = None):
         self.pdf_path = pdf_path or "C:/Users/MANIKUMAR/Downloads/202402170534-NABL-600-doc-1.pdf"
@@ -36,7 +85,8 @@ class NABLPDFProcessor:
     
     def extract_text_from_pdf(self) -> str:
         """Extract text from PDF using multiple methods for better accuracy"""
-        text_content = ""
+        # Collect page blocks in a list and join once (avoids quadratic string +=)
+        blocks = []
         
         try:
             # Method 1: Using pdfplumber (better for tables and structured data)
@@ -46,24 +96,16 @@ class NABLPDFProcessor:
                 for page_num, page in enumerate(pdf.pages, 1):
                     self.logger.info(f"Processing page {page_num}")
                     
-                    # Extract text
+                    # Extract text and tables if present
                     page_text = page.extract_text()
-                    if page_text:
-                        text_content += f"\n--- PAGE {page_num} ---\n"
-                        text_content += page_text
-                    
-                    # Extract tables if present
                     tables = page.extract_tables()
                     if tables:
                         self.logger.info(f"Found {len(tables)} tables on page {page_num}")
-                        for table_num, table in enumerate(tables, 1):
-                            text_content += f"\n--- TABLE {page_num}-{table_num} ---\n"
-                            for row in table:
-                                if row and any(cell for cell in row if cell):
-                                    text_content += " | ".join(str(cell) if cell else "" for cell in row) + "\n"
+                    blocks.append(_format_page_block(page_num, page_text, tables))
                 
         except Exception as e:
             self.logger.warning(f"pdfplumber extraction failed: {e}")
+            blocks = []
             
             # Fallback: Using PyPDF2
             try:
@@ -72,55 +114,191 @@ class NABLPDFProcessor:
                     self.logger.info(f"Fallback: PDF has {len(pdf_reader.pages)} pages")
                     
                     for page_num, page in enumerate(pdf_reader.pages, 1):
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_content += f"\n--- PAGE {page_num} (PyPDF2) ---\n"
-                            text_content += page_text
+                        blocks.append(_format_page_block(page_num, page.extract_text(), [], ' (PyPDF2)'))
                             
             except Exception as e2:
                 self.logger.error(f"Both PDF extraction methods failed: {e2}")
                 return ""
         
-        return text_content
+        return "".join(blocks)
     
     def parse_organization_data(self, text_content: str) -> List[Dict[str, Any]]:
         """Parse organization data from extracted text"""
-        organizations = []
-        lines = text_content.split('\n')
+        parser_state = {'in_table': False, 'table_headers': []}
+        organizations = list(self.iter_parsed_organizations(text_content.split('\n'), parser_state))
         
-        current_org = {}
-        in_table = False
-        table_headers = []
+        self.logger.info(f"Extracted {len(organizations)} organizations from PDF")
+        return organizations
+    
+    def iter_parsed_organizations(self, lines, parser_state: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield organizations from lines, carrying table state across calls.
         
-        for line_num, line in enumerate(lines):
+        parser_state holds 'in_table' and 'table_headers' so that pages can be
+        fed one at a time and still parse exactly like the concatenated text.
+        """
+        for line in lines:
             line = line.strip()
             if not line:
                 continue
             
             # Detect table headers
             if 'S.No' in line or 'Organization' in line or 'Laboratory' in line:
-                in_table = True
-                table_headers = [col.strip() for col in line.split('|') if col.strip()]
-                self.logger.info(f"Found table headers: {table_headers}")
+                parser_state['in_table'] = True
+                parser_state['table_headers'] = [col.strip() for col in line.split('|') if col.strip()]
+                self.logger.debug(f"Found table headers: {parser_state['table_headers']}")
                 continue
             
             # Process table rows
-            if in_table and '|' in line:
+            if parser_state['in_table'] and '|' in line:
                 row_data = [col.strip() for col in line.split('|') if col.strip()]
                 
                 if len(row_data) >= 2:  # At least organization name and some data
-                    org_data = self.extract_organization_info(row_data, table_headers)
+                    org_data = self.extract_organization_info(row_data, parser_state['table_headers'])
                     if org_data:
-                        organizations.append(org_data)
+                        yield org_data
                 continue
             
             # Process non-table format
             org_info = self.extract_organization_from_line(line)
             if org_info:
-                organizations.append(org_info)
+                yield org_info
+    
+    def get_page_count(self) -> int:
+        """Return the number of pages in the PDF"""
+        try:
+            with pdfplumber.open(self.pdf_path) as pdf:
+                return len(pdf.pages)
+        except Exception:
+            with open(self.pdf_path, 'rb') as file:
+                return len(PyPDF2.PdfReader(file).pages)
+    
+    def iter_page_records(self, start_page: int = 1, workers: Optional[int] = None,
+                          pages_per_task: int = 8) -> Iterator[Dict[str, Any]]:
+        """Yield per-page records in page order, extracted by a process pool.
+        
+        Page ranges are submitted through a sliding window of at most two tasks
+        per worker, so only a bounded number of extracted pages is ever held in
+        memory regardless of PDF size.
+        """
+        total_pages = self.get_page_count()
+        ranges: List[Tuple[int, int]] = [
+            (start, min(start + pages_per_task - 1, total_pages))
+            for start in range(start_page, total_pages + 1, pages_per_task)
+        ]
+        if not ranges:
+            return
+        workers = workers or min(os.cpu_count() or 1, len(ranges))
+        self.logger.info(f"Extracting pages {start_page}-{total_pages} with {workers} worker processes")
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            window = []
+            next_range = 0
+            while next_range < len(ranges) or window:
+                while next_range < len(ranges) and len(window) < workers * 2:
+                    start, end = ranges[next_range]
+                    window.append(executor.submit(_extract_page_range, self.pdf_path, start, end))
+                    next_range += 1
+                for record in window.pop(0).result():
+                    yield record
+    
+    def process_pdf_streaming(self, output_path: str = None, workers: Optional[int] = None,
+                              pages_per_task: int = 8, resume: bool = True) -> Dict[str, Any]:
+        """Extract the PDF page-parallel and write organizations to JSONL incrementally.
+        
+        A checkpoint file next to the output records the last completed page and
+        the parser state, so an interrupted run restarts from the next page and
+        appends to the same JSONL file. Duplicates are skipped using the same
+        lower-cased name rule as remove_duplicates.
+        
+        Returns:
+            Run statistics including the output and checkpoint paths
+        """
+        if not Path(self.pdf_path).exists():
+            self.logger.error(f"PDF file not found: {self.pdf_path}")
+            return {'success': False, 'error': 'PDF file not found'}
         
-        self.logger.info(f"Extracted {len(organizations)} organizations from PDF")
-        return organizations
+        output_path = Path(output_path or self.project_root / "nabl_pdf_extracted_data.jsonl")
+        checkpoint_path = output_path.with_suffix(output_path.suffix + '.checkpoint.json')
+        
+        parser_state = {'in_table': False, 'table_headers': []}
+        last_page = 0
+        seen_names = set()
+        checkpoint = self._read_checkpoint(checkpoint_path) if resume and output_path.exists() else None
+        if checkpoint is not None:
+            last_page = checkpoint.get('last_page', 0)
+            parser_state = checkpoint.get('parser_state', parser_state)
+            # Rebuild the dedupe set from what was already written, line by line
+            valid_bytes = 0
+            with open(output_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        org = json.loads(line)
+                    except ValueError:
+                        break  # Partial trailing line from an interrupted write
+                    seen_names.add(org['organization_name'].lower().strip())
+                    valid_bytes += len(line.encode('utf-8'))
+            with open(output_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+            self.logger.info(f"Resuming after page {last_page} with {len(seen_names)} organizations already written")
+        else:
+            output_path.write_text('', encoding='utf-8')
+        
+        written = 0
+        duplicates = 0
+        pages = 0
+        with open(output_path, 'a', encoding='utf-8') as out:
+            for record in self.iter_page_records(last_page + 1, workers, pages_per_task):
+                for org in self.iter_parsed_organizations(record['text'].split('\n'), parser_state):
+                    key = org['organization_name'].lower().strip()
+                    if key in seen_names:
+                        duplicates += 1
+                        continue
+                    seen_names.add(key)
+                    out.write(json.dumps(org, ensure_ascii=False) + '\n')
+                    written += 1
+                out.flush()
+                pages += 1
+                # Atomic replace: a kill mid-write leaves the previous checkpoint intact
+                tmp_path = checkpoint_path.with_suffix(checkpoint_path.suffix + '.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'last_page': record['page'], 'parser_state': parser_state,
+                               'updated': datetime.now().isoformat()}, f)
+                os.replace(tmp_path, checkpoint_path)
+        
+        self.logger.info(f"Streamed {written} organizations from {pages} pages to {output_path}")
+        return {
+            'success': True,
+            'output_path': str(output_path),
+            'checkpoint_path': str(checkpoint_path),
+            'pages_processed': pages,
+            'resumed_from_page': last_page,
+            'organizations_written': written,
+            'duplicates_skipped': duplicates,
+            'total_organizations': len(seen_names)
+        }
+    
+    def _read_checkpoint(self, checkpoint_path: Path) -> Optional[Dict[str, Any]]:
+        """Checkpoint of an earlier run; None if there is none or it cannot be read (start over)"""
+        if not checkpoint_path.exists():
+            return None
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if isinstance(checkpoint, dict) and isinstance(checkpoint.get('last_page', 0), int):
+                return checkpoint
+        except (OSError, ValueError):
+            pass
+        self.logger.warning(f"Ignoring unreadable checkpoint {checkpoint_path}; starting from page 0")
+        return None
+    
+    @staticmethod
+    def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+        """Stream organizations back from a JSONL file written by process_pdf_streaming"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
     
     def extract_organization_info(self, row_data: List[str], headers: List[str]) -> Optional[Dict[str, Any]]:
         """Extract organization information from table row"""
@@ -362,14 +540,26 @@ class NABLPDFProcessor:
 def main():
     import sys
     
-    # Get PDF path from command line or use default
-    pdf_path = sys.argv[1] if len(sys.argv) > 1 else None
+    # Get PDF path from command line or use default; --parallel streams JSONL page by page
+    args = [a for a in sys.argv[1:] if a != '--parallel']
+    parallel = '--parallel' in sys.argv[1:]
+    pdf_path = args[0] if args else None
     
     processor = NABLPDFProcessor(pdf_path)
     
     print("🔍 NABL PDF Processing Started")
     print("=" * 50)
     
+    if parallel:
+        stats = processor.process_pdf_streaming()
+        if stats.get('success'):
+            print(f"✅ Streamed {stats['total_organizations']} organizations "
+                  f"({stats['pages_processed']} pages, resumed after page {stats['resumed_from_page']})")
+            print(f"   • JSONL Output: {stats['output_path']}")
+        else:
+            print(f"❌ {stats.get('error', 'Extraction failed')}")
+        return
+    
     # Process the PDF
     organizations = processor.process_pdf()
     
@@ -1,23 +1,26 @@
 import requests
 import json
 import csv
-import time
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 import re
-import random
 from urllib.parse import urljoin, quote
 
+from crawl_engine import CrawlPlugin, CrawlRequest, crawl
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class OptimizedNABHScraper:
+class OptimizedNABHScraper(CrawlPlugin):
+    crawl_name = "nabh_optimized"
+
     def __init__(self):
         self.base_url = "https://nabh.co"
         self.search_endpoint = "https://nabh.co/search/ajax"
         self.organizations = []
+        self.crawl_stats = {}
         
         # Session for maintaining cookies and headers
         self.session = requests.Session()
@@ -31,6 +34,8 @@ class OptimizedNABHScraper:
             'Referer': 'https://nabh.co/find-a-healthcare-organisation/',
             'Origin': 'https://nabh.co'
         })
+        # Crawl engine requests use the same headers as the session
+        self.crawl_headers = dict(self.session.headers)
         
         # Search parameters to try
         self.search_terms = [
@@ -268,113 +273,62 @@ class OptimizedNABHScraper:
             logger.error(f"Error extracting organization from HTML: {e}")
             return None
 
+    def _search_request(self, search_term: str = "", state: str = "", city: str = "",
+                        page: int = 1, max_pages: int = 1, min_results: int = 0) -> CrawlRequest:
+        """Crawl request for one page of the search API"""
+        params = {'search': search_term, 'state': state, 'city': city, 'page': page, 'per_page': 50}
+        params = {k: v for k, v in params.items() if v}
+        label = f"term '{search_term}'" if search_term else f"state {state}" if state else f"city {city}" if city else "all"
+        return CrawlRequest(self.search_endpoint, params=params, callback='parse_search_page',
+                            meta={'search_term': search_term, 'state': state, 'city': city, 'page': page,
+                                  'max_pages': max_pages, 'min_results': min_results, 'label': label})
+
+    def seeds(self):
+        """First page of every search strategy; later pages follow from parse_search_page"""
+        # Strategy 1: Search with empty parameters to get all
+        yield self._search_request(max_pages=20, min_results=10)
+        # Strategy 2: Search by states (limit for efficiency)
+        for state in self.states[:10]:
+            if state:
+                yield self._search_request(state=state, max_pages=5, min_results=5)
+        # Strategy 3: Search by terms
+        for term in self.search_terms[:8]:
+            if term:
+                yield self._search_request(search_term=term, max_pages=3, min_results=5)
+        # Strategy 4: Search by major cities (first page only)
+        for city in self.cities[:15]:
+            if city:
+                yield self._search_request(city=city)
+
+    def parse_search_page(self, response):
+        """Organizations from one search page, plus the next page while more are available"""
+        try:
+            result = response.json()
+        except ValueError:
+            # If not JSON, try to parse HTML response
+            result = self.parse_html_response(response.text)
+        meta = response.request.meta
+        orgs = result.get('organizations') if isinstance(result, dict) else None
+        if not orgs:
+            return
+        logger.info(f"{meta['label'].capitalize()}, Page {meta['page']}: Found {len(orgs)} organizations")
+        yield from orgs
+        if (meta['page'] < meta['max_pages'] and result.get('has_more', False)
+                and len(orgs) >= meta['min_results']):
+            yield self._search_request(meta['search_term'], meta['state'], meta['city'], meta['page'] + 1,
+                                       meta['max_pages'], meta['min_results'])
+
     def comprehensive_search(self):
-        """Perform comprehensive search using various combinations"""
+        """Perform comprehensive search using various combinations (strategies crawl concurrently)"""
         logger.info("Starting comprehensive NABH API-based search...")
         
         all_organizations = []
-        search_count = 0
-        
         try:
-            # Strategy 1: Search with empty parameters to get all
-            logger.info("Searching with empty parameters...")
-            for page in range(1, 21):  # Try up to 20 pages
-                result = self.search_organizations_api(page=page)
-                
-                if result and 'organizations' in result:
-                    orgs = result['organizations']
-                    if orgs:
-                        all_organizations.extend(orgs)
-                        logger.info(f"Page {page}: Found {len(orgs)} organizations")
-                        search_count += 1
-                        
-                        if not result.get('has_more', False) or len(orgs) < 10:
-                            break
-                    else:
-                        break
-                else:
-                    break
-                
-                time.sleep(random.uniform(1, 2))
-            
-            # Strategy 2: Search by states
-            for i, state in enumerate(self.states[:10]):  # Limit for efficiency
-                if not state:  # Skip empty state
-                    continue
-                    
-                logger.info(f"Searching in state: {state} ({i+1}/{min(10, len(self.states))})")
-                
-                for page in range(1, 6):  # Up to 5 pages per state
-                    result = self.search_organizations_api(state=state, page=page)
-                    
-                    if result and 'organizations' in result:
-                        orgs = result['organizations']
-                        if orgs:
-                            all_organizations.extend(orgs)
-                            logger.info(f"State {state}, Page {page}: Found {len(orgs)} organizations")
-                            search_count += 1
-                            
-                            if not result.get('has_more', False) or len(orgs) < 5:
-                                break
-                        else:
-                            break
-                    else:
-                        break
-                    
-                    time.sleep(random.uniform(0.5, 1.5))
-                
-                time.sleep(random.uniform(1, 2))
-            
-            # Strategy 3: Search by terms
-            for i, term in enumerate(self.search_terms[:8]):  # Limit for efficiency
-                if not term:  # Skip empty term
-                    continue
-                    
-                logger.info(f"Searching with term: {term} ({i+1}/{min(8, len(self.search_terms))})")
-                
-                for page in range(1, 4):  # Up to 3 pages per term
-                    result = self.search_organizations_api(search_term=term, page=page)
-                    
-                    if result and 'organizations' in result:
-                        orgs = result['organizations']
-                        if orgs:
-                            all_organizations.extend(orgs)
-                            logger.info(f"Term '{term}', Page {page}: Found {len(orgs)} organizations")
-                            search_count += 1
-                            
-                            if not result.get('has_more', False) or len(orgs) < 5:
-                                break
-                        else:
-                            break
-                    else:
-                        break
-                    
-                    time.sleep(random.uniform(0.5, 1.5))
-                
-                time.sleep(random.uniform(1, 2))
-            
-            # Strategy 4: Search by major cities
-            for i, city in enumerate(self.cities[:15]):  # Limit for efficiency
-                if not city:  # Skip empty city
-                    continue
-                    
-                logger.info(f"Searching in city: {city} ({i+1}/{min(15, len(self.cities))})")
-                
-                result = self.search_organizations_api(city=city)
-                
-                if result and 'organizations' in result:
-                    orgs = result['organizations']
-                    if orgs:
-                        all_organizations.extend(orgs)
-                        logger.info(f"City {city}: Found {len(orgs)} organizations")
-                        search_count += 1
-                
-                time.sleep(random.uniform(0.5, 1.5))
-            
+            all_organizations = crawl(self, rate_per_sec=1.0, per_domain_concurrency=2)
         except Exception as e:
             logger.error(f"Error in comprehensive search: {e}")
         
-        logger.info(f"Completed {search_count} API calls")
+        logger.info(f"Completed {self.crawl_stats.get('requests', 0)} API calls")
         
         # Remove duplicates and clean data
         self.organizations = self.remove_duplicates_and_clean(all_organizations)
@@ -6,13 +6,13 @@ Google Reviews, Facebook, Twitter/X, Healthgrades, and Yelp for real-time scorin
 
 import requests
 import json
-import time
 import re
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-import statistics
-from textblob import TextBlob
+from feedback_pipeline import (
+    FeedbackAggregateCache, RateLimiter, compute_feedback_aggregates, fetch_platforms, get_sentiment_model
+)
 import logging
 
 # Configure logging
@@ -60,6 +60,12 @@ class PatientFeedbackAnalyzer:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         
+        # Platforms are fetched concurrently; requests to the same platform stay
+        # at least 1s apart. Sentiment uses the shared cached lexicon model.
+        self.rate_limiter = RateLimiter(rate_per_sec=1.0, burst=1)
+        self.sentiment_model = get_sentiment_model()
+        self.summary_cache = FeedbackAggregateCache(ttl_seconds=3600)
+        
         # Initialize data validator for organization validation
         try:
             from data_validator import HealthcareDataValidator
@@ -127,19 +133,11 @@ class PatientFeedbackAnalyzer:
             return []
         
         all_feedback = []
+        results = fetch_platforms(self.platforms, organization_name, location, rate_limiter=self.rate_limiter)
+        for feedback_list in results.values():
+            all_feedback.extend(feedback_list or [])
         
-        for platform_name, scraper_func in self.platforms.items():
-            try:
-                logger.info(f"Scraping {platform_name} for {organization_name}")
-                feedback_list = scraper_func(organization_name, location)
-                all_feedback.extend(feedback_list)
-                
-                # Rate limiting to avoid being blocked
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error scraping {platform_name}: {str(e)}")
-        
+        self._score_sentiment_batch(all_feedback)
         return all_feedback
     
     def analyze_feedback_summary(self, organization_name: str, location: str = "") -> FeedbackSummary:
@@ -153,6 +151,10 @@ class PatientFeedbackAnalyzer:
         Returns:
             FeedbackSummary with aggregated feedback data
         """
+        cached = self.summary_cache.get(organization_name, location)
+        if cached is not None:
+            return cached
+        
         all_feedback = self.get_patient_feedback_data(organization_name, location)
         
         if not all_feedback:
@@ -164,7 +166,9 @@ class PatientFeedbackAnalyzer:
         for feedback in all_feedback:
             platform_counts[feedback.platform] = platform_counts.get(feedback.platform, 0) + 1
         
-        return self._analyze_feedback(organization_name, all_feedback, platform_counts)
+        summary = self._analyze_feedback(organization_name, all_feedback, platform_counts)
+        self.summary_cache.put(organization_name, location, summary)
+        return summary
     
     def _scrape_google_reviews(self, org_name: str, location: str) -> List[PatientFeedback]:
         """Scrape Google Reviews using simulation for demonstration"""
@@ -175,14 +179,12 @@ class PatientFeedbackAnalyzer:
             simulated_reviews = self._generate_simulated_google_reviews(org_name)
             
             for review_data in simulated_reviews:
-                sentiment = self._analyze_sentiment(review_data['text'])
-                
                 feedback = PatientFeedback(
                     organization_name=org_name,
                     platform='google',
                     rating=review_data['rating'],
                     feedback_text=review_data['text'],
-                    sentiment_score=sentiment,
+                    sentiment_score=0.0,
                     timestamp=review_data['date'],
                     reviewer_name=review_data.get('author', 'Anonymous'),
                     verified=True
@@ -202,14 +204,12 @@ class PatientFeedbackAnalyzer:
             simulated_reviews = self._generate_simulated_facebook_reviews(org_name)
             
             for review_data in simulated_reviews:
-                sentiment = self._analyze_sentiment(review_data['text'])
-                
                 feedback = PatientFeedback(
                     organization_name=org_name,
                     platform='facebook',
                     rating=review_data.get('rating'),
                     feedback_text=review_data['text'],
-                    sentiment_score=sentiment,
+                    sentiment_score=0.0,
                     timestamp=review_data['date'],
                     reviewer_name=review_data.get('author', 'Anonymous'),
                     verified=False
@@ -229,14 +229,12 @@ class PatientFeedbackAnalyzer:
             simulated_tweets = self._generate_simulated_twitter_mentions(org_name)
             
             for tweet_data in simulated_tweets:
-                sentiment = self._analyze_sentiment(tweet_data['text'])
-                
                 feedback = PatientFeedback(
                     organization_name=org_name,
                     platform='twitter',
                     rating=None,  # Twitter doesn't have ratings
                     feedback_text=tweet_data['text'],
-                    sentiment_score=sentiment,
+                    sentiment_score=0.0,
                     timestamp=tweet_data['date'],
                     reviewer_name=tweet_data.get('author', 'Anonymous'),
                     verified=tweet_data.get('verified', False)
@@ -256,14 +254,12 @@ class PatientFeedbackAnalyzer:
             simulated_reviews = self._generate_simulated_healthgrades_reviews(org_name)
             
             for review_data in simulated_reviews:
-                sentiment = self._analyze_sentiment(review_data['text'])
-                
                 feedback = PatientFeedback(
                     organization_name=org_name,
                     platform='healthgrades',
                     rating=review_data['rating'],
                     feedback_text=review_data['text'],
-                    sentiment_score=sentiment,
+                    sentiment_score=0.0,
                     timestamp=review_data['date'],
                     reviewer_name=review_data.get('author', 'Anonymous'),
                     verified=True
@@ -283,14 +279,12 @@ class PatientFeedbackAnalyzer:
             simulated_reviews = self._generate_simulated_yelp_reviews(org_name)
             
             for review_data in simulated_reviews:
-                sentiment = self._analyze_sentiment(review_data['text'])
-                
                 feedback = PatientFeedback(
                     organization_name=org_name,
                     platform='yelp',
                     rating=review_data['rating'],
                     feedback_text=review_data['text'],
-                    sentiment_score=sentiment,
+                    sentiment_score=0.0,
                     timestamp=review_data['date'],
                     reviewer_name=review_data.get('author', 'Anonymous'),
                     verified=False
@@ -303,35 +297,37 @@ class PatientFeedbackAnalyzer:
         return feedback_list
     
     def _analyze_sentiment(self, text: str) -> float:
-        """Analyze sentiment of review text using TextBlob"""
+        """Analyze sentiment of a single review text (-1 negative to 1 positive)"""
         try:
-            blob = TextBlob(text)
-            # TextBlob returns polarity from -1 (negative) to 1 (positive)
-            return blob.sentiment.polarity
+            return self.sentiment_model.polarity(text)
         except Exception as e:
             logger.error(f"Sentiment analysis error: {str(e)}")
             return 0.0
+
+    def _score_sentiment_batch(self, feedback_list: List[PatientFeedback]) -> None:
+        """Score sentiment for all scraped feedback in one vectorized batch (scrapers leave it at 0.0)"""
+        if not feedback_list:
+            return
+        try:
+            scores = self.sentiment_model.polarity_batch(f.feedback_text for f in feedback_list)
+        except Exception as e:
+            logger.error(f"Sentiment analysis error: {str(e)}")
+            return
+        for feedback, score in zip(feedback_list, scores.tolist()):
+            feedback.sentiment_score = score
     
     def _analyze_feedback(self, org_name: str, feedback_list: List[PatientFeedback], 
                          platform_counts: Dict[str, int]) -> FeedbackSummary:
         """Analyze all collected feedback and create summary"""
         
-        # Calculate metrics
-        total_reviews = len(feedback_list)
-        
-        # Average rating (only from platforms that provide ratings)
-        ratings = [f.rating for f in feedback_list if f.rating is not None]
-        avg_rating = statistics.mean(ratings) if ratings else 0.0
-        
-        # Overall sentiment score
-        sentiment_scores = [f.sentiment_score for f in feedback_list]
-        overall_sentiment = statistics.mean(sentiment_scores) if sentiment_scores else 0.0
-        
-        # Calculate trend based on recent vs older reviews
-        recent_trend = self._calculate_trend(feedback_list)
-        
-        # Confidence score based on volume and recency
-        confidence = self._calculate_confidence_score(feedback_list)
+        # Rating, sentiment, trend (recent vs older reviews) and confidence
+        # (volume, recency, platform diversity) in one numpy pass
+        aggregates = self._aggregate(feedback_list)
+        total_reviews = aggregates['count']
+        avg_rating = aggregates['average_rating']
+        overall_sentiment = aggregates['sentiment_score']
+        recent_trend = aggregates['recent_trend']
+        confidence = aggregates['confidence_score']
         
         # Calculate trend score for compatibility
         trend_scores = {
@@ -353,54 +349,22 @@ class PatientFeedbackAnalyzer:
             trend_score=trend_score
         )
     
+    def _aggregate(self, feedback_list: List[PatientFeedback]):
+        """Numpy aggregates over sentiment, ratings and timestamps (see feedback_pipeline)"""
+        return compute_feedback_aggregates(
+            [f.sentiment_score for f in feedback_list],
+            [f.rating for f in feedback_list],
+            [f.timestamp for f in feedback_list],
+            [f.platform for f in feedback_list]
+        )
+    
     def _calculate_trend(self, feedback_list: List[PatientFeedback]) -> str:
         """Calculate if sentiment is improving, stable, or declining"""
-        if len(feedback_list) < 4:
-            return 'stable'
-        
-        # Sort by timestamp
-        sorted_feedback = sorted(feedback_list, key=lambda x: x.timestamp)
-        
-        # Split into recent and older halves
-        mid_point = len(sorted_feedback) // 2
-        older_half = sorted_feedback[:mid_point]
-        recent_half = sorted_feedback[mid_point:]
-        
-        # Calculate average sentiment for each half
-        older_sentiment = statistics.mean([f.sentiment_score for f in older_half])
-        recent_sentiment = statistics.mean([f.sentiment_score for f in recent_half])
-        
-        # Determine trend
-        difference = recent_sentiment - older_sentiment
-        
-        if difference > 0.1:
-            return 'improving'
-        elif difference < -0.1:
-            return 'declining'
-        else:
-            return 'stable'
+        return self._aggregate(feedback_list)['recent_trend']
     
     def _calculate_confidence_score(self, feedback_list: List[PatientFeedback]) -> float:
         """Calculate confidence score based on review volume and recency"""
-        if not feedback_list:
-            return 0.0
-        
-        # Volume factor (more reviews = higher confidence)
-        volume_factor = min(len(feedback_list) / 50.0, 1.0)  # Max at 50 reviews
-        
-        # Recency factor (recent reviews = higher confidence)
-        now = datetime.now()
-        recent_reviews = [f for f in feedback_list 
-                         if (now - f.timestamp).days <= 90]  # Last 90 days
-        recency_factor = len(recent_reviews) / len(feedback_list)
-        
-        # Platform diversity factor
-        platforms = set(f.platform for f in feedback_list)
-        diversity_factor = min(len(platforms) / 3.0, 1.0)  # Max at 3 platforms
-        
-        # Combined confidence score
-        confidence = (volume_factor * 0.4 + recency_factor * 0.4 + diversity_factor * 0.2)
-        return min(confidence, 1.0)
+        return self._aggregate(feedback_list)['confidence_score']
     
     def _create_empty_summary(self, org_name: str) -> FeedbackSummary:
         """Create empty summary when no feedback is found"""
@@ -0,0 +1,568 @@
+"""
+Recommendation Rules for QuXAT Healthcare Quality Grid
+Rule tables behind the improvement recommendations shown with each search result.
+
+Recommendations depend on an organization only through a small profile:
+
+- gaps:   bitmask over KEY_CERTIFICATIONS missing from its active certifications
+- band:   bitmask over SCORE_THRESHOLDS its scores fall below
+- region: bitmask over REGION_FLAGS (multi-location, major Indian metro)
+
+Each rule is (section, condition on the profile, item). A profile is compiled
+once into the ids of the rules it matches and memoized, so rendering
+recommendations is a lookup plus the per-organization score_potential numbers.
+Batch scoring precomputes the profiles of every scored organization into
+recommendation_profiles.json; the file is ignored when the rules have changed
+since it was written.
+
+Items are shared between organizations with the same profile and must not be
+modified by callers.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+RECOMMENDATIONS_FILE = 'recommendation_profiles.json'
+PROFILES_FORMAT_VERSION = 1
+
+# Scoring ceilings used for score_potential (75 certification + 35 quality initiatives)
+MAX_POSSIBLE_SCORE = 110
+MAX_CERTIFICATION_SCORE = 75
+MAX_QUALITY_INITIATIVES_SCORE = 35
+
+SECTIONS = ('priority_actions', 'certification_gaps', 'quality_initiatives',
+            'operational_improvements', 'strategic_recommendations')
+INTERNATIONAL_SECTIONS = ('priority_actions', 'certification_opportunities', 'quality_initiatives',
+                          'international_expansion')
+
+# Key certifications, matched as a case-insensitive substring of an active certification name
+KEY_CERTIFICATIONS = (
+    # MANDATORY ISO STANDARDS (Critical Priority)
+    ('CAP', {
+        'name': 'College of American Pathologists (CAP) Laboratory Accreditation',
+        'priority': 'Critical',
+        'score_impact': '15 points penalty if missing',
+        'description': 'MANDATORY: International laboratory quality standard - highest penalty for missing',
+        'prerequisites': ['Laboratory quality management system', 'Proficiency testing', 'Quality control procedures', 'Staff competency assessment']
+    }),
+    ('ISO 9001', {
+        'name': 'ISO 9001:2015 Quality Management System',
+        'priority': 'Critical',
+        'score_impact': '8 points penalty if missing',
+        'description': 'MANDATORY: International quality management standard - foundation for healthcare quality',
+        'prerequisites': ['Quality management system', 'Process documentation', 'Internal audits', 'Management review']
+    }),
+    ('ISO 15189', {
+        'name': 'ISO 15189:2012 Medical Laboratory Quality and Competence',
+        'priority': 'Critical',
+        'score_impact': '10 points penalty if missing',
+        'description': 'MANDATORY: Specific standard for medical laboratory quality and competence',
+        'prerequisites': ['Laboratory quality system', 'Technical competence', 'Quality control', 'Proficiency testing']
+    }),
+    ('ISO 27001', {
+        'name': 'ISO 27001:2013 Information Security Management',
+        'priority': 'Critical',
+        'score_impact': '12 points penalty if missing',
+        'description': 'MANDATORY: Information security management system - critical for patient data protection',
+        'prerequisites': ['Information security policy', 'Risk assessment', 'Security controls', 'Incident management']
+    }),
+    ('ISO 45001', {
+        'name': 'ISO 45001:2018 Occupational Health and Safety Management',
+        'priority': 'Critical',
+        'score_impact': '10 points penalty if missing',
+        'description': 'MANDATORY: Occupational health and safety management system for healthcare workers',
+        'prerequisites': ['OH&S policy', 'Hazard identification', 'Risk assessment', 'Emergency procedures']
+    }),
+    ('ISO 13485', {
+        'name': 'ISO 13485:2016 Medical Devices Quality Management',
+        'priority': 'Critical',
+        'score_impact': '8 points penalty if missing',
+        'description': 'MANDATORY: Quality management system for medical devices and equipment',
+        'prerequisites': ['Medical device quality system', 'Design controls', 'Risk management', 'Post-market surveillance']
+    }),
+    ('ISO 14001', {
+        'name': 'ISO 14001:2015 Environmental Management System',
+        'priority': 'Critical',
+        'score_impact': '6 points penalty if missing',
+        'description': 'MANDATORY: Environmental management system for sustainable healthcare operations',
+        'prerequisites': ['Environmental policy', 'Waste management system', 'Energy efficiency measures', 'Environmental monitoring']
+    }),
+    # RECOMMENDED HIGH-VALUE CERTIFICATIONS
+    ('JCI', {
+        'name': 'Joint Commission International Hospital Accreditation',
+        'priority': 'Critical',
+        'score_impact': '12 points penalty if missing',
+        'description': 'MANDATORY: Global gold standard for healthcare quality and patient safety',
+        'prerequisites': ['Strong quality management system', 'Staff training programs', 'Patient safety protocols', 'Performance improvement']
+    }),
+    ('NABH', {
+        'name': 'National Accreditation Board for Hospitals & Healthcare Providers',
+        'priority': 'Critical',
+        'score_impact': '15-20 points bonus',
+        'description': 'RECOMMENDED: National standard for healthcare quality in India',
+        'prerequisites': ['Quality policy', 'Patient rights charter', 'Infection control protocols', 'Clinical governance']
+    }),
+    ('NABL', {
+        'name': 'National Accreditation Board for Testing and Calibration Laboratories',
+        'priority': 'Critical',
+        'score_impact': '10 points penalty if missing',
+        'description': 'MANDATORY: Laboratory accreditation for diagnostic services',
+        'prerequisites': ['Laboratory quality system', 'Calibrated equipment', 'Trained technicians', 'Quality control']
+    }),
+    ('ISO 50001', {
+        'name': 'ISO 50001:2018 Energy Management System',
+        'priority': 'Critical',
+        'score_impact': '6 points penalty if missing',
+        'description': 'MANDATORY: Energy management system for operational efficiency',
+        'prerequisites': ['Energy policy', 'Energy planning', 'Energy monitoring', 'Continuous improvement']
+    }),
+)
+
+# Score thresholds: (name, predicate on (total, certification, quality initiatives, active certifications))
+SCORE_THRESHOLDS = (
+    ('certification_below_50', lambda total, cert, quality, active: cert < 50),
+    ('quality_below_15', lambda total, cert, quality, active: quality < 15),
+    ('quality_below_20', lambda total, cert, quality, active: quality < 20),
+    ('fewer_than_3_active', lambda total, cert, quality, active: active < 3),
+    ('total_below_70', lambda total, cert, quality, active: total < 70),
+    ('total_below_80', lambda total, cert, quality, active: total < 80),
+)
+REGION_FLAGS = ('has_branches', 'major_indian_metro')
+MAJOR_INDIAN_METROS = ('chennai', 'bangalore', 'mumbai', 'delhi')
+
+# International recommendations: total score bands (upper bound exclusive) and certification groups
+INTERNATIONAL_BANDS = (('below_30', 30), ('below_60', 60), ('60_and_above', None))
+INTERNATIONAL_GROUPS = ('GLOBAL_GOLD', 'ISO_STANDARDS')
+
+
+def _bit(names: Tuple[str, ...], name: str) -> int:
+    return 1 << names.index(name)
+
+
+_THRESHOLD_NAMES = tuple(name for name, _ in SCORE_THRESHOLDS)
+_KEY_NAMES_UPPER = tuple(key.upper() for key, _ in KEY_CERTIFICATIONS)
+CERTIFICATION_BELOW_50 = _bit(_THRESHOLD_NAMES, 'certification_below_50')
+QUALITY_BELOW_15 = _bit(_THRESHOLD_NAMES, 'quality_below_15')
+QUALITY_BELOW_20 = _bit(_THRESHOLD_NAMES, 'quality_below_20')
+FEWER_THAN_3_ACTIVE = _bit(_THRESHOLD_NAMES, 'fewer_than_3_active')
+TOTAL_BELOW_70 = _bit(_THRESHOLD_NAMES, 'total_below_70')
+TOTAL_BELOW_80 = _bit(_THRESHOLD_NAMES, 'total_below_80')
+HAS_BRANCHES = _bit(REGION_FLAGS, 'has_branches')
+MAJOR_INDIAN_METRO = _bit(REGION_FLAGS, 'major_indian_metro')
+
+
+class Profile(NamedTuple):
+    """Everything the recommendation rules look at"""
+    gaps: int
+    band: int
+    region: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.gaps}:{self.band}:{self.region}"
+
+    @classmethod
+    def from_key(cls, key: str) -> 'Profile':
+        return cls(*(int(part) for part in key.split(':')))
+
+
+class RecommendationRule(NamedTuple):
+    rule_id: str
+    section: str
+    when: Callable[[Any], Any]
+    item: Any
+
+
+def active_certification_names(certifications: Iterable[Dict]) -> List[str]:
+    return [cert.get('name') or '' for cert in certifications or []
+            if isinstance(cert, dict) and str(cert.get('status', '')).strip() == 'Active']
+
+
+def gap_mask(certifications: Iterable[Dict]) -> int:
+    """Bitmask of KEY_CERTIFICATIONS not found in the active certification names"""
+    return _gap_mask(active_certification_names(certifications))
+
+
+def _gap_mask(active_names: List[str]) -> int:
+    # One substring search per key over all names (keys never contain the separator)
+    names = '\n'.join(active_names).upper()
+    mask = 0
+    for bit, key in enumerate(_KEY_NAMES_UPPER):
+        if key not in names:
+            mask |= 1 << bit
+    return mask
+
+
+def score_band(score_breakdown: Dict, active_count: int) -> int:
+    """Bitmask of the SCORE_THRESHOLDS the scores fall below"""
+    total = score_breakdown.get('total_score', 0)
+    cert = score_breakdown.get('certification_score', 0)
+    quality = score_breakdown.get('quality_initiatives_score', 0)
+    band = 0
+    for bit, (_, below) in enumerate(SCORE_THRESHOLDS):
+        if below(total, cert, quality, active_count):
+            band |= 1 << bit
+    return band
+
+
+def region_mask(org_name: str, branch_info: Optional[Dict] = None) -> int:
+    region = 0
+    if branch_info and branch_info.get('has_branches'):
+        region |= HAS_BRANCHES
+    org_name_lower = (org_name or '').lower()
+    if any(city in org_name_lower for city in MAJOR_INDIAN_METROS):
+        region |= MAJOR_INDIAN_METRO
+    return region
+
+
+def recommendation_profile(org_name: str, score_breakdown: Dict, certifications: Iterable[Dict],
+                           branch_info: Optional[Dict] = None) -> Profile:
+    active_names = active_certification_names(certifications)
+    return Profile(_gap_mask(active_names), score_band(score_breakdown, len(active_names)),
+                   region_mask(org_name, branch_info))
+
+
+def score_potential(score_breakdown: Dict) -> Dict[str, Any]:
+    current_total = score_breakdown.get('total_score', 0)
+    return {
+        'current_score': current_total,
+        'maximum_possible': MAX_POSSIBLE_SCORE,
+        'improvement_potential': MAX_POSSIBLE_SCORE - current_total,
+        'certification_potential': max(0, MAX_CERTIFICATION_SCORE - score_breakdown.get('certification_score', 0)),
+        'quality_initiatives_potential': max(0, MAX_QUALITY_INITIATIVES_SCORE - score_breakdown.get('quality_initiatives_score', 0))
+    }
+
+
+RECOMMENDATION_RULES = (
+    # Priority Actions (High Impact, Quick Wins)
+    RecommendationRule('jci_priority', 'priority_actions', lambda p: p.band & CERTIFICATION_BELOW_50, {
+        'action': 'Pursue JCI Accreditation',
+        'impact': 'High',
+        'timeline': '12-18 months',
+        'score_increase': '15-25 points',
+        'description': 'Joint Commission International accreditation provides the highest certification score boost and international recognition.',
+        'steps': [
+            'Conduct gap analysis against JCI standards',
+            'Develop implementation timeline',
+            'Train staff on JCI requirements',
+            'Implement quality management systems',
+            'Schedule JCI survey'
+        ]
+    }),
+    RecommendationRule('patient_safety_priority', 'priority_actions', lambda p: p.band & QUALITY_BELOW_15, {
+        'action': 'Implement Patient Safety Initiatives',
+        'impact': 'High',
+        'timeline': '3-6 months',
+        'score_increase': '8-12 points',
+        'description': 'Patient safety initiatives have the highest weight in quality scoring.',
+        'steps': [
+            'Establish patient safety committee',
+            'Implement medication safety protocols',
+            'Deploy infection control measures',
+            'Create incident reporting system',
+            'Conduct regular safety audits'
+        ]
+    }),
+) + tuple(
+    # Certification Gap Analysis - one rule per missing key certification
+    RecommendationRule(f'gap_{key.lower().replace(" ", "_")}', 'certification_gaps',
+                       lambda p, bit=1 << position: p.gaps & bit, info)
+    for position, (key, info) in enumerate(KEY_CERTIFICATIONS)
+) + (
+    # Quality Initiatives Recommendations
+    RecommendationRule('clinical_excellence', 'quality_initiatives', lambda p: p.band & QUALITY_BELOW_20, {
+        'initiative': 'Clinical Excellence Program',
+        'category': 'Clinical Excellence',
+        'impact_score': 8,
+        'timeline': '6-12 months',
+        'description': 'Implement evidence-based clinical protocols and outcome tracking',
+        'key_components': ['Clinical pathways', 'Outcome metrics', 'Physician engagement', 'Continuous improvement']
+    }),
+    RecommendationRule('technology_innovation', 'quality_initiatives', lambda p: p.band & QUALITY_BELOW_20, {
+        'initiative': 'Technology Innovation Initiative',
+        'category': 'Technology Innovation',
+        'impact_score': 6,
+        'timeline': '3-9 months',
+        'description': 'Deploy healthcare technology solutions for improved patient care',
+        'key_components': ['Electronic health records', 'Telemedicine capabilities', 'AI-assisted diagnostics', 'Mobile health apps']
+    }),
+    RecommendationRule('staff_development', 'quality_initiatives', lambda p: p.band & QUALITY_BELOW_20, {
+        'initiative': 'Staff Development Program',
+        'category': 'Staff Development',
+        'impact_score': 5,
+        'timeline': 'Ongoing',
+        'description': 'Comprehensive training and development for healthcare staff',
+        'key_components': ['Continuing education', 'Skills assessment', 'Leadership development', 'Performance management']
+    }),
+    # Operational Improvements
+    RecommendationRule('quality_management_system', 'operational_improvements', lambda p: p.band & FEWER_THAN_3_ACTIVE, {
+        'area': 'Quality Management System',
+        'recommendation': 'Establish comprehensive quality management framework',
+        'benefit': 'Foundation for multiple certifications and improved patient outcomes',
+        'implementation': 'Hire quality manager, develop policies, train staff'
+    }),
+    RecommendationRule('performance_monitoring', 'operational_improvements', lambda p: p.band & TOTAL_BELOW_80, {
+        'area': 'Performance Monitoring',
+        'recommendation': 'Implement real-time quality metrics dashboard',
+        'benefit': 'Continuous monitoring and rapid response to quality issues',
+        'implementation': 'Deploy analytics platform, define KPIs, train staff on data interpretation'
+    }),
+    RecommendationRule('multi_location_standardization', 'operational_improvements', lambda p: p.region & HAS_BRANCHES, {
+        'area': 'Multi-location Quality Standardization',
+        'recommendation': 'Standardize quality protocols across all locations',
+        'benefit': 'Consistent quality delivery and improved overall scoring',
+        'implementation': 'Develop standard operating procedures, conduct cross-location audits'
+    }),
+    # Strategic Recommendations
+    RecommendationRule('excellence_recognition', 'strategic_recommendations', lambda p: not p.band & TOTAL_BELOW_80, {
+        'strategy': 'Excellence Recognition Program',
+        'description': 'Pursue national and international healthcare awards',
+        'timeline': '12-24 months',
+        'expected_outcome': 'Enhanced reputation and market positioning'
+    }),
+    RecommendationRule('quality_transformation', 'strategic_recommendations', lambda p: p.band & TOTAL_BELOW_70, {
+        'strategy': 'Quality Transformation Initiative',
+        'description': 'Comprehensive organizational quality transformation',
+        'timeline': '18-36 months',
+        'expected_outcome': 'Significant improvement in quality scores and patient outcomes'
+    }),
+    RecommendationRule('international_expansion', 'strategic_recommendations', lambda p: p.region & MAJOR_INDIAN_METRO, {
+        'strategy': 'International Expansion Readiness',
+        'description': 'Prepare for international healthcare market entry',
+        'timeline': '24-36 months',
+        'expected_outcome': 'Access to global healthcare markets and partnerships'
+    }),
+)
+
+
+class InternationalProfile(NamedTuple):
+    band: int
+    missing_groups: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.band}:{self.missing_groups}"
+
+
+def international_profile(score_breakdown: Dict) -> InternationalProfile:
+    total_score = score_breakdown.get('total_score', 0)
+    band = next(i for i, (_, upper) in enumerate(INTERNATIONAL_BANDS) if upper is None or total_score < upper)
+    cert_breakdown = score_breakdown.get('certification_breakdown', {})
+    missing = 0
+    for bit, group in enumerate(INTERNATIONAL_GROUPS):
+        if group not in cert_breakdown:
+            missing |= 1 << bit
+    return InternationalProfile(band, missing)
+
+
+def _international_rules() -> Tuple[RecommendationRule, ...]:
+    priority_actions = (
+        ["Pursue JCI (Joint Commission International) accreditation for global recognition",
+         "Implement ISO 9001 Quality Management System as foundation",
+         "Establish patient safety initiatives aligned with WHO guidelines",
+         "Develop quality improvement programs with measurable outcomes"],
+        ["Expand ISO certification portfolio (ISO 13485, 15189, 27001)",
+         "Implement advanced patient experience programs",
+         "Pursue regional excellence accreditation (Joint Commission, CQC, etc.)",
+         "Develop international collaboration partnerships"],
+        ["Pursue Magnet Recognition for nursing excellence",
+         "Implement Planetree patient-centered care model",
+         "Establish WHO Collaborating Centre status",
+         "Lead international healthcare quality initiatives"],
+    )
+    rules = []
+    for band, actions in enumerate(priority_actions):
+        for i, action in enumerate(actions):
+            rules.append(RecommendationRule(f'{INTERNATIONAL_BANDS[band][0]}_action_{i + 1}', 'priority_actions',
+                                            lambda p, band=band: p.band == band, action))
+    rules += [
+        RecommendationRule('jci_opportunity', 'certification_opportunities', lambda p: p.missing_groups & 1, {
+            'certification': 'Joint Commission International (JCI)',
+            'impact': '40 points',
+            'description': 'Global gold standard for healthcare quality',
+            'timeline': '12-18 months'
+        }),
+        RecommendationRule('iso_9001_opportunity', 'certification_opportunities', lambda p: p.missing_groups & 2, {
+            'certification': 'ISO 9001 Quality Management',
+            'impact': '28 points',
+            'description': 'Foundation for quality management systems',
+            'timeline': '6-12 months'
+        }),
+        RecommendationRule('iso_13485_opportunity', 'certification_opportunities', lambda p: p.missing_groups & 2, {
+            'certification': 'ISO 13485 Medical Devices',
+            'impact': '30 points',
+            'description': 'Quality management for medical devices',
+            'timeline': '8-12 months'
+        }),
+    ]
+    always = lambda p: True
+    for i, initiative in enumerate(["Implement WHO Patient Safety Solutions",
+                                    "Establish clinical outcome measurement programs",
+                                    "Develop patient experience improvement initiatives",
+                                    "Create sustainability and environmental health programs",
+                                    "Implement technology innovation projects"]):
+        rules.append(RecommendationRule(f'quality_initiative_{i + 1}', 'quality_initiatives', always, initiative))
+    for i, opportunity in enumerate(["Participate in global healthcare quality networks",
+                                     "Establish international patient referral programs",
+                                     "Develop telemedicine capabilities for global reach",
+                                     "Create international medical tourism programs",
+                                     "Participate in global health research collaborations"]):
+        rules.append(RecommendationRule(f'international_expansion_{i + 1}', 'international_expansion', always, opportunity))
+    return tuple(rules)
+
+
+INTERNATIONAL_RULES = _international_rules()
+
+
+def rules_version() -> str:
+    """Hash of this module; precomputed profiles from another version are not used"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+class RuleTable:
+    """Rules compiled per profile into {section: matching rule ids}, memoized (thread-safe LRU)"""
+
+    def __init__(self, rules: Iterable[RecommendationRule], sections: Tuple[str, ...], max_entries: int = 4096):
+        self.rules = tuple(rules)
+        self.sections = sections
+        self.max_entries = max_entries
+        self._by_id = {rule.rule_id: rule for rule in self.rules}
+        if len(self._by_id) != len(self.rules):
+            raise ValueError("Recommendation rule ids must be unique")
+        self._compiled: 'OrderedDict[Any, Dict[str, Tuple[Any, ...]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'compiles': 0}
+
+    def rule_ids(self, profile: Any) -> Dict[str, List[str]]:
+        """{section: ids of the rules matching profile} (uncached)"""
+        matched = {section: [] for section in self.sections}
+        for rule in self.rules:
+            if rule.when(profile):
+                matched[rule.section].append(rule.rule_id)
+        return matched
+
+    def _store(self, profile: Any, rule_ids: Dict[str, List[str]]) -> Dict[str, Tuple[Any, ...]]:
+        compiled = {section: tuple(self._by_id[rule_id].item for rule_id in rule_ids.get(section, ()))
+                    for section in self.sections}
+        self._compiled[profile] = compiled
+        self._compiled.move_to_end(profile)
+        while len(self._compiled) > self.max_entries:
+            self._compiled.popitem(last=False)
+        return compiled
+
+    def compile(self, profile: Any) -> Dict[str, Tuple[Any, ...]]:
+        """{section: matching items} for profile"""
+        with self._lock:
+            compiled = self._compiled.get(profile)
+            if compiled is not None:
+                self._compiled.move_to_end(profile)
+                self.stats['hits'] += 1
+                return compiled
+        rule_ids = self.rule_ids(profile)
+        with self._lock:
+            self.stats['compiles'] += 1
+            return self._store(profile, rule_ids)
+
+    def seed(self, compiled: Dict[Any, Dict[str, List[str]]]) -> None:
+        """Load precomputed {profile: {section: rule ids}}; unknown rule ids are skipped"""
+        with self._lock:
+            for profile, rule_ids in compiled.items():
+                known = {section: [rule_id for rule_id in ids if rule_id in self._by_id]
+                         for section, ids in rule_ids.items()}
+                self._store(profile, known)
+
+    def render(self, profile: Any) -> Dict[str, List[Any]]:
+        """Fresh section lists (of shared items) for profile"""
+        return {section: list(items) for section, items in self.compile(profile).items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._compiled.clear()
+            self.stats = {'hits': 0, 'compiles': 0}
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+
+class RecommendationEngine:
+    """Improvement recommendations (default and international) served from memoized rule tables"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.table = RuleTable(RECOMMENDATION_RULES, SECTIONS, max_entries)
+        self.international_table = RuleTable(INTERNATIONAL_RULES, INTERNATIONAL_SECTIONS, max_entries)
+
+    def recommendations(self, org_name: str, score_breakdown: Dict, certifications: Iterable[Dict],
+                        branch_info: Optional[Dict] = None) -> Dict[str, Any]:
+        """Same structure generate_improvement_recommendations always returned"""
+        profile = recommendation_profile(org_name, score_breakdown, certifications, branch_info)
+        recommendations = self.table.render(profile)
+        recommendations['score_potential'] = score_potential(score_breakdown)
+        return recommendations
+
+    def international_recommendations(self, score_breakdown: Dict) -> Dict[str, List[Any]]:
+        return self.international_table.render(international_profile(score_breakdown))
+
+    def precompute(self, scored_organizations: Iterable[Dict]) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Compile the profile of every scored organization
+
+        Returns {profile key: {section: rule ids}} for save_profiles(); the
+        branch flag is not part of scored records and is left unset.
+        """
+        profiles = {}
+        for org in scored_organizations:
+            if not isinstance(org, dict) or 'error' in org:
+                continue
+            breakdown = org.get('score_breakdown') or org
+            profile = recommendation_profile(org.get('name', ''), breakdown, org.get('certifications', []))
+            if profile.key not in profiles:
+                self.table.compile(profile)
+                profiles[profile.key] = self.table.rule_ids(profile)
+        return profiles
+
+    def load_profiles(self, path: str = RECOMMENDATIONS_FILE) -> int:
+        """Seed the table from a precomputed file; number of profiles loaded (0 if missing or stale)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if data.get('format_version') != PROFILES_FORMAT_VERSION or data.get('rules_version') != rules_version():
+            return 0
+        profiles = data.get('profiles', {})
+        self.table.seed({Profile.from_key(key): rule_ids for key, rule_ids in profiles.items()})
+        return len(profiles)
+
+
+def save_profiles(profiles: Dict[str, Dict[str, List[str]]], path: str = RECOMMENDATIONS_FILE) -> None:
+    """Write precomputed profiles compactly (atomic replace)"""
+    data = {
+        'format_version': PROFILES_FORMAT_VERSION,
+        'rules_version': rules_version(),
+        'generated_at': datetime.now().isoformat(),
+        'profiles': profiles,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+_default_engine: Optional[RecommendationEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_recommendation_engine() -> RecommendationEngine:
+    """Process-wide engine, seeded from the batch-precomputed profiles next to this module when available"""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = RecommendationEngine()
+            _default_engine.load_profiles(os.path.join(os.path.dirname(os.path.abspath(__file__)), RECOMMENDATIONS_FILE))
+        return _default_engine
@@ -9,6 +9,38 @@ import os
 from datetime import datetime
 from collections import defaultdict, Counter
 
+import pandas as pd
+
+from validation_rules import (CERTIFICATIONS, ORGANIZATIONS, Rule, RuleEngine, first_seen_counts,
+                              flatten_organizations, org_values)
+
+
+def _certification_category(term, earlier=()):
+    """Certification types containing term and none of the earlier categories' terms"""
+    def check(certs):
+        mask = certs['type_lower'].str.contains(term, regex=False)
+        for other in earlier:
+            mask &= ~certs['type_lower'].str.contains(other, regex=False)
+        return mask
+    return check
+
+
+def _from_updated_nabh_portal(certs):
+    return (certs['source_lower'].str.contains('updated_nabh', regex=False)
+            | certs['source_lower'].str.contains('nabh_entry_level', regex=False)
+            | certs['data_source'].str.contains('Updated_NABH_Portal', regex=False))
+
+
+# Each certification counts towards the first category its type matches
+CERTIFICATION_RULES = RuleEngine([
+    Rule('nabh', "NABH hospital", CERTIFICATIONS, _certification_category('nabh')),
+    Rule('updated_nabh', "NABH hospital from the updated NABH portal", CERTIFICATIONS,
+         lambda certs: _certification_category('nabh')(certs) & _from_updated_nabh_portal(certs)),
+    Rule('jci', "JCI hospital", CERTIFICATIONS, _certification_category('jci', earlier=('nabh',))),
+    Rule('nabl', "NABL laboratory", CERTIFICATIONS, _certification_category('nabl', earlier=('nabh', 'jci'))),
+    Rule('cap', "CAP laboratory", CERTIFICATIONS, _certification_category('cap', earlier=('nabh', 'jci', 'nabl'))),
+])
+
 def load_database(file_path):
     """Load the unified healthcare organizations database"""
     try:
@@ -55,63 +87,33 @@ def analyze_database_comprehensive(db_data):
     # Analyze object types
     type_counts, string_samples = analyze_organization_types(organizations)
     
-    # Initialize counters
+    # Dictionary entries, flattened into organization and certification frames
+    frames = flatten_organizations(organizations,
+                                   org_fields={'country': 'Unknown', 'source': 'Unknown', 'data_source': ''},
+                                   cert_fields={'type': 'Unknown'})
+    orgs = frames[ORGANIZATIONS]
+    certs = frames[CERTIFICATIONS]
+    certs['type_lower'] = certs['type'].str.lower()
+    certs['source_lower'] = pd.Series(org_values(frames, 'source'), dtype=str).str.lower()
+    certs['data_source'] = pd.Series(org_values(frames, 'data_source'), dtype=str)
+    results = CERTIFICATION_RULES.evaluate(frames)
+    
     stats = {
         'total_organizations': len(organizations),
-        'valid_dict_organizations': 0,
-        'string_entries': 0,
-        'countries': defaultdict(int),
-        'sources': defaultdict(int),
-        'nabh_hospitals': 0,
-        'updated_nabh_hospitals': 0,
-        'jci_hospitals': 0,
-        'nabl_labs': 0,
-        'cap_labs': 0,
-        'certification_counts': defaultdict(int),
-        'data_quality_issues': []
+        'valid_dict_organizations': len(orgs),
+        'string_entries': type_counts.get('str', 0),
+        'countries': defaultdict(int, first_seen_counts(orgs['country'])),
+        'sources': defaultdict(int, first_seen_counts(orgs['source'])),
+        'nabh_hospitals': results.count('nabh'),
+        'updated_nabh_hospitals': results.count('updated_nabh'),
+        'jci_hospitals': results.count('jci'),
+        'nabl_labs': results.count('nabl'),
+        'cap_labs': results.count('cap'),
+        'certification_counts': defaultdict(int, first_seen_counts(certs['type'])),
+        'data_quality_issues': [f"String entry at index {i}: {org[:50]}..."
+                                for i, org in enumerate(organizations) if isinstance(org, str)]
     }
     
-    # Process only dictionary entries
-    for i, org in enumerate(organizations):
-        if isinstance(org, dict):
-            stats['valid_dict_organizations'] += 1
-            
-            # Country analysis
-            country = safe_get_attribute(org, 'country', 'Unknown')
-            stats['countries'][country] += 1
-            
-            # Source analysis
-            source = safe_get_attribute(org, 'source', 'Unknown')
-            stats['sources'][source] += 1
-            
-            # Certification analysis
-            certifications = org.get('certifications', [])
-            if isinstance(certifications, list):
-                for cert in certifications:
-                    if isinstance(cert, dict):
-                        cert_type = cert.get('type', 'Unknown')
-                        stats['certification_counts'][cert_type] += 1
-                        
-                        # Count specific certification types
-                        if 'nabh' in cert_type.lower():
-                            stats['nabh_hospitals'] += 1
-                            # Check if it's from updated NABH data
-                            data_source = safe_get_attribute(org, 'data_source', '')
-                            if ('updated_nabh' in source.lower() or 
-                                'nabh_entry_level' in source.lower() or
-                                'Updated_NABH_Portal' in data_source):
-                                stats['updated_nabh_hospitals'] += 1
-                        elif 'jci' in cert_type.lower():
-                            stats['jci_hospitals'] += 1
-                        elif 'nabl' in cert_type.lower():
-                            stats['nabl_labs'] += 1
-                        elif 'cap' in cert_type.lower():
-                            stats['cap_labs'] += 1
-        
-        elif isinstance(org, str):
-            stats['string_entries'] += 1
-            stats['data_quality_issues'].append(f"String entry at index {i}: {org[:50]}...")
-    
     # Add type analysis to stats
     stats['object_types'] = dict(type_counts)
     stats['string_samples'] = string_samples
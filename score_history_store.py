@@ -0,0 +1,387 @@
+"""
+Score History Store for QuXAT Healthcare Quality Grid
+Persists score and ranking history in a local SQLite time-series store so that
+trends survive browser sessions and deploys, and are shared across users.
+
+Batch scoring runs and interactive searches both append to the store. Trend,
+delta and moving-average queries are served from per-organization rollup
+tables that are refreshed on write, so reading a trend is a single-row lookup.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'score_history.db')
+
+# Number of most recent samples used for the moving average in the rollups
+MOVING_AVERAGE_WINDOW = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scoring_runs (
+    run_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    organization_count INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS score_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_key TEXT NOT NULL,
+    org_name TEXT NOT NULL,
+    run_id TEXT,
+    source TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    total_score REAL,
+    certification_score REAL,
+    quality_initiatives_score REAL
+);
+CREATE INDEX IF NOT EXISTS idx_score_history_org ON score_history (org_key, timestamp);
+CREATE TABLE IF NOT EXISTS ranking_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    org_key TEXT NOT NULL,
+    org_name TEXT NOT NULL,
+    run_id TEXT,
+    source TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    overall_rank INTEGER,
+    percentile REAL,
+    total_organizations INTEGER,
+    regional_rank INTEGER,
+    regional_percentile REAL
+);
+CREATE INDEX IF NOT EXISTS idx_ranking_history_org ON ranking_history (org_key, timestamp);
+CREATE TABLE IF NOT EXISTS score_rollups (
+    org_key TEXT PRIMARY KEY,
+    org_name TEXT,
+    samples INTEGER,
+    first_seen TEXT,
+    last_seen TEXT,
+    latest_score REAL,
+    previous_score REAL,
+    delta REAL,
+    moving_average REAL
+);
+CREATE TABLE IF NOT EXISTS ranking_rollups (
+    org_key TEXT PRIMARY KEY,
+    org_name TEXT,
+    samples INTEGER,
+    last_seen TEXT,
+    latest_rank INTEGER,
+    previous_rank INTEGER,
+    latest_percentile REAL,
+    previous_percentile REAL,
+    moving_average_percentile REAL
+);
+"""
+
+
+def normalize_org_key(name: str) -> str:
+    """Normalize an organization name into the key used by the history store."""
+    if not name:
+        return ''
+    n = str(name).lower().strip()
+    n = re.sub(r"[\-_,.&'\"]", " ", n)
+    return re.sub(r"\s+", " ", n).strip()
+
+
+class ScoreHistoryStore:
+    """SQLite-backed time-series store for organization scores and rankings"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """Open (and create if needed) the history database"""
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------ writes
+
+    def start_run(self, source: str = 'batch', run_id: Optional[str] = None, organization_count: int = 0) -> str:
+        """Register a scoring run and return its identifier"""
+        run_id = run_id or f"{source}-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO scoring_runs (run_id, source, started_at, organization_count) VALUES (?, ?, ?, ?)',
+                (run_id, source, datetime.now().isoformat(), organization_count)
+            )
+        return run_id
+
+    def record_score(self, org_name: str, score_data: Dict, run_id: Optional[str] = None, source: str = 'search') -> None:
+        """Append a single score sample and refresh the organization's rollup"""
+        key = normalize_org_key(org_name)
+        if not key:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'INSERT INTO score_history (org_key, org_name, run_id, source, timestamp, total_score, '
+                'certification_score, quality_initiatives_score) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                self._score_row(key, org_name, score_data, run_id, source)
+            )
+            self._refresh_score_rollups(conn, [key])
+
+    def record_ranking(self, org_name: str, rankings_data: Dict, run_id: Optional[str] = None, source: str = 'search') -> None:
+        """Append a single ranking sample and refresh the organization's rollup"""
+        key = normalize_org_key(org_name)
+        if not key:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'INSERT INTO ranking_history (org_key, org_name, run_id, source, timestamp, overall_rank, percentile, '
+                'total_organizations, regional_rank, regional_percentile) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                self._ranking_row(key, org_name, rankings_data, run_id, source)
+            )
+            self._refresh_ranking_rollups(conn, [key])
+
+    def record_batch_run(self, scored_organizations: Iterable[Dict], source: str = 'batch') -> str:
+        """Write the scores and unique ranks of a complete batch run in one transaction"""
+        orgs = [o for o in scored_organizations if isinstance(o, dict) and o.get('name')]
+        run_id = self.start_run(source=source, organization_count=len(orgs))
+        score_rows = []
+        ranking_rows = []
+        touched_keys = set()
+        for org in orgs:
+            key = normalize_org_key(org['name'])
+            if not key:
+                continue
+            touched_keys.add(key)
+            score_rows.append(self._score_row(key, org['name'], org, run_id, source))
+            if org.get('overall_rank') is not None:
+                ranking_rows.append(self._ranking_row(key, org['name'], {
+                    'overall_rank': org.get('overall_rank'),
+                    'percentile': org.get('percentile'),
+                    'total_organizations': len(orgs)
+                }, run_id, source))
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                'INSERT INTO score_history (org_key, org_name, run_id, source, timestamp, total_score, '
+                'certification_score, quality_initiatives_score) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                score_rows
+            )
+            conn.executemany(
+                'INSERT INTO ranking_history (org_key, org_name, run_id, source, timestamp, overall_rank, percentile, '
+                'total_organizations, regional_rank, regional_percentile) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ranking_rows
+            )
+            # Only the organizations written in this run have new samples
+            self._refresh_score_rollups(conn, sorted(touched_keys))
+            self._refresh_ranking_rollups(conn, sorted(touched_keys))
+        logger.info(f"Recorded batch run {run_id} with {len(score_rows)} scores and {len(ranking_rows)} rankings")
+        return run_id
+
+    @staticmethod
+    def _score_row(key, org_name, score_data, run_id, source):
+        return (
+            key, org_name, run_id, source, datetime.now().isoformat(timespec='microseconds'),
+            score_data.get('total_score', 0),
+            score_data.get('certification_score', 0),
+            score_data.get('quality_initiatives_score', 0)
+        )
+
+    @staticmethod
+    def _ranking_row(key, org_name, rankings_data, run_id, source):
+        regional = rankings_data.get('regional_ranking') or {}
+        return (
+            key, org_name, run_id, source, datetime.now().isoformat(timespec='microseconds'),
+            rankings_data.get('overall_rank', 0),
+            rankings_data.get('percentile', 0),
+            rankings_data.get('total_organizations', 0),
+            regional.get('rank', 0),
+            regional.get('percentile', 0)
+        )
+
+    # ---------------------------------------------------------------- rollups
+
+    # Above this many keys the filter goes through a temp table instead of
+    # bound parameters (SQLite caps the number of host parameters per statement)
+    _MAX_INLINE_KEYS = 500
+
+    def _key_filter(self, conn, org_keys: Optional[List[str]]):
+        """WHERE clause and parameters restricting a rollup refresh to org_keys (None = all)"""
+        if org_keys is None:
+            return '', []
+        if len(org_keys) <= self._MAX_INLINE_KEYS:
+            return f"WHERE org_key IN ({','.join('?' for _ in org_keys)})", list(org_keys)
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS refresh_keys (org_key TEXT PRIMARY KEY)')
+        conn.execute('DELETE FROM refresh_keys')
+        conn.executemany('INSERT OR IGNORE INTO refresh_keys (org_key) VALUES (?)', ((k,) for k in org_keys))
+        return 'WHERE org_key IN (SELECT org_key FROM refresh_keys)', []
+
+    def _refresh_score_rollups(self, conn, org_keys: Optional[List[str]] = None) -> None:
+        """Recompute score rollups with window functions (all orgs, or only the given keys)"""
+        where, key_params = self._key_filter(conn, org_keys)
+        params: List = [MOVING_AVERAGE_WINDOW] + key_params
+        conn.execute(f"""
+            INSERT OR REPLACE INTO score_rollups
+                (org_key, org_name, samples, first_seen, last_seen, latest_score, previous_score, delta, moving_average)
+            SELECT org_key,
+                   MAX(CASE WHEN rn = 1 THEN org_name END),
+                   MAX(samples),
+                   MIN(first_seen),
+                   MAX(timestamp),
+                   MAX(CASE WHEN rn = 1 THEN total_score END),
+                   MAX(CASE WHEN rn = 2 THEN total_score END),
+                   MAX(CASE WHEN rn = 1 THEN total_score END) - MAX(CASE WHEN rn = 2 THEN total_score END),
+                   AVG(CASE WHEN rn <= ? THEN total_score END)
+            FROM (
+                SELECT org_key, org_name, timestamp, total_score,
+                       ROW_NUMBER() OVER (PARTITION BY org_key ORDER BY timestamp DESC, id DESC) AS rn,
+                       COUNT(*) OVER (PARTITION BY org_key) AS samples,
+                       MIN(timestamp) OVER (PARTITION BY org_key) AS first_seen
+                FROM score_history {where}
+            )
+            GROUP BY org_key
+        """, params)
+
+    def _refresh_ranking_rollups(self, conn, org_keys: Optional[List[str]] = None) -> None:
+        """Recompute ranking rollups with window functions (all orgs, or only the given keys)"""
+        where, key_params = self._key_filter(conn, org_keys)
+        params: List = [MOVING_AVERAGE_WINDOW] + key_params
+        conn.execute(f"""
+            INSERT OR REPLACE INTO ranking_rollups
+                (org_key, org_name, samples, last_seen, latest_rank, previous_rank,
+                 latest_percentile, previous_percentile, moving_average_percentile)
+            SELECT org_key,
+                   MAX(CASE WHEN rn = 1 THEN org_name END),
+                   MAX(samples),
+                   MAX(timestamp),
+                   MAX(CASE WHEN rn = 1 THEN overall_rank END),
+                   MAX(CASE WHEN rn = 2 THEN overall_rank END),
+                   MAX(CASE WHEN rn = 1 THEN percentile END),
+                   MAX(CASE WHEN rn = 2 THEN percentile END),
+                   AVG(CASE WHEN rn <= ? THEN percentile END)
+            FROM (
+                SELECT org_key, org_name, timestamp, overall_rank, percentile,
+                       ROW_NUMBER() OVER (PARTITION BY org_key ORDER BY timestamp DESC, id DESC) AS rn,
+                       COUNT(*) OVER (PARTITION BY org_key) AS samples
+                FROM ranking_history {where}
+            )
+            GROUP BY org_key
+        """, params)
+
+    # ----------------------------------------------------------------- reads
+
+    def get_score_history(self, org_name: str, limit: int = 12) -> List[Dict]:
+        """Return the most recent score samples, oldest first, in the session-history entry format"""
+        key = normalize_org_key(org_name)
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT timestamp, total_score, certification_score FROM score_history '
+                'WHERE org_key = ? ORDER BY timestamp DESC, id DESC LIMIT ?', (key, limit)
+            ).fetchall()
+        history = []
+        for row in reversed(rows):
+            ts = datetime.fromisoformat(row['timestamp'])
+            history.append({
+                'timestamp': ts.strftime('%Y-%m-%d %H:%M:%S'),
+                'date': ts.strftime('%Y-%m-%d'),
+                'total_score': row['total_score'],
+                'base_score': row['total_score'],
+                'certification_score': row['certification_score']
+            })
+        return history
+
+    def get_ranking_history(self, org_name: str, limit: int = 12) -> List[Dict]:
+        """Return the most recent ranking samples, oldest first, in the session-history entry format"""
+        key = normalize_org_key(org_name)
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT timestamp, overall_rank, percentile, total_organizations, regional_rank, regional_percentile '
+                'FROM ranking_history WHERE org_key = ? ORDER BY timestamp DESC, id DESC LIMIT ?', (key, limit)
+            ).fetchall()
+        history = []
+        for row in reversed(rows):
+            ts = datetime.fromisoformat(row['timestamp'])
+            history.append({
+                'timestamp': ts.strftime('%Y-%m-%d %H:%M:%S'),
+                'date': ts.strftime('%Y-%m-%d'),
+                'overall_rank': row['overall_rank'],
+                'percentile': row['percentile'],
+                'total_organizations': row['total_organizations'],
+                'category_rankings': {},
+                'regional_rank': row['regional_rank'],
+                'regional_percentile': row['regional_percentile']
+            })
+        return history
+
+    def get_score_trend(self, org_name: str) -> Optional[Dict]:
+        """Score trend from the precomputed rollup (same shape as get_score_trend in the app)"""
+        key = normalize_org_key(org_name)
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM score_rollups WHERE org_key = ?', (key,)).fetchone()
+        if not row or (row['samples'] or 0) < 2 or row['delta'] is None:
+            return None
+        change = round(row['delta'], 2)
+        if change > 0:
+            direction, status = 'up', 'improving'
+        elif change < 0:
+            direction, status = 'down', 'declining'
+        else:
+            direction, status = 'stable', 'stable'
+        return {
+            'direction': direction,
+            'change': abs(change),
+            'status': status,
+            'samples': row['samples'],
+            'moving_average': row['moving_average'],
+            'first_seen': row['first_seen'],
+            'last_seen': row['last_seen']
+        }
+
+    def get_ranking_trend(self, org_name: str) -> Optional[Dict]:
+        """Ranking trend from the precomputed rollup (same shape as get_ranking_trend in the app)"""
+        key = normalize_org_key(org_name)
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM ranking_rollups WHERE org_key = ?', (key,)).fetchone()
+        if not row or (row['samples'] or 0) < 2 or row['previous_rank'] is None:
+            return None
+        rank_change = (row['previous_rank'] or 0) - (row['latest_rank'] or 0)
+        percentile_change = (row['latest_percentile'] or 0) - (row['previous_percentile'] or 0)
+        if rank_change > 0:
+            direction, status, description = 'up', 'improving', f'Moved up {rank_change} positions'
+        elif rank_change < 0:
+            direction, status, description = 'down', 'declining', f'Dropped {abs(rank_change)} positions'
+        else:
+            direction, status, description = 'stable', 'stable', 'Maintained position'
+        return {
+            'direction': direction,
+            'rank_change': abs(rank_change),
+            'percentile_change': percentile_change,
+            'status': status,
+            'description': description,
+            'samples': row['samples'],
+            'moving_average_percentile': row['moving_average_percentile']
+        }
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_history_store(db_path: str = DEFAULT_DB_PATH) -> ScoreHistoryStore:
+    """Return the process-wide history store for the default database path"""
+    global _default_store
+    if db_path != DEFAULT_DB_PATH:
+        return ScoreHistoryStore(db_path)
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ScoreHistoryStore(db_path)
+        return _default_store
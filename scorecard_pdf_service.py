@@ -0,0 +1,659 @@
+"""
+Scorecard PDF Rendering Service for QuXAT Healthcare Quality Grid
+Renders the detailed organization scorecard PDF without touching global
+matplotlib.pyplot state, so it is safe under Streamlit's threaded script runs.
+
+- Charts are drawn on object-oriented Figure/Agg canvases and memoized.
+- ReportLab paragraph and table styles are compiled once per process.
+- Finished PDFs are cached by a content hash of the organization name and the
+  score and certification fields shown on the scorecard, plus the render date
+  (the PDF prints its generation date and a dated report ID), in memory and
+  optionally on disk. Disk entries from earlier days are pruned.
+- Batch mode pre-renders scorecards for all ranked organizations across a
+  process pool, so downloads can be served straight from the disk cache for
+  the rest of that day.
+"""
+
+import os
+import io
+import sys
+import json
+import hashlib
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as ReportLabImage, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors as rl_colors
+from reportlab.lib.enums import TA_CENTER
+
+from score_history_store import normalize_org_key
+
+logger = logging.getLogger(__name__)
+
+# Bump when the scorecard layout changes so cached PDFs are re-rendered
+TEMPLATE_VERSION = '1'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scorecard_cache')
+
+# Fields the scorecard renders; everything else on a search result (timestamps,
+# site details, rankings, recommendations, ...) changes between searches without
+# changing the PDF and must not be part of the cache key
+SCORE_BREAKDOWN_FIELDS = ('certification_score', 'reputation_bonus', 'location_adjustment', 'compliance_check')
+CERTIFICATION_FIELDS = ('name', 'status', 'valid_until', 'score_impact')
+INITIATIVE_FIELDS = ('name', 'year')
+
+SCORE_BAND_COLORS = ['#ff4444', '#ffaa44', '#ffdd44', '#88dd44', '#44dd44']
+SCORE_BAND_LIMITS = [20, 40, 60, 80, 100]
+CERTIFICATION_STATUS_COLORS = {'Active': '#44dd44', 'In Progress': '#ffaa44', 'Expired': '#ff4444', 'Unknown': '#cccccc'}
+
+
+def _pick(item: Any, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    return {k: item.get(k) for k in fields} if isinstance(item, dict) else {}
+
+
+def score_version(org_data: Dict[str, Any]) -> str:
+    """Content hash of the score and certification fields the scorecard renders"""
+    org_data = org_data or {}
+    content = {
+        'total_score': org_data.get('total_score', 0),
+        'score_breakdown': _pick(org_data.get('score_breakdown') or {}, SCORE_BREAKDOWN_FIELDS),
+        'certifications': [_pick(c, CERTIFICATION_FIELDS) for c in org_data.get('certifications') or []],
+        'quality_initiatives': [_pick(i, INITIATIVE_FIELDS) for i in org_data.get('quality_initiatives') or []],
+    }
+    payload = json.dumps(content, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def scorecard_cache_key(org_name: str, org_data: Dict[str, Any], render_date: Optional[date] = None) -> str:
+    """Cache key for a rendered scorecard: organization + score version + template version + render date"""
+    render_date = render_date or date.today()
+    raw = f"{normalize_org_key(org_name)}|{score_version(org_data)}|{TEMPLATE_VERSION}|{render_date.isoformat()}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def report_number(org_name: str) -> int:
+    """Stable 4-digit report number (builtin hash() is randomized per process)"""
+    return zlib.crc32((org_name or '').encode('utf-8')) % 10000
+
+
+def _figure_png(fig: Figure) -> bytes:
+    buffer = io.BytesIO()
+    FigureCanvasAgg(fig)
+    fig.savefig(buffer, format='png', bbox_inches='tight', dpi=150)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=512)
+def _score_chart_png(score: float, title: str) -> bytes:
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
+    
+    # Create background bars
+    for i, (range_val, color) in enumerate(zip(SCORE_BAND_LIMITS, SCORE_BAND_COLORS)):
+        start = SCORE_BAND_LIMITS[i-1] if i > 0 else 0
+        ax.barh(0, range_val - start, left=start, height=0.5, color=color, alpha=0.3)
+    
+    # Create score bar
+    score_color = SCORE_BAND_COLORS[max(0, min(int(score // 20), 4))]
+    ax.barh(0, score, height=0.3, color=score_color, alpha=0.8)
+    
+    # Add score text
+    ax.text(score/2, 0, f'{score:.1f}', ha='center', va='center',
+            fontsize=16, fontweight='bold', color='white')
+    
+    ax.set_xlim(0, 100)
+    ax.set_ylim(-0.5, 0.5)
+    ax.set_xlabel('Score')
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_yticks([])
+    return _figure_png(fig)
+
+
+@lru_cache(maxsize=256)
+def _certification_chart_png(status_counts: Tuple[Tuple[str, int], ...]) -> bytes:
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
+    
+    statuses = [status for status, _ in status_counts]
+    counts = [count for _, count in status_counts]
+    chart_colors = [CERTIFICATION_STATUS_COLORS.get(status, '#cccccc') for status in statuses]
+    
+    ax.pie(counts, labels=statuses, colors=chart_colors, autopct='%1.1f%%', startangle=90)
+    ax.set_title('Certification Status Distribution', fontsize=14, fontweight='bold')
+    return _figure_png(fig)
+
+
+def render_score_chart(score, title="Quality Score") -> io.BytesIO:
+    """Gauge-like score chart as a PNG buffer"""
+    return io.BytesIO(_score_chart_png(round(float(score or 0), 1), title))
+
+
+def render_certification_chart(certifications) -> Optional[io.BytesIO]:
+    """Certification status pie chart as a PNG buffer (None without certifications)"""
+    if not certifications:
+        return None
+    
+    # Count certifications by status (first-seen order, as in the legend)
+    status_counts = {}
+    for cert in certifications:
+        status = cert.get('status', 'Unknown')
+        status_counts[status] = status_counts.get(status, 0) + 1
+    return io.BytesIO(_certification_chart_png(tuple(status_counts.items())))
+
+
+class ScorecardStyles:
+    """ReportLab paragraph and table styles, compiled once and shared read-only"""
+    
+    def __init__(self):
+        base = getSampleStyleSheet()
+        self.title = ParagraphStyle(
+            'CustomTitle',
+            parent=base['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            textColor=rl_colors.HexColor('#2c3e50')
+        )
+        self.heading = ParagraphStyle(
+            'CustomHeading',
+            parent=base['Heading2'],
+            fontSize=16,
+            spaceAfter=12,
+            textColor=rl_colors.HexColor('#34495e')
+        )
+        self.subheading = ParagraphStyle(
+            'CustomSubheading',
+            parent=base['Heading3'],
+            fontSize=14,
+            spaceAfter=8,
+            textColor=rl_colors.HexColor('#7f8c8d')
+        )
+        self.normal = ParagraphStyle(
+            'CustomNormal',
+            parent=base['Normal'],
+            fontSize=11,
+            spaceAfter=6
+        )
+        self.score_table = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#3498db')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -2), rl_colors.beige),
+            ('BACKGROUND', (0, -1), (-1, -1), rl_colors.HexColor('#ecf0f1')),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, rl_colors.black)
+        ])
+        self.certification_table = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#27ae60')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, rl_colors.black)
+        ])
+
+
+_styles = None
+_styles_lock = threading.Lock()
+
+
+def get_scorecard_styles() -> ScorecardStyles:
+    """Process-wide compiled styles"""
+    global _styles
+    if _styles is None:
+        with _styles_lock:
+            if _styles is None:
+                _styles = ScorecardStyles()
+    return _styles
+
+
+def build_scorecard_pdf(org_name: str, org_data: Dict[str, Any], generated_at: Optional[datetime] = None) -> bytes:
+    """Render the detailed scorecard PDF (uncached), stamped with generated_at (default: now)"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=18)
+    doc.build(build_scorecard_story(org_name, org_data, generated_at))
+    return buffer.getvalue()
+
+
+def build_scorecard_story(org_name: str, org_data: Dict[str, Any], generated_at: Optional[datetime] = None) -> list:
+    """Flowables for the detailed scorecard"""
+    generated_at = generated_at or datetime.now()
+    styles = get_scorecard_styles()
+    title_style = styles.title
+    heading_style = styles.heading
+    subheading_style = styles.subheading
+    normal_style = styles.normal
+    
+    story = []
+    
+    # Header
+    story.append(Paragraph("Global Healthcare Quality Grid", title_style))
+    story.append(Paragraph(f"Detailed Assessment Report for {org_name}", heading_style))
+    story.append(Paragraph(f"Generated on: {generated_at.strftime('%B %d, %Y at %I:%M %p')}", normal_style))
+    story.append(Spacer(1, 20))
+    
+    # Executive Summary
+    story.append(Paragraph("Executive Summary", heading_style))
+    
+    score = org_data.get('total_score', 0)
+    # Determine grade based on adjusted scoring scale (max 85)
+    grade = "A+" if score >= 75 else "A" if score >= 65 else "B+" if score >= 55 else "B" if score >= 45 else "C"
+    
+    summary_text = f"""
+    <b>{org_name}</b> has achieved an overall Global Healthcare Quality Assessment quality score of <b>{score:.1f}/100</b> (Grade: <b>{grade}</b>).
+    This assessment is based on comprehensive analysis of certifications, quality initiatives, transparency measures, 
+    and reputation factors from publicly available sources.
+    """
+    story.append(Paragraph(summary_text, normal_style))
+    story.append(Spacer(1, 15))
+    
+    # Compliance Verification Section
+    story.append(Paragraph("Mandatory Compliance Verification", heading_style))
+    
+    compliance_check = org_data.get('score_breakdown', {}).get('compliance_check', {})
+    if compliance_check:
+        compliance_percentage = compliance_check.get('compliance_percentage', 0)
+        compliant_count = compliance_check.get('compliant_count', 0)
+        total_required = compliance_check.get('total_required', 8)
+        is_fully_compliant = compliance_check.get('is_fully_compliant', False)
+        
+        compliance_status = "✅ FULLY COMPLIANT - ALL MANDATORY ISO STANDARDS MET" if is_fully_compliant else "⚠️ CRITICAL NON-COMPLIANCE - MANDATORY ISO STANDARDS MISSING"
+        
+        compliance_text = f"""
+        <b>MANDATORY ISO STANDARDS COMPLIANCE STATUS:</b> {compliance_status}<br/>
+        <b>Compliance Rate:</b> {compliance_percentage:.1f}% ({compliant_count}/{total_required} mandatory certifications)<br/>
+        <b>Penalty Applied:</b> {compliance_check.get('total_penalty', 0)} points for missing mandatory standards<br/><br/>
+        
+        <b>MANDATORY ISO STANDARDS REVIEW:</b><br/>
+        """
+        
+        # Add details for each required certification with penalty information
+        details = compliance_check.get('details', {})
+        for cert_name, cert_info in details.items():
+            status_icon = "✅" if cert_info.get('found') and cert_info.get('status') in ['Active', 'Valid', 'Current'] else "❌"
+            cert_status = cert_info.get('status', 'Not Found') if cert_info.get('found') else 'Not Found'
+            penalty_info = f" (Penalty: {cert_info.get('penalty', 0)} points)" if cert_info.get('mandatory', False) and not cert_info.get('found') else ""
+            mandatory_label = " [MANDATORY]" if cert_info.get('mandatory', False) else " [RECOMMENDED]"
+            compliance_text += f"• {status_icon} <b>{cert_name}{mandatory_label}:</b> {cert_status}{penalty_info}<br/>"
+        
+        story.append(Paragraph(compliance_text, normal_style))
+    else:
+        story.append(Paragraph("Compliance verification data not available for this assessment.", normal_style))
+    
+    story.append(Spacer(1, 20))
+    
+    # Score Breakdown
+    story.append(Paragraph("Quality Score Breakdown", heading_style))
+    
+    score_breakdown = org_data.get('score_breakdown', {})
+    
+    # Create score breakdown table - certification-only scoring
+    score_data = [
+        ['Component', 'Weight', 'Score', 'Weighted Score'],
+        ['Certifications', '100%', f"{score_breakdown.get('certification_score', 0):.2f}",
+            f"{score_breakdown.get('certification_score', 0):.2f}"],
+            ['Reputation Bonus', 'Bonus', f"{score_breakdown.get('reputation_bonus', 0):.2f}",
+            f"{score_breakdown.get('reputation_bonus', 0):.2f}"],
+            ['Location Adjustment', 'Adjustment', f"{score_breakdown.get('location_adjustment', 0):.2f}",
+            f"{score_breakdown.get('location_adjustment', 0):.2f}"],
+            ['', '', 'Total Score:', f"{score:.2f}/100"]
+    ]
+    
+    score_table = Table(score_data, colWidths=[2.5*inch, 1*inch, 1*inch, 1.5*inch])
+    score_table.setStyle(styles.score_table)
+    
+    story.append(score_table)
+    story.append(Spacer(1, 20))
+    
+    # Add score chart
+    score_chart = render_score_chart(score, f"{org_name} Quality Score")
+    if score_chart:
+        story.append(Paragraph("Visual Score Representation", subheading_style))
+        story.append(ReportLabImage(score_chart, width=5*inch, height=3*inch))
+        story.append(Spacer(1, 15))
+    
+    # Certifications Section
+    story.append(Paragraph("Certifications Analysis", heading_style))
+    
+    certifications = org_data.get('certifications', [])
+    if certifications:
+        story.append(Paragraph(f"Total Certifications Found: {len(certifications)}", subheading_style))
+        
+        # Active certifications table
+        active_certs = [cert for cert in certifications if cert.get('status') == 'Active']
+        if active_certs:
+            cert_data = [['Certification', 'Status', 'Valid Until', 'Score Impact']]
+            for cert in active_certs[:10]:  # Show top 10
+                cert_data.append([
+                    cert.get('name', 'N/A'),
+                    cert.get('status', 'N/A'),
+                    cert.get('valid_until', 'N/A'),
+                    f"{cert.get('score_impact', 0):.1f}"
+                ])
+            
+            cert_table = Table(cert_data, colWidths=[2.5*inch, 1*inch, 1.5*inch, 1*inch])
+            cert_table.setStyle(styles.certification_table)
+            
+            story.append(cert_table)
+            story.append(Spacer(1, 15))
+        
+        # Add certification chart
+        cert_chart = render_certification_chart(certifications)
+        if cert_chart:
+            story.append(Paragraph("Certification Status Distribution", subheading_style))
+            story.append(ReportLabImage(cert_chart, width=4*inch, height=3*inch))
+            story.append(Spacer(1, 15))
+    else:
+        story.append(Paragraph("No certifications found in our database.", normal_style))
+        story.append(Spacer(1, 10))
+    
+    # Quality Initiatives Section
+    story.append(Paragraph("Quality Initiatives", heading_style))
+    
+    initiatives = org_data.get('quality_initiatives', [])
+    if initiatives:
+        story.append(Paragraph(f"Quality Initiatives Identified: {len(initiatives)}", subheading_style))
+        
+        for i, initiative in enumerate(initiatives[:8], 1):  # Show top 8
+            init_text = f"<b>{i}.</b> {initiative.get('name', 'N/A')} ({initiative.get('year', 'N/A')})"
+            story.append(Paragraph(init_text, normal_style))
+        
+        story.append(Spacer(1, 15))
+    else:
+        story.append(Paragraph("No specific quality initiatives found in our analysis.", normal_style))
+        story.append(Spacer(1, 10))
+    
+    # Page break for next section
+    story.append(PageBreak())
+    
+    # Methodology Section
+    story.append(Paragraph("Assessment Methodology", heading_style))
+    
+    methodology_text = """
+    <b>Data Sources:</b><br/>
+    • Official certification body databases (ISO, JCI, NABH, CAP, NABL, etc.)<br/>
+    • International accreditation organizations<br/>
+    • Government healthcare regulatory databases<br/>
+    • Verified certification registries<br/>
+    • Official organization certification disclosures<br/><br/>
+    
+    <b>Mandatory Compliance Review:</b><br/>
+    All organizations must be reviewed for compliance with these certification/accreditation standards before QuXAT score generation:<br/>
+    • <b>ISO 9001</b> - Quality Management Systems<br/>
+    • <b>ISO 14001</b> - Environmental Management Systems<br/>
+    • <b>ISO 45001</b> - Occupational Health and Safety Management Systems<br/>
+    • <b>ISO 27001</b> - Information Security Management Systems<br/>
+    • <b>ISO 13485</b> - Medical Devices Quality Management Systems<br/>
+    • <b>ISO 50001</b> - Energy Management Systems<br/>
+    • <b>ISO 15189</b> - Medical Laboratories Quality and Competence<br/>
+    • <b>College of American Pathologists (CAP)</b> - Laboratory Accreditation<br/><br/>
+    
+    <b>Scoring Methodology:</b><br/>
+    • <b>Weighted Certification System (100%):</b> Evidence-based scoring using verified certifications with specific weights<br/><br/>
+    
+    <b>Certification Weight Hierarchy:</b><br/>
+    • <b>JCI Accreditation:</b> Weight 3.5, Base Score 30 pts (Global Gold Standard)<br/>
+    • <b>ISO 9001 & ISO 13485:</b> Weight 3.2, Base Score 25 pts (Quality & Medical Device Management)<br/>
+    • <b>ISO 15189:</b> Weight 3.0, Base Score 22 pts (Medical Laboratory Quality)<br/>
+    • <b>ISO 27001:</b> Weight 2.8, Base Score 20 pts (Information Security)<br/>
+    • <b>CAP Accreditation:</b> Weight 2.8, Base Score 22 pts (Laboratory Standards)<br/>
+    • <b>ISO 45001:</b> Weight 2.6, Base Score 18 pts (Occupational Health & Safety)<br/>
+    • <b>NABH Accreditation:</b> Weight 2.6, Base Score 20 pts (Hospital Standards)<br/>
+    • <b>ISO 14001:</b> Weight 2.4, Base Score 16 pts (Environmental Management)<br/>
+    • <b>NABL Accreditation:</b> Weight 2.4, Base Score 18 pts (Testing & Calibration)<br/>
+    • <b>ISO 50001:</b> Weight 2.2, Base Score 14 pts (Energy Management)<br/>
+    • <b>Other ISO Standards:</b> Weight 2.0, Base Score 12 pts (General ISO Certifications)<br/><br/>
+    
+    <b>Certification Status:</b> Active certifications (100% weight), In-Progress (50% weight)<br/>
+    <b>Performance Bonuses:</b> Diversity bonus (multiple cert types), International premium (JCI/ISO certs)<br/><br/>
+    
+    <b>Score Ranges (Evidence-Based Scale):</b><br/>
+    • 90-100: A+ (Exceptional Quality Recognition)<br/>
+    • 80-89: A (Excellent - Quality Recognition)<br/>
+    • 70-79: B+ (Good - Quality Recognition)<br/>
+    • 60-69: B (Adequate - Quality Recognition)<br/>
+    • 50-59: C (Average - Quality Recognition)
+    """
+    
+    story.append(Paragraph(methodology_text, normal_style))
+    story.append(Spacer(1, 20))
+    
+    # Disclaimers Section
+    story.append(Paragraph("Important Disclaimers", heading_style))
+    
+    disclaimer_text = """
+    <b>Assessment Limitations:</b> This scoring system is based on publicly available information and may not 
+    capture all quality aspects of an organization. Scores are generated through automated analysis and 
+    <b>may be incorrect or incomplete</b>.<br/><br/>
+    
+    <b>Data Dependencies:</b> Accuracy depends on the availability and reliability of public data sources. 
+    Organizations may have additional certifications or quality initiatives not captured in our database.<br/><br/>
+    
+    <b>Not Medical Advice:</b> Healthcare Quality Grid scores do not constitute medical advice, professional recommendations, 
+    or endorsements. Users should conduct independent verification and due diligence before making healthcare decisions.<br/><br/>
+    
+    <b>Limitation of Liability:</b> Healthcare Quality Grid and its developers disclaim all warranties, express or implied, 
+    regarding the accuracy or completeness of information. Users assume full responsibility for any decisions 
+    made based on Healthcare Quality Grid assessments.<br/><br/>
+    
+    <b>Comparative Tool Only:</b> Intended for comparative analysis and research purposes, not absolute quality determination.
+    """
+    
+    story.append(Paragraph(disclaimer_text, normal_style))
+    story.append(Spacer(1, 20))
+    
+    # Footer
+    footer_text = f"""
+    <b>Report Generated by:</b> Healthcare Quality Grid v3.0<br/>
+    <b>Generation Date:</b> {generated_at.strftime('%B %d, %Y at %I:%M %p')}<br/>
+    <b>Organization:</b> {org_name}<br/>
+    <b>Report ID:</b> QXT-{generated_at.strftime('%Y%m%d')}-{report_number(org_name):04d}<br/>
+    <br/>
+    <b>Contact Information:</b><br/>
+    Contact the Global Healthcare Quality Assessment team at quxat.team@gmail.com to add your organization to our quality self-assessment database.
+    """
+    
+    story.append(Paragraph(footer_text, normal_style))
+    
+    return story
+
+
+class ScorecardPDFService:
+    """Thread-safe scorecard renderer with a content-hash PDF cache"""
+    
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, max_memory_entries: int = 128):
+        """
+        Args:
+            cache_dir: Directory for rendered PDFs (None keeps the cache in memory only)
+            max_memory_entries: Size of the in-memory LRU of recently served PDFs
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._pruned_before: Optional[date] = None
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'renders': 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+    
+    def _cache_path(self, key: str, render_date: date) -> Optional[str]:
+        # Date prefix so entries from earlier days can be pruned without opening them
+        return os.path.join(self.cache_dir, f"{render_date:%Y%m%d}-{key}.pdf") if self.cache_dir else None
+    
+    def _remember(self, key: str, pdf_data: bytes):
+        with self._lock:
+            self._memory[key] = pdf_data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+    
+    def _write_disk(self, key: str, pdf_data: bytes, render_date: date):
+        path = self._cache_path(key, render_date)
+        if not path:
+            return
+        if self._pruned_before != render_date:
+            self.prune(render_date)
+        # Atomic replace so concurrent readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(pdf_data)
+        os.replace(tmp_path, path)
+    
+    def prune(self, before: Optional[date] = None) -> int:
+        """Delete disk entries rendered before the given day (default: today); returns how many"""
+        before = before or date.today()
+        self._pruned_before = before
+        if not self.cache_dir:
+            return 0
+        cutoff = f"{before:%Y%m%d}"
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            # Undated names are entries from before render dates were part of the key
+            dated = name[:8].isdigit() and name[8:9] == '-'
+            if name.endswith('.pdf') and (not dated or name[:8] < cutoff):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+    
+    def get_cached(self, org_name: str, org_data: Dict[str, Any],
+                   generated_at: Optional[datetime] = None) -> Optional[bytes]:
+        """Return a PDF already rendered today (or on generated_at's day) for this score version, if any"""
+        render_date = (generated_at or datetime.now()).date()
+        key = scorecard_cache_key(org_name, org_data, render_date)
+        with self._lock:
+            pdf_data = self._memory.get(key)
+            if pdf_data is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return pdf_data
+        path = self._cache_path(key, render_date)
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                pdf_data = f.read()
+            with self._lock:
+                self.stats['disk_hits'] += 1
+            self._remember(key, pdf_data)
+            return pdf_data
+        return None
+    
+    def render(self, org_name: str, org_data: Dict[str, Any], generated_at: Optional[datetime] = None) -> bytes:
+        """Return the scorecard PDF, rendering it only if this score version is not cached for the day"""
+        generated_at = generated_at or datetime.now()
+        pdf_data = self.get_cached(org_name, org_data, generated_at)
+        if pdf_data is not None:
+            return pdf_data
+        key = scorecard_cache_key(org_name, org_data, generated_at.date())
+        pdf_data = build_scorecard_pdf(org_name, org_data, generated_at)
+        with self._lock:
+            self.stats['renders'] += 1
+        self._write_disk(key, pdf_data, generated_at.date())
+        self._remember(key, pdf_data)
+        return pdf_data
+    
+    def render_batch(self, organizations: Iterable[Dict[str, Any]], workers: Optional[int] = None,
+                     name_field: str = 'name') -> Dict[str, int]:
+        """
+        Pre-render scorecards for many organizations into the disk cache
+        
+        Args:
+            organizations: Scored organizations (e.g. scored_organizations_complete.json)
+            workers: Process pool size (defaults to CPU count); 0 renders in-process
+            name_field: Key holding the organization name
+        
+        Returns:
+            Counts of rendered, already cached and failed scorecards
+        """
+        if not self.cache_dir:
+            raise ValueError("Batch rendering requires a cache_dir")
+        
+        result = {'rendered': 0, 'cached': 0, 'failed': 0}
+        today = date.today()
+        self.prune(today)
+        pending = []
+        for org in organizations:
+            org_name = org.get(name_field) or ''
+            if not org_name:
+                continue
+            if os.path.exists(self._cache_path(scorecard_cache_key(org_name, org, today), today)):
+                result['cached'] += 1
+            else:
+                pending.append((org_name, org, self.cache_dir))
+        
+        if not pending:
+            return result
+        if workers == 0:
+            outcomes = map(_render_to_cache, pending)
+            self._count_outcomes(outcomes, result)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                self._count_outcomes(executor.map(_render_to_cache, pending, chunksize=8), result)
+        logger.info(f"Scorecard batch: {result['rendered']} rendered, {result['cached']} cached, {result['failed']} failed")
+        return result
+    
+    @staticmethod
+    def _count_outcomes(outcomes, result):
+        for ok in outcomes:
+            result['rendered' if ok else 'failed'] += 1
+
+
+def _render_to_cache(task) -> bool:
+    """Process-pool worker: render one scorecard into the disk cache"""
+    org_name, org_data, cache_dir = task
+    try:
+        ScorecardPDFService(cache_dir=cache_dir, max_memory_entries=0).render(org_name, org_data)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to render scorecard for {org_name}: {e}")
+        return False
+
+
+def main():
+    """Pre-render scorecards for all ranked organizations"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Pre-render QuXAT scorecard PDFs')
+    parser.add_argument('scored_file', nargs='?', default='scored_organizations_complete.json',
+                        help='Scored organizations JSON produced by batch_scoring_system.py')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--limit', type=int, default=None, help='Only render the top N ranked organizations')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(args.scored_file, 'r', encoding='utf-8') as f:
+        organizations = json.load(f)
+    if isinstance(organizations, dict):
+        organizations = organizations.get('organizations', [])
+    organizations = sorted(organizations, key=lambda o: o.get('overall_rank') or sys.maxsize)
+    if args.limit:
+        organizations = organizations[:args.limit]
+    
+    started = datetime.now()
+    result = ScorecardPDFService(cache_dir=args.cache_dir).render_batch(organizations, workers=args.workers)
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"Rendered {result['rendered']} scorecards ({result['cached']} already cached, "
+          f"{result['failed']} failed) in {elapsed:.1f}s -> {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
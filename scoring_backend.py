@@ -0,0 +1,514 @@
+"""
+Scoring Backend for QuXAT Healthcare Quality Grid
+A small local process pool that does the CPU-bound scoring for the Streamlit
+front end, so scoring scales across cores while UI processes stay light.
+
+    streamlit_app.py --(local socket)--> ScoringBackendServer --> worker processes
+                                                                        |
+                                      unified_snapshot.jsonl (read-only, memory-mapped)
+
+The unified database is written once as a dataset snapshot: one compact JSON
+record per line plus a NumPy array of line offsets. Every worker memory-maps
+the same snapshot read-only and decodes only the records it scores, so the
+dataset is shared through the page cache rather than copied per process.
+
+Whole-database rankings (used by the percentile rankings) are sharded across
+the workers and memoized for the snapshot. Snapshots record the data manifest
+version they were built from (see data_manifest.py); the front end only uses
+backend rankings for the data version it has loaded itself and scores
+in-process otherwise.
+
+Deployment: start the backend next to the app and point the app at it. Calls
+are pickled, so both sides must share a secret key, and the backend only
+listens on the loopback interface or a Unix socket.
+
+    export QUXAT_SCORING_BACKEND_AUTHKEY=$(python -c "import secrets; print(secrets.token_hex(32))")
+    python scoring_backend.py --workers 4 --address 127.0.0.1:8765
+    QUXAT_SCORING_BACKEND=127.0.0.1:8765 streamlit run streamlit_app.py
+
+LocalScoringBackend serves the same calls in-process (tests, single-process runs).
+"""
+
+import argparse
+import ipaddress
+import json
+import logging
+import mmap
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from data_manifest import MANIFEST_FILE, ManifestVersion
+from score_history_store import normalize_org_key
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+SNAPSHOT_FILE = 'unified_snapshot.jsonl'
+OFFSETS_SUFFIX = '.offsets.npy'
+META_SUFFIX = '.meta.json'
+
+BACKEND_ENV = 'QUXAT_SCORING_BACKEND'
+AUTHKEY_ENV = 'QUXAT_SCORING_BACKEND_AUTHKEY'
+DEFAULT_ADDRESS = ('127.0.0.1', 8765)
+
+Address = Union[str, Tuple[str, int]]
+
+
+class ScoringBackendError(RuntimeError):
+    """A backend call failed on the server side"""
+
+
+def is_local_address(address: Address) -> bool:
+    """True for a Unix socket path or a loopback (host, port)"""
+    if isinstance(address, str):
+        return True
+    host = address[0]
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def authkey_from_env() -> Optional[bytes]:
+    """Shared key from QUXAT_SCORING_BACKEND_AUTHKEY, None when it is not set"""
+    authkey = os.environ.get(AUTHKEY_ENV, '').strip()
+    return authkey.encode('utf-8') if authkey else None
+
+
+def _atomic_write(path: str, write: Callable[[Any], None], mode: str = 'wb') -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, mode) as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def write_snapshot(records: List[Any], path: str, manifest_version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write organization records as a dataset snapshot
+
+    The metadata file is written last, so readers never see offsets that do
+    not belong to the records file.
+
+    Returns:
+        The snapshot metadata
+    """
+    records = [r for r in records or [] if isinstance(r, dict)]
+    lines = [json.dumps(r, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n' for r in records]
+    offsets = np.zeros(len(lines) + 1, dtype=np.int64)
+    np.cumsum([len(line) for line in lines], out=offsets[1:])
+
+    _atomic_write(path, lambda f: f.writelines(lines))
+    _atomic_write(path + OFFSETS_SUFFIX, lambda f: np.save(f, offsets))
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'manifest_version': manifest_version,
+        'count': len(records),
+        'size': int(offsets[-1]),
+        'names': [normalize_org_key(r.get('name', '')) for r in records],
+    }
+    _atomic_write(path + META_SUFFIX, lambda f: json.dump(meta, f, ensure_ascii=False, separators=(',', ':')),
+                  mode='w')
+    return meta
+
+
+class DatasetSnapshot:
+    """Read-only, memory-mapped view of a dataset snapshot"""
+
+    def __init__(self, path: str):
+        with open(path + META_SUFFIX, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format: {meta.get('format_version')!r}")
+        self.path = path
+        self.manifest_version = meta.get('manifest_version')
+        self.offsets = np.load(path + OFFSETS_SUFFIX, mmap_mode='r')
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if len(self.offsets) != meta['count'] + 1 or size != meta['size']:
+            self._file.close()
+            raise ValueError(f"Snapshot files out of step: {path}")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._positions: Dict[str, List[int]] = {}
+        for position, key in enumerate(meta['names']):
+            self._positions.setdefault(key, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def record(self, position: int) -> Dict[str, Any]:
+        """Decode one record; each call returns a fresh dict"""
+        start, stop = int(self.offsets[position]), int(self.offsets[position + 1])
+        return json.loads(self._data[start:stop])
+
+    def positions(self, name: str) -> List[int]:
+        """Positions of the records whose name normalizes to the same key, in database order"""
+        return self._positions.get(normalize_org_key(name), [])
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+
+def ranking_entry(org: Dict[str, Any], score_data: Dict[str, Any]) -> Dict[str, Any]:
+    """An organization's entry in the percentile rankings"""
+    return {
+        'name': org['name'],
+        'location': f"{org.get('city', '')}, {org.get('country', '')}".strip(', '),
+        'country': org.get('country', ''),
+        'hospital_type': org.get('hospital_type', 'Hospital'),
+        'jci_accredited': any('JCI' in cert for cert in org.get('certifications', [])),
+        'total_score': score_data.get('total_score', 0),
+        'score_data': score_data
+    }
+
+
+def score_organization(analyzer: Any, org: Dict[str, Any]) -> Dict[str, Any]:
+    """Score a database record from its stored certifications and initiatives"""
+    return analyzer.calculate_quality_score(org.get('certifications', []), org.get('quality_initiatives', []),
+                                            org['name'], None, [])
+
+
+class SnapshotScorer:
+    """Scores snapshot records with the analyzer's scoring rules"""
+
+    def __init__(self, snapshot: DatasetSnapshot, analyzer: Any = None):
+        if analyzer is None:
+            from streamlit_app import HealthcareOrgAnalyzer
+            analyzer = HealthcareOrgAnalyzer.for_scoring()
+        self.snapshot = snapshot
+        self.analyzer = analyzer
+
+    def score(self, name: str) -> Optional[Dict[str, Any]]:
+        """Ranking entry of the last record with this name, None if there is none"""
+        for position in reversed(self.snapshot.positions(name)):
+            org = self.snapshot.record(position)
+            try:
+                return ranking_entry(org, score_organization(self.analyzer, org))
+            except Exception:
+                continue
+        return None
+
+    def rank_entries(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Ranking entries of the records in [start, stop); records that fail to score are skipped"""
+        entries = []
+        for position in range(start, stop):
+            try:
+                org = self.snapshot.record(position)
+                entries.append(ranking_entry(org, score_organization(self.analyzer, org)))
+            except Exception:
+                continue
+        return entries
+
+
+def _shards(count: int, parts: int) -> List[Tuple[int, int]]:
+    step = max(1, -(-count // max(1, parts)))
+    return [(start, min(start + step, count)) for start in range(0, count, step)]
+
+
+# Process-pool worker state: one scorer per worker over the shared snapshot
+_worker_scorer: Optional[SnapshotScorer] = None
+
+
+def _init_worker(snapshot_path: str) -> None:
+    global _worker_scorer
+    _worker_scorer = SnapshotScorer(DatasetSnapshot(snapshot_path))
+
+
+def _worker_rank_entries(bounds: Tuple[int, int]) -> List[Dict[str, Any]]:
+    return _worker_scorer.rank_entries(*bounds)
+
+
+def _worker_score(name: str) -> Optional[Dict[str, Any]]:
+    return _worker_scorer.score(name)
+
+
+class LocalScoringBackend:
+    """In-process stand-in for the backend, with the same calls as ScoringBackendClient"""
+
+    def __init__(self, snapshot_path: str, analyzer: Any = None):
+        self.snapshot = DatasetSnapshot(snapshot_path)
+        self.scorer = SnapshotScorer(self.snapshot, analyzer)
+        self._rankings: Optional[List[Dict[str, Any]]] = None
+
+    def ping(self) -> Dict[str, Any]:
+        return {'manifest_version': self.snapshot.manifest_version, 'organizations': len(self.snapshot),
+                'workers': 0}
+
+    def score(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.scorer.score(name)
+
+    def rankings(self, manifest_version: Any = None) -> Optional[List[Dict[str, Any]]]:
+        """Ranking entries for the whole snapshot in database order; None if it holds another data version"""
+        if manifest_version is not None and manifest_version != self.snapshot.manifest_version:
+            return None
+        if self._rankings is None:
+            self._rankings = self.scorer.rank_entries(0, len(self.snapshot))
+        # A fresh list, like a reply from the server
+        return list(self._rankings)
+
+    def close(self) -> None:
+        self.snapshot.close()
+
+
+class ScoringBackendServer:
+    """Serves scoring calls over a local socket from a pool of worker processes"""
+
+    def __init__(self, snapshot_path: str, address: Address = DEFAULT_ADDRESS, workers: Optional[int] = None,
+                 authkey: Optional[bytes] = None, rebuild: Optional[Callable[[], Any]] = None,
+                 manifest_path: Optional[str] = None):
+        """
+        Args:
+            snapshot_path: Dataset snapshot written by write_snapshot()
+            address: Loopback (host, port) or a Unix socket path
+            workers: Worker processes (defaults to CPU count)
+            authkey: Shared key clients must present (a random key for this
+                server when omitted; see the authkey attribute)
+            rebuild: Rewrites the snapshot at snapshot_path; called when the data
+                manifest version no longer matches the snapshot's
+            manifest_path: Data manifest to watch (only with rebuild)
+        """
+        if not is_local_address(address):
+            raise ValueError(f"Scoring backend must listen on a loopback address or Unix socket, not {address!r}")
+        self.snapshot_path = snapshot_path
+        self.workers = workers or os.cpu_count() or 1
+        self._rebuild = rebuild
+        self._manifest = ManifestVersion(manifest_path or MANIFEST_FILE) if rebuild else None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.authkey = authkey or os.urandom(32)
+        self._start_pool()
+        self._listener = Listener(address, authkey=self.authkey)
+        self.address = self._listener.address
+
+    def _start_pool(self) -> None:
+        self.snapshot = DatasetSnapshot(self.snapshot_path)
+        # Spawned workers: the server runs accept threads, which do not mix with fork
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_init_worker, initargs=(self.snapshot_path,))
+        self._rankings: Optional[List[Dict[str, Any]]] = None
+
+    def refresh(self) -> bool:
+        """Rebuild the snapshot and restart the workers if the data manifest version changed"""
+        if self._manifest is None:
+            return False
+        version = self._manifest.current()
+        with self._lock:
+            if version == self.snapshot.manifest_version:
+                return False
+            logger.info(f"Data version changed ({self.snapshot.manifest_version} -> {version}); rebuilding snapshot")
+            self._rebuild()
+            old_executor, old_snapshot = self._executor, self.snapshot
+            self._start_pool()
+        old_executor.shutdown()
+        old_snapshot.close()
+        return True
+
+    def ping(self) -> Dict[str, Any]:
+        return {'manifest_version': self.snapshot.manifest_version, 'organizations': len(self.snapshot),
+                'workers': self.workers}
+
+    def score(self, name: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        return self._executor.submit(_worker_score, name).result()
+
+    def rankings(self, manifest_version: Any = None) -> Optional[List[Dict[str, Any]]]:
+        """Ranking entries for the whole snapshot, sharded across the workers and memoized"""
+        self.refresh()
+        with self._lock:
+            if manifest_version is not None and manifest_version != self.snapshot.manifest_version:
+                return None
+            if self._rankings is None:
+                entries = []
+                for part in self._executor.map(_worker_rank_entries, _shards(len(self.snapshot), self.workers * 4)):
+                    entries.extend(part)
+                self._rankings = entries
+            return self._rankings
+
+    def dispatch(self, op: str, args: Tuple) -> Any:
+        if op not in ('ping', 'score', 'rankings'):
+            raise ValueError(f"Unknown operation: {op!r}")
+        return getattr(self, op)(*args)
+
+    def _handle(self, conn) -> None:
+        with conn:
+            while True:
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = ('ok', self.dispatch(op, args))
+                except Exception as e:
+                    logger.error(f"Backend call {op} failed: {e}")
+                    reply = ('error', f"{type(e).__name__}: {e}")
+                try:
+                    conn.send(reply)
+                except OSError:
+                    return
+
+    def serve_forever(self) -> None:
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, multiprocessing.AuthenticationError):
+                if self._closed:
+                    break
+                continue
+            if self._closed:
+                conn.close()
+                break
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def start(self) -> 'ScoringBackendServer':
+        """Serve from a background thread"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            # Wake the blocking accept()
+            Client(self.address, authkey=self.authkey).close()
+        except (OSError, EOFError, multiprocessing.AuthenticationError):
+            pass
+        self._listener.close()
+        self._executor.shutdown()
+        self.snapshot.close()
+
+
+class ScoringBackendClient:
+    """Front-end side of the backend socket; thread-safe, reconnects once on a broken connection"""
+
+    def __init__(self, address: Address, authkey: bytes, timeout: float = 60.0):
+        if not authkey:
+            raise ValueError("A scoring backend client needs the server's authkey")
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _call(self, op: str, *args: Any) -> Any:
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._conn is None:
+                        self._conn = Client(self.address, authkey=self.authkey)
+                    self._conn.send((op, args))
+                    if not self._conn.poll(self.timeout):
+                        raise TimeoutError(f"Scoring backend did not answer {op} within {self.timeout}s")
+                    status, value = self._conn.recv()
+                    break
+                except multiprocessing.AuthenticationError as e:
+                    self._disconnect()
+                    raise ScoringBackendError(f"Scoring backend rejected the authkey: {e}") from e
+                except (OSError, EOFError):
+                    self._disconnect()
+                    if attempt:
+                        raise
+        if status == 'error':
+            raise ScoringBackendError(value)
+        return value
+
+    def _disconnect(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+
+    def ping(self) -> Dict[str, Any]:
+        return self._call('ping')
+
+    def score(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._call('score', name)
+
+    def rankings(self, manifest_version: Any = None) -> Optional[List[Dict[str, Any]]]:
+        return self._call('rankings', manifest_version)
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+
+def parse_address(text: str) -> Address:
+    """'host:port' -> (host, port); anything else is a Unix socket path"""
+    host, sep, port = text.strip().rpartition(':')
+    if sep and host and port.isdigit():
+        return (host, int(port))
+    return text.strip()
+
+
+_default_backend: Optional[ScoringBackendClient] = None
+_default_lock = threading.Lock()
+
+
+def get_scoring_backend() -> Optional[ScoringBackendClient]:
+    """Client for the backend named by QUXAT_SCORING_BACKEND, or None when the app scores in-process"""
+    global _default_backend
+    setting = os.environ.get(BACKEND_ENV, '').strip()
+    if not setting:
+        return None
+    authkey = authkey_from_env()
+    if authkey is None:
+        logger.warning(f"{BACKEND_ENV} is set without {AUTHKEY_ENV}; scoring in-process")
+        return None
+    address = parse_address(setting)
+    with _default_lock:
+        if (_default_backend is None or _default_backend.address != address
+                or _default_backend.authkey != authkey):
+            _default_backend = ScoringBackendClient(address, authkey)
+        return _default_backend
+
+
+def build_snapshot(path: str = SNAPSHOT_FILE) -> Dict[str, Any]:
+    """Write the analyzer's unified database as a snapshot, stamped with the data version it loaded"""
+    from streamlit_app import HealthcareOrgAnalyzer
+    analyzer = HealthcareOrgAnalyzer()
+    return write_snapshot(analyzer.unified_database, path, analyzer._loaded_manifest_version)
+
+
+def main():
+    """Build the dataset snapshot and serve scoring calls until interrupted"""
+    parser = argparse.ArgumentParser(description='Run the QuXAT scoring backend')
+    parser.add_argument('--address', default=os.environ.get(BACKEND_ENV) or '%s:%d' % DEFAULT_ADDRESS,
+                        help='host:port or Unix socket path')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--snapshot', default=SNAPSHOT_FILE)
+    args = parser.parse_args()
+
+    # The app must present the same key, so it has to come from the environment
+    authkey = authkey_from_env()
+    if authkey is None:
+        parser.error(f"set {AUTHKEY_ENV} to a secret shared with the app")
+    address = parse_address(args.address)
+    if not is_local_address(address):
+        parser.error(f"--address must be a loopback host or a Unix socket path, not {args.address!r}")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    meta = build_snapshot(args.snapshot)
+    server = ScoringBackendServer(args.snapshot, address, args.workers, authkey,
+                                  rebuild=lambda: build_snapshot(args.snapshot))
+    logger.info(f"Scoring backend: {meta['count']} organizations, {server.workers} workers on {server.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Search Result Cache for QuXAT Healthcare Quality Grid
+Process-wide, size-bounded cache of complete organization search payloads.
+
+Popular organizations are searched by many users, and every search reruns the
+whole pipeline (database match, validation, scoring, recommendations, ranking
+and percentile passes over the full database). This cache keeps the finished
+payloads, shared by all sessions, keyed by the canonical organization plus a
+data-version stamp:
+
+- DataVersion stamps the dataset files (unified database sources and the
+  scored rankings file) by size and modification time, so any rewrite of
+  them gives a new version and the cache starts over.
+- Entries are evicted least-recently-used beyond max_entries.
+- Hit/miss counters per kind of result are kept for the admin panel.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from score_history_store import normalize_org_key
+from single_flight import SingleFlight
+
+
+class DataVersion:
+    """Cheap version stamp over a set of dataset files and directories"""
+
+    def __init__(self, paths: Iterable[str], min_check_interval: float = 2.0):
+        """
+        Args:
+            paths: Files, or directories whose direct entries are stamped
+            min_check_interval: Seconds between filesystem checks; stamps are
+                reused in between so hot lookups do not stat on every call
+        """
+        self.paths = list(paths)
+        self.min_check_interval = min_check_interval
+        self._stamp: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat(path: str) -> Tuple:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return (path, None)
+        if os.path.isdir(path):
+            entries = []
+            for name in sorted(os.listdir(path)):
+                try:
+                    est = os.stat(os.path.join(path, name))
+                except OSError:
+                    continue
+                entries.append((name, est.st_size, est.st_mtime_ns))
+            return (path, tuple(entries))
+        return (path, st.st_size, st.st_mtime_ns)
+
+    def current(self, force: bool = False) -> Tuple:
+        with self._lock:
+            now = time.monotonic()
+            if force or self._stamp is None or now - self._checked_at >= self.min_check_interval:
+                self._stamp = tuple(self._stat(p) for p in self.paths)
+                self._checked_at = now
+            return self._stamp
+
+
+class SearchResultCache:
+    """Thread-safe LRU of search payloads, invalidated when the data version changes"""
+
+    def __init__(self, version_func: Callable[[], Hashable], max_entries: int = 512):
+        """
+        Args:
+            version_func: Returns the current data-version stamp (any hashable)
+            max_entries: Total payloads kept across all kinds
+        """
+        self.version_func = version_func
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, Any]' = OrderedDict()
+        self._version: Optional[Hashable] = None
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0, 'by_kind': {}}
+        self._flights = SingleFlight()
+
+    @staticmethod
+    def make_key(kind: str, org_name: str, *extra: Hashable) -> Tuple:
+        return (kind, normalize_org_key(org_name)) + tuple(extra)
+
+    def _check_version(self) -> None:
+        """Drop everything if the data changed (lock held)"""
+        version = self.version_func()
+        if version != self._version:
+            if self._version is not None and self._entries:
+                self.stats['invalidations'] += 1
+            self._entries.clear()
+            self._version = version
+
+    def _count(self, kind: str, field: str) -> None:
+        self.stats[field] += 1
+        per_kind = self.stats['by_kind'].setdefault(kind, {'hits': 0, 'misses': 0})
+        per_kind[field] += 1
+
+    def get(self, kind: str, org_name: str, *extra: Hashable) -> Optional[Any]:
+        """Cached payload (a copy) or None"""
+        key = self.make_key(kind, org_name, *extra)
+        with self._lock:
+            self._check_version()
+            if key not in self._entries:
+                self._count(kind, 'misses')
+                return None
+            self._entries.move_to_end(key)
+            self._count(kind, 'hits')
+            value = self._entries[key]
+        return copy.deepcopy(value)
+
+    def peek(self, kind: str, org_name: str, *extra: Hashable) -> Optional[Any]:
+        """Cached payload (a copy) or None, without counting a hit or miss"""
+        key = self.make_key(kind, org_name, *extra)
+        with self._lock:
+            self._check_version()
+            value = self._entries.get(key)
+        return copy.deepcopy(value) if value is not None else None
+
+    def put(self, kind: str, org_name: str, value: Any, *extra: Hashable) -> None:
+        if value is None:
+            return
+        key = self.make_key(kind, org_name, *extra)
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._check_version()
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def get_or_compute(self, kind: str, org_name: str, compute: Callable[[], Any], *extra: Hashable) -> Any:
+        """
+        Cached payload, or compute() stored for the next caller
+
+        Concurrent misses for the same key share one compute() call. None
+        results (failed searches) are returned but not cached. Callers
+        always receive their own copy, so they may modify it freely.
+        """
+        value = self.get(kind, org_name, *extra)
+        if value is not None:
+            return value
+
+        def compute_and_store():
+            # A flight that landed just before this one started may have stored the payload
+            stored = self.peek(kind, org_name, *extra)
+            if stored is not None:
+                return stored
+            result = compute()
+            self.put(kind, org_name, result, *extra)
+            return result
+
+        value, shared = self._flights.do_shared(self.make_key(kind, org_name, *extra), compute_and_store)
+        return copy.deepcopy(value) if shared else value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters for display (admin panel)"""
+        with self._lock:
+            by_kind = {kind: dict(counts) for kind, counts in self.stats['by_kind'].items()}
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'hit_ratio': round(self.hit_ratio, 4),
+                'evictions': self.stats['evictions'],
+                'invalidations': self.stats['invalidations'],
+                'coalesced': self._flights.stats['shared'],
+                'by_kind': by_kind,
+            }
+
+
+def dataset_paths(base_dir: str) -> List[str]:
+    """Files whose changes invalidate cached search results"""
+    names = [
+        'unified_healthcare_organizations_with_mayo_cap.json',
+        'unified_healthcare_organizations.json',
+        'global_healthcare_organizations.json',
+        'validation_discovered_organizations.json',
+        'external_organizations',
+        'scored_organizations_complete.json',
+    ]
+    return [os.path.join(base_dir, name) for name in names]
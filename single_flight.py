@@ -0,0 +1,89 @@
+"""
+Single-Flight Calls for QuXAT Healthcare Quality Grid
+Coalesces concurrent identical lookups into one computation.
+
+Streamlit serves every session from a thread of the same process, so several
+users searching the same organization at once each ran the whole lookup
+(validation, ISO searches, official-site fetches), including duplicate
+outbound HTTP. SingleFlight.do(key, fn) runs fn for the first caller of a
+key; callers arriving while it is in flight wait and receive the same result
+(or exception) instead of starting their own. Only results and Exception
+failures are shared: if the first caller is interrupted by any other
+BaseException (Streamlit's rerun/stop control flow, KeyboardInterrupt), the
+waiting callers run fn themselves.
+
+Nothing is remembered once the flight lands: callers put the result in their
+own cache (validation_cache, certification_cache, the search result cache)
+from inside fn, so later callers find it there.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'error', 'aborted')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.aborted = False
+
+
+class SingleFlight:
+    """Thread-safe coalescing of concurrent calls that share a key"""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {'executions': 0, 'shared': 0}
+
+    def do_shared(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, bool]:
+        """
+        Result of fn(*args, **kwargs), computed once for all concurrent callers of key
+
+        Returns:
+            (result, shared): shared is True for callers that received another
+            caller's result (the very same object)
+        """
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                    self.stats['executions'] += 1
+            if leader:
+                break
+            flight.done.wait()
+            if flight.aborted:
+                # The leader's control-flow exception is not ours: take over the call
+                continue
+            with self._lock:
+                self.stats['shared'] += 1
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn(*args, **kwargs)
+        except Exception as e:
+            flight.error = e
+            raise
+        except BaseException:
+            flight.aborted = True
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """fn(*args, **kwargs), computed once for all concurrent callers of key"""
+        return self.do_shared(key, fn, *args, **kwargs)[0]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
@@ -0,0 +1,280 @@
+"""
+Streaming Dataset Loader for QuXAT Healthcare Quality Grid
+Reads organization datasets (external_organizations/, unified database files)
+one record at a time and deduplicates them in a single pass.
+
+- JSON files are parsed incrementally: the top-level array, or the array under
+  an "organizations" key, is decoded element by element from fixed-size
+  chunks, so a multi-hundred-MB export never has to be held as one string or
+  one list. JSON Lines (.jsonl/.ndjson) and CSV files stream natively.
+- DedupReducer keeps only the preferred record per dedup key, so peak memory
+  is bounded by the number of distinct organizations rather than the number
+  of rows across all files.
+- LoadStats reports rows read, duplicates dropped and rows/sec.
+"""
+
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+SUPPORTED_EXTENSIONS = ('.json', '.csv') + JSON_LINES_EXTENSIONS
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',:]}'
+_decoder = json.JSONDecoder()
+
+
+class _ChunkReader:
+    """Text buffer over a file that grows on demand and drops consumed input"""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos > self.chunk_size:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of input)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self.fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A value not followed by a delimiter may be a number cut at the chunk end
+            # ("2" of "2.5"), so decode again with more input
+            if (end == len(self.buf) or self.buf[end] not in _DELIMITERS) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(reader: _ChunkReader) -> Iterator[Any]:
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    while True:
+        yield reader.decode()
+        char = reader.peek()
+        reader.pos += 1
+        if char == ']':
+            return
+        if char != ',':
+            raise ValueError(f"expected ',' or ']' at offset {reader.pos - 1}")
+
+
+def iter_json_records(path: str, array_keys: Sequence[str] = ('organizations',),
+                      single_object: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Stream the records of a JSON dataset file
+
+    Args:
+        path: JSON file holding either a list of records or an object wrapping one
+        array_keys: Keys of a top-level object whose list value holds the records
+            (the first one present wins)
+        single_object: Treat a top-level object without any array_keys as one record
+        chunk_size: Characters read per chunk
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _ChunkReader(f, chunk_size)
+        first = reader.peek()
+        if first == '[':
+            yield from _iter_array(reader)
+            return
+        if first != '{':
+            value = reader.decode()
+            if single_object and isinstance(value, dict):
+                yield value
+            return
+
+        reader.expect('{')
+        while reader.peek() != '}':
+            key = reader.decode()
+            reader.expect(':')
+            if key in array_keys and reader.peek() == '[':
+                # Other keys (metadata, etc.) are decoded and discarded as they pass
+                yield from _iter_array(reader)
+                return
+            reader.decode()
+            if reader.peek() == ',':
+                reader.pos += 1
+
+    if single_object:
+        # No records array: the object itself is the record (small, legacy single-org files)
+        with open(path, 'r', encoding='utf-8') as f:
+            yield json.load(f)
+
+
+def iter_jsonl_records(path: str) -> Iterator[Any]:
+    """Stream a JSON Lines file, one record per non-blank line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_csv_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream a CSV file as dict rows"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+
+def iter_dataset_records(path: str, array_keys: Sequence[str] = ('organizations',),
+                         single_object: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Stream records from a .json, .jsonl/.ndjson or .csv file (by extension)"""
+    lower = path.lower()
+    if lower.endswith(JSON_LINES_EXTENSIONS):
+        return iter_jsonl_records(path)
+    if lower.endswith('.csv'):
+        return iter_csv_records(path)
+    return iter_json_records(path, array_keys=array_keys, single_object=single_object, chunk_size=chunk_size)
+
+
+def non_empty_field_count(record: Dict[str, Any]) -> int:
+    """Richness of a record: number of truthy fields"""
+    return sum(1 for value in record.values() if value)
+
+
+@dataclass
+class LoadStats:
+    """Throughput and dedup counters for one streaming load"""
+    files: int = 0
+    rows: int = 0
+    unique: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+    failed_files: List[str] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed_seconds: float = 0.0
+
+    def finish(self) -> 'LoadStats':
+        self.elapsed_seconds = time.perf_counter() - self.started_at
+        return self
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'files': self.files,
+            'rows': self.rows,
+            'unique': self.unique,
+            'duplicates': self.duplicates,
+            'skipped': self.skipped,
+            'failed_files': list(self.failed_files),
+            'elapsed_seconds': round(self.elapsed_seconds, 3),
+            'rows_per_sec': round(self.rows_per_sec, 1),
+        }
+
+    def summary(self) -> str:
+        return (f"{self.rows:,} rows from {self.files} files -> {self.unique:,} unique "
+                f"({self.duplicates:,} duplicates) in {self.elapsed_seconds:.2f}s "
+                f"({self.rows_per_sec:,.0f} rows/sec)")
+
+
+class DedupReducer:
+    """Single-pass dedup: keeps the richest record per key, in first-seen key order"""
+
+    def __init__(self, key_func: Callable[[Dict[str, Any]], str],
+                 score_func: Callable[[Dict[str, Any]], int] = non_empty_field_count,
+                 stats: Optional[LoadStats] = None):
+        self.key_func = key_func
+        self.score_func = score_func
+        self.stats = stats or LoadStats()
+        # key -> (richness, record); only the kept record is referenced
+        self._kept: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+    def add(self, record: Any) -> bool:
+        """Offer one record; returns True if it was kept (new key or richer than the current one)"""
+        self.stats.rows += 1
+        if not isinstance(record, dict):
+            self.stats.skipped += 1
+            return False
+        key = self.key_func(record)
+        score = self.score_func(record)
+        current = self._kept.get(key)
+        if current is None:
+            self._kept[key] = (score, record)
+            return True
+        self.stats.duplicates += 1
+        if score > current[0]:
+            self._kept[key] = (score, record)
+            return True
+        return False
+
+    def extend(self, records: Iterable[Any]) -> int:
+        """Offer every record from an iterable; returns how many rows were read"""
+        before = self.stats.rows
+        for record in records:
+            self.add(record)
+        return self.stats.rows - before
+
+    def __len__(self) -> int:
+        return len(self._kept)
+
+    def values(self) -> List[Dict[str, Any]]:
+        self.stats.unique = len(self._kept)
+        return [record for _, record in self._kept.values()]
+
+
+def list_dataset_files(directory: str, extensions: Sequence[str] = SUPPORTED_EXTENSIONS) -> List[str]:
+    """Dataset files in a directory, sorted by name for a deterministic load order"""
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.lower().endswith(tuple(extensions)) and os.path.isfile(os.path.join(directory, name))]
+
+
+def stream_dedup(paths: Iterable[str], key_func: Callable[[Dict[str, Any]], str],
+                 score_func: Callable[[Dict[str, Any]], int] = non_empty_field_count,
+                 array_keys: Sequence[str] = ('organizations',),
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[List[Dict[str, Any]], LoadStats]:
+    """Stream every file through one DedupReducer; unreadable files are recorded and skipped"""
+    reducer = DedupReducer(key_func, score_func)
+    for path in paths:
+        reducer.stats.files += 1
+        try:
+            reducer.extend(iter_dataset_records(path, array_keys=array_keys, chunk_size=chunk_size))
+        except FileNotFoundError:
+            reducer.stats.files -= 1
+        except (ValueError, UnicodeDecodeError, csv.Error):
+            reducer.stats.failed_files.append(path)
+    records = reducer.values()
+    return records, reducer.stats.finish()
@@ -1,22 +1,17 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 from datetime import datetime
 import warnings
 import os
 import requests
-from bs4 import BeautifulSoup
 import json
 import re
 import time
+import uuid
 from urllib.parse import quote_plus
 import plotly.express as px
 import plotly.graph_objects as go
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as ReportLabImage, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors as rl_colors
+from reportlab.lib.pagesizes import letter
 from reportlab.graphics.shapes import Drawing
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 import traceback
@@ -33,12 +28,27 @@ from international_quality_methods import (
     generate_international_improvement_recommendations
 )
 from international_scoring_algorithm import InternationalHealthcareScorer
+from score_history_store import get_history_store, normalize_org_key
+from geo_index import GeoIndex
+from suggestion_prefetch import SuggestionPrefetcher
+from search_result_cache import DataVersion, SearchResultCache, dataset_paths
+from html_parsing import visible_text
+from analytics_cube import CUBE_FILE, AnalyticsCube
+from trends_pipeline import TRENDS_FILE, get_trends_cache
+from recommendation_rules import get_recommendation_engine
+from certification_bitsets import (COMPLIANT_STATUSES, FLAG_BITS, INTERNATIONAL_MASK, MANDATORY_ISO_STANDARDS,
+                                   MANDATORY_STANDARDS, PENALTY_TABLES, CertificationIndex, certification_bits,
+                                   flags_of, mandatory_bits, status_class)
+from data_manifest import MANIFEST_FILE, ManifestVersion
+from streaming_loader import DedupReducer, LoadStats, iter_dataset_records, list_dataset_files
+from ingestion_queue import IngestionQueue
+from single_flight import SingleFlight
+from scoring_backend import ScoringBackendError, get_scoring_backend, ranking_entry, score_organization
+from scorecard_pdf_service import ScorecardPDFService, render_score_chart, render_certification_chart
 from reportlab.graphics.charts.piecharts import Pie
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-import matplotlib.pyplot as plt
+from reportlab.lib.enums import TA_LEFT, TA_RIGHT
 import matplotlib.patches as patches
 from PIL import Image as PILImage
-import io
 import base64
 warnings.filterwarnings('ignore')
 
@@ -256,6 +266,26 @@ def is_admin_authenticated():
     return st.session_state.get('admin_authenticated', False)
 
 # Data Upload Management System
+UNIFIED_DATABASE_FILES = ('unified_healthcare_organizations_with_mayo_cap.json', 'unified_healthcare_organizations.json')
+
+def get_unified_database_path():
+    """Unified database file that completed uploads are integrated into (the one the loader reads first)"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in UNIFIED_DATABASE_FILES:
+        for candidate in (name, os.path.join(base_dir, name)):
+            if os.path.exists(candidate):
+                return candidate
+    return os.path.join(base_dir, UNIFIED_DATABASE_FILES[-1])
+
+@st.cache_resource
+def get_ingestion_queue():
+    """Process-wide persistent ingestion queue with background workers"""
+    queue = IngestionQueue(scorer=lambda org: get_analyzer().calculate_quality_score(
+        org.get('certifications', []), [], org.get('name', '')
+    ))
+    queue.start_workers()
+    return queue
+
 def init_upload_storage():
     """Initialize upload storage in session state"""
     if 'pending_uploads' not in st.session_state:
@@ -268,14 +298,18 @@ def init_upload_storage():
 def add_pending_upload(upload_data):
     """Add new upload to pending queue"""
     init_upload_storage()
-    upload_data['upload_id'] = len(st.session_state.pending_uploads) + 1
     upload_data['upload_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     upload_data['status'] = 'pending'
+    # Persistent job id (survives reruns and restarts, unlike a list-length counter)
+    upload_data['upload_id'] = get_ingestion_queue().submit(
+        dict(upload_data), requires_approval=True, database_path=get_unified_database_path()
+    )
     st.session_state.pending_uploads.append(upload_data)
 
 def approve_upload(upload_id):
-    """Approve a pending upload"""
+    """Approve a pending upload; background workers validate, dedupe and score it"""
     init_upload_storage()
+    get_ingestion_queue().approve(upload_id)
     for i, upload in enumerate(st.session_state.pending_uploads):
         if upload['upload_id'] == upload_id:
             upload['status'] = 'approved'
@@ -287,6 +321,7 @@ def approve_upload(upload_id):
 def reject_upload(upload_id, reason=""):
     """Reject a pending upload"""
     init_upload_storage()
+    get_ingestion_queue().reject(upload_id, reason)
     for i, upload in enumerate(st.session_state.pending_uploads):
         if upload['upload_id'] == upload_id:
             upload['status'] = 'rejected'
@@ -296,6 +331,10 @@ def reject_upload(upload_id, reason=""):
             st.session_state.pending_uploads.pop(i)
             break
 
+def get_upload_status(upload_id):
+    """Poll the ingestion job status and progress for an upload"""
+    return get_ingestion_queue().get_job(upload_id)
+
 # Hospital Management System
 def init_hospital_storage():
     """Initialize hospital storage in session state"""
@@ -308,6 +347,14 @@ def add_hospital(hospital_data):
     hospital_data['hospital_id'] = len(st.session_state.custom_hospitals) + 1
     hospital_data['added_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     st.session_state.custom_hospitals.append(hospital_data)
+    # Persist through the ingestion queue so the addition is normalized, scored and kept across sessions
+    try:
+        hospital_data['ingestion_job_id'] = get_ingestion_queue().submit(
+            {'organizations': [dict(hospital_data)]}, requires_approval=False,
+            database_path=get_unified_database_path()
+        )
+    except Exception:
+        pass
 
 def delete_hospital(hospital_id):
     """Delete hospital from the database"""
@@ -335,8 +382,70 @@ class HealthcareOrgAnalyzer:
         self.unified_database = self.load_unified_database()
         
         # Load precomputed scored rankings (unique ranks with tie-breaking)
+        self._load_scored_index()
+        
+        # Spatial index for nearby-peer comparisons, with precomputed scores attached
+        self._geo_index = None
+        self._geo_index_source = None
+        self.get_geo_index()
+        
+        # Certification bitsets of every organization (see certification_bitsets.py)
+        self._certification_index = None
+        self._certification_index_source = None
+        self.get_certification_index()
+        
+        # Materialized dashboard aggregates (loaded on first use)
+        self._analytics_cube = None
+        self._analytics_cube_source = None
+        
+        # Coalesces concurrent official-site fetches for the same organization
+        self._site_details_flights = SingleFlight()
+        
+        # Background search for shown/selected suggestions (created on first use)
+        self._suggestion_prefetcher = None
+        self._prefetch_source = None
+        
+        # Complete search payloads shared by all sessions, keyed by data version
+        base_dirs = [os.getcwd()]
+        try:
+            base_dirs.append(os.path.dirname(os.path.abspath(__file__)))
+        except Exception:
+            pass
+        paths = [p for d in dict.fromkeys(base_dirs) for p in dataset_paths(d)]
+        self._data_version = DataVersion(paths)
+        # Version of the derived data (see data_manifest.py); a new version reloads everything
+        manifest_path = next((os.path.join(d, MANIFEST_FILE) for d in dict.fromkeys(base_dirs)
+                              if os.path.exists(os.path.join(d, MANIFEST_FILE))), MANIFEST_FILE)
+        self._manifest_version = ManifestVersion(manifest_path)
+        self._loaded_manifest_version = self._manifest_version.current()
+        self._search_result_cache = SearchResultCache(
+            lambda: (self._manifest_version.current(), self._data_version.current()))
+        self._search_cache_source = self.unified_database
+        
+        # Bind international quality methods to this class
+        self.calculate_international_quality_initiatives = _calculate_international_quality_initiatives_score.__get__(self, HealthcareOrgAnalyzer)
+        self.calculate_international_quality_metrics = _calculate_international_quality_metrics.__get__(self, HealthcareOrgAnalyzer)
+        self.calculate_regional_adaptation_bonus = _calculate_regional_adaptation_bonus.__get__(self, HealthcareOrgAnalyzer)
+        self.generate_international_improvement_recommendations = generate_international_improvement_recommendations.__get__(self, HealthcareOrgAnalyzer)
+        # Initialize international scorer
+        self.international_scorer = InternationalHealthcareScorer()
+
+    @classmethod
+    def for_scoring(cls):
+        """Analyzer holding only the precomputed rankings, for processes that just score records
+
+        Skips the unified database and its indexes; used by the scoring backend
+        workers (see scoring_backend.py).
+        """
+        analyzer = cls.__new__(cls)
+        analyzer._load_scored_index()
+        return analyzer
+
+    def _load_scored_index(self):
+        """Load precomputed scored rankings (unique ranks with tie-breaking)"""
         self.scored_index = {}
         self.scored_entries = []
+        self._scored_path = None
         try:
             # Resolve path robustly: try CWD first, then script directory
             scored_path = 'scored_organizations_complete.json'
@@ -355,6 +464,7 @@ class HealthcareOrgAnalyzer:
                 raise FileNotFoundError('scored_organizations_complete.json not found')
             with open(open_path, 'r', encoding='utf-8') as f:
                 scored = json.load(f)
+            self._scored_path = open_path
             self.scored_entries = [e for e in scored if isinstance(e, dict)]
             for entry in self.scored_entries:
                 name = entry.get('name') or entry.get('organization_name')
@@ -372,14 +482,76 @@ class HealthcareOrgAnalyzer:
             # Fallback gracefully if precomputed file is missing or invalid
             self.scored_index = {}
             self.scored_entries = []
-        
-        # Bind international quality methods to this class
-        self.calculate_international_quality_initiatives = _calculate_international_quality_initiatives_score.__get__(self, HealthcareOrgAnalyzer)
-        self.calculate_international_quality_metrics = _calculate_international_quality_metrics.__get__(self, HealthcareOrgAnalyzer)
-        self.calculate_regional_adaptation_bonus = _calculate_regional_adaptation_bonus.__get__(self, HealthcareOrgAnalyzer)
-        self.generate_international_improvement_recommendations = generate_international_improvement_recommendations.__get__(self, HealthcareOrgAnalyzer)
-        # Initialize international scorer
-        self.international_scorer = InternationalHealthcareScorer()
+
+    def get_geo_index(self):
+        """Spatial index over organizations with coordinates, rebuilt when the database is reloaded"""
+        if self._geo_index is None or self._geo_index_source is not self.unified_database:
+            scores = {normalize_org_key(e.get('name', '')): e for e in self.scored_entries if e.get('name')}
+            self._geo_index = GeoIndex(self.unified_database or [], scores=scores, scorer=self._score_unified_record)
+            self._geo_index_source = self.unified_database
+        return self._geo_index
+
+    def get_certification_index(self):
+        """Certification bitsets per organization, rebuilt when the database is reloaded"""
+        if self._certification_index is None or self._certification_index_source is not self.unified_database:
+            self._certification_index = CertificationIndex(self.unified_database or [])
+            self._certification_index_source = self.unified_database
+        return self._certification_index
+
+    def get_analytics_cube(self):
+        """Dashboard aggregates (see analytics_cube.py), reloaded with the scored rankings
+
+        Uses the cube written by batch scoring; if it is missing or older than
+        the scored file, it is built once from the loaded scored entries.
+        """
+        self.refresh_if_data_changed()
+        if self._analytics_cube is None or self._analytics_cube_source is not self.scored_entries:
+            cube = None
+            if self._scored_path:
+                cube_path = os.path.join(os.path.dirname(self._scored_path), CUBE_FILE)
+                cube = AnalyticsCube.load(cube_path, newer_than=self._scored_path)
+            self._analytics_cube = cube or AnalyticsCube.from_records(self.scored_entries)
+            self._analytics_cube_source = self.scored_entries
+        return self._analytics_cube
+
+    def get_suggestion_prefetcher(self):
+        """Prefetcher for suggestion searches; its cached results are dropped when the database is reloaded"""
+        if self._suggestion_prefetcher is None:
+            self._suggestion_prefetcher = SuggestionPrefetcher(self._search_organization_info_from_suggestion_uncached)
+        elif self._prefetch_source is not self.unified_database:
+            self._suggestion_prefetcher.clear()
+        self._prefetch_source = self.unified_database
+        return self._suggestion_prefetcher
+
+    def refresh_if_data_changed(self):
+        """Reload the unified database and scored rankings when the data manifest version changed
+
+        Derived caches (geo index, prefetched and cached search results) follow,
+        since they are rebuilt whenever the unified database is reloaded.
+        Returns True if the data was reloaded.
+        """
+        version = self._manifest_version.current()
+        if version == self._loaded_manifest_version:
+            return False
+        self._loaded_manifest_version = version
+        self._unified_db_cache = None
+        self.unified_database = self.load_unified_database()
+        self._load_scored_index()
+        return True
+
+    def get_search_result_cache(self):
+        """Cross-session cache of search, ranking and percentile results; cleared when the database is reloaded"""
+        self.refresh_if_data_changed()
+        if self._search_cache_source is not self.unified_database:
+            self._search_result_cache.clear()
+            self._search_cache_source = self.unified_database
+        return self._search_result_cache
+
+    def _score_unified_record(self, org):
+        """Score a unified database record from its stored certifications (no web search)"""
+        certifications = [c for c in (org.get('certifications') or []) if isinstance(c, dict)]
+        score_data = self.calculate_quality_score(certifications, org.get('quality_initiatives') or [], org.get('name', ''))
+        return {'total_score': score_data.get('total_score', 0), 'score_breakdown': score_data}
 
     def _normalize_name(self, name: str) -> str:
         """Normalize organization name for consistent scored index lookup."""
@@ -422,9 +594,16 @@ class HealthcareOrgAnalyzer:
 
         This method looks up the organization in the unified database to find a website URL,
         then fetches the homepage and, if available, a contact page to extract contact details.
+        Concurrent calls for the same organization share one set of page fetches.
 
         Returns a dict with keys: website, address, phone, email. Missing fields are None.
         """
+        details, shared = self._site_details_flights.do_shared(
+            (org_name or '').lower().strip(), self._fetch_official_site_details, org_name)
+        return dict(details) if shared else details
+
+    def _fetch_official_site_details(self, org_name: str) -> dict:
+        """Fetch the official site details (see get_official_site_details)"""
         details = {"website": None, "address": None, "phone": None, "email": None}
         try:
             if not org_name:
@@ -478,9 +657,8 @@ class HealthcareOrgAnalyzer:
             if not html_text:
                 return details
 
-            # Parse HTML for address, phone, email
-            soup = BeautifulSoup(html_text, "html.parser")
-            page_text = soup.get_text(" ", strip=True)
+            # Parse HTML for address, phone, email (text only, straight from lxml)
+            page_text = visible_text(html_text)
 
             # Email
             email_match = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", page_text)
@@ -956,22 +1134,24 @@ class HealthcareOrgAnalyzer:
                 return self._unified_db_cache
         except Exception:
             pass
-        def _safe_load_list_or_dict(path):
+        load_stats = LoadStats()
+
+        def _iter_source(path):
+            """Stream one source file's records (see streaming_loader)"""
+            if not os.path.exists(path):
+                return
+            load_stats.files += 1
+            yielded = False
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                if isinstance(data, dict) and 'organizations' in data:
-                    return data['organizations']
-                elif isinstance(data, list):
-                    return data
-                elif isinstance(data, dict):
-                    # Single org object
-                    return [data]
-                else:
-                    return []
+                for record in iter_dataset_records(path):
+                    yielded = True
+                    yield record
             except FileNotFoundError:
-                return []
+                return
             except Exception:
+                if yielded:
+                    # Keep the records streamed before the file turned malformed
+                    return
                 # Attempt minimal recovery for loosely formatted JSON files (e.g., scraped content)
                 try:
                     with open(path, 'r', encoding='utf-8') as f:
@@ -981,15 +1161,13 @@ class HealthcareOrgAnalyzer:
                     website_match = re.search(r'"website"\s*:\s*"([^"]+)"', text)
                     address_match = re.search(r'"address"\s*:\s*"([^"]+)"', text)
                     if website_match or address_match:
-                        recovered = {
+                        yield {
                             'name': name_match.group(1) if name_match else '',
                             'website': website_match.group(1) if website_match else '',
                             'address': address_match.group(1) if address_match else ''
                         }
-                        return [recovered]
                 except Exception:
                     pass
-                return []
 
         def _normalize_key(name: str, country: str) -> str:
             base = (name or '').lower().strip()
@@ -1043,50 +1221,35 @@ class HealthcareOrgAnalyzer:
             return n.strip()
 
         try:
-            merged: list = []
+            # Records stream straight into the dedup reducer: deduplicate by canonical
+            # base name (for grouping), preferring entries with more non-empty fields
+            reducer = DedupReducer(
+                lambda org: canonicalize_org_name(org.get('name', ''), org.get('city', ''),
+                                                  org.get('state', ''), org.get('country', '')).lower(),
+                stats=load_stats
+            )
             # Primary source (preferred)
-            primary = _safe_load_list_or_dict(_resolve_path('unified_healthcare_organizations_with_mayo_cap.json'))
-            if not primary:
+            if not reducer.extend(_iter_source(_resolve_path('unified_healthcare_organizations_with_mayo_cap.json'))):
                 # Fallback to legacy file
-                primary = _safe_load_list_or_dict(_resolve_path('unified_healthcare_organizations.json'))
-                if primary:
+                if reducer.extend(_iter_source(_resolve_path('unified_healthcare_organizations.json'))):
                     st.warning("WARNING️ Using legacy unified database as fallback.")
-            merged.extend(primary)
 
             # Optional global sources
-            merged.extend(_safe_load_list_or_dict(_resolve_path('global_healthcare_organizations.json')))
-            merged.extend(_safe_load_list_or_dict(_resolve_path('validation_discovered_organizations.json')))
-
-            # External directory: external_organizations/*.json
-            external_dir = _resolve_path('external_organizations')
-            if os.path.isdir(external_dir):
-                for fname in os.listdir(external_dir):
-                    if not fname.lower().endswith('.json'):
-                        continue
-                    merged.extend(_safe_load_list_or_dict(os.path.join(external_dir, fname)))
+            reducer.extend(_iter_source(_resolve_path('global_healthcare_organizations.json')))
+            reducer.extend(_iter_source(_resolve_path('validation_discovered_organizations.json')))
+
+            # External directory: external_organizations/*.json (and JSON Lines exports)
+            external_files = list_dataset_files(_resolve_path('external_organizations'),
+                                                extensions=('.json', '.jsonl', '.ndjson'))
+            for path in external_files:
+                reducer.extend(_iter_source(path))
 
             # Removed ad-hoc file injection to prevent cross-organization contamination
             # (tmc_details.json contained partial address-only data that could leak into other matches)
 
-            # Deduplicate by canonical base name + country (for grouping)
-            deduped = {}
-            for org in merged:
-                if not isinstance(org, dict):
-                    continue
-                name = org.get('name', '')
-                key = canonicalize_org_name(name, org.get('city', ''), org.get('state', ''), org.get('country', '')).lower()
-                # Prefer entries with richer data
-                if key in deduped:
-                    # Keep the one with more non-empty fields
-                    existing = deduped[key]
-                    existing_fields = sum(1 for k, v in existing.items() if v)
-                    new_fields = sum(1 for k, v in org.items() if v)
-                    if new_fields > existing_fields:
-                        deduped[key] = org
-                else:
-                    deduped[key] = org
-
-            final_list = list(deduped.values())
+            final_list = reducer.values()
+            self._unified_db_load_stats = load_stats.finish().to_dict()
+            print(f"Unified database loaded: {load_stats.summary()}")
             if not final_list:
                 st.warning("WARNING️ Unified healthcare database not found or empty. Some search features may be limited.")
             # Cache and return
@@ -1179,8 +1342,29 @@ class HealthcareOrgAnalyzer:
     def search_organization_info_from_suggestion(self, suggestion_data):
         """Search for organization information using complete suggestion data from QuXAT database.
 
+        A result the suggestion prefetcher already resolved (or is still resolving)
+        is reused; the score is added to history only here, for the selected result.
+        """
+        prefetcher = self.get_suggestion_prefetcher()
+        results = prefetcher.get(suggestion_data, timeout=60) if suggestion_data is not None else None
+        if results is None:
+            results = self._search_organization_info_from_suggestion_uncached(suggestion_data, notify=True)
+            prefetcher.store(suggestion_data, results)
+        if results is None:
+            # Fail gracefully without surfacing low-level errors to the UI
+            st.info("🔍 Organization search did not yield results using the suggestion. You can refine the name or try the regular search.")
+            return None
+
+        # Add score to history for trend tracking
+        add_score_to_history(results['name'], results.get('score_breakdown', {}))
+        return results
+
+    def _search_organization_info_from_suggestion_uncached(self, suggestion_data, notify=False):
+        """Resolve and score a suggestion without touching the UI or session state.
+
         Canonicalizes the suggestion display name by stripping location tokens so
         unified database matching works reliably (e.g., "Mayo Clinic - Rochester, Minnesota" -> "Mayo Clinic").
+        Runs on prefetch worker threads, so it makes no st.* calls unless notify is set.
         """
         try:
             # Ensure suggestion_data is usable as a dictionary
@@ -1201,7 +1385,9 @@ class HealthcareOrgAnalyzer:
                 except Exception:
                     suggestion_str = ''
                 if suggestion_str:
-                    return self.search_organization_info(suggestion_str)
+                    return self.get_search_result_cache().get_or_compute(
+                        'search', suggestion_str, lambda: self._search_organization_info_uncached(suggestion_str),
+                        suggestion_str)
                 return None
             
             org_name = suggestion_data.get('display_name', '')
@@ -1219,7 +1405,6 @@ class HealthcareOrgAnalyzer:
                 # Check if suggestion_data has other name fields
                 org_name = suggestion_data.get('name', '') or suggestion_data.get('full_name', '')
                 if not org_name:
-                    st.error("No organization name found in suggestion data")
                     return None
             
             # Initialize results structure
@@ -1273,14 +1458,14 @@ class HealthcareOrgAnalyzer:
                     results['original_name'] = unified_org['original_name']
             else:
                 # Fallback to regular certification search
-                certifications = self.search_certifications(base_name)
+                certifications = self.search_certifications(base_name, notify=notify)
                 results['certifications'] = certifications
             
             # Apply comprehensive deduplication to all certifications
             results['certifications'] = self._comprehensive_deduplicate_certifications(results['certifications'])
             
             # Search for quality initiatives
-            initiatives = self.search_quality_initiatives(base_name)
+            initiatives = self.search_quality_initiatives(base_name, notify=notify)
             results['quality_initiatives'] = initiatives
 
             # Get branch info from healthcare validator
@@ -1310,17 +1495,23 @@ class HealthcareOrgAnalyzer:
             )
             results['improvement_recommendations'] = recommendations
             
-            # Add score to history for trend tracking
-            add_score_to_history(base_name, score_data)
-            
             return results
             
         except Exception:
-            # Fail gracefully without surfacing low-level errors to the UI
-            st.info("🔍 Organization search did not yield results using the suggestion. You can refine the name or try the regular search.")
             return None
 
     def search_organization_info(self, org_name):
+        """Search for organization information, served from the shared result cache when warm"""
+        # Keyed by the verbatim name too: matching and ranking compare names exactly
+        results = self.get_search_result_cache().get_or_compute(
+            'search', org_name, lambda: self._search_organization_info_uncached(org_name), org_name)
+        if results is None:
+            return None
+        # Add score to history for trend tracking
+        add_score_to_history(org_name, results.get('score_breakdown', {}))
+        return results
+
+    def _search_organization_info_uncached(self, org_name):
         """Search for organization information from multiple sources including unified database"""
         try:
             # Initialize results
@@ -1497,9 +1688,6 @@ class HealthcareOrgAnalyzer:
             )
             results['improvement_recommendations'] = recommendations
             
-            # Add score to history for trend tracking
-            add_score_to_history(org_name, score_data)
-            
             return results
             
         except Exception as e:
@@ -1603,8 +1791,11 @@ class HealthcareOrgAnalyzer:
         # As last resort, try aggregation by input name
         return self.aggregate_unified_records(org_name)
 
-    def search_certifications(self, org_name):
-        """Search for organization certifications using only validated official sources"""
+    def search_certifications(self, org_name, notify=True):
+        """Search for organization certifications using only validated official sources
+
+        With notify=False no warnings are shown (for searches run off the script thread).
+        """
         org_name_lower = org_name.lower().strip()
         
         # Use web validator to get real certification data from official sources only
@@ -1623,18 +1814,21 @@ class HealthcareOrgAnalyzer:
                 
                 # If no validated data found, show disclaimer
                 if not final_certifications:
-                    st.warning(f"WARNING️ No validated certification data found for '{org_name}'. Please verify organization name or check official certification databases.")
+                    if notify:
+                        st.warning(f"WARNING️ No validated certification data found for '{org_name}'. Please verify organization name or check official certification databases.")
                     return []
                 
                 return final_certifications
             else:
                 # No automatic JCI assignment - only show validated certifications
-                st.warning(f"WARNING️ No validated certification data found for '{org_name}'. Please verify organization name or check official certification databases.")
+                if notify:
+                    st.warning(f"WARNING️ No validated certification data found for '{org_name}'. Please verify organization name or check official certification databases.")
                 return []
             
         except Exception as e:
-            st.error(f"Error validating certification data: {str(e)}")
-            st.info("💡 Please check the organization name and try again. Only validated data from official sources is displayed.")
+            if notify:
+                st.error(f"Error validating certification data: {str(e)}")
+                st.info("💡 Please check the organization name and try again. Only validated data from official sources is displayed.")
             return []
     
     def _comprehensive_deduplicate_certifications(self, certifications):
@@ -1837,8 +2031,8 @@ class HealthcareOrgAnalyzer:
         
         return sanitized
     
-    def search_quality_initiatives(self, org_name):
-        """Search for quality initiatives using web-validated data"""
+    def search_quality_initiatives(self, org_name, notify=True):
+        """Search for quality initiatives using web-validated data (errors shown only if notify)"""
         try:
             validation_result = healthcare_validator.validate_quality_initiatives(org_name)
             
@@ -1857,8 +2051,9 @@ class HealthcareOrgAnalyzer:
                 return []
             
         except Exception as e:
-            st.error(f"Error validating quality initiative data: {str(e)}")
-            st.info("💡 Please check the organization name and try again. Only validated data from official sources is displayed.")
+            if notify:
+                st.error(f"Error validating quality initiative data: {str(e)}")
+                st.info("💡 Please check the organization name and try again. Only validated data from official sources is displayed.")
             return []
     
     def calculate_quality_score(self, certifications, initiatives, org_name="", branch_info=None, patient_feedback_data=None):
@@ -1892,19 +2087,11 @@ class HealthcareOrgAnalyzer:
         
         # Normalize certification statuses to be uniform and encouraging
         try:
-            status_active_synonyms = {
-                'ACTIVE', 'ACCREDITED', 'ACCREDITATION', 'VALID', 'CURRENT', 'COMPLIANT', 'CERTIFIED'
-            }
-            status_progress_synonyms = {
-                'IN PROGRESS', 'PENDING', 'APPLIED', 'UNDER REVIEW'
-            }
             for c in certifications:
                 if isinstance(c, dict):
-                    raw = str(c.get('status', '')).strip().upper()
-                    if raw in status_active_synonyms:
-                        c['status'] = 'Active'
-                    elif raw in status_progress_synonyms:
-                        c['status'] = 'In Progress'
+                    status = status_class(c.get('status', ''))
+                    if status:
+                        c['status'] = status
         except Exception:
             pass
 
@@ -2310,10 +2497,8 @@ class HealthcareOrgAnalyzer:
         """Count international certifications (JCI, ISO)"""
         international_count = 0
         for cert in certifications:
-            if cert['status'] == 'Active':
-                cert_name = cert.get('name', '').upper()
-                if 'JCI' in cert_name or 'ISO' in cert_name or 'JOINT COMMISSION' in cert_name or 'MAGNET' in cert_name:
-                    international_count += 1
+            if cert.get('status') == 'Active' and certification_bits(cert.get('name', '')) & INTERNATIONAL_MASK:
+                international_count += 1
         return international_count
     
     def _apply_nabl_iso_equivalency(self, certifications):
@@ -2325,24 +2510,12 @@ class HealthcareOrgAnalyzer:
             return certifications
         
         # Check if NABL accreditation exists and is active
-        has_active_nabl = False
-        nabl_cert = None
-        
-        for cert in certifications:
-            cert_name = cert.get('name', '').upper()
-            if 'NABL' in cert_name and cert.get('status') == 'Active':
-                has_active_nabl = True
-                nabl_cert = cert
-                break
+        nabl_cert = next((cert for cert in certifications
+                          if cert.get('status') == 'Active' and certification_bits(cert.get('name', '')) & FLAG_BITS['NABL']), None)
         
         # If NABL is found, check if ISO 15189 already exists
-        if has_active_nabl:
-            has_iso_15189 = False
-            for cert in certifications:
-                cert_name = cert.get('name', '').upper()
-                if 'ISO 15189' in cert_name or 'ISO15189' in cert_name:
-                    has_iso_15189 = True
-                    break
+        if nabl_cert is not None:
+            has_iso_15189 = any(certification_bits(cert.get('name', '')) & FLAG_BITS['ISO 15189'] for cert in certifications)
             
             # If ISO 15189 doesn't exist, add it as an implied certification
             if not has_iso_15189:
@@ -2379,41 +2552,41 @@ class HealthcareOrgAnalyzer:
         - Penalties are proportional to the importance of each standard
         - Organizations without any ISO standards will face significant but not devastating penalties
         - Room for improvement through quality initiatives and other certifications
+        
+        Standards are tracked as certification bitsets (see certification_bitsets.py):
+        the last certification matching a standard decides its status.
         """
-        required_certifications = {
-            'CAP': {'found': False, 'status': None, 'name': None, 'mandatory': True, 'penalty': 8, 'category': 'Laboratory Standards', 'importance': 'Critical'},
-            'JCI': {'found': False, 'status': None, 'name': None, 'mandatory': True, 'penalty': 10, 'category': 'Hospital Accreditation', 'importance': 'Critical'},
-            'ISO 9001': {'found': False, 'status': None, 'name': None, 'mandatory': True, 'penalty': 4, 'category': 'Quality Management', 'importance': 'Critical'},
-            'ISO 15189': {'found': False, 'status': None, 'name': None, 'mandatory': True, 'penalty': 5, 'category': 'Laboratory Quality', 'importance': 'Critical'},
-            'ISO 27001': {'found': False, 'status': None, 'name': None, 'mandatory': True, 'penalty': 6, 'category': 'Information Security', 'importance': 'Critical'},
-            'ISO 45001': {'found': False, 'status': None, 'name': None, 'mandatory': True, 'penalty': 5, 'category': 'Occupational Safety', 'importance': 'Critical'},
-            'ISO 13485': {'found': False, 'status': None, 'name': None, 'mandatory': True, 'penalty': 4, 'category': 'Medical Devices', 'importance': 'Critical'},
-            'ISO 14001': {'found': False, 'status': None, 'name': None, 'mandatory': True, 'penalty': 3, 'category': 'Environmental Management', 'importance': 'Critical'},
-            'ISO 50001': {'found': False, 'status': None, 'name': None, 'mandatory': False, 'penalty': 0, 'category': 'Energy Management', 'importance': 'Critical'}
-        }
-
-        # Regional adjustments: soften ISO penalties when strong US-equivalent standards are present
-        # Detect presence of U.S. Joint Commission (non-international) and CAP
-        has_us_joint_commission = False
-        has_cap = False
-        if certifications:
-            for cert in certifications:
-                name_upper = str(cert.get('name', '')).upper()
-                if 'JOINT COMMISSION' in name_upper and 'INTERNATIONAL' not in name_upper:
-                    has_us_joint_commission = True
-                if 'CAP' in name_upper or 'COLLEGE OF AMERICAN PATHOLOGISTS' in name_upper:
-                    has_cap = True
-
-        if has_us_joint_commission or has_cap:
-            # Softening ISO penalties to reflect US equivalency (TJC/CAP)
-            # ISO 15189 is lab-specific: if CAP is present, do not penalize for missing ISO 15189
-            if has_cap:
-                required_certifications['ISO 15189']['penalty'] = 0
+        certifications = certifications or []
+        
+        # Bitsets: every type seen, and the standards whose latest matching certification is compliant
+        seen = 0
+        compliant = 0
+        latest = {}
+        for cert in certifications:
+            bits = certification_bits(cert.get('name', ''))
+            seen |= bits
+            standards = mandatory_bits(bits)
+            if not standards:
+                continue
+            if cert.get('status', 'Unknown') in COMPLIANT_STATUSES:
+                compliant |= standards
             else:
-                required_certifications['ISO 15189']['penalty'] = max(1, int(required_certifications['ISO 15189']['penalty'] * 0.5))
-
-            for iso_key in ['ISO 9001', 'ISO 27001', 'ISO 45001', 'ISO 13485', 'ISO 14001']:
-                required_certifications[iso_key]['penalty'] = max(1, int(required_certifications[iso_key]['penalty'] * 0.5))
+                compliant &= ~standards
+            for flag in flags_of(standards):
+                latest[flag] = cert
+        
+        # Regional adjustments: soften ISO penalties when strong US-equivalent standards are present (TJC/CAP)
+        penalties = PENALTY_TABLES[(bool(seen & FLAG_BITS['US JOINT COMMISSION']), bool(seen & FLAG_BITS['CAP']))]
+        
+        required_certifications = {}
+        for standard, flag, mandatory, _, category in MANDATORY_STANDARDS:
+            cert = latest.get(flag)
+            required_certifications[standard] = {
+                'found': cert is not None,
+                'status': cert.get('status', 'Unknown') if cert is not None else None,
+                'name': cert.get('name', '') if cert is not None else None,
+                'mandatory': mandatory, 'penalty': penalties[standard], 'category': category, 'importance': 'Critical'
+            }
         
         compliance_summary = {
             'total_required': len(required_certifications),
@@ -2422,111 +2595,38 @@ class HealthcareOrgAnalyzer:
             'compliance_percentage': 0,
             'details': required_certifications,
             'is_fully_compliant': False,
-            'cap_compliant': False,  # Track CAP compliance specifically
+            'cap_compliant': bool(compliant & FLAG_BITS['CAP']),  # Track CAP compliance specifically
             'total_penalty': 0,  # Track total penalty for missing mandatory certifications
             'penalty_breakdown': {},  # Track penalties by category
             'missing_critical_standards': []  # Track missing critical international standards
         }
         
-        if not certifications:
-            # No certifications provided: treat all mandatory standards as missing
-            compliance_summary['compliant_count'] = 0
-            compliance_summary['non_compliant_count'] = len(required_certifications)
-            compliance_summary['compliance_percentage'] = 0
-            compliance_summary['is_fully_compliant'] = False
-            compliance_summary['cap_compliant'] = False
-
-            total_penalty = 0
-            for cert_key, cert_info in required_certifications.items():
-                # Record missing mandatory standards with penalties
-                if cert_info.get('mandatory', False) and cert_info.get('penalty', 0) > 0:
-                    total_penalty += cert_info['penalty']
-                    category = cert_info.get('category', 'Other')
-                    # Track penalty breakdown by category
-                    if category not in compliance_summary['penalty_breakdown']:
-                        compliance_summary['penalty_breakdown'][category] = 0
-                    compliance_summary['penalty_breakdown'][category] += cert_info['penalty']
-
-                    compliance_summary['missing_critical_standards'].append({
-                        'standard': cert_key,
-                        'category': category,
-                        'penalty': cert_info['penalty'],
-                        'impact': cert_info.get('importance', 'Critical'),
-                        'mandatory': True,
-                        'description': f"Missing {cert_key} certification - {cert_info['penalty']} point penalty applied"
-                    })
-
-            compliance_summary['total_penalty'] = total_penalty
-            return compliance_summary
-        
-        # Check each certification against requirements
-        for cert in certifications:
-            cert_name = cert.get('name', '').upper()
-            cert_status = cert.get('status', 'Unknown')
-            
-            # Check for ISO certifications
-            for iso_standard in ['9001', '14001', '45001', '27001', '13485', '50001', '15189']:
-                if f'ISO {iso_standard}' in cert_name or f'ISO{iso_standard}' in cert_name:
-                    key = f'ISO {iso_standard}'
-                    required_certifications[key]['found'] = True
-                    required_certifications[key]['status'] = cert_status
-                    required_certifications[key]['name'] = cert.get('name', '')
-                    break
-            
-            # Check for CAP accreditation
-            if 'CAP' in cert_name or 'COLLEGE OF AMERICAN PATHOLOGISTS' in cert_name:
-                required_certifications['CAP']['found'] = True
-                required_certifications['CAP']['status'] = cert_status
-                required_certifications['CAP']['name'] = cert.get('name', '')
-
-            # Check for JCI accreditation (mandatory) and equivalency for US Joint Commission
-            if 'JOINT COMMISSION INTERNATIONAL' in cert_name or 'JCI' in cert_name:
-                required_certifications['JCI']['found'] = True
-                required_certifications['JCI']['status'] = cert_status
-                required_certifications['JCI']['name'] = cert.get('name', '')
-            elif 'JOINT COMMISSION' in cert_name and 'INTERNATIONAL' not in cert_name:
-                # Treat US Joint Commission as equivalent to JCI for mandatory compliance
-                required_certifications['JCI']['found'] = True
-                required_certifications['JCI']['status'] = cert_status
-                required_certifications['JCI']['name'] = cert.get('name', '')
-        
         # Calculate compliance metrics with MANDATORY ISO STANDARDS PENALTY SYSTEM
-        for cert_key, cert_info in required_certifications.items():
-            if cert_info['found'] and cert_info['status'] in ['Active', 'Valid', 'Current']:
+        for standard, flag, mandatory, _, category in MANDATORY_STANDARDS:
+            if compliant & FLAG_BITS[flag]:
                 compliance_summary['compliant_count'] += 1
-                # Check CAP compliance specifically
-                if cert_key == 'CAP':
-                    compliance_summary['cap_compliant'] = True
-            else:
-                compliance_summary['non_compliant_count'] += 1
-                # Apply penalty for missing MANDATORY certifications
-                penalty = cert_info.get('penalty', 0)
-                category = cert_info.get('category', 'Other')
-                importance = cert_info.get('importance', 'Recommended')
-                
-                # ONLY apply penalties for MANDATORY certifications
-                if cert_info.get('mandatory', False) and penalty > 0:
-                    compliance_summary['total_penalty'] += penalty
-                    
-                    # Track penalty breakdown by category
-                    if category not in compliance_summary['penalty_breakdown']:
-                        compliance_summary['penalty_breakdown'][category] = 0
-                    compliance_summary['penalty_breakdown'][category] += penalty
-                    
-                    # Track missing critical standards (ALL mandatory standards are critical)
-                    compliance_summary['missing_critical_standards'].append({
-                        'standard': cert_key,
-                        'category': category,
-                        'penalty': penalty,
-                        'impact': importance,
-                        'mandatory': True,
-                        'description': f"Missing {cert_key} certification - {penalty} point penalty applied"
-                    })
+                continue
+            compliance_summary['non_compliant_count'] += 1
+            
+            # ONLY apply penalties for MANDATORY certifications
+            penalty = penalties[standard]
+            if mandatory and penalty > 0:
+                compliance_summary['total_penalty'] += penalty
+                compliance_summary['penalty_breakdown'][category] = compliance_summary['penalty_breakdown'].get(category, 0) + penalty
+                compliance_summary['missing_critical_standards'].append({
+                    'standard': standard,
+                    'category': category,
+                    'penalty': penalty,
+                    'impact': 'Critical',
+                    'mandatory': True,
+                    'description': f"Missing {standard} certification - {penalty} point penalty applied"
+                })
         
-        compliance_summary['compliance_percentage'] = (
-            compliance_summary['compliant_count'] / compliance_summary['total_required'] * 100
-        )
-        compliance_summary['is_fully_compliant'] = compliance_summary['compliant_count'] == compliance_summary['total_required']
+        if certifications:
+            compliance_summary['compliance_percentage'] = (
+                compliance_summary['compliant_count'] / compliance_summary['total_required'] * 100
+            )
+            compliance_summary['is_fully_compliant'] = compliance_summary['compliant_count'] == compliance_summary['total_required']
         
         return compliance_summary
     
@@ -2577,246 +2677,13 @@ class HealthcareOrgAnalyzer:
         return min(total_score, 35)
     
     def generate_improvement_recommendations(self, org_name, score_breakdown, certifications, initiatives, branch_info=None):
-        """Generate actionable improvement recommendations based on scoring analysis"""
-        recommendations = {
-            'priority_actions': [],
-            'certification_gaps': [],
-            'quality_initiatives': [],
-            'operational_improvements': [],
-            'strategic_recommendations': [],
-            'score_potential': {}
-        }
-        
-        current_total = score_breakdown.get('total_score', 0)
-        cert_score = score_breakdown.get('certification_score', 0)
-        quality_score = score_breakdown.get('quality_initiatives_score', 0)
-        
-        # Calculate potential score improvements - UPDATED FOR REBALANCED SCORING
-        max_possible_score = 110  # 75 (cert) + 35 (quality initiatives) - UPDATED
-        improvement_potential = max_possible_score - current_total
-        
-        recommendations['score_potential'] = {
-            'current_score': current_total,
-            'maximum_possible': max_possible_score,
-            'improvement_potential': improvement_potential,
-            'certification_potential': max(0, 75 - cert_score),  # Updated from 70 to 75
-            'quality_initiatives_potential': max(0, 35 - quality_score)  # Updated from 30 to 35
-        }
-        
-        # Priority Actions (High Impact, Quick Wins)
-        if cert_score < 50:
-            recommendations['priority_actions'].append({
-                'action': 'Pursue JCI Accreditation',
-                'impact': 'High',
-                'timeline': '12-18 months',
-                'score_increase': '15-25 points',
-                'description': 'Joint Commission International accreditation provides the highest certification score boost and international recognition.',
-                'steps': [
-                    'Conduct gap analysis against JCI standards',
-                    'Develop implementation timeline',
-                    'Train staff on JCI requirements',
-                    'Implement quality management systems',
-                    'Schedule JCI survey'
-                ]
-            })
-        
-        if quality_score < 15:
-            recommendations['priority_actions'].append({
-                'action': 'Implement Patient Safety Initiatives',
-                'impact': 'High',
-                'timeline': '3-6 months',
-                'score_increase': '8-12 points',
-                'description': 'Patient safety initiatives have the highest weight in quality scoring.',
-                'steps': [
-                    'Establish patient safety committee',
-                    'Implement medication safety protocols',
-                    'Deploy infection control measures',
-                    'Create incident reporting system',
-                    'Conduct regular safety audits'
-                ]
-            })
-        
-        # Certification Gap Analysis - INCLUDING ALL MANDATORY ISO STANDARDS
-        active_certs = [cert.get('name') for cert in certifications if str(cert.get('status', '')).strip() == 'Active']
-        
-        # Check for missing key certifications - COMPREHENSIVE LIST INCLUDING ALL MANDATORY ISO STANDARDS
-        key_certifications = {
-            # MANDATORY ISO STANDARDS (Critical Priority)
-            'CAP': {
-                'name': 'College of American Pathologists (CAP) Laboratory Accreditation',
-                'priority': 'Critical',
-                'score_impact': '15 points penalty if missing',
-                'description': 'MANDATORY: International laboratory quality standard - highest penalty for missing',
-                'prerequisites': ['Laboratory quality management system', 'Proficiency testing', 'Quality control procedures', 'Staff competency assessment']
-            },
-            'ISO 9001': {
-                'name': 'ISO 9001:2015 Quality Management System',
-                'priority': 'Critical',
-                'score_impact': '8 points penalty if missing',
-                'description': 'MANDATORY: International quality management standard - foundation for healthcare quality',
-                'prerequisites': ['Quality management system', 'Process documentation', 'Internal audits', 'Management review']
-            },
-            'ISO 15189': {
-                'name': 'ISO 15189:2012 Medical Laboratory Quality and Competence',
-                'priority': 'Critical',
-                'score_impact': '10 points penalty if missing',
-                'description': 'MANDATORY: Specific standard for medical laboratory quality and competence',
-                'prerequisites': ['Laboratory quality system', 'Technical competence', 'Quality control', 'Proficiency testing']
-            },
-            'ISO 27001': {
-                'name': 'ISO 27001:2013 Information Security Management',
-                'priority': 'Critical',
-                'score_impact': '12 points penalty if missing',
-                'description': 'MANDATORY: Information security management system - critical for patient data protection',
-                'prerequisites': ['Information security policy', 'Risk assessment', 'Security controls', 'Incident management']
-            },
-            'ISO 45001': {
-                'name': 'ISO 45001:2018 Occupational Health and Safety Management',
-                'priority': 'Critical',
-                'score_impact': '10 points penalty if missing',
-                'description': 'MANDATORY: Occupational health and safety management system for healthcare workers',
-                'prerequisites': ['OH&S policy', 'Hazard identification', 'Risk assessment', 'Emergency procedures']
-            },
-            'ISO 13485': {
-                'name': 'ISO 13485:2016 Medical Devices Quality Management',
-                'priority': 'Critical',
-                'score_impact': '8 points penalty if missing',
-                'description': 'MANDATORY: Quality management system for medical devices and equipment',
-                'prerequisites': ['Medical device quality system', 'Design controls', 'Risk management', 'Post-market surveillance']
-            },
-            'ISO 14001': {
-                'name': 'ISO 14001:2015 Environmental Management System',
-                'priority': 'Critical',
-                'score_impact': '6 points penalty if missing',
-                'description': 'MANDATORY: Environmental management system for sustainable healthcare operations',
-                'prerequisites': ['Environmental policy', 'Waste management system', 'Energy efficiency measures', 'Environmental monitoring']
-            },
-            # RECOMMENDED HIGH-VALUE CERTIFICATIONS
-            'JCI': {
-                'name': 'Joint Commission International Hospital Accreditation',
-                'priority': 'Critical',
-                'score_impact': '12 points penalty if missing',
-                'description': 'MANDATORY: Global gold standard for healthcare quality and patient safety',
-                'prerequisites': ['Strong quality management system', 'Staff training programs', 'Patient safety protocols', 'Performance improvement']
-            },
-            'NABH': {
-                'name': 'National Accreditation Board for Hospitals & Healthcare Providers',
-                'priority': 'Critical',
-                'score_impact': '15-20 points bonus',
-                'description': 'RECOMMENDED: National standard for healthcare quality in India',
-                'prerequisites': ['Quality policy', 'Patient rights charter', 'Infection control protocols', 'Clinical governance']
-            },
-            'NABL': {
-                'name': 'National Accreditation Board for Testing and Calibration Laboratories',
-                'priority': 'Critical',
-                'score_impact': '10 points penalty if missing',
-                'description': 'MANDATORY: Laboratory accreditation for diagnostic services',
-                'prerequisites': ['Laboratory quality system', 'Calibrated equipment', 'Trained technicians', 'Quality control']
-            },
-            'ISO 50001': {
-                'name': 'ISO 50001:2018 Energy Management System',
-                'priority': 'Critical',
-                'score_impact': '6 points penalty if missing',
-                'description': 'MANDATORY: Energy management system for operational efficiency',
-                'prerequisites': ['Energy policy', 'Energy planning', 'Energy monitoring', 'Continuous improvement']
-            }
-        }
-        
-        for cert_key, cert_info in key_certifications.items():
-            if not any(cert_key.upper() in cert_name.upper() for cert_name in active_certs):
-                recommendations['certification_gaps'].append(cert_info)
-        
-        # Quality Initiatives Recommendations
-        if quality_score < 20:
-            quality_recommendations = [
-                {
-                    'initiative': 'Clinical Excellence Program',
-                    'category': 'Clinical Excellence',
-                    'impact_score': 8,
-                    'timeline': '6-12 months',
-                    'description': 'Implement evidence-based clinical protocols and outcome tracking',
-                    'key_components': ['Clinical pathways', 'Outcome metrics', 'Physician engagement', 'Continuous improvement']
-                },
-                {
-                    'initiative': 'Technology Innovation Initiative',
-                    'category': 'Technology Innovation',
-                    'impact_score': 6,
-                    'timeline': '3-9 months',
-                    'description': 'Deploy healthcare technology solutions for improved patient care',
-                    'key_components': ['Electronic health records', 'Telemedicine capabilities', 'AI-assisted diagnostics', 'Mobile health apps']
-                },
-                {
-                    'initiative': 'Staff Development Program',
-                    'category': 'Staff Development',
-                    'impact_score': 5,
-                    'timeline': 'Ongoing',
-                    'description': 'Comprehensive training and development for healthcare staff',
-                    'key_components': ['Continuing education', 'Skills assessment', 'Leadership development', 'Performance management']
-                }
-            ]
-            recommendations['quality_initiatives'].extend(quality_recommendations)
-        
-        # Operational Improvements
-        operational_improvements = []
-        
-        if len(active_certs) < 3:
-            operational_improvements.append({
-                'area': 'Quality Management System',
-                'recommendation': 'Establish comprehensive quality management framework',
-                'benefit': 'Foundation for multiple certifications and improved patient outcomes',
-                'implementation': 'Hire quality manager, develop policies, train staff'
-            })
-        
-        if current_total < 80:
-            operational_improvements.append({
-                'area': 'Performance Monitoring',
-                'recommendation': 'Implement real-time quality metrics dashboard',
-                'benefit': 'Continuous monitoring and rapid response to quality issues',
-                'implementation': 'Deploy analytics platform, define KPIs, train staff on data interpretation'
-            })
-        
-        if branch_info and branch_info.get('has_branches'):
-            operational_improvements.append({
-                'area': 'Multi-location Quality Standardization',
-                'recommendation': 'Standardize quality protocols across all locations',
-                'benefit': 'Consistent quality delivery and improved overall scoring',
-                'implementation': 'Develop standard operating procedures, conduct cross-location audits'
-            })
-        
-        recommendations['operational_improvements'] = operational_improvements
-        
-        # Strategic Recommendations
-        strategic_recommendations = []
-        
-        if current_total >= 80:
-            strategic_recommendations.append({
-                'strategy': 'Excellence Recognition Program',
-                'description': 'Pursue national and international healthcare awards',
-                'timeline': '12-24 months',
-                'expected_outcome': 'Enhanced reputation and market positioning'
-            })
-        
-        if current_total < 70:
-            strategic_recommendations.append({
-                'strategy': 'Quality Transformation Initiative',
-                'description': 'Comprehensive organizational quality transformation',
-                'timeline': '18-36 months',
-                'expected_outcome': 'Significant improvement in quality scores and patient outcomes'
-            })
-        
-        # Check for international presence potential
-        org_name_lower = org_name.lower()
-        if any(city in org_name_lower for city in ['chennai', 'bangalore', 'mumbai', 'delhi']):
-            strategic_recommendations.append({
-                'strategy': 'International Expansion Readiness',
-                'description': 'Prepare for international healthcare market entry',
-                'timeline': '24-36 months',
-                'expected_outcome': 'Access to global healthcare markets and partnerships'
-            })
-        
-        recommendations['strategic_recommendations'] = strategic_recommendations
-        
-        return recommendations
+        """Generate actionable improvement recommendations based on scoring analysis
+
+        Served from the memoized rule table in recommendation_rules.py: organizations
+        with the same certification-gap profile, score band and region share one
+        compiled set of recommendations.
+        """
+        return get_recommendation_engine().recommendations(org_name, score_breakdown, certifications, branch_info)
     
     def calculate_location_adjustment(self, org_name, branch_info):
         """Calculate location-specific quality score adjustments based on branch type and regional factors"""
@@ -3001,6 +2868,17 @@ class HealthcareOrgAnalyzer:
         return 1.0  # No multiplier for unknown hospitals
     
     def calculate_organization_rankings(self, current_org_name, current_score):
+        """Rankings for the current organization, served from the shared result cache when warm"""
+        try:
+            score_key = round(float(current_score), 4)
+        except (TypeError, ValueError):
+            return self._calculate_organization_rankings_uncached(current_org_name, current_score)
+        return self.get_search_result_cache().get_or_compute(
+            'rankings', current_org_name,
+            lambda: self._calculate_organization_rankings_uncached(current_org_name, current_score),
+            current_org_name, score_key)
+
+    def _calculate_organization_rankings_uncached(self, current_org_name, current_score):
         """Calculate rankings and percentiles for the current organization against all others in database"""
         try:
             # Get all organizations from unified database
@@ -3313,12 +3191,30 @@ class HealthcareOrgAnalyzer:
                 'rank': rank,
                 'total_in_region': len(regional_orgs) + 1,
                 'percentile': percentile,
-                'top_in_region': regional_orgs[:3]
+                'top_in_region': regional_orgs[:3],
+                'nearby': self.get_nearby_ranking(current_org_name, current_score)
             }
             
         except Exception as e:
             return None
     
+    def get_nearby_ranking(self, current_org_name, current_score, radius_km=50, k=50):
+        """Rank among the closest peers within radius_km (None without coordinates)"""
+        try:
+            peers = self.find_nearby_organizations(current_org_name, k=k, radius_km=radius_km)
+            if not peers:
+                return None
+            rank = sum(1 for peer in peers if peer['total_score'] > current_score) + 1
+            return {
+                'radius_km': radius_km,
+                'rank': rank,
+                'total_nearby': len(peers) + 1,
+                'percentile': ((len(peers) + 1 - rank) / (len(peers) + 1)) * 100,
+                'top_nearby': peers[:3]
+            }
+        except Exception:
+            return None
+    
     def _get_iso_score_impact(self, iso_standard):
         """Get the score impact for different ISO standards in healthcare"""
         iso_score_mapping = {
@@ -3399,6 +3295,11 @@ class HealthcareOrgAnalyzer:
         if not hasattr(self, 'unified_database') or not self.unified_database:
             self.unified_database = self.load_unified_database()
         
+        # Organizations with coordinates: nearest peers straight from the spatial index
+        nearby_orgs = self.find_nearby_organizations(org_name, k=8)
+        if nearby_orgs:
+            return nearby_orgs
+        
         # Filter organizations from the same region using unified database
         region_orgs = []
         for org in self.unified_database:
@@ -3462,6 +3363,44 @@ class HealthcareOrgAnalyzer:
         
         return similar_orgs
     
+    def find_nearby_organizations(self, org_name, k=8, radius_km=None):
+        """Nearest organizations to org_name with precomputed scores (empty if it has no coordinates)"""
+        geo_index = self.get_geo_index()
+        coords = geo_index.locate(org_name)
+        if coords is None:
+            return []
+        if radius_km is None:
+            peers = geo_index.nearest(coords[0], coords[1], k=k, exclude_name=org_name)
+        else:
+            peers = geo_index.within_radius(coords[0], coords[1], radius_km, limit=k, exclude_name=org_name)
+        
+        nearby_orgs = []
+        for peer in peers:
+            record = peer['record']
+            location_parts = [part for part in (peer.get('city'), peer.get('state'), peer.get('country')) if part]
+            certifications = [c for c in (record.get('certifications') or []) if isinstance(c, dict)]
+            org_type_determined = 'Healthcare Organization'
+            if any('JCI' in cert.get('name', '') for cert in certifications):
+                org_type_determined = 'JCI Accredited Hospital'
+            elif any('NABH' in cert.get('name', '') for cert in certifications):
+                org_type_determined = 'NABH Accredited Hospital'
+            elif any('CAP' in cert.get('name', '') for cert in certifications):
+                org_type_determined = 'CAP Accredited Laboratory'
+            nearby_orgs.append({
+                'name': peer['name'],
+                'location': ', '.join(location_parts) if location_parts else 'Unknown',
+                'type': org_type_determined,
+                'total_score': peer.get('total_score') or 0,
+                'score_breakdown': peer.get('score_breakdown') or {},
+                'certifications': certifications,
+                'quality_initiatives': record.get('quality_initiatives', []),
+                'distance_km': peer['distance_km']
+            })
+        
+        # Sort by score (highest first)
+        nearby_orgs.sort(key=lambda x: x['total_score'], reverse=True)
+        return nearby_orgs
+    
     def _is_same_region(self, org_country, search_region):
         """Helper method to determine if an organization's country matches the search region"""
         # Country to region mapping
@@ -3551,42 +3490,48 @@ class HealthcareOrgAnalyzer:
         return region_proximity.get(region.lower(), [])
     
     def calculate_detailed_percentile_rankings(self, org_name, org_location=""):
+        """Percentile rankings for an organization, served from the shared result cache when warm"""
+        return self.get_search_result_cache().get_or_compute(
+            'percentiles', org_name,
+            lambda: self._calculate_detailed_percentile_rankings_uncached(org_name, org_location),
+            org_name, org_location)
+
+    def _ranking_entries(self):
+        """Score every organization for the percentile rankings, in database order
+
+        Uses the scoring backend's worker pool when one is configured and serves
+        the data version loaded here (see scoring_backend.py).
+        """
+        backend = get_scoring_backend()
+        if backend is not None:
+            try:
+                entries = backend.rankings(self._loaded_manifest_version)
+                if entries is not None:
+                    return entries
+            except (OSError, EOFError, ScoringBackendError) as e:
+                print(f"Scoring backend unavailable, scoring in-process: {e}")
+        
+        entries = []
+        for org in self.unified_database:
+            try:
+                entries.append(ranking_entry(org, score_organization(self, org)))
+            except Exception:
+                continue
+        return entries
+
+    def _calculate_detailed_percentile_rankings_uncached(self, org_name, org_location=""):
         """Calculate comprehensive percentile rankings for healthcare organizations"""
         # Load unified database if not already loaded
         if not hasattr(self, 'unified_database') or not self.unified_database:
             self.unified_database = self.load_unified_database()
         
         # Calculate scores for all organizations
-        all_scores = []
+        all_scores = self._ranking_entries()
         org_data = {}
-        
-        for org in self.unified_database:
-            try:
-                # Calculate score for each organization
-                # Get certifications and initiatives for this organization
-                certifications = org.get('certifications', [])
-                initiatives = org.get('quality_initiatives', [])
-                score_data = self.calculate_quality_score(certifications, initiatives, org['name'], None, [])
-                total_score = score_data.get('total_score', 0)
-                
-                org_info = {
-                    'name': org['name'],
-                    'location': f"{org.get('city', '')}, {org.get('country', '')}".strip(', '),
-                    'country': org.get('country', ''),
-                    'hospital_type': org.get('hospital_type', 'Hospital'),
-                    'jci_accredited': any('JCI' in cert for cert in org.get('certifications', [])),
-                    'total_score': total_score,
-                    'score_data': score_data
-                }
-                
-                all_scores.append(org_info)
-                
-                # Store data for the searched organization
-                if org['name'].lower() == org_name.lower():
-                    org_data = org_info
-                    
-            except Exception as e:
-                continue
+        for org_info in all_scores:
+            # Store data for the searched organization
+            if org_info['name'].lower() == org_name.lower():
+                org_data = org_info
         
         # Sort by total score (descending)
         all_scores.sort(key=lambda x: x['total_score'], reverse=True)
@@ -3867,378 +3812,24 @@ class HealthcareOrgAnalyzer:
             return False
 
 # PDF Generation Functions
+# Rendering lives in scorecard_pdf_service (thread-safe charts, compiled styles, PDF cache)
 def create_score_chart(score, title="Quality Score"):
     """Create a score visualization chart for PDF"""
-    fig, ax = plt.subplots(figsize=(6, 4))
-    
-    # Create a gauge-like chart
-    colors_list = ['#ff4444', '#ffaa44', '#ffdd44', '#88dd44', '#44dd44']
-    ranges = [20, 40, 60, 80, 100]
-    
-    # Create background bars
-    for i, (range_val, color) in enumerate(zip(ranges, colors_list)):
-        start = ranges[i-1] if i > 0 else 0
-        ax.barh(0, range_val - start, left=start, height=0.5, color=color, alpha=0.3)
-    
-    # Create score bar
-    score_color = colors_list[min(int(score // 20), 4)]
-    ax.barh(0, score, height=0.3, color=score_color, alpha=0.8)
-    
-    # Add score text
-    ax.text(score/2, 0, f'{score:.1f}', ha='center', va='center', 
-            fontsize=16, fontweight='bold', color='white')
-    
-    ax.set_xlim(0, 100)
-    ax.set_ylim(-0.5, 0.5)
-    ax.set_xlabel('Score')
-    ax.set_title(title, fontsize=14, fontweight='bold')
-    ax.set_yticks([])
-    
-    # Save to bytes
-    img_buffer = io.BytesIO()
-    plt.savefig(img_buffer, format='png', bbox_inches='tight', dpi=150)
-    img_buffer.seek(0)
-    plt.close()
-    
-    return img_buffer
+    return render_score_chart(score, title)
 
 def create_certification_chart(certifications):
     """Create a certification breakdown chart for PDF"""
-    if not certifications:
-        return None
-    
-    # Count certifications by status
-    status_counts = {}
-    for cert in certifications:
-        status = cert.get('status', 'Unknown')
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
-    fig, ax = plt.subplots(figsize=(6, 4))
-    
-    colors = {'Active': '#44dd44', 'In Progress': '#ffaa44', 'Expired': '#ff4444', 'Unknown': '#cccccc'}
-    
-    statuses = list(status_counts.keys())
-    counts = list(status_counts.values())
-    chart_colors = [colors.get(status, '#cccccc') for status in statuses]
-    
-    ax.pie(counts, labels=statuses, colors=chart_colors, autopct='%1.1f%%', startangle=90)
-    ax.set_title('Certification Status Distribution', fontsize=14, fontweight='bold')
-    
-    # Save to bytes
-    img_buffer = io.BytesIO()
-    plt.savefig(img_buffer, format='png', bbox_inches='tight', dpi=150)
-    img_buffer.seek(0)
-    plt.close()
-    
-    return img_buffer
+    return render_certification_chart(certifications)
+
+@st.cache_resource
+def get_scorecard_service():
+    """Process-wide scorecard PDF service; serves pre-rendered scorecards from its cache"""
+    return ScorecardPDFService()
 
 def generate_detailed_scorecard_pdf(org_name, org_data):
     """Generate a comprehensive PDF scorecard for the organization"""
     try:
-        # Create PDF buffer
-        buffer = io.BytesIO()
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, 
-                              topMargin=72, bottomMargin=18)
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=rl_colors.HexColor('#2c3e50')
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            textColor=rl_colors.HexColor('#34495e')
-        )
-        
-        subheading_style = ParagraphStyle(
-            'CustomSubheading',
-            parent=styles['Heading3'],
-            fontSize=14,
-            spaceAfter=8,
-            textColor=rl_colors.HexColor('#7f8c8d')
-        )
-        
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=11,
-            spaceAfter=6
-        )
-        
-        # Build PDF content
-        story = []
-        
-        # Header
-        story.append(Paragraph("Global Healthcare Quality Grid", title_style))
-        story.append(Paragraph(f"Detailed Assessment Report for {org_name}", heading_style))
-        story.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", normal_style))
-        story.append(Spacer(1, 20))
-        
-        # Executive Summary
-        story.append(Paragraph("Executive Summary", heading_style))
-        
-        score = org_data.get('total_score', 0)
-        # Determine grade based on adjusted scoring scale (max 85)
-        grade = "A+" if score >= 75 else "A" if score >= 65 else "B+" if score >= 55 else "B" if score >= 45 else "C"
-        
-        summary_text = f"""
-        <b>{org_name}</b> has achieved an overall Global Healthcare Quality Assessment quality score of <b>{score:.1f}/100</b> (Grade: <b>{grade}</b>).
-        This assessment is based on comprehensive analysis of certifications, quality initiatives, transparency measures, 
-        and reputation factors from publicly available sources.
-        """
-        story.append(Paragraph(summary_text, normal_style))
-        story.append(Spacer(1, 15))
-        
-        # Compliance Verification Section
-        story.append(Paragraph("Mandatory Compliance Verification", heading_style))
-        
-        compliance_check = org_data.get('score_breakdown', {}).get('compliance_check', {})
-        if compliance_check:
-            compliance_percentage = compliance_check.get('compliance_percentage', 0)
-            compliant_count = compliance_check.get('compliant_count', 0)
-            total_required = compliance_check.get('total_required', 8)
-            is_fully_compliant = compliance_check.get('is_fully_compliant', False)
-            
-            compliance_status = "✅ FULLY COMPLIANT - ALL MANDATORY ISO STANDARDS MET" if is_fully_compliant else "⚠️ CRITICAL NON-COMPLIANCE - MANDATORY ISO STANDARDS MISSING"
-            
-            compliance_text = f"""
-            <b>MANDATORY ISO STANDARDS COMPLIANCE STATUS:</b> {compliance_status}<br/>
-            <b>Compliance Rate:</b> {compliance_percentage:.1f}% ({compliant_count}/{total_required} mandatory certifications)<br/>
-            <b>Penalty Applied:</b> {compliance_check.get('total_penalty', 0)} points for missing mandatory standards<br/><br/>
-            
-            <b>MANDATORY ISO STANDARDS REVIEW:</b><br/>
-            """
-            
-            # Add details for each required certification with penalty information
-            details = compliance_check.get('details', {})
-            for cert_name, cert_info in details.items():
-                status_icon = "✅" if cert_info.get('found') and cert_info.get('status') in ['Active', 'Valid', 'Current'] else "❌"
-                cert_status = cert_info.get('status', 'Not Found') if cert_info.get('found') else 'Not Found'
-                penalty_info = f" (Penalty: {cert_info.get('penalty', 0)} points)" if cert_info.get('mandatory', False) and not cert_info.get('found') else ""
-                mandatory_label = " [MANDATORY]" if cert_info.get('mandatory', False) else " [RECOMMENDED]"
-                compliance_text += f"• {status_icon} <b>{cert_name}{mandatory_label}:</b> {cert_status}{penalty_info}<br/>"
-            
-            story.append(Paragraph(compliance_text, normal_style))
-        else:
-            story.append(Paragraph("Compliance verification data not available for this assessment.", normal_style))
-        
-        story.append(Spacer(1, 20))
-        
-        # Score Breakdown
-        story.append(Paragraph("Quality Score Breakdown", heading_style))
-        
-        score_breakdown = org_data.get('score_breakdown', {})
-        
-        # Create score breakdown table - certification-only scoring
-        score_data = [
-            ['Component', 'Weight', 'Score', 'Weighted Score'],
-            ['Certifications', '100%', f"{score_breakdown.get('certification_score', 0):.2f}",
-                f"{score_breakdown.get('certification_score', 0):.2f}"],
-                ['Reputation Bonus', 'Bonus', f"{score_breakdown.get('reputation_bonus', 0):.2f}",
-                f"{score_breakdown.get('reputation_bonus', 0):.2f}"],
-                ['Location Adjustment', 'Adjustment', f"{score_breakdown.get('location_adjustment', 0):.2f}",
-                f"{score_breakdown.get('location_adjustment', 0):.2f}"],
-                ['', '', 'Total Score:', f"{score:.2f}/100"]
-        ]
-        
-        score_table = Table(score_data, colWidths=[2.5*inch, 1*inch, 1*inch, 1.5*inch])
-        score_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#3498db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -2), rl_colors.beige),
-            ('BACKGROUND', (0, -1), (-1, -1), rl_colors.HexColor('#ecf0f1')),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, rl_colors.black)
-        ]))
-        
-        story.append(score_table)
-        story.append(Spacer(1, 20))
-        
-        # Add score chart
-        score_chart = create_score_chart(score, f"{org_name} Quality Score")
-        if score_chart:
-            story.append(Paragraph("Visual Score Representation", subheading_style))
-            story.append(ReportLabImage(score_chart, width=5*inch, height=3*inch))
-            story.append(Spacer(1, 15))
-        
-        # Certifications Section
-        story.append(Paragraph("Certifications Analysis", heading_style))
-        
-        certifications = org_data.get('certifications', [])
-        if certifications:
-            story.append(Paragraph(f"Total Certifications Found: {len(certifications)}", subheading_style))
-            
-            # Active certifications table
-            active_certs = [cert for cert in certifications if cert.get('status') == 'Active']
-            if active_certs:
-                cert_data = [['Certification', 'Status', 'Valid Until', 'Score Impact']]
-                for cert in active_certs[:10]:  # Show top 10
-                    cert_data.append([
-                        cert.get('name', 'N/A'),
-                        cert.get('status', 'N/A'),
-                        cert.get('valid_until', 'N/A'),
-                        f"{cert.get('score_impact', 0):.1f}"
-                    ])
-                
-                cert_table = Table(cert_data, colWidths=[2.5*inch, 1*inch, 1.5*inch, 1*inch])
-                cert_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), rl_colors.HexColor('#27ae60')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), rl_colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 11),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), rl_colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, rl_colors.black)
-                ]))
-                
-                story.append(cert_table)
-                story.append(Spacer(1, 15))
-            
-            # Add certification chart
-            cert_chart = create_certification_chart(certifications)
-            if cert_chart:
-                story.append(Paragraph("Certification Status Distribution", subheading_style))
-                story.append(ReportLabImage(cert_chart, width=4*inch, height=3*inch))
-                story.append(Spacer(1, 15))
-        else:
-            story.append(Paragraph("No certifications found in our database.", normal_style))
-            story.append(Spacer(1, 10))
-        
-        # Quality Initiatives Section
-        story.append(Paragraph("Quality Initiatives", heading_style))
-        
-        initiatives = org_data.get('quality_initiatives', [])
-        if initiatives:
-            story.append(Paragraph(f"Quality Initiatives Identified: {len(initiatives)}", subheading_style))
-            
-            for i, initiative in enumerate(initiatives[:8], 1):  # Show top 8
-                init_text = f"<b>{i}.</b> {initiative.get('name', 'N/A')} ({initiative.get('year', 'N/A')})"
-                story.append(Paragraph(init_text, normal_style))
-            
-            story.append(Spacer(1, 15))
-        else:
-            story.append(Paragraph("No specific quality initiatives found in our analysis.", normal_style))
-            story.append(Spacer(1, 10))
-        
-        # Page break for next section
-        story.append(PageBreak())
-        
-        # Methodology Section
-        story.append(Paragraph("Assessment Methodology", heading_style))
-        
-        methodology_text = """
-        <b>Data Sources:</b><br/>
-        • Official certification body databases (ISO, JCI, NABH, CAP, NABL, etc.)<br/>
-        • International accreditation organizations<br/>
-        • Government healthcare regulatory databases<br/>
-        • Verified certification registries<br/>
-        • Official organization certification disclosures<br/><br/>
-        
-        <b>Mandatory Compliance Review:</b><br/>
-        All organizations must be reviewed for compliance with these certification/accreditation standards before QuXAT score generation:<br/>
-        • <b>ISO 9001</b> - Quality Management Systems<br/>
-        • <b>ISO 14001</b> - Environmental Management Systems<br/>
-        • <b>ISO 45001</b> - Occupational Health and Safety Management Systems<br/>
-        • <b>ISO 27001</b> - Information Security Management Systems<br/>
-        • <b>ISO 13485</b> - Medical Devices Quality Management Systems<br/>
-        • <b>ISO 50001</b> - Energy Management Systems<br/>
-        • <b>ISO 15189</b> - Medical Laboratories Quality and Competence<br/>
-        • <b>College of American Pathologists (CAP)</b> - Laboratory Accreditation<br/><br/>
-        
-        <b>Scoring Methodology:</b><br/>
-        • <b>Weighted Certification System (100%):</b> Evidence-based scoring using verified certifications with specific weights<br/><br/>
-        
-        <b>Certification Weight Hierarchy:</b><br/>
-        • <b>JCI Accreditation:</b> Weight 3.5, Base Score 30 pts (Global Gold Standard)<br/>
-        • <b>ISO 9001 & ISO 13485:</b> Weight 3.2, Base Score 25 pts (Quality & Medical Device Management)<br/>
-        • <b>ISO 15189:</b> Weight 3.0, Base Score 22 pts (Medical Laboratory Quality)<br/>
-        • <b>ISO 27001:</b> Weight 2.8, Base Score 20 pts (Information Security)<br/>
-        • <b>CAP Accreditation:</b> Weight 2.8, Base Score 22 pts (Laboratory Standards)<br/>
-        • <b>ISO 45001:</b> Weight 2.6, Base Score 18 pts (Occupational Health & Safety)<br/>
-        • <b>NABH Accreditation:</b> Weight 2.6, Base Score 20 pts (Hospital Standards)<br/>
-        • <b>ISO 14001:</b> Weight 2.4, Base Score 16 pts (Environmental Management)<br/>
-        • <b>NABL Accreditation:</b> Weight 2.4, Base Score 18 pts (Testing & Calibration)<br/>
-        • <b>ISO 50001:</b> Weight 2.2, Base Score 14 pts (Energy Management)<br/>
-        • <b>Other ISO Standards:</b> Weight 2.0, Base Score 12 pts (General ISO Certifications)<br/><br/>
-        
-        <b>Certification Status:</b> Active certifications (100% weight), In-Progress (50% weight)<br/>
-        <b>Performance Bonuses:</b> Diversity bonus (multiple cert types), International premium (JCI/ISO certs)<br/><br/>
-        
-        <b>Score Ranges (Evidence-Based Scale):</b><br/>
-        • 90-100: A+ (Exceptional Quality Recognition)<br/>
-        • 80-89: A (Excellent - Quality Recognition)<br/>
-        • 70-79: B+ (Good - Quality Recognition)<br/>
-        • 60-69: B (Adequate - Quality Recognition)<br/>
-        • 50-59: C (Average - Quality Recognition)
-        """
-        
-        story.append(Paragraph(methodology_text, normal_style))
-        story.append(Spacer(1, 20))
-        
-        # Disclaimers Section
-        story.append(Paragraph("Important Disclaimers", heading_style))
-        
-        disclaimer_text = """
-        <b>Assessment Limitations:</b> This scoring system is based on publicly available information and may not 
-        capture all quality aspects of an organization. Scores are generated through automated analysis and 
-        <b>may be incorrect or incomplete</b>.<br/><br/>
-        
-        <b>Data Dependencies:</b> Accuracy depends on the availability and reliability of public data sources. 
-        Organizations may have additional certifications or quality initiatives not captured in our database.<br/><br/>
-        
-        <b>Not Medical Advice:</b> Healthcare Quality Grid scores do not constitute medical advice, professional recommendations, 
-        or endorsements. Users should conduct independent verification and due diligence before making healthcare decisions.<br/><br/>
-        
-        <b>Limitation of Liability:</b> Healthcare Quality Grid and its developers disclaim all warranties, express or implied, 
-        regarding the accuracy or completeness of information. Users assume full responsibility for any decisions 
-        made based on Healthcare Quality Grid assessments.<br/><br/>
-        
-        <b>Comparative Tool Only:</b> Intended for comparative analysis and research purposes, not absolute quality determination.
-        """
-        
-        story.append(Paragraph(disclaimer_text, normal_style))
-        story.append(Spacer(1, 20))
-        
-        # Footer
-        footer_text = f"""
-        <b>Report Generated by:</b> Healthcare Quality Grid v3.0<br/>
-        <b>Generation Date:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>
-        <b>Organization:</b> {org_name}<br/>
-        <b>Report ID:</b> QXT-{datetime.now().strftime('%Y%m%d')}-{hash(org_name) % 10000:04d}<br/>
-        <br/>
-        <b>Contact Information:</b><br/>
-        Contact the Global Healthcare Quality Assessment team at quxat.team@gmail.com to add your organization to our quality self-assessment database.
-        """
-        
-        story.append(Paragraph(footer_text, normal_style))
-        
-        # Build PDF
-        doc.build(story)
-        
-        # Get PDF data
-        buffer.seek(0)
-        pdf_data = buffer.getvalue()
-        buffer.close()
-        
-        return pdf_data
+        return get_scorecard_service().render(org_name, org_data)
         
     except Exception as e:
         # Log error without using Streamlit functions to avoid context issues
@@ -4246,6 +3837,18 @@ def generate_detailed_scorecard_pdf(org_name, org_data):
         traceback.print_exc()
         return None
 
+def display_scorecard_pdf_download(org_name, org_data, key_prefix='scorecard_pdf'):
+    """PDF scorecard download button (served from the scorecard cache when already rendered)"""
+    pdf_data = generate_detailed_scorecard_pdf(org_name, org_data)
+    if pdf_data:
+        st.download_button(
+            label="📄 Download PDF Scorecard",
+            data=pdf_data,
+            file_name=f"{re.sub(r'[^A-Za-z0-9]+', '_', org_name).strip('_')}_scorecard.pdf",
+            mime="application/pdf",
+            key=f"{key_prefix}_{org_name}"
+        )
+
 def display_detailed_scorecard_inline(org_name, org_data, score):
     """
     Display a comprehensive detailed scorecard inline instead of generating PDF
@@ -4473,12 +4076,12 @@ def display_detailed_scorecard_inline(org_name, org_data, score):
         
         # Score History and Trend Analysis
         trend_data = get_score_trend(org_name)
-        if trend_data or org_name in st.session_state.score_history:
+        history = get_score_history(org_name)
+        if trend_data or history:
             st.markdown("### 📈 Healthcare Quality Score History & Trends")
             st.markdown("*Track your healthcare quality score over time*")
             
-            if org_name in st.session_state.score_history and len(st.session_state.score_history[org_name]) > 0:
-                history = st.session_state.score_history[org_name]
+            if len(history) > 0:
                 
                 # Create trend visualization
                 col1, col2, col3 = st.columns(3)
@@ -5097,6 +4700,8 @@ def display_detailed_scorecard_inline(org_name, org_data, score):
         st.markdown("---")
         st.success("✅ Detailed scorecard displayed successfully! This comprehensive view includes all information that would be in the PDF report.")
         
+        display_scorecard_pdf_download(org_name, org_data, key_prefix='inline_scorecard_pdf')
+        
     except Exception as e:
         st.error(f"Error displaying detailed scorecard: {str(e)}")
         st.error(f"Traceback: {traceback.format_exc()}")
@@ -5146,6 +4751,12 @@ def add_score_to_history(org_name, score_data):
     if len(st.session_state.score_history[org_name]) > 12:
         st.session_state.score_history[org_name] = st.session_state.score_history[org_name][-12:]
 
+    # Persist to the shared time-series store so trends survive sessions and deploys
+    try:
+        get_history_store().record_score(org_name, score_data)
+    except Exception:
+        pass
+
 def add_ranking_to_history(org_name, rankings_data):
     """Add ranking data to the organization's ranking history"""
     if org_name not in st.session_state.ranking_history:
@@ -5168,10 +4779,38 @@ def add_ranking_to_history(org_name, rankings_data):
     if len(st.session_state.ranking_history[org_name]) > 12:
         st.session_state.ranking_history[org_name] = st.session_state.ranking_history[org_name][-12:]
 
+    # Persist to the shared time-series store so trends survive sessions and deploys
+    try:
+        get_history_store().record_ranking(org_name, rankings_data)
+    except Exception:
+        pass
+
+def get_score_history(org_name):
+    """Get score history, preferring the persistent store over the session-only list"""
+    session_history = st.session_state.score_history.get(org_name, [])
+    try:
+        persistent = get_history_store().get_score_history(org_name)
+    except Exception:
+        persistent = []
+    return persistent if len(persistent) >= len(session_history) else session_history
+
+def get_ranking_history(org_name):
+    """Get ranking history, preferring the persistent store over the session-only list"""
+    session_history = st.session_state.ranking_history.get(org_name, [])
+    try:
+        persistent = get_history_store().get_ranking_history(org_name)
+    except Exception:
+        persistent = []
+    return persistent if len(persistent) >= len(session_history) else session_history
+
 def get_ranking_trend(org_name):
     """Get ranking trend analysis for an organization"""
     if org_name not in st.session_state.ranking_history or len(st.session_state.ranking_history[org_name]) < 2:
-        return None
+        # Fall back to the cross-session rollups so trends do not depend on searching twice
+        try:
+            return get_history_store().get_ranking_trend(org_name)
+        except Exception:
+            return None
     
     history = st.session_state.ranking_history[org_name]
     latest_rank = history[-1]['overall_rank']
@@ -5211,7 +4850,11 @@ def get_ranking_trend(org_name):
 def get_score_trend(org_name):
     """Get score trend analysis for an organization"""
     if org_name not in st.session_state.score_history or len(st.session_state.score_history[org_name]) < 2:
-        return None
+        # Fall back to the cross-session rollups so trends do not depend on searching twice
+        try:
+            return get_history_store().get_score_trend(org_name)
+        except Exception:
+            return None
     
     history = st.session_state.score_history[org_name]
     latest_score = history[-1]['total_score']
@@ -5350,13 +4993,30 @@ with st.sidebar:
     """)
     st.info("💡 We welcome healthcare organizations worldwide!")
 
+    st.markdown("---")
+    with st.expander("🔐 Admin"):
+        if is_admin_authenticated():
+            cache_summary = get_analyzer().get_search_result_cache().summary()
+            st.metric("Search Cache Hit Ratio", f"{cache_summary['hit_ratio'] * 100:.1f}%",
+                      delta=f"{cache_summary['hits']:,} hits / {cache_summary['misses']:,} misses",
+                      delta_color="off")
+            st.caption(f"{cache_summary['entries']:,}/{cache_summary['max_entries']:,} cached results · "
+                       f"{cache_summary['evictions']:,} evictions · "
+                       f"{cache_summary['invalidations']:,} data-version invalidations · "
+                       f"{cache_summary['coalesced']:,} concurrent searches coalesced")
+            for kind, counts in cache_summary['by_kind'].items():
+                st.caption(f"{kind}: {counts['hits']:,} hits / {counts['misses']:,} misses")
+            admin_logout()
+        else:
+            admin_login()
+
 # Page routing
 if page == "📈 Global Healthcare Quality Trends":
     # Global Healthcare Quality Trends Page
     try:
-        # Load trends data
-        with open('global_healthcare_trends_2022_2024.json', 'r') as f:
-            trends_data = json.load(f)
+        # Aggregates and figures are built once per version of the trends file
+        trends_view = get_trends_cache().get(TRENDS_FILE)
+        trends_metrics = trends_view.metrics
         
         # Page Header
         st.markdown("""
@@ -5378,13 +5038,8 @@ if page == "📈 Global Healthcare Quality Trends":
         # Key Metrics Overview
         col1, col2, col3, col4 = st.columns(4)
         
-        # Calculate total accreditations
-        total_accreditations = sum(month['total_accreditations'] for month in trends_data['monthly_accreditations'])
-        
-        # Calculate growth rate
-        first_month_total = trends_data['monthly_accreditations'][0]['total_accreditations']
-        last_month_total = trends_data['monthly_accreditations'][-1]['total_accreditations']
-        growth_rate = ((last_month_total - first_month_total) / first_month_total) * 100
+        total_accreditations = trends_metrics['total_accreditations']
+        growth_rate = trends_metrics['growth_rate']
         
         with col1:
             st.metric(
@@ -5394,7 +5049,7 @@ if page == "📈 Global Healthcare Quality Trends":
             )
         
         with col2:
-            avg_monthly = total_accreditations / len(trends_data['monthly_accreditations'])
+            avg_monthly = trends_metrics['average_monthly']
             st.metric(
                 "Monthly Average",
                 f"{avg_monthly:.0f}",
@@ -5402,8 +5057,7 @@ if page == "📈 Global Healthcare Quality Trends":
             )
         
         with col3:
-            # Count unique certification types
-            cert_types = len(trends_data['monthly_accreditations'][0]['certifications'])
+            cert_types = trends_metrics['certification_types']
             st.metric(
                 "Certification Types",
                 cert_types,
@@ -5411,12 +5065,10 @@ if page == "📈 Global Healthcare Quality Trends":
             )
         
         with col4:
-            # Calculate peak month
-            peak_month = max(trends_data['monthly_accreditations'], key=lambda x: x['total_accreditations'])
             st.metric(
                 "Peak Month",
-                f"{peak_month['month_name']} {peak_month['year']}",
-                delta=f"{peak_month['total_accreditations']} accreditations"
+                trends_metrics['peak_label'],
+                delta=f"{trends_metrics['peak_accreditations']} accreditations"
             )
         
         st.markdown("---")
@@ -5470,240 +5122,51 @@ if page == "📈 Global Healthcare Quality Trends":
         with tab1:
             st.subheader("Monthly Accreditation Trends")
             
-            # Prepare data for monthly trends
-            monthly_df = pd.DataFrame(trends_data['monthly_accreditations'])
-            monthly_df['date'] = pd.to_datetime(monthly_df['date'])
-            
-            # Create line chart for total accreditations
-            fig_monthly = go.Figure()
-            
-            fig_monthly.add_trace(go.Scatter(
-                x=monthly_df['date'],
-                y=monthly_df['total_accreditations'],
-                mode='lines+markers',
-                name='Total Accreditations',
-                line=dict(color='#667eea', width=3),
-                marker=dict(size=6, color='#667eea'),
-                hovertemplate='<b>%{x|%B %Y}</b><br>Accreditations: %{y}<extra></extra>'
-            ))
-            
-            fig_monthly.update_layout(
-                title="Monthly Healthcare Accreditations Worldwide",
-                xaxis_title="Month",
-                yaxis_title="Number of Accreditations",
-                hovermode='x unified',
-                height=400,
-                showlegend=False
-            )
-            
+            fig_monthly = trends_view.figure('monthly')
             st.plotly_chart(fig_monthly, use_container_width=True)
             
             # Monthly breakdown by certification type
             st.subheader("Monthly Breakdown by Certification Type")
             
-            # Prepare data for stacked area chart
-            cert_data = []
-            for month in trends_data['monthly_accreditations']:
-                for cert_type, cert_info in month['certifications'].items():
-                    cert_data.append({
-                        'date': month['date'],
-                        'certification': cert_type,
-                        'count': cert_info['count'],
-                        'full_name': cert_info['name']
-                    })
-            
-            cert_df = pd.DataFrame(cert_data)
-            cert_df['date'] = pd.to_datetime(cert_df['date'])
-            
-            # Create stacked area chart
-            fig_stacked = px.area(
-                cert_df, 
-                x='date', 
-                y='count', 
-                color='certification',
-                title="Monthly Accreditations by Certification Type",
-                labels={'count': 'Number of Accreditations', 'date': 'Month'},
-                height=400
-            )
-            
-            fig_stacked.update_layout(
-                hovermode='x unified',
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            
+            fig_stacked = trends_view.figure('stacked')
             st.plotly_chart(fig_stacked, use_container_width=True)
         
         with tab2:
             st.subheader("Certification Types Distribution")
             
-            # Calculate total by certification type
-            cert_totals = {}
-            for month in trends_data['monthly_accreditations']:
-                for cert_type, cert_info in month['certifications'].items():
-                    if cert_type not in cert_totals:
-                        cert_totals[cert_type] = {'name': cert_info['name'], 'total': 0}
-                    cert_totals[cert_type]['total'] += cert_info['count']
-            
-            # Create pie chart
-            fig_pie = go.Figure(data=[go.Pie(
-                labels=[f"{cert_type}<br>({info['name']})" for cert_type, info in cert_totals.items()],
-                values=[info['total'] for info in cert_totals.values()],
-                hole=0.4,
-                hovertemplate='<b>%{label}</b><br>Accreditations: %{value}<br>Percentage: %{percent}<extra></extra>'
-            )])
-            
-            fig_pie.update_layout(
-                title="Distribution of Accreditations by Certification Type (2022-2024)",
-                height=500,
-                showlegend=True,
-                legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.05)
-            )
-            
+            fig_pie = trends_view.figure('pie')
             st.plotly_chart(fig_pie, use_container_width=True)
             
             # Bar chart for better comparison
-            cert_names = [info['name'] for info in cert_totals.values()]
-            cert_counts = [info['total'] for info in cert_totals.values()]
-            
-            fig_bar = px.bar(
-                x=cert_counts,
-                y=cert_names,
-                orientation='h',
-                title="Total Accreditations by Certification Type",
-                labels={'x': 'Total Accreditations', 'y': 'Certification Type'},
-                height=400
-            )
-            
-            fig_bar.update_layout(yaxis={'categoryorder': 'total ascending'})
+            fig_bar = trends_view.figure('bar')
             st.plotly_chart(fig_bar, use_container_width=True)
         
         with tab3:
             st.subheader("Cumulative Growth Over Time")
             
-            # Calculate cumulative data
-            cumulative_data = []
-            running_total = 0
-            
-            for month in trends_data['monthly_accreditations']:
-                running_total += month['total_accreditations']
-                cumulative_data.append({
-                    'date': month['date'],
-                    'cumulative_total': running_total,
-                    'month_name': month['month_name'],
-                    'year': month['year']
-                })
-            
-            cumulative_df = pd.DataFrame(cumulative_data)
-            cumulative_df['date'] = pd.to_datetime(cumulative_df['date'])
-            
-            # Create cumulative growth chart
-            fig_cumulative = go.Figure()
-            
-            fig_cumulative.add_trace(go.Scatter(
-                x=cumulative_df['date'],
-                y=cumulative_df['cumulative_total'],
-                mode='lines+markers',
-                name='Cumulative Accreditations',
-                line=dict(color='#28a745', width=3),
-                marker=dict(size=6, color='#28a745'),
-                fill='tonexty',
-                hovertemplate='<b>%{x|%B %Y}</b><br>Cumulative: %{y:,}<extra></extra>'
-            ))
-            
-            fig_cumulative.update_layout(
-                title="Cumulative Healthcare Accreditations Growth",
-                xaxis_title="Time",
-                yaxis_title="Cumulative Accreditations",
-                height=400,
-                showlegend=False
-            )
-            
+            fig_cumulative = trends_view.figure('cumulative')
             st.plotly_chart(fig_cumulative, use_container_width=True)
             
             # Growth rate analysis
             st.subheader("Growth Rate Analysis")
             
-            # Calculate monthly growth rates
-            growth_rates = []
-            for i in range(1, len(cumulative_data)):
-                prev_total = cumulative_data[i-1]['cumulative_total']
-                curr_total = cumulative_data[i]['cumulative_total']
-                growth_rate = ((curr_total - prev_total) / prev_total) * 100 if prev_total > 0 else 0
-                growth_rates.append({
-                    'date': cumulative_data[i]['date'],
-                    'growth_rate': growth_rate
-                })
-            
-            growth_df = pd.DataFrame(growth_rates)
-            growth_df['date'] = pd.to_datetime(growth_df['date'])
-            
-            fig_growth = px.line(
-                growth_df,
-                x='date',
-                y='growth_rate',
-                title="Monthly Growth Rate (%)",
-                labels={'growth_rate': 'Growth Rate (%)', 'date': 'Month'},
-                height=300
-            )
-            
+            fig_growth = trends_view.figure('growth')
             st.plotly_chart(fig_growth, use_container_width=True)
         
         with tab4:
             st.subheader("Year-over-Year Comparison")
             
-            # Prepare yearly comparison data
-            yearly_data = {}
-            for month in trends_data['monthly_accreditations']:
-                year = month['year']
-                month_num = month['month']
-                if year not in yearly_data:
-                    yearly_data[year] = {}
-                if month_num not in yearly_data[year]:
-                    yearly_data[year][month_num] = 0
-                yearly_data[year][month_num] += month['total_accreditations']
-            
-            # Create comparison chart
-            fig_yearly = go.Figure()
-            
-            colors = ['#667eea', '#764ba2', '#f093fb']
-            for i, (year, monthly_data) in enumerate(yearly_data.items()):
-                months = sorted(monthly_data.keys())
-                values = [monthly_data[month] for month in months]
-                
-                fig_yearly.add_trace(go.Scatter(
-                    x=months,
-                    y=values,
-                    mode='lines+markers',
-                    name=f'{year}',
-                    line=dict(color=colors[i % len(colors)], width=3),
-                    marker=dict(size=8)
-                ))
-            
-            fig_yearly.update_layout(
-                title="Year-over-Year Monthly Comparison",
-                xaxis_title="Month",
-                yaxis_title="Accreditations",
-                height=400,
-                xaxis=dict(tickmode='linear', tick0=1, dtick=1)
-            )
-            
+            fig_yearly = trends_view.figure('yearly')
             st.plotly_chart(fig_yearly, use_container_width=True)
             
             # Yearly totals
             st.subheader("Annual Summary")
             
-            yearly_totals = {}
-            for year, monthly_data in yearly_data.items():
-                yearly_totals[year] = sum(monthly_data.values())
-            
             col1, col2, col3 = st.columns(3)
             
-            for i, (year, total) in enumerate(yearly_totals.items()):
+            for i, (year, total, yoy_growth) in enumerate(trends_view.aggregates.annual_summary()):
                 with [col1, col2, col3][i]:
-                    if i > 0:
-                        prev_year = list(yearly_totals.keys())[i-1]
-                        prev_total = yearly_totals[prev_year]
-                        yoy_growth = ((total - prev_total) / prev_total) * 100
+                    if yoy_growth is not None:
                         st.metric(f"{year} Total", f"{total:,}", delta=f"+{yoy_growth:.1f}% YoY")
                     else:
                         st.metric(f"{year} Total", f"{total:,}")
@@ -5712,31 +5175,8 @@ if page == "📈 Global Healthcare Quality Trends":
         st.markdown("---")
         st.subheader("🌍 Regional Distribution Analysis")
         
-        # Simulated regional data based on the trends
-        regions = {
-            'North America': {'percentage': 28, 'color': '#FF6B6B'},
-            'Europe': {'percentage': 24, 'color': '#4ECDC4'},
-            'Asia-Pacific': {'percentage': 22, 'color': '#45B7D1'},
-            'Middle East': {'percentage': 15, 'color': '#96CEB4'},
-            'Latin America': {'percentage': 7, 'color': '#FFEAA7'},
-            'Africa': {'percentage': 4, 'color': '#DDA0DD'}
-        }
-        
-        # Create regional distribution chart
-        fig_regional = go.Figure(data=[go.Pie(
-            labels=list(regions.keys()),
-            values=[region['percentage'] for region in regions.values()],
-            marker_colors=[region['color'] for region in regions.values()],
-            hole=0.4,
-            hovertemplate='<b>%{label}</b><br>Percentage: %{value}%<br>Estimated Accreditations: %{customdata}<extra></extra>',
-            customdata=[int(total_accreditations * region['percentage'] / 100) for region in regions.values()]
-        )])
-        
-        fig_regional.update_layout(
-            title="Regional Distribution of Healthcare Accreditations",
-            height=400,
-            showlegend=True
-        )
+        # Simulated regional shares (see trends_pipeline.REGIONAL_SHARES)
+        fig_regional = trends_view.figure('regional')
         
         st.plotly_chart(fig_regional, use_container_width=True)
         
@@ -5791,58 +5231,69 @@ if page == "📈 Global Healthcare Quality Trends":
         st.error(f"❌ Error loading trends data: {str(e)}")
 
 elif page == "📊 Quality Dashboard & Analytics":
-    # Quality Dashboard & Analytics page content
+    # Quality Dashboard & Analytics page content (aggregates from the analytics cube)
     st.header("📊 Quality Dashboard & Analytics")
     
+    analyzer = get_analyzer()
+    cube = analyzer.get_analytics_cube()
+    cube_summary = cube.summary()
+    
     # Global Healthcare Quality Trends
     st.markdown("### 🌍 Global Healthcare Quality Trends")
     
     # Key Metrics Row
     col1, col2, col3, col4 = st.columns(4)
     
-    # Unified dynamic count for organizations (ranked dataset)
-    try:
-        _total_ranked_orgs = len(getattr(analyzer, 'scored_entries', []) or [])
-    except Exception:
-        _total_ranked_orgs = 0
-    _total_ranked_orgs_fmt = f"{_total_ranked_orgs:,}"
-
     with col1:
         st.metric(
             label="🏥 Total Organizations",
-            value=_total_ranked_orgs_fmt
+            value=f"{cube_summary['organizations']:,}"
         )
     
     with col2:
         st.metric(
             label="🏥 NABH Hospitals",
-            value="4,561",
-                delta="↗️ +2,161 updated"
+            value=f"{cube.count(certification='NABH'):,}"
         )
     
     with col3:
         st.metric(
             label="📊 Avg Quality Score",
-            value="78.2",
-            delta="↗️ +2.1 improvement"
+            value=f"{cube_summary['average_score']:.1f}",
+            help=f"Median {cube_summary['median_score']:.1f}"
         )
     
     with col4:
         st.metric(
             label="🏆 Top Performers",
-            value="342",
-            delta="↗️ +18 this quarter"
+            value=f"{cube_summary['top_performers']:,}",
+            help=f"Organizations graded {' or '.join(cube.bands[:2])}"
         )
     
     # Regional Analysis
     st.markdown("### 🗺️ Regional Analysis")
     
+    region_rows = [(region, stats) for region, stats in cube.breakdown('region') if region != 'Unknown']
+    if region_rows:
+        region_df = pd.DataFrame({
+            'Region': [region for region, _ in region_rows],
+            'Organizations': [stats['count'] for _, stats in region_rows],
+            'Average Score': [round(stats['mean'], 1) for _, stats in region_rows],
+            'Median Score': [stats['p50'] for _, stats in region_rows],
+            'Top Performers': [sum(list(stats['bands'].values())[:2]) for _, stats in region_rows]
+        })
+        fig = px.bar(region_df, x='Region', y='Average Score', color='Organizations',
+                     title='Average Quality Score by Region', color_continuous_scale='viridis')
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(region_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No regional breakdown available yet.")
+    
     # Healthcare Organization Distribution by Quality Score Range
     st.markdown("### 📈 Healthcare Organization Distribution by Quality Score Range")
     
-    # Sample data for the chart
-    score_ranges = ['90-100', '80-89', '70-79', '60-69', '50-59', 'Below 50']
-    organization_counts = [342, 687, 923, 534, 267, 94]
+    score_ranges = list(cube_summary['band_counts'].keys())
+    organization_counts = list(cube_summary['band_counts'].values())
     
     # Create a bar chart
     try:
@@ -5880,26 +5331,62 @@ elif page == "📊 Quality Dashboard & Analytics":
     cert_col1, cert_col2, cert_col3 = st.columns(3)
     
     with cert_col1:
-        st.info("🏆 **JCI Accredited**\n1,247 Organizations")
+        st.info(f"🏆 **JCI Accredited**\n{cube.count(certification='JCI'):,} Organizations")
     
     with cert_col2:
-        st.success("🇮🇳 **NABH Certified**\n892 Organizations")
+        st.success(f"🇮🇳 **NABH Certified**\n{cube.count(certification='NABH'):,} Organizations")
     
     with cert_col3:
-        st.warning("🔬 **CAP Accredited**\n456 Laboratories")
+        st.warning(f"🔬 **CAP Accredited**\n{cube.count(certification='CAP'):,} Laboratories")
     
-    # Performance Trends
-    st.markdown("### 📈 Performance Trends")
-    st.markdown("""
-    - **Quality Improvement**: 78% of organizations showed score improvements over the last year
-    - **Certification Growth**: 15% increase in new certifications acquired
-    - **Global Expansion**: Coverage expanded to 3 new countries this quarter
-    - **Patient Satisfaction**: Average satisfaction scores increased by 2.3 points
-    """)
+    cert_rows = [(cert, stats) for cert, stats in cube.breakdown('certification', limit=12) if cert != 'None']
+    if cert_rows:
+        st.dataframe(pd.DataFrame({
+            'Certification': [cert for cert, _ in cert_rows],
+            'Organizations': [stats['count'] for _, stats in cert_rows],
+            'Average Score': [round(stats['mean'], 1) for _, stats in cert_rows],
+            'Score Range (P10-P90)': [f"{stats['p10']:.0f}-{stats['p90']:.0f}" for _, stats in cert_rows]
+        }), use_container_width=True, hide_index=True)
+    
+    # Certification Gap Finder (bitset queries over the unified database)
+    st.markdown("### 🔎 Certification Gap Finder")
+    gap_types = ['NABH', 'JCI', 'NABL', 'CAP', 'MAGNET'] + list(MANDATORY_ISO_STANDARDS)
+    gap_col1, gap_col2, gap_col3 = st.columns(3)
+    with gap_col1:
+        gap_holds = st.selectbox("Holds (active)", gap_types, index=0, key="gap_finder_holds")
+    with gap_col2:
+        gap_lacks = st.selectbox("Missing", gap_types, index=gap_types.index('ISO 27001'), key="gap_finder_lacks")
+    with gap_col3:
+        gap_country = st.text_input("Country", value="India", key="gap_finder_country").strip()
+    cert_index = analyzer.get_certification_index()
+    gap_criteria = {'has': [gap_holds], 'lacks': [gap_lacks], 'country': gap_country or None}
+    gap_count = cert_index.count(**gap_criteria)
+    st.info(f"**{gap_count:,}** {gap_holds} organizations{f' in {gap_country}' if gap_country else ''} without {gap_lacks}")
+    if gap_count:
+        gap_orgs = cert_index.query(limit=50, **gap_criteria)
+        st.dataframe(pd.DataFrame({
+            'Organization': [org.get('name', 'Unknown') for org in gap_orgs],
+            'City': [org.get('city', '') for org in gap_orgs],
+            'Country': [org.get('country', '') for org in gap_orgs]
+        }), use_container_width=True, hide_index=True)
+    
+    # Performance Highlights
+    st.markdown("### 📈 Performance Highlights")
+    top_countries = cube.breakdown('country', sort_by='mean', limit=3, min_count=10)
+    certified_share = (cube_summary['certified'] / cube_summary['organizations'] * 100) if cube_summary['organizations'] else 0
+    highlights = [
+        f"- **Certification Coverage**: {certified_share:.1f}% of organizations hold at least one active certification",
+        f"- **Global Coverage**: {cube_summary['countries']:,} countries represented",
+    ]
+    if top_countries:
+        highlights.append("- **Highest Average Scores** (10+ organizations): " + ", ".join(
+            f"{country} ({stats['mean']:.1f})" for country, stats in top_countries))
+    st.markdown("\n".join(highlights))
     
     # Additional analytics content
     st.markdown("---")
-    st.markdown("*Data updated in real-time from global healthcare quality databases*")
+    generated = (cube_summary['generated_at'] or '')[:16].replace('T', ' ')
+    st.markdown(f"*Aggregated from the latest batch scoring run{f' ({generated})' if generated else ''}*")
 
 else:
     # Main content - All Healthcare Quality Grid content consolidated on Home page
@@ -6209,6 +5696,14 @@ else:
                     key="org_suggestions"
                 )
                 
+                # Start resolving and scoring the top suggestions while the user decides
+                prefetcher = analyzer.get_suggestion_prefetcher()
+                if 'prefetch_session_id' not in st.session_state:
+                    st.session_state.prefetch_session_id = uuid.uuid4().hex
+                prefetch_session = st.session_state.prefetch_session_id
+                if selected_suggestion in ["Select from suggestions..."]:
+                    prefetcher.prefetch(analyzer_suggestions, top_n=2, session_id=prefetch_session)
+                
                 # If user selected a suggestion, use it
                 if selected_suggestion not in ["Select from suggestions..."]:
                     # Remove prefix and find the corresponding suggestion
@@ -6237,6 +5732,11 @@ else:
                     # If no matching suggestion found, clear the selection
                     if not suggestion_found:
                         st.session_state.selected_suggestion_data = None
+                    else:
+                        # Focus the background work on the selection; queued work for
+                        # the other suggestions is cancelled
+                        prefetcher.prefetch([st.session_state.selected_suggestion_data], top_n=1,
+                                            session_id=prefetch_session)
             else:
                 # If no database suggestions found, try dynamic validation
                 # Check if the organization exists through validation system
@@ -6503,8 +6003,10 @@ else:
                     # Use the complete organization data from the suggestion
                     suggestion_data = st.session_state.selected_suggestion_data
                     
-                    # Search for the organization using the complete data
+                    # Search for the organization using the complete data; a prefetched
+                    # (or still running) background search is reused when available
                     org_data = analyzer.search_organization_info_from_suggestion(suggestion_data)
+                    analyzer.get_suggestion_prefetcher().cancel(st.session_state.get('prefetch_session_id', 'default'))
                     
                     # Clear the session state after use
                     st.session_state.selected_suggestion_data = None
@@ -7624,6 +7126,8 @@ else:
                         - **Comparative Tool Only:** Intended for comparative analysis and research purposes, not absolute quality determination
                         """)
                     
+                    display_scorecard_pdf_download(org_name, org_data)
+                    
                     # Comparative Analysis Section
                     st.markdown("---")
                     
@@ -8412,8 +7916,8 @@ else:
             
 
             # Ranking History Chart
-            if 'ranking_history' in st.session_state and org_name in st.session_state.ranking_history:
-                ranking_history = st.session_state.ranking_history[org_name]
+            ranking_history = get_ranking_history(org_name)
+            if ranking_history:
                 if len(ranking_history) > 1:
                     with st.expander("📈 Ranking History & Trends", expanded=False):
                         # Create ranking trend chart
@@ -8647,39 +8151,48 @@ else:
         st.markdown("---")
         st.header("📊 Quality Dashboard & Analytics")
         
-        # Sample quality trend data
-        dates = pd.date_range('2024-01-01', periods=30, freq='D')
-        quality_scores = np.random.normal(82, 8, 30)
-        trend_data = pd.DataFrame({'Date': dates, 'Average Quality Score': quality_scores})
+        cube = analyzer.get_analytics_cube()
+        cube_summary = cube.summary()
+        
+        # Average score across the organizations with the most coverage
+        country_rows = cube.breakdown('country', limit=15)
+        trend_data = pd.DataFrame({
+            'Country': [country for country, _ in country_rows],
+            'Average Quality Score': [round(stats['mean'], 1) for _, stats in country_rows],
+            'Organizations': [stats['count'] for _, stats in country_rows]
+        })
         
         st.subheader("📈 Global Healthcare Quality Trends")
-        fig = px.line(trend_data, x='Date', y='Average Quality Score', 
-                      title="30-Day Healthcare Quality Score Trend")
-        st.plotly_chart(fig, use_container_width=True)
+        if country_rows:
+            fig = px.bar(trend_data, x='Country', y='Average Quality Score', hover_data=['Organizations'],
+                         title="Average Quality Score in the 15 Most Covered Countries")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("Quality scores will appear here after the next batch scoring run.")
         
         # Regional analysis
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("🌍 Regional Quality Analysis")
-            regions = ['North America', 'Europe', 'Asia-Pacific', 'Middle East', 'Latin America']
-            avg_scores = [88, 85, 79, 76, 73]
+            region_rows = [(region, stats) for region, stats in cube.breakdown('region') if region != 'Unknown']
+            regions = [region for region, _ in region_rows]
+            avg_scores = [round(stats['mean'], 1) for _, stats in region_rows]
             
-            fig = px.bar(x=regions, y=avg_scores, title="Average Quality Scores by Region")
-            st.plotly_chart(fig, use_container_width=True)
+            if regions:
+                fig = px.bar(x=regions, y=avg_scores, title="Average Quality Scores by Region")
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No regional breakdown available yet.")
         
         with col2:
             st.subheader("📊 Key Metrics")
-            # Use the same unified dynamic count here for consistency
-            try:
-                _total_ranked_orgs = len(getattr(analyzer, 'scored_entries', []) or [])
-            except Exception:
-                _total_ranked_orgs = 0
-            _total_ranked_orgs_fmt = f"{_total_ranked_orgs:,}"
-            st.metric("🏥 Total Organizations", _total_ranked_orgs_fmt)
-            st.metric("📊 Average Score", "81.2")
-            st.metric("🏆 Top Performers (90+)", "156")
-            st.metric("WARNING️ Need Improvement (<60)", "89")
+            total_stats = cube.total()
+            st.metric("🏥 Total Organizations", f"{cube_summary['organizations']:,}")
+            st.metric("📊 Average Score", f"{cube_summary['average_score']:.1f}")
+            st.metric("🏆 Top Performers", f"{cube_summary['top_performers']:,}")
+            st.metric("WARNING️ Need Improvement", f"{list(total_stats['bands'].values())[-1]:,}",
+                      help=f"Organizations graded {cube.bands[-1]}")
 
         # Global Healthcare Quality Section - Consolidated from Global Healthcare Quality page
         st.markdown("---")
@@ -8689,9 +8202,8 @@ else:
         # Global Healthcare Quality Distribution Chart and Metrics (moved from home page)
         st.subheader("📊 Healthcare Organizations by Quality Score Range")
         
-        # Generate sample data
-        quality_ranges = ['75-85 (A+)', '65-74 (A)', '55-64 (B+)', '45-54 (B)', 'Below 45 (C)']
-        organization_counts = [150, 320, 280, 180, 70]
+        quality_ranges = list(cube_summary['band_counts'].keys())
+        organization_counts = list(cube_summary['band_counts'].values())
         colors = ['#2E8B57', '#32CD32', '#FFD700', '#FFA500', '#FF6347']
         
         fig = px.bar(x=quality_ranges, y=organization_counts, 
@@ -8707,17 +8219,17 @@ else:
             try:
                 _total_tracked_orgs = len(getattr(analyzer, 'unified_database', []) or [])
                 if not _total_tracked_orgs:
-                    _total_tracked_orgs = len(getattr(analyzer, 'scored_entries', []) or [])
+                    _total_tracked_orgs = cube_summary['organizations']
             except Exception:
-                _total_tracked_orgs = len(getattr(analyzer, 'scored_entries', []) or [])
+                _total_tracked_orgs = cube_summary['organizations']
             _total_tracked_orgs_fmt = f"{_total_tracked_orgs:,}"
             st.metric("🏥 Organizations Tracked", _total_tracked_orgs_fmt)
         with col2:
-            st.metric("🌍 Countries Covered", "50+")
+            st.metric("🌍 Countries Covered", f"{cube_summary['countries']:,}")
         with col3:
-            st.metric("📊 Average Quality Score", "78.5")
+            st.metric("📊 Average Quality Score", f"{cube_summary['average_score']:.1f}")
         with col4:
-            st.metric("🏆 Top Performers", "150")
+            st.metric("🏆 Top Performers", f"{cube_summary['top_performers']:,}")
         
         st.divider()  # Visual separator between sections
         
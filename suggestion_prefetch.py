@@ -0,0 +1,231 @@
+"""
+Suggestion Prefetch for QuXAT Healthcare Quality Grid
+Speculatively resolves, scores and ranks the organizations a user is likely
+to search for while they are still looking at the Home page suggestions.
+
+A small background executor runs the (slow) suggestion search for the top
+suggestions as soon as they are shown, and for a selection as soon as it is
+made. Finished results go into a TTL cache keyed by the canonical
+organization, shared by all sessions, so pressing Search usually returns a
+warm result. Each session's interest is tracked per key: when a session moves
+on to another selection, queued work nobody else is waiting for is cancelled.
+Work is stamped with the cache generation it started in; after clear() (a data
+reload) older work is neither cached nor handed to callers.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from score_history_store import normalize_org_key
+
+
+def suggestion_key(suggestion: Any) -> str:
+    """Canonical cache key for a suggestion (organization name + location)"""
+    if isinstance(suggestion, dict):
+        name = suggestion.get('display_name') or suggestion.get('name') or suggestion.get('full_name') or ''
+        location = suggestion.get('location') or ''
+    else:
+        name, location = str(suggestion or ''), ''
+    return f"{normalize_org_key(name)}|{normalize_org_key(location)}"
+
+
+class TTLResultCache:
+    """Thread-safe LRU cache whose entries expire after ttl_seconds"""
+
+    def __init__(self, ttl_seconds: float = 600.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SuggestionPrefetcher:
+    """Background executor that warms a shared result cache for likely searches"""
+
+    def __init__(self, resolver: Callable[[Dict[str, Any]], Any], max_workers: int = 2,
+                 ttl_seconds: float = 600.0, max_entries: int = 256,
+                 key_func: Callable[[Any], str] = suggestion_key):
+        """
+        Args:
+            resolver: Computes the search result for a suggestion (e.g.
+                HealthcareOrgAnalyzer._search_organization_info_from_suggestion_uncached)
+            max_workers: Concurrent speculative searches
+            ttl_seconds: How long a finished result stays valid
+            max_entries: Cache size bound
+            key_func: Canonical key of a suggestion
+        """
+        self.resolver = resolver
+        self.key_func = key_func
+        self.cache = TTLResultCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='suggestion-prefetch')
+        self._lock = threading.Lock()
+        # key -> (generation the work started in, future)
+        self._in_flight: Dict[str, Tuple[int, Future]] = {}
+        # key -> sessions that currently want it; session -> keys it wants
+        self._interest: Dict[str, Set[str]] = {}
+        self._session_keys: Dict[str, Set[str]] = {}
+        # Cache generation: results started before clear() are not stored
+        self._generation = 0
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0,
+                      'hits': 0, 'waited': 0, 'misses': 0}
+
+    def _run(self, key: str, suggestion: Dict[str, Any], generation: int) -> Any:
+        try:
+            result = self.resolver(copy.deepcopy(suggestion))
+        except Exception:
+            with self._lock:
+                self.stats['failed'] += 1
+                self._finish(key, generation)
+            raise
+        with self._lock:
+            self.stats['completed'] += 1
+            if result is not None and generation == self._generation:
+                self.cache.put(key, result)
+            self._finish(key, generation)
+        return result
+
+    def _finish(self, key: str, generation: int) -> None:
+        """Forget finished work, unless key was resubmitted in a newer generation (lock held)"""
+        entry = self._in_flight.get(key)
+        if entry is not None and entry[0] == generation:
+            del self._in_flight[key]
+
+    def prefetch(self, suggestions: Iterable[Any], top_n: int = 2, session_id: str = 'default') -> List[str]:
+        """
+        Start resolving the first top_n suggestions in the background
+
+        The session's interest moves to these suggestions: queued work for its
+        earlier suggestions is cancelled unless another session still wants it.
+
+        Returns:
+            Canonical keys of the suggestions being (or already) prefetched
+        """
+        wanted = []
+        for suggestion in suggestions:
+            if len(wanted) >= top_n:
+                break
+            if isinstance(suggestion, str):
+                suggestion = {'display_name': suggestion, 'full_name': suggestion, 'location': '',
+                              'type': 'Healthcare Organization'}
+            if not isinstance(suggestion, dict):
+                continue
+            key = self.key_func(suggestion)
+            if key not in (k for k, _ in wanted):
+                wanted.append((key, suggestion))
+
+        with self._lock:
+            keys = {key for key, _ in wanted}
+            for key in self._session_keys.get(session_id, set()) - keys:
+                self._release(session_id, key)
+            self._session_keys[session_id] = keys
+            for key, suggestion in wanted:
+                self._interest.setdefault(key, set()).add(session_id)
+                if key in self._in_flight or self.cache.get(key) is not None:
+                    continue
+                self.stats['submitted'] += 1
+                self._in_flight[key] = (self._generation,
+                                        self._executor.submit(self._run, key, suggestion, self._generation))
+        return [key for key, _ in wanted]
+
+    def _release(self, session_id: str, key: str) -> None:
+        """Drop a session's interest in key; cancel queued work nobody wants (lock held)"""
+        sessions = self._interest.get(key)
+        if sessions is not None:
+            sessions.discard(session_id)
+            if sessions:
+                return
+            del self._interest[key]
+        entry = self._in_flight.get(key)
+        # Only queued work can be cancelled; a running search finishes and is cached
+        if entry is not None and entry[1].cancel():
+            del self._in_flight[key]
+            self.stats['cancelled'] += 1
+
+    def cancel(self, session_id: str = 'default') -> None:
+        """Withdraw all of a session's prefetch requests"""
+        with self._lock:
+            for key in self._session_keys.pop(session_id, set()):
+                self._release(session_id, key)
+
+    def get(self, suggestion: Any, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Warm result for a suggestion, or None
+
+        A result still being computed is waited for (up to timeout seconds),
+        since that is never slower than starting the same search again; work
+        started before the last clear() is not. The returned value is a copy,
+        so callers may modify it freely.
+        """
+        key = self.key_func(suggestion)
+        result = self.cache.get(key)
+        if result is not None:
+            with self._lock:
+                self.stats['hits'] += 1
+            return copy.deepcopy(result)
+        with self._lock:
+            entry = self._in_flight.get(key)
+            future = entry[1] if entry is not None and entry[0] == self._generation else None
+        if future is not None and not future.cancelled():
+            try:
+                result = future.result(timeout=timeout)
+            except (FutureTimeout, Exception):
+                result = None
+            if result is not None:
+                with self._lock:
+                    self.stats['waited'] += 1
+                return copy.deepcopy(result)
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def store(self, suggestion: Any, result: Any) -> None:
+        """Cache a result computed inline so the next identical search is warm"""
+        if result is not None:
+            self.cache.put(self.key_func(suggestion), copy.deepcopy(result))
+
+    def clear(self) -> None:
+        """Forget cached results (e.g. after the database was reloaded)"""
+        with self._lock:
+            self._generation += 1
+            self.cache.clear()
+            # Running work finishes but is ignored; queued work is dropped so it is resubmitted
+            for key, (_, future) in list(self._in_flight.items()):
+                if future.cancel():
+                    self.stats['cancelled'] += 1
+                del self._in_flight[key]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for _, future in self._in_flight.values():
+                future.cancel()
+            self._in_flight.clear()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the materialized analytics cube.
+Builds a cube from synthetic scored organizations and checks every cuboid
+against a brute-force recomputation, plus save/load and staleness.
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+import time
+from itertools import combinations
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from analytics_cube import (DIMENSIONS, NO_CERTIFICATION, AnalyticsCube, build_cube, certification_type,
+                            save_cube)
+
+COUNTRIES = {'India': 'Asia-Pacific', 'United States': 'North America', 'Germany': 'Europe', 'UAE': 'Middle East'}
+TYPES = ['Hospital', 'Medical Laboratory', 'Academic Medical Center']
+CERTS = [{'name': 'Joint Commission International (JCI)', 'type': 'JCI Accreditation'},
+         {'name': 'NABH Full Accreditation', 'type': 'Hospital Accreditation'},
+         {'name': 'College of American Pathologists (CAP)', 'type': 'CAP 15189 Accreditation'},
+         {'name': 'ISO 9001:2015', 'type': 'Quality Management System'}]
+
+
+def _organizations(count=400, seed=7):
+    rng = random.Random(seed)
+    orgs = []
+    for i in range(count):
+        country = rng.choice(list(COUNTRIES))
+        certs = [dict(c, status=rng.choice(['Active', 'Active', 'Expired'])) for c in rng.sample(CERTS, rng.randint(0, 3))]
+        orgs.append({'name': f'Org {i}', 'country': country, 'region': COUNTRIES[country],
+                     'hospital_type': rng.choice(TYPES), 'certifications': certs,
+                     'total_score': round(rng.uniform(0, 95), 1)})
+    orgs.append({'name': 'Broken', 'country': 'India', 'total_score': 0, 'error': 'scoring failed'})
+    return orgs
+
+
+def _labels(org, dimension):
+    if dimension != 'certification':
+        return [org.get(dimension) or 'Unknown']
+    active = {certification_type(c) for c in org['certifications'] if c['status'] == 'Active'}
+    return sorted(active) or [NO_CERTIFICATION]
+
+
+def test_cube_matches_records():
+    """Every cell of every cuboid equals a direct recomputation over the records"""
+    print("🧪 Testing Cube Against Brute Force")
+    print("=" * 50)
+
+    orgs = _organizations()
+    cube = AnalyticsCube.from_records(orgs)
+    valid = [o for o in orgs if 'error' not in o]
+    assert cube.total()['count'] == len(valid)
+    assert certification_type(CERTS[0]) == 'JCI' and certification_type(CERTS[3]) == 'ISO 9001'
+
+    checked = 0
+    for size in range(len(DIMENSIONS) + 1):
+        for dims in combinations(DIMENSIONS, size):
+            groups = {}
+            for org in valid:
+                keys = [()]
+                for dim in dims:
+                    keys = [k + (label,) for k in keys for label in _labels(org, dim)]
+                for key in keys:
+                    groups.setdefault(key, []).append(org['total_score'])
+            for key, scores in groups.items():
+                cell = cube.cell(**dict(zip(dims, key)))
+                assert cell['count'] == len(scores), (dims, key)
+                assert abs(cell['mean'] - np.mean(scores)) < 1e-3
+                assert abs(cell['p50'] - np.percentile(scores, 50)) < 1e-3
+                assert cell['min'] == min(scores) and cell['max'] == max(scores)
+                assert sum(cell['bands'].values()) == len(scores)
+                checked += 1
+    print(f"Checked {checked} cells")
+
+    # Breakdowns and headline numbers come from the same cells
+    by_region = dict(cube.breakdown('region'))
+    assert sum(stats['count'] for stats in by_region.values()) == len(valid)
+    india_certs = dict(cube.breakdown('certification', country='India'))
+    assert india_certs['NABH']['count'] == cube.count(country='India', certification='NABH')
+    summary = cube.summary()
+    assert summary['countries'] == 4
+    assert summary['top_performers'] == len([o for o in valid if o['total_score'] >= 65])
+    assert summary['certified'] == len([o for o in valid if any(c['status'] == 'Active' for c in o['certifications'])])
+    assert cube.cell(country='Atlantis') is None and cube.count(country='Atlantis') == 0
+    print("✅ Cube matches records")
+
+
+def test_save_load_and_staleness():
+    """The compact file round-trips; a cube older than the scored file is not used"""
+    print("\n🧪 Testing Save, Load and Staleness")
+    print("=" * 50)
+
+    orgs = _organizations(3000)
+    with tempfile.TemporaryDirectory() as tmp:
+        scored = os.path.join(tmp, 'scored_organizations_complete.json')
+        cube_path = os.path.join(tmp, 'analytics_cube.json')
+        with open(scored, 'w', encoding='utf-8') as f:
+            json.dump(orgs, f)
+        save_cube(build_cube(orgs), cube_path)
+        print(f"Cube file: {os.path.getsize(cube_path):,} bytes for {len(orgs):,} organizations "
+              f"(scored file {os.path.getsize(scored):,} bytes)")
+        assert os.path.getsize(cube_path) < os.path.getsize(scored)
+
+        loaded = AnalyticsCube.load(cube_path, newer_than=scored)
+        assert loaded is not None
+        assert loaded.summary() == AnalyticsCube.from_records(orgs).summary() | {'generated_at': loaded.generated_at}
+
+        # Lookups do not depend on the number of organizations
+        started = time.perf_counter()
+        for _ in range(1000):
+            loaded.summary()
+            loaded.count(certification='NABH')
+        print(f"1000 dashboard reads: {time.perf_counter() - started:.3f}s")
+
+        later = os.path.getmtime(cube_path) + 10
+        os.utime(scored, (later, later))
+        assert AnalyticsCube.load(cube_path, newer_than=scored) is None
+        assert AnalyticsCube.load(os.path.join(tmp, 'missing.json')) is None
+    print("✅ Save, load and staleness verified")
+
+
+if __name__ == "__main__":
+    test_cube_matches_records()
+    test_save_load_and_staleness()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for certification bitsets.
+Checks name matching, mandatory-standard compliance and penalties computed
+from bits, and vectorized gap queries against a brute-force scan.
+"""
+
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from certification_bitsets import (FLAG_BITS, PENALTY_TABLES, CertificationIndex, certification_bits,
+                                   certification_profile, flags_of, mandatory_bits, type_mask)
+
+NAMES = ['Joint Commission International (JCI)', 'The Joint Commission', 'NABH Full Accreditation',
+         'NABL Accreditation', 'College of American Pathologists (CAP)', 'ISO 9001:2015', 'ISO15189:2012',
+         'ISO 27001:2013', 'ISO 45001 / ISO 14001', 'Magnet Recognition', 'State Licence']
+STATUSES = ['Active', 'accredited', 'In Progress', 'pending', 'Expired', '']
+
+
+def test_certification_bits():
+    """Name matching and the mandatory standard each certification counts towards"""
+    print("🧪 Testing Certification Bits")
+    print("=" * 50)
+
+    assert flags_of(certification_bits('Joint Commission International (JCI)')) == ['JCI', 'JOINT COMMISSION']
+    assert flags_of(certification_bits('The Joint Commission')) == ['JOINT COMMISSION', 'US JOINT COMMISSION']
+    assert flags_of(certification_bits('iso15189 medical labs')) == ['ISO 15189', 'ISO']
+    assert certification_bits(None) == 0 and certification_bits('State Licence') == 0
+
+    # Several ISO standards in one name count for the first one only; U.S. Joint Commission counts as JCI
+    assert flags_of(mandatory_bits(certification_bits('ISO 15189 and ISO 9001'))) == ['ISO 9001']
+    assert flags_of(mandatory_bits(certification_bits('The Joint Commission'))) == ['JCI']
+    assert mandatory_bits(certification_bits('NABH Full Accreditation')) == 0
+
+    assert PENALTY_TABLES[(False, False)]['ISO 15189'] == 5
+    assert PENALTY_TABLES[(True, False)]['ISO 15189'] == 2 and PENALTY_TABLES[(True, False)]['ISO 27001'] == 3
+    assert PENALTY_TABLES[(False, True)]['ISO 15189'] == 0 and PENALTY_TABLES[(False, True)]['ISO 14001'] == 1
+    try:
+        type_mask('JCI', 'UNKNOWN')
+        assert False, "unknown certification types must be rejected"
+    except ValueError:
+        pass
+    print("✅ Certification bits verified")
+
+
+def test_mandatory_compliance():
+    """The analyzer's compliance summary from bits, including last-certification-wins status"""
+    print("\n🧪 Testing Mandatory Compliance")
+    print("=" * 50)
+
+    from streamlit_app import HealthcareOrgAnalyzer
+    analyzer = HealthcareOrgAnalyzer.__new__(HealthcareOrgAnalyzer)
+
+    empty = analyzer._validate_mandatory_certifications([])
+    assert empty['total_penalty'] == 8 + 10 + 4 + 5 + 6 + 5 + 4 + 3
+    assert empty['non_compliant_count'] == 9 and empty['compliance_percentage'] == 0
+
+    summary = analyzer._validate_mandatory_certifications([
+        {'name': 'College of American Pathologists (CAP)', 'status': 'Active'},
+        {'name': 'ISO 9001:2015', 'status': 'Active'},
+        {'name': 'ISO 9001:2015', 'status': 'Expired'},
+        {'name': 'The Joint Commission', 'status': 'Valid'},
+    ])
+    assert summary['cap_compliant'] and summary['compliant_count'] == 2
+    assert summary['details']['JCI'] == {'found': True, 'status': 'Valid', 'name': 'The Joint Commission',
+                                         'mandatory': True, 'penalty': 10, 'category': 'Hospital Accreditation',
+                                         'importance': 'Critical'}
+    assert summary['details']['ISO 9001']['status'] == 'Expired'
+    # CAP present: ISO 15189 not penalized, other ISO penalties halved
+    assert [m['standard'] for m in summary['missing_critical_standards']] == ['ISO 9001', 'ISO 27001', 'ISO 45001',
+                                                                            'ISO 13485', 'ISO 14001']
+    assert summary['total_penalty'] == 2 + 3 + 2 + 2 + 1
+
+    certs = [{'name': 'NABL Accreditation', 'status': 'Active', 'certificate_number': 'MC-1'},
+             {'name': 'ISO 27001', 'status': 'Active'}, {'name': 'Magnet Recognition', 'status': 'Expired'}]
+    enhanced = analyzer._apply_nabl_iso_equivalency(list(certs))
+    assert enhanced[-1]['certificate_number'] == 'IMPLIED-MC-1'
+    assert analyzer._apply_nabl_iso_equivalency(enhanced) == enhanced
+    assert analyzer._count_international_certifications(enhanced) == 2
+    print("✅ Mandatory compliance verified")
+
+
+def _organizations(count, seed=9):
+    rng = random.Random(seed)
+    return [{'name': f'Org {i}', 'country': rng.choice(['India', 'india ', 'USA', 'Germany', None]),
+             'certifications': [{'name': rng.choice(NAMES), 'status': rng.choice(STATUSES)}
+                                for _ in range(rng.randint(0, 4))]}
+            for i in range(count)] + ['corrupted']
+
+
+def test_index_queries():
+    """Vectorized has/lacks/country queries equal a scan of the records"""
+    print("\n🧪 Testing Certification Index")
+    print("=" * 50)
+
+    orgs = _organizations(20000)
+    started = time.perf_counter()
+    index = CertificationIndex(orgs)
+    build_seconds = time.perf_counter() - started
+    assert len(index) == 20000
+
+    def holds(org, flag, include_in_progress=False):
+        active, in_progress = certification_profile(org['certifications'])
+        held = active | in_progress if include_in_progress else active
+        return bool(held & FLAG_BITS[flag])
+
+    started = time.perf_counter()
+    found = index.query(has=['NABH'], lacks=['ISO 27001'], country='India')
+    query_seconds = time.perf_counter() - started
+    expected = [o for o in orgs[:-1] if (o['country'] or '').strip().lower() == 'india'
+                and holds(o, 'NABH') and not holds(o, 'ISO 27001')]
+    assert found == expected and found
+    print(f"Index built in {build_seconds:.3f}s; gap query in {query_seconds * 1000:.2f}ms ({len(found)} matches)")
+
+    assert index.count(has=['JCI', 'CAP'], include_in_progress=True) == sum(
+        1 for o in orgs[:-1] if holds(o, 'JCI', True) and holds(o, 'CAP', True))
+    assert index.count(has=['MAGNET']) < index.count(has=['MAGNET'], include_in_progress=True)
+    assert index.count() == len(index) and index.query(limit=3) == orgs[:3]
+    print("✅ Index queries verified")
+
+
+if __name__ == "__main__":
+    test_certification_bits()
+    test_mandatory_compliance()
+    test_index_queries()
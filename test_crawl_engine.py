@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared crawl engine.
+Runs plugins against a local HTTP stand-in to check pagination callbacks,
+retries on 503, the per-domain concurrency cap, error fallbacks, the
+response cache and resuming from a checkpoint.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crawl_engine import CrawlEngine, CrawlPlugin, CrawlRequest, CrawlResponse, Frontier, crawl
+from jci_data_extractor import JCIDataExtractor
+from optimized_nabh_scraper import OptimizedNABHScraper
+
+
+class _StandIn:
+    """Paginated listing, a flaky page, a missing page and slow pages served over HTTP"""
+
+    def __init__(self):
+        self.requests = []
+        self.flaky_failures = 1
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urllib.parse.urlparse(self.path)
+                query = {k: v[0] for k, v in urllib.parse.parse_qs(parsed.query).items()}
+                status, body, headers = stand_in.handle(parsed.path, query)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def count(self, path):
+        return sum(1 for p in self.requests if p == path)
+
+    def handle(self, path, query):
+        with self.lock:
+            self.requests.append(path if path != "/list" else f"/list?page={query['page']}")
+        if path == "/list":
+            page = int(query["page"])
+            items = [{"name": f"Hospital {page}-{i}"} for i in range(2)]
+            return 200, json.dumps({"items": items, "has_more": page < 3}), {}
+        if path == "/flaky":
+            with self.lock:
+                failing = self.flaky_failures > 0
+                self.flaky_failures -= 1
+            if failing:
+                return 503, "busy", {"Retry-After": "0"}
+            return 200, json.dumps({"items": [{"name": "Flaky Hospital"}], "has_more": False}), {}
+        if path == "/slow":
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(0.1)
+            with self.lock:
+                self.in_flight -= 1
+            return 200, json.dumps({"items": [{"name": f"Slow {query['i']}"}], "has_more": False}), {}
+        if path == "/jci/listing":
+            rows = "".join(f"<tr><td>JCI Hospital {i}</td><td>Singapore</td></tr>" for i in range(3))
+            return 200, f"<table><tr><th>Name</th><th>City</th></tr>{rows}</table>", {}
+        if path == "/jci/empty":
+            return 200, "<p>Nothing here</p>", {}
+        return 404, "not found", {}
+
+
+class _ListingPlugin(CrawlPlugin):
+    crawl_name = "test_listing"
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.failed = []
+
+    def page(self, number):
+        return CrawlRequest(f"{self.base_url}/list", params={"page": number}, callback="parse_list")
+
+    def seeds(self):
+        yield self.page(1)
+
+    def parse_list(self, response):
+        result = response.json()
+        yield from result["items"]
+        if result["has_more"]:
+            yield self.page(response.request.params["page"] + 1)
+
+    def on_crawl_error(self, request, error):
+        self.failed.append(request.url)
+        if request.url.endswith("/missing"):
+            return [CrawlRequest(f"{self.base_url}/flaky", callback="parse_list")]
+        return []
+
+
+def _names(items):
+    return sorted(item["name"] for item in items)
+
+
+def test_pagination_retries_and_fallback():
+    """Callbacks follow pages, 503s are retried and failed requests fall back"""
+    print("🧪 Testing Pagination, Retries and Fallback")
+    print("=" * 50)
+
+    stand_in = _StandIn()
+    plugin = _ListingPlugin(stand_in.url)
+    engine = CrawlEngine(plugin, rate_per_sec=0, backoff_base=0.01)
+    seeds = list(plugin.seeds()) + [CrawlRequest(f"{stand_in.url}/missing", callback="parse_list")]
+    items = engine.run(seeds)
+
+    print(f"Stats: {engine.stats}")
+    assert _names(items) == ["Flaky Hospital"] + [f"Hospital {p}-{i}" for p in (1, 2, 3) for i in range(2)]
+    assert plugin.failed == [f"{stand_in.url}/missing"], "404 is not retried and goes to on_crawl_error"
+    assert stand_in.count("/missing") == 1
+    assert stand_in.count("/flaky") == 2 and engine.stats["retries"] == 1
+    assert engine.stats["failed"] == 1 and engine.stats["items"] == 7
+
+    # The same request is never fetched twice within a crawl
+    engine = CrawlEngine(plugin, rate_per_sec=0)
+    engine.run([plugin.page(1), plugin.page(1)])
+    assert stand_in.count("/list?page=1") == 2
+    print("✅ Pagination, retries and fallback verified")
+
+
+def test_domain_concurrency_and_rate():
+    """One domain never sees more than per_domain_concurrency requests, paced by its token bucket"""
+    print("\n🧪 Testing Per-Domain Concurrency and Rate")
+    print("=" * 50)
+
+    stand_in = _StandIn()
+    plugin = _ListingPlugin(stand_in.url)
+    seeds = [CrawlRequest(f"{stand_in.url}/slow", params={"i": i}, callback="parse_list") for i in range(8)]
+    engine = CrawlEngine(plugin, concurrency=8, per_domain_concurrency=2, rate_per_sec=0)
+    started = time.perf_counter()
+    assert len(engine.run(seeds)) == 8
+    elapsed = time.perf_counter() - started
+    print(f"Max in flight: {stand_in.max_in_flight}, elapsed {elapsed:.2f}s")
+    assert stand_in.max_in_flight == 2
+    assert elapsed >= 0.35, "8 requests of 0.1s at 2 at a time take at least 0.4s"
+
+    seeds = [CrawlRequest(f"{stand_in.url}/list", params={"page": 3, "n": i}, callback="parse_list")
+             for i in range(4)]
+    engine = CrawlEngine(plugin, rate_per_sec=10, burst=1)
+    started = time.perf_counter()
+    engine.run(seeds)
+    assert time.perf_counter() - started >= 0.25, "4 requests at 10/s with burst 1 take at least 0.3s"
+    print("✅ Per-domain concurrency and rate verified")
+
+
+def test_cache_and_resume():
+    """A re-run is served from the cache; an interrupted crawl resumes from its checkpoint"""
+    print("\n🧪 Testing Response Cache and Checkpoint Resume")
+    print("=" * 50)
+
+    stand_in = _StandIn()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, "cache")
+        state_dir = os.path.join(tmp, "state")
+        plugin = _ListingPlugin(stand_in.url)
+        first = crawl(plugin, cache_dir=cache_dir, state_dir=state_dir, rate_per_sec=0)
+        assert len(stand_in.requests) == 3
+
+        second = crawl(plugin, cache_dir=cache_dir, state_dir=state_dir, rate_per_sec=0)
+        print(f"Cached run stats: {plugin.crawl_stats}")
+        assert _names(second) == _names(first)
+        assert len(stand_in.requests) == 3 and plugin.crawl_stats["cache_hits"] == 3
+
+        # A crawl stopped after page 1: its item and the pending page 2 are checkpointed
+        frontier = Frontier(os.path.join(state_dir, f"{plugin.crawl_name}.json"))
+        frontier.add(plugin.page(1))
+        frontier.finish(plugin.page(1))
+        frontier.add(plugin.page(2))
+        frontier.items = [{"name": "Hospital 1-0"}, {"name": "Hospital 1-1"}]
+        frontier.save()
+
+        resumed = crawl(plugin, cache_dir=None, state_dir=state_dir, rate_per_sec=0)
+        print(f"Requests after resume: {stand_in.requests[3:]}")
+        assert stand_in.requests[3:] == ["/list?page=2", "/list?page=3"]
+        assert _names(resumed) == _names(first)
+
+        # A completed checkpoint is not resumed
+        crawl(plugin, cache_dir=None, state_dir=state_dir, rate_per_sec=0)
+        assert stand_in.count("/list?page=1") == 2
+    print("✅ Cache and resume verified")
+
+
+def test_scraper_plugins():
+    """Scrapers run as plugins: JCI falls through its URLs, NABH search pages paginate"""
+    print("\n🧪 Testing Scraper Plugins")
+    print("=" * 50)
+
+    stand_in = _StandIn()
+    extractor = JCIDataExtractor()
+    extractor.jci_urls = [f"{stand_in.url}/jci/gone", f"{stand_in.url}/jci/empty",
+                          f"{stand_in.url}/jci/listing", f"{stand_in.url}/jci/never"]
+    organizations = CrawlEngine(extractor, rate_per_sec=0).run()
+    assert [org["name"] for org in organizations] == [f"JCI Hospital {i}" for i in range(3)]
+    assert stand_in.count("/jci/never") == 0, "URLs after the first successful one are not fetched"
+
+    scraper = OptimizedNABHScraper()
+    request = scraper._search_request(state="Kerala", max_pages=5, min_results=2)
+    payload = {"organizations": [{"name": "A"}, {"name": "B"}], "has_more": True}
+    results = list(scraper.parse_search_page(CrawlResponse(request, request.url, 200, json.dumps(payload))))
+    assert results[:2] == payload["organizations"]
+    assert isinstance(results[2], CrawlRequest) and results[2].params["page"] == 2
+    assert results[2].params["state"] == "Kerala"
+
+    last = scraper._search_request(state="Kerala", page=5, max_pages=5, min_results=2)
+    assert len(list(scraper.parse_search_page(CrawlResponse(last, last.url, 200, json.dumps(payload))))) == 2
+    print("✅ Scraper plugins verified")
+
+
+if __name__ == "__main__":
+    test_pagination_retries_and_fallback()
+    test_domain_concurrency_and_rate()
+    test_cache_and_resume()
+    test_scraper_plugins()
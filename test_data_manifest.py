@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script for the data manifest and incremental rebuild.
+Uses a small unified DB -> scores -> ranks -> report pipeline of callables in
+a temporary directory and checks that only stale stages rerun.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_manifest import DataManifest, ManifestVersion, Stage, StageError
+
+
+def _read(root, name):
+    with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write(root, name, data):
+    with open(os.path.join(root, name), 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def _pipeline(runs):
+    """unified.json -> scores.json -> ranks.json -> report.json (+ unrelated nabh stage)"""
+
+    def scores(root):
+        runs.append('scores')
+        orgs = _read(root, 'unified.json')
+        _write(root, 'scores.json', [{'name': o['name'], 'score': len(o.get('certifications', []))} for o in orgs])
+
+    def ranks(root):
+        runs.append('ranks')
+        ranked = sorted(_read(root, 'scores.json'), key=lambda o: -o['score'])
+        _write(root, 'ranks.json', [o['name'] for o in ranked])
+
+    def report(root):
+        runs.append('report')
+        _write(root, 'report.json', {'top': _read(root, 'ranks.json')[:1]})
+
+    def nabh(root):
+        runs.append('nabh')
+        _write(root, 'nabh_processed.json', _read(root, 'nabh.json'))
+
+    return [
+        Stage('report', ['ranks.json'], ['report.json'], report),
+        Stage('ranks', ['scores.json'], ['ranks.json'], ranks),
+        Stage('scores', ['unified.json', 'external/*.json'], ['scores.json'], scores),
+        Stage('nabh', ['nabh.json'], ['nabh_processed.json'], nabh),
+    ]
+
+
+def test_incremental_rebuild():
+    """Only stages downstream of a changed input rerun"""
+    print("🧪 Testing Incremental Rebuild")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as root:
+        _write(root, 'unified.json', [{'name': 'Apollo', 'certifications': ['JCI', 'NABH']},
+                                      {'name': 'Fortis', 'certifications': ['NABH']}])
+        _write(root, 'nabh.json', [{'name': 'Apollo'}])
+        runs = []
+        manifest = DataManifest(root, stages=_pipeline(runs))
+
+        assert manifest.dependency_graph() == {'report': ['ranks'], 'ranks': ['scores'], 'scores': [], 'nabh': []}
+        order = manifest.build_order()
+        assert order.index('scores') < order.index('ranks') < order.index('report')
+
+        manifest.rebuild()
+        assert sorted(runs) == ['nabh', 'ranks', 'report', 'scores']
+        version_1 = manifest.data['version']
+
+        # Nothing changed: nothing runs (also from a fresh load of the manifest)
+        runs.clear()
+        results = DataManifest(root, stages=_pipeline(runs)).rebuild()
+        assert runs == [] and all(r.status == 'fresh' for r in results)
+
+        # A new external dataset changes scores -> ranks -> report, not nabh
+        os.makedirs(os.path.join(root, 'external'))
+        _write(root, 'external/new.json', [{'name': 'Max'}])
+        manifest = DataManifest(root, stages=_pipeline(runs))
+        assert manifest.stale_reasons('scores') == ['inputs changed']
+        manifest.rebuild()
+        print(f"Rebuilt after external change: {runs}")
+        assert runs == ['scores']  # scores.json came out identical, so ranks/report stay fresh
+
+        # A scoring-relevant change cascades
+        runs.clear()
+        _write(root, 'unified.json', [{'name': 'Apollo', 'certifications': ['JCI']},
+                                      {'name': 'Fortis', 'certifications': ['NABH', 'ISO', 'JCI']}])
+        manifest.rebuild()
+        assert runs == ['scores', 'ranks', 'report']
+        assert manifest.data['version'] != version_1
+        print("✅ Incremental rebuild verified")
+
+
+def test_outputs_and_targets():
+    """Missing or hand-edited outputs are rebuilt; targets limit the build to their upstream"""
+    print("\n🧪 Testing Outputs and Targets")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as root:
+        _write(root, 'unified.json', [{'name': 'Apollo', 'certifications': ['JCI']}])
+        _write(root, 'nabh.json', [])
+        runs = []
+        manifest = DataManifest(root, stages=_pipeline(runs))
+        manifest.rebuild(['ranks'])
+        assert runs == ['scores', 'ranks']
+
+        runs.clear()
+        os.remove(os.path.join(root, 'ranks.json'))
+        _write(root, 'scores.json', [{'name': 'Apollo', 'score': 99}])
+        dry = {r.stage: r for r in manifest.rebuild(dry_run=True)}
+        print(f"Dry run: {[(r.stage, r.status, r.reasons) for r in dry.values()]}")
+        assert runs == []
+        assert dry['scores'].status == 'stale' and 'modified outside the pipeline' in dry['scores'].reasons[0]
+        assert dry['ranks'].status == 'stale' and dry['report'].status == 'stale'
+
+        manifest.rebuild()
+        assert sorted(runs) == ['nabh', 'ranks', 'report', 'scores']
+        assert _read(root, 'scores.json') == [{'name': 'Apollo', 'score': 1}]
+
+        runs.clear()
+        manifest.rebuild(['scores'], force=True)
+        assert runs == ['scores']
+        print("✅ Outputs and targets verified")
+
+
+def test_failures_cycles_and_version_reader():
+    """Failed stages raise, cycles are rejected, and the app-side reader sees new versions"""
+    print("\n🧪 Testing Failures, Cycles and Version Reader")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as root:
+        _write(root, 'a.json', [1])
+        reader = ManifestVersion(os.path.join(root, 'data_manifest.json'), min_check_interval=0)
+        assert reader.current() is None
+
+        manifest = DataManifest(root, stages=[Stage('noop', ['a.json'], ['b.json'], lambda r: None)])
+        try:
+            manifest.rebuild()
+            assert False, "a stage that produces nothing must fail"
+        except StageError:
+            pass
+
+        cyclic = DataManifest(root, stages=[Stage('x', ['y.json'], ['x.json'], lambda r: None),
+                                            Stage('y', ['x.json'], ['y.json'], lambda r: None)])
+        try:
+            cyclic.build_order()
+            assert False, "cycles must be rejected"
+        except StageError:
+            pass
+
+        copy_stage = Stage('copy', ['a.json'], ['b.json'], lambda r: _write(r, 'b.json', _read(r, 'a.json')))
+        manifest = DataManifest(root, stages=[copy_stage])
+        manifest.rebuild()
+        first = reader.current()
+        assert first == manifest.data['version']
+        _write(root, 'a.json', [1, 2])
+        manifest.rebuild()
+        assert reader.current() != first
+    print("✅ Failures, cycles and version reader verified")
+
+
+if __name__ == "__main__":
+    test_incremental_rebuild()
+    test_outputs_and_targets()
+    test_failures_cycles_and_version_reader()
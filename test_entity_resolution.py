@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared entity-resolution index.
+Checks the match rules used by the integrators, that only blocked candidates
+are scored, and that decisions explain themselves.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from entity_resolution import EntityResolver, MatchPolicy, normalize_name
+from nabl_database_integrator import NABLDatabaseIntegrator
+
+
+def _organizations():
+    return [
+        {'name': 'Apollo Hospitals Enterprise Ltd.', 'city': 'Chennai', 'state': 'Tamil Nadu'},
+        {'name': 'Fortis Memorial Research Institute', 'city': 'Gurgaon', 'state': 'Haryana'},
+        {'name': 'Max Super Speciality Hospital', 'city': 'Delhi', 'state': 'Delhi'},
+        {'name': 'Apollo Hospitals', 'city': 'Delhi', 'state': 'Delhi'},
+    ]
+
+
+def test_match_rules():
+    """Exact, containment, location-aware containment and Jaccard rules"""
+    print("🧪 Testing Entity Resolution Rules")
+    print("=" * 50)
+
+    assert normalize_name('Apollo Hospitals Enterprise Ltd.') == 'apollo hospitals enterprise'
+
+    resolver = EntityResolver(_organizations())
+    exact = resolver.resolve('Max Super-Speciality Hospital')
+    print(f"Exact: {exact.explain()}")
+    assert exact.matched and exact.rule == 'exact' and exact.index == 2
+
+    first = resolver.resolve('Apollo Hospitals')
+    best = resolver.resolve('Apollo Hospitals', strategy='best')
+    assert first.index == 0 and first.rule == 'containment'
+    assert best.index == 3 and best.rule == 'exact'
+
+    located = EntityResolver(_organizations(), policy=MatchPolicy(containment_requires_location=True))
+    assert located.resolve('Fortis Memorial', city='Gurgaon', state='Haryana').index == 1
+    assert not located.resolve('Fortis Memorial', city='Delhi', state='Delhi').matched
+
+    fuzzy = EntityResolver(_organizations(), policy=MatchPolicy(allow_containment=False, jaccard_threshold=0.6))
+    decision = fuzzy.resolve('Fortis Memorial Research Centre')
+    print(f"Jaccard: {decision.explain()}")
+    assert decision.rule == 'jaccard' and decision.index == 1
+
+    miss = resolver.resolve('Medanta The Medicity')
+    assert not miss.matched and miss.candidates_considered == 0
+    print("✅ Match rules verified")
+
+
+def test_blocking_and_incremental_add():
+    """Only records sharing a token are candidates; added records become matchable"""
+    print("\n🧪 Testing Blocking Index")
+    print("=" * 50)
+
+    resolver = EntityResolver(_organizations(), record_filter=lambda org: org.get('state') != 'Delhi')
+    assert resolver.candidates('apollo hospitals') == [0]
+    assert not resolver.resolve('Max Super Speciality Hospital').matched
+
+    index = resolver.add({'name': 'Medanta The Medicity', 'state': 'Haryana'})
+    decision = resolver.resolve('medanta the medicity')
+    assert decision.matched and decision.index == index == 4
+    assert decision.to_dict()['explanation'].startswith("matched 'Medanta The Medicity' by exact")
+    print("✅ Blocking and incremental indexing verified")
+
+
+def test_common_tokens_do_not_block_alone():
+    """Generic words block only with a location; rare tokens and contained names still find candidates"""
+    print("\n🧪 Testing Common-Token Cutoff")
+    print("=" * 50)
+
+    cities = ['Delhi', 'Mumbai', 'Pune', 'Chennai']
+    organizations = [{'name': f'Zone{i} Medical Hospital', 'city': cities[i % 4], 'country': 'India'}
+                     for i in range(200)]
+    organizations += [{'name': 'Medical Hospital', 'city': 'Pune', 'country': 'India'},
+                      {'name': 'Sunrise Clinic', 'city': 'Delhi', 'country': 'India'}]
+    resolver = EntityResolver(organizations, common_token_min_count=10)
+    assert resolver.common_token_cutoff() == 10
+
+    # 'medical' and 'hospital' are in 201 names: only the rare token and the contained name block
+    assert resolver.candidates('sunrise medical hospital') == [200, 201]
+    decision = resolver.resolve('Sunrise Medical Hospital')
+    print(f"Rare-token query: {decision.explain()}")
+    assert decision.index == 200 and decision.rule == 'containment'
+    assert resolver.candidates('zone7 medical hospital') == [7, 200]
+
+    # With a city, generic words block within that city only
+    in_pune = resolver.candidates('medical hospital', city='Pune')
+    assert len(in_pune) == 51 and all(organizations[i]['city'] == 'Pune' for i in in_pune)
+    assert len(resolver.candidates('general hospital', country='India')) == 201
+    # Without a location, a name made only of generic words needs all of them
+    assert len(resolver.candidates('medical hospital')) == 201
+    print("✅ Common tokens no longer pull in most of the index")
+
+
+def test_nabl_integrator_uses_index():
+    """NABL matching keeps its legacy rules and records which rule matched"""
+    print("\n🧪 Testing NABL Integrator Matching")
+    print("=" * 50)
+
+    integrator = NABLDatabaseIntegrator()
+    existing = [{'name': 'SRL Diagnostics Private Limited'}, {'name': 'Metropolis Healthcare Lab'}]
+    assert integrator.find_matching_organization({'organization_name': 'SRL Diagnostics Pvt Ltd'}, existing) is existing[0]
+    # 'metropolis' alone overlaps only a third of the words
+    assert integrator.find_matching_organization({'organization_name': 'Metropolis'}, existing) is None
+    print(f"Match rules: {integrator.stats['match_rules']}")
+    assert integrator.stats['match_rules'] == {'exact': 1, 'none': 1}
+    print("✅ NABL integrator matching verified")
+
+
+if __name__ == "__main__":
+    test_match_rules()
+    test_blocking_and_incremental_add()
+    test_common_tokens_do_not_block_alone()
+    test_nabl_integrator_uses_index()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized Excel/CSV ingestion pipeline.
+Verifies that the chunked column-wise path produces the same organizations
+as the original per-row path, and that database integration joins on
+normalized names.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from excel_data_processor import ExcelDataProcessor
+
+
+def _write_sample_csv(path):
+    pd.DataFrame({
+        'name': ['Apollo Hospital Delhi', '  Fortis Memorial ', None, 'nan', 'Max Hospital', 'Apollo Hospital Delhi'],
+        'country': ['India', 'India', 'India', 'India', None, 'India'],
+        'city': ['Delhi', 'Gurgaon', 'Delhi', 'Delhi', 'Delhi', 'Delhi'],
+        'state': ['Delhi', 'Haryana', 'Delhi', 'Delhi', 'Delhi', 'Delhi'],
+        'hospital_type': ['multi-specialty', 'Teaching', 'general', None, 'Hospice', 'general'],
+        'certifications': ['JCI, NABH; ISO 9001', 'nabl|CAP', None, 'JCI', ' , ', 'Magnet'],
+        'website': ['https://www.apollohospitals.com', None, None, None, 'https://www.maxhealthcare.in', None],
+        'bed_count': [500, None, 200, 100, 'unknown', 350.0],
+        'specialties': ['Cardiology, Oncology', None, 'Neurology', None, 'Cardiology,,', None],
+    }).to_csv(path, index=False)
+
+
+def _strip_timestamps(orgs):
+    for org in orgs:
+        org.pop('last_updated', None)
+    return orgs
+
+
+def test_vectorized_matches_row_path():
+    """The vectorized path reproduces the per-row output"""
+    print("🧪 Testing Vectorized Ingestion Equivalence")
+    print("=" * 50)
+
+    processor = ExcelDataProcessor()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'upload.csv')
+        _write_sample_csv(csv_path)
+        validation = processor.validate_excel_file(csv_path)
+        assert validation['is_valid'], validation['errors']
+
+        row_result = processor.process_excel_data(csv_path, validation, vectorized=False)
+        vec_result = processor.process_excel_data_vectorized(csv_path, validation, chunk_size=2)
+
+        row_orgs = _strip_timestamps(row_result['organizations'])
+        vec_orgs = _strip_timestamps(vec_result['organizations'])
+        print(f"Row path: {len(row_orgs)} organizations, vectorized path: {len(vec_orgs)}")
+        assert row_orgs == vec_orgs
+        assert vec_result['statistics']['total_rows_processed'] == 6
+        assert vec_result['statistics']['organizations_created'] == 4
+        print("✅ Vectorized output matches row-by-row output")
+
+
+def test_bad_record_keeps_rest_of_chunk():
+    """A record that breaks column-wise processing only costs that record, not its chunk"""
+    print("\n🧪 Testing Per-Record Error Isolation")
+    print("=" * 50)
+
+    processor = ExcelDataProcessor()
+    standardize = processor._standardize_hospital_type
+
+    def fragile_standardize(hospital_type):
+        if hospital_type.strip().lower() == 'teaching':
+            raise ValueError("unsupported hospital type")
+        return standardize(hospital_type)
+
+    processor._standardize_hospital_type = fragile_standardize
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'upload.csv')
+        _write_sample_csv(csv_path)
+        validation = processor.validate_excel_file(csv_path)
+        result = processor.process_excel_data_vectorized(csv_path, validation, chunk_size=4)
+
+    names = [org['name'] for org in result['organizations']]
+    print(f"Kept: {names}; warnings: {result['warnings']}")
+    assert result['success'] and names == ['Apollo Hospital Delhi', 'Max Hospital', 'Apollo Hospital Delhi']
+    assert result['warnings'] == ["Error processing row 2: unsupported hospital type"]
+    print("✅ Bad record skipped and logged, rest of the chunk kept")
+
+
+def test_integration_normalized_join():
+    """Integration merges uploads into existing organizations by normalized name"""
+    print("\n🧪 Testing Normalized-Name Database Join")
+    print("=" * 50)
+
+    processor = ExcelDataProcessor()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'db.json')
+        with open(db_path, 'w', encoding='utf-8') as f:
+            json.dump({'organizations': [
+                {'name': 'Apollo Hospital, Delhi', 'certifications': [{'name': 'ISO 9001'}]}
+            ]}, f)
+
+        uploads = [
+            {'name': 'Apollo Hospital Delhi', 'certifications': [{'name': 'ISO 9001'}, {'name': 'NABH'}]},
+            {'name': 'New Clinic', 'certifications': []},
+        ]
+        result = processor.integrate_with_database(uploads, db_path)
+        stats = result['statistics']
+        print(f"Integration statistics: {stats}")
+        assert result['success']
+        assert stats['existing_organizations_updated'] == 1
+        assert stats['new_organizations_added'] == 1
+
+        with open(db_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        apollo = saved['organizations'][0]
+        assert [c['name'] for c in apollo['certifications']] == ['ISO 9001', 'NABH']
+        print("✅ Uploads joined on normalized names without duplicate certifications")
+
+
+if __name__ == "__main__":
+    test_vectorized_matches_row_path()
+    test_bad_record_keeps_rest_of_chunk()
+    test_integration_normalized_join()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental external dataset sync.
+Runs the Wikidata and OSM syncs against a local HTTP stand-in to check
+pagination, backoff on rate limits, change-only snapshots and resuming an
+interrupted run.
+"""
+
+import sys
+import os
+import json
+import re
+import tempfile
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from external_dataset_sync import HttpClient, OSMHospitalSync, SyncHTTPError, WikidataHospitalSync
+
+
+class _StandIn:
+    """In-memory Wikidata/Overpass stand-in served over HTTP"""
+
+    def __init__(self):
+        self.items = {f"Q{i:04d}": f"Hospital {i}" for i in range(1, 24)}
+        self.osm = {
+            "India": [{"type": "node", "id": 1, "lat": 28.6, "lon": 77.2, "tags": {"name": "AIIMS"}},
+                      {"type": "way", "id": 2, "center": {"lat": 19.0, "lon": 72.8}, "tags": {"name": "KEM"}}],
+            "Kenya": [{"type": "node", "id": 3, "lat": -1.3, "lon": 36.8, "tags": {"name": "Kenyatta"}},
+                      {"type": "node", "id": 4, "lat": -1.2, "lon": 36.9, "tags": {}}],
+        }
+        self.requests = []
+        self.rate_limited = set()
+        self.fail_offsets = set()
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+                form = urllib.parse.parse_qs(body)
+                status, payload = stand_in.handle(self.path, form)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def handle(self, path, form):
+        if path == "/sparql":
+            query = form["query"][0]
+            limit = int(re.search(r"LIMIT (\d+)", query).group(1))
+            offset = int(re.search(r"OFFSET (\d+)", query).group(1))
+            with self.lock:
+                self.requests.append(("sparql", offset))
+            if offset in self.fail_offsets:
+                return 500, {}
+            page = sorted(self.items.items())[offset:offset + limit]
+            bindings = [{"item": {"value": f"http://www.wikidata.org/entity/{qid}"},
+                         "itemLabel": {"value": label},
+                         "countryLabel": {"value": "India"},
+                         "coord": {"value": "Point(77.2 28.6)"}} for qid, label in page]
+            return 200, {"results": {"bindings": bindings}}
+        if path == "/interpreter":
+            country = re.search(r'area\["name"="([^"]+)"\]', form["data"][0]).group(1)
+            with self.lock:
+                self.requests.append(("overpass", country))
+                if country not in self.rate_limited:
+                    # Every country is rate limited once to exercise the backoff
+                    self.rate_limited.add(country)
+                    return 429, {}
+            return 200, {"elements": self.osm.get(country, [])}
+        return 404, {}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _client():
+    return HttpClient(timeout=10, max_retries=2, backoff_base=0.01)
+
+
+def _wikidata(stand_in, tmp, **kwargs):
+    return WikidataHospitalSync(page_size=5, endpoint=stand_in.url + "/sparql", client=_client(),
+                                output_dir=os.path.join(tmp, "out"), state_dir=os.path.join(tmp, "state"), **kwargs)
+
+
+def _changes(sync):
+    with open(sync.changes_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_wikidata_pagination_and_incremental_diff():
+    """Pages are fetched concurrently; a re-sync only writes the changed records"""
+    print("🧪 Testing Wikidata Incremental Sync")
+    print("=" * 50)
+
+    stand_in = _StandIn()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = _wikidata(stand_in, tmp).run(workers=3)
+            print(f"First sync: {stats}")
+            assert stats["added"] == 23 and stats["record_count"] == 23 and stats["written"]
+            snapshot_path = os.path.join(tmp, "out", "wikidata_hospitals.json")
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            assert snapshot["metadata"]["license"] == "CC0 (Wikidata)"
+            assert snapshot["organizations"][0]["source_id"] == "wikidata:Q0001"
+
+            # Nothing changed upstream: the snapshot is left alone
+            mtime = os.path.getmtime(snapshot_path)
+            stats = _wikidata(stand_in, tmp).run(workers=3)
+            assert stats["added"] == stats["changed"] == stats["removed"] == 0
+            assert not stats["written"] and os.path.getmtime(snapshot_path) == mtime
+
+            stand_in.items["Q0002"] = "Hospital 2 (renamed)"
+            del stand_in.items["Q0003"]
+            stand_in.items["Q0100"] = "New Hospital"
+            sync = _wikidata(stand_in, tmp)
+            stats = sync.run(workers=3)
+            print(f"Second sync: {stats}")
+            assert (stats["added"], stats["changed"], stats["removed"]) == (1, 1, 1)
+            ops = {(c["op"], c["key"]) for c in _changes(sync) if c["run_id"] == stats["run_id"]}
+            assert ops == {("added", "wikidata:Q0100"), ("changed", "wikidata:Q0002"), ("removed", "wikidata:Q0003")}
+
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                names = [r["name"] for r in json.load(f)["organizations"]]
+            assert names[1] == "Hospital 2 (renamed)" and "Hospital 3" not in names and names[-1] == "New Hospital"
+
+            # A capped run never treats the unseen tail as removed
+            stats = _wikidata(stand_in, tmp, max_records=10).run(workers=3)
+            assert stats["removed"] == 0 and stats["record_count"] == 23
+        print("✅ Pagination and incremental diff verified")
+    finally:
+        stand_in.close()
+
+
+def test_resume_after_interrupted_run():
+    """A failed run resumes with only the shards it had not finished"""
+    print("\n🧪 Testing Resume After Interruption")
+    print("=" * 50)
+
+    stand_in = _StandIn()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            stand_in.fail_offsets = {10}
+            try:
+                _wikidata(stand_in, tmp).run(workers=1)
+                assert False, "the run should fail on the broken page"
+            except SyncHTTPError:
+                pass
+            assert not os.path.exists(os.path.join(tmp, "out", "wikidata_hospitals.json"))
+
+            stand_in.fail_offsets = set()
+            stand_in.requests.clear()
+            stats = _wikidata(stand_in, tmp).run(workers=1)
+            print(f"Resumed sync: {stats}, requests={stand_in.requests}")
+            assert [offset for _, offset in stand_in.requests] == [10, 15, 20]
+            assert stats["shards_resumed"] == 2 and stats["record_count"] == 23
+        print("✅ Interrupted run resumed from its checkpoint")
+    finally:
+        stand_in.close()
+
+
+def test_osm_backoff_and_partial_country_sync():
+    """Rate-limited countries are retried; syncing one country leaves the others untouched"""
+    print("\n🧪 Testing OSM Sync")
+    print("=" * 50)
+
+    stand_in = _StandIn()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            def _osm(countries):
+                return OSMHospitalSync(countries=countries, endpoint=stand_in.url + "/interpreter", client=_client(),
+                                       output_dir=os.path.join(tmp, "out"), state_dir=os.path.join(tmp, "state"))
+
+            stats = _osm(["India", "Kenya"]).run(workers=2)
+            print(f"OSM sync: {stats}")
+            assert stats["added"] == 3 and stats["requests"] == 4
+
+            stand_in.osm["Kenya"] = []
+            stats = _osm(["India"]).run(workers=2)
+            assert stats["removed"] == 0 and stats["record_count"] == 3
+
+            stats = _osm(["Kenya"]).run(workers=2)
+            assert stats["removed"] == 1 and stats["record_count"] == 2
+        print("✅ Backoff and per-country ownership verified")
+    finally:
+        stand_in.close()
+
+
+if __name__ == "__main__":
+    test_wikidata_pagination_and_incremental_diff()
+    test_resume_after_interrupted_run()
+    test_osm_backoff_and_partial_country_sync()
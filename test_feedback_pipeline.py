@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the batched patient feedback pipeline.
+Checks batch sentiment scoring, numpy aggregates against the original
+per-review calculations, concurrent rate-limited platform fetching and the
+per-organization summary cache.
+"""
+
+import sys
+import os
+import time
+import random
+import statistics
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from feedback_pipeline import (
+    FeedbackAggregateCache, RateLimiter, compute_feedback_aggregates, fetch_platforms, get_sentiment_model
+)
+from patient_feedback_module import PatientFeedbackAnalyzer
+
+
+def _legacy_trend(items):
+    """Original sorted-halves trend calculation"""
+    if len(items) < 4:
+        return 'stable'
+    ordered = sorted(items, key=lambda x: x[1])
+    mid = len(ordered) // 2
+    difference = statistics.mean(s for s, _ in ordered[mid:]) - statistics.mean(s for s, _ in ordered[:mid])
+    return 'improving' if difference > 0.1 else 'declining' if difference < -0.1 else 'stable'
+
+
+def test_batch_sentiment():
+    """Batch scores equal single-text scores; negation and intensifiers apply per review"""
+    print("🧪 Testing Batch Sentiment")
+    print("=" * 50)
+
+    model = get_sentiment_model()
+    assert model is get_sentiment_model()
+    texts = ["Excellent care and very helpful staff.", "Not good at all.", "", "Poor service.",
+             "Excellent care and very helpful staff.", "Room 12 on floor 3"]
+    batch = model.polarity_batch(texts)
+    assert [round(model.polarity(t), 6) for t in texts] == [round(s, 6) for s in batch]
+    assert batch[0] > 0.5 and batch[1] < 0 and batch[2] == 0.0 and batch[3] < 0 and batch[5] == 0.0
+    # A negation at the end of one review never flips the first word of the next
+    assert model.polarity_batch(["It was not", "good"])[1] == model.polarity("good")
+    print(f"Scores: {[round(s, 3) for s in batch]}")
+    print("✅ Batch sentiment verified")
+
+
+def test_aggregates_match_original_logic():
+    """Numpy trend/confidence/averages agree with the original statistics-based code"""
+    print("\n🧪 Testing Numpy Aggregates")
+    print("=" * 50)
+
+    rng = random.Random(7)
+    now = datetime.now()
+    for _ in range(50):
+        n = rng.randint(1, 60)
+        sentiments = [rng.uniform(-1, 1) for _ in range(n)]
+        ratings = [rng.choice([None, round(rng.uniform(1, 5), 1)]) for _ in range(n)]
+        stamps = [now - timedelta(days=rng.randint(0, 200), hours=rng.randint(0, 23)) for _ in range(n)]
+        platforms = [rng.choice(['google', 'yelp', 'facebook', 'twitter']) for _ in range(n)]
+
+        result = compute_feedback_aggregates(sentiments, ratings, stamps, platforms, now=now)
+        rated = [r for r in ratings if r is not None]
+        assert abs(result['average_rating'] - (statistics.mean(rated) if rated else 0.0)) < 1e-9
+        assert abs(result['sentiment_score'] - statistics.mean(sentiments)) < 1e-9
+        assert result['recent_trend'] == _legacy_trend(list(zip(sentiments, stamps)))
+        recency = len([t for t in stamps if (now - t).days <= 90]) / n
+        confidence = min(min(n / 50.0, 1.0) * 0.4 + recency * 0.4 + min(len(set(platforms)) / 3.0, 1.0) * 0.2, 1.0)
+        assert abs(result['confidence_score'] - confidence) < 1e-9
+    print("✅ Aggregates match the original calculations")
+
+
+def test_thousands_of_reviews_under_a_second():
+    """Scoring and aggregating thousands of fetched reviews stays well under a second"""
+    print("\n🧪 Testing Batch Throughput")
+    print("=" * 50)
+
+    rng = random.Random(1)
+    words = ['excellent', 'care', 'poor', 'staff', 'not', 'very', 'good', 'waiting', 'rude', 'clean', 'doctor']
+    texts = [' '.join(rng.choice(words) for _ in range(rng.randint(5, 30))) for _ in range(5000)]
+    now = datetime.now()
+    started = time.perf_counter()
+    sentiments = get_sentiment_model().polarity_batch(texts)
+    result = compute_feedback_aggregates(sentiments, [4.0] * 5000,
+                                         [now - timedelta(days=i % 365) for i in range(5000)], ['google'] * 5000)
+    elapsed = time.perf_counter() - started
+    print(f"5000 reviews scored in {elapsed:.3f}s ({result['recent_trend']}, confidence {result['confidence_score']:.2f})")
+    assert elapsed < 1.0
+    print("✅ Throughput verified")
+
+
+def test_concurrent_rate_limited_fetch_and_cache():
+    """Platforms run concurrently, a platform's repeat requests are spaced, summaries are cached"""
+    print("\n🧪 Testing Concurrent Fetch and Summary Cache")
+    print("=" * 50)
+
+    def _slow(platform):
+        def _scrape(org, location):
+            time.sleep(0.2)
+            if platform == 'broken':
+                raise RuntimeError('blocked')
+            return [platform]
+        return _scrape
+
+    platforms = {name: _slow(name) for name in ['google', 'yelp', 'facebook', 'broken']}
+    started = time.perf_counter()
+    results = fetch_platforms(platforms, 'Apollo Hospital', rate_limiter=RateLimiter(rate_per_sec=1.0))
+    elapsed = time.perf_counter() - started
+    assert list(results) == ['google', 'yelp', 'facebook', 'broken']
+    assert results['google'] == ['google'] and results['broken'] is None
+    assert elapsed < 0.6, f"platforms should run concurrently ({elapsed:.2f}s)"
+
+    limiter = RateLimiter(rate_per_sec=20.0)
+    assert limiter.acquire('google') == 0.0 and limiter.acquire('yelp') == 0.0
+    assert limiter.acquire('google') > 0.03
+
+    cache = FeedbackAggregateCache(ttl_seconds=60)
+    cache.put('Apollo Hospital', 'Chennai', 'summary')
+    assert cache.get('apollo  hospital', 'chennai') == 'summary'
+    cache.invalidate('Apollo-Hospital')
+    assert cache.get('Apollo Hospital', 'Chennai') is None
+
+    analyzer = PatientFeedbackAnalyzer()
+    analyzer.validation_enabled = False
+    analyzer.rate_limiter = RateLimiter(rate_per_sec=1000.0)
+    summary = analyzer.analyze_feedback_summary('Apollo Hospital', 'Chennai')
+    print(f"Summary: {summary.total_feedback_count} reviews, sentiment {summary.sentiment_score:.2f}, "
+          f"trend {summary.recent_trend}")
+    assert summary.total_feedback_count > 0 and summary.sentiment_score != 0.0
+    assert analyzer.analyze_feedback_summary('Apollo Hospital', 'Chennai') is summary
+    print("✅ Concurrent fetch, rate limiting and caching verified")
+
+
+if __name__ == "__main__":
+    test_batch_sentiment()
+    test_aggregates_match_original_logic()
+    test_thousands_of_reviews_under_a_second()
+    test_concurrent_rate_limited_fetch_and_cache()
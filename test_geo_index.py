@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the geospatial nearby-peer index.
+Compares k-nearest and radius queries against a brute-force haversine scan
+and checks that precomputed scores are attached to results.
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from geo_index import GeoIndex, haversine_km
+
+
+def _organizations(count=2000, seed=7):
+    rng = random.Random(seed)
+    orgs = [{'name': f"Hospital {i}", 'lat': rng.uniform(-60, 75), 'lon': rng.uniform(-180, 180)}
+            for i in range(count)]
+    # A dense cluster around Delhi, one near the antimeridian and records without coordinates
+    orgs += [{'name': f"Delhi Clinic {i}", 'lat': 28.6 + rng.uniform(-0.3, 0.3), 'lon': 77.2 + rng.uniform(-0.3, 0.3)}
+             for i in range(50)]
+    orgs.append({'name': 'Fiji Hospital', 'lat': -17.8, 'lon': 179.9})
+    orgs.append({'name': 'No Coordinates Hospital', 'lat': None, 'lon': None})
+    return orgs
+
+
+def _brute_force(orgs, lat, lon):
+    located = [o for o in orgs if o.get('lat') is not None]
+    distances = haversine_km(lat, lon, np.array([o['lat'] for o in located]), np.array([o['lon'] for o in located]))
+    return sorted(zip(distances, [o['name'] for o in located]))
+
+
+def test_queries_match_brute_force():
+    """k-nearest and radius results equal a full haversine scan"""
+    print("🧪 Testing Geospatial Index Queries")
+    print("=" * 50)
+
+    orgs = _organizations()
+    index = GeoIndex(orgs, cell_degrees=2.0)
+    assert len(index) == len(orgs) - 1
+
+    for lat, lon in [(28.6, 77.2), (-17.5, -179.8), (70.0, 20.0), (0.0, 0.0)]:
+        expected = _brute_force(orgs, lat, lon)
+        nearest = index.nearest(lat, lon, k=10)
+        assert [r['name'] for r in nearest] == [name for _, name in expected[:10]]
+
+        within = index.within_radius(lat, lon, 750)
+        assert sorted(r['name'] for r in within) == sorted(name for d, name in expected if d <= 750)
+        print(f"({lat}, {lon}): nearest {nearest[0]['name']} at {nearest[0]['distance_km']} km, "
+              f"{len(within)} within 750 km")
+
+    # The antimeridian query must see across the +180/-180 seam
+    assert index.nearest(-17.5, -179.8, k=1)[0]['name'] == 'Fiji Hospital'
+    print("✅ Queries match brute force")
+
+
+def test_scores_and_exclusion():
+    """Precomputed scores are attached, the scorer fills gaps once, and the query org is excluded"""
+    print("\n🧪 Testing Attached Scores")
+    print("=" * 50)
+
+    calls = []
+
+    def scorer(org):
+        calls.append(org['name'])
+        return {'total_score': 10.0}
+
+    orgs = _organizations(count=0)
+    scores = {'delhi clinic 0': {'total_score': 72.5, 'overall_rank': 3, 'percentile': 99.0}}
+    index = GeoIndex(orgs, scores=scores, scorer=scorer)
+
+    peers = index.nearest_to('Delhi Clinic 1', k=49)
+    assert 'Delhi Clinic 1' not in [p['name'] for p in peers]
+    scored = {p['name']: p['total_score'] for p in peers}
+    assert scored['Delhi Clinic 0'] == 72.5
+    assert all(score == 10.0 for name, score in scored.items() if name != 'Delhi Clinic 0')
+
+    index.nearest_to('Delhi Clinic 1', k=49)
+    assert len(calls) == len(set(calls)) == 48
+    assert index.locate('Unknown Hospital') is None
+    print(f"Scorer called {len(calls)} times for {len(peers)} peers")
+    print("✅ Scores attached without re-searching")
+
+
+if __name__ == "__main__":
+    test_queries_match_brute_force()
+    test_scores_and_exclusion()
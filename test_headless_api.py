@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test script for the headless JSON API.
+Drives the ASGI app directly: endpoint payloads against the analyzer,
+ETag revalidation and invalidation on a new data version, and coalescing of
+identical concurrent requests.
+"""
+
+import sys
+import os
+import asyncio
+import copy
+import json
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from headless_api import MAX_BATCH_NAMES, HeadlessAPI
+
+CERTIFICATIONS = [
+    [{'name': 'Joint Commission International (JCI)', 'status': 'Active'}, {'name': 'ISO 9001:2015', 'status': 'Active'}],
+    [{'name': 'NABH Full Accreditation', 'status': 'accredited'}, {'name': 'NABL', 'status': 'Active'}],
+    [{'name': 'CAP', 'status': 'Active'}],
+    [],
+]
+
+
+def _organizations(count=40):
+    return [{'name': f'Apollo Care {i}' if i % 4 == 0 else f'City Hospital {i}', 'city': f'City {i % 5}',
+             'state': 'State', 'country': ['India', 'USA'][i % 2], 'hospital_type': 'Hospital',
+             'certifications': copy.deepcopy(CERTIFICATIONS[i % 4])}
+            for i in range(count)]
+
+
+def _analyzer(organizations):
+    from streamlit_app import HealthcareOrgAnalyzer
+    analyzer = HealthcareOrgAnalyzer.for_scoring()
+    analyzer.scored_index, analyzer.scored_entries = {}, []
+    analyzer.unified_database = organizations
+    return analyzer
+
+
+def _request(app, method, path, query='', body=b'', headers=()):
+    """Run one ASGI request; returns (status, headers dict, parsed JSON or None)"""
+    async def run():
+        sent = []
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+        async def receive():
+            return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query.encode(),
+                 'headers': [(k.encode(), v.encode()) for k, v in headers]}
+        await app(scope, receive, send)
+        return sent
+    sent = asyncio.run(run())
+    response_headers = {k.decode(): v.decode() for k, v in sent[0]['headers']}
+    payload = sent[1]['body']
+    return sent[0]['status'], response_headers, json.loads(payload) if payload else None
+
+
+def test_endpoints():
+    """Suggestions, lookup, score, rank and batch payloads match the analyzer"""
+    print("🧪 Testing API Endpoints")
+    print("=" * 50)
+
+    organizations = _organizations()
+    analyzer = _analyzer(organizations)
+    app = HeadlessAPI(analyzer, version_func=lambda: 'v1')
+
+    status, _, body = _request(app, 'GET', '/v1/suggestions', 'q=apollo&limit=3')
+    assert status == 200 and body['suggestions'] == analyzer.generate_organization_suggestions('apollo', 3)
+    assert len(body['suggestions']) == 3
+
+    status, _, body = _request(app, 'GET', '/v1/organizations/city hospital 5')
+    assert status == 200 and body['organization']['name'] == 'City Hospital 5'
+
+    expected = analyzer._score_unified_record(copy.deepcopy(organizations[1]))
+    status, _, body = _request(app, 'GET', '/v1/organizations/City Hospital 1/score')
+    assert status == 200 and body['total_score'] == expected['total_score']
+    assert body['score_breakdown'] == json.loads(json.dumps(expected['score_breakdown'], default=str))
+
+    scores = sorted((analyzer._score_unified_record(copy.deepcopy(o))['total_score'] for o in organizations),
+                    reverse=True)
+    status, _, rank = _request(app, 'GET', '/v1/organizations/City Hospital 1/rank')
+    assert status == 200 and rank['source'] == 'computed' and rank['total_organizations'] == len(organizations)
+    assert rank['overall_rank'] == scores.index(rank['total_score']) + 1
+    assert rank['percentile'] == (len(organizations) - rank['overall_rank'] + 1) / len(organizations) * 100
+
+    # Precomputed batch ranks take precedence
+    analyzer.scored_index['apollo care 0'] = {'name': 'Apollo Care 0', 'total_score': 91.5, 'overall_rank': 3,
+                                              'percentile': 99.2}
+    analyzer.scored_entries = [{}] * 250
+    status, _, rank = _request(app, 'GET', '/v1/organizations/Apollo Care 0/rank')
+    assert rank == {'name': 'Apollo Care 0', 'total_score': 91.5, 'overall_rank': 3, 'total_organizations': 250,
+                    'percentile': 99.2, 'source': 'precomputed'}
+
+    names = [o['name'].upper() for o in organizations] + ['Unknown Clinic']
+    status, _, batch = _request(app, 'POST', '/v1/scores/batch', body=json.dumps({'names': names}).encode())
+    assert status == 200 and batch['count'] == len(names) and batch['found'] == len(organizations)
+    assert batch['results'][-1] == {'name': 'Unknown Clinic', 'found': False}
+    assert batch['results'][1]['matched_name'] == 'City Hospital 1' and batch['results'][1]['name'] == 'CITY HOSPITAL 1'
+    assert batch['results'][0]['overall_rank'] == 3 and 'score_breakdown' not in batch['results'][0]
+
+    assert _request(app, 'GET', '/v1/organizations/Nowhere Medical Xyzzy')[0] == 404
+    assert _request(app, 'GET', '/v1/unknown')[0] == 404
+    assert _request(app, 'POST', '/v1/suggestions')[0] == 405
+    assert _request(app, 'GET', '/v1/suggestions', 'q=apollo&limit=many')[0] == 400
+    assert _request(app, 'POST', '/v1/scores/batch', body=b'not json')[0] == 400
+    too_many = json.dumps({'names': ['x'] * (MAX_BATCH_NAMES + 1)}).encode()
+    assert _request(app, 'POST', '/v1/scores/batch', body=too_many)[0] == 413
+    status, _, health = _request(app, 'GET', '/v1/health')
+    assert status == 200 and health['organizations'] == len(organizations) and health['stats']['errors'] == 6
+    print("✅ Endpoints verified")
+
+
+def test_etags_and_data_versions():
+    """Revalidation answers 304 without recomputing; a new data version changes the ETag"""
+    print("\n🧪 Testing ETag Caching")
+    print("=" * 50)
+
+    version = ['v1']
+    analyzer = _analyzer(_organizations())
+    app = HeadlessAPI(analyzer, version_func=lambda: version[0])
+
+    status, headers, first = _request(app, 'GET', '/v1/organizations/City Hospital 2/score')
+    etag = headers['etag']
+    assert status == 200 and headers['cache-control'] == 'no-cache'
+    status, headers, body = _request(app, 'GET', '/v1/organizations/City Hospital 2/score',
+                                     headers=[('If-None-Match', f'"other", {etag}')])
+    assert status == 304 and body is None and headers['etag'] == etag
+    assert app.stats['computed'] == 1 and app.stats['cache_hits'] == 1 and app.stats['not_modified'] == 1
+
+    version[0] = 'v2'
+    status, headers, body = _request(app, 'GET', '/v1/organizations/City Hospital 2/score',
+                                     headers=[('If-None-Match', etag)])
+    assert status == 200 and body == first and headers['etag'] != etag and app.stats['computed'] == 2
+
+    # Reloading the database rebuilds the index
+    analyzer.unified_database = _organizations(3)
+    status, _, _ = _request(app, 'GET', '/v1/organizations/City Hospital 2/score')
+    assert status == 200 and app.stats['computed'] == 3
+    assert _request(app, 'GET', '/v1/health')[2]['organizations'] == 3
+    print("✅ ETags verified")
+
+
+def test_concurrent_requests_are_coalesced():
+    """Identical requests in flight together share one computation"""
+    print("\n🧪 Testing Request Coalescing")
+    print("=" * 50)
+
+    analyzer = _analyzer(_organizations())
+    calls = []
+    lock = threading.Lock()
+    suggest = analyzer.generate_organization_suggestions
+
+    def slow_suggestions(text, limit):
+        with lock:
+            calls.append(text)
+        time.sleep(0.2)
+        return suggest(text, limit)
+
+    analyzer.generate_organization_suggestions = slow_suggestions
+    app = HeadlessAPI(analyzer, version_func=lambda: 'v1')
+
+    async def run():
+        sent = {}
+
+        async def one(i, query):
+            messages = [{'type': 'http.request', 'body': b''}]
+
+            async def receive():
+                return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+            async def send(message):
+                sent.setdefault(i, []).append(message)
+
+            await app({'type': 'http', 'method': 'GET', 'path': '/v1/suggestions', 'query_string': query,
+                       'headers': []}, receive, send)
+
+        queries = [b'q=apollo'] * 20 + [b'q=city'] * 5
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i, q) for i, q in enumerate(queries)))
+        return sent, time.perf_counter() - started
+
+    sent, elapsed = asyncio.run(run())
+    assert sorted(calls) == ['apollo', 'city'], calls
+    assert app.stats['coalesced'] == 23 and app.stats['computed'] == 2
+    bodies = {i: messages[1]['body'] for i, messages in sent.items()}
+    assert len({bodies[i] for i in range(20)}) == 1 and bodies[0] != bodies[24]
+    print(f"25 requests, {len(calls)} computations in {elapsed:.2f}s")
+    print("✅ Coalescing verified")
+
+
+if __name__ == "__main__":
+    test_endpoints()
+    test_etags_and_data_versions()
+    test_concurrent_requests_are_coalesced()
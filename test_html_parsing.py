@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the lxml parsing layer.
+Checks that text extraction and the single-pass keyword matcher agree with
+the per-keyword BeautifulSoup searches they replace, that strained parsing
+keeps the tables scrapers read, and times both approaches on a large page.
+"""
+
+import sys
+import os
+import re
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+
+from html_parsing import KeywordMatcher, make_soup, node_text, only, parse_html, visible_text
+from data_validator import QUALITY_KEYWORDS, HealthcareDataValidator
+
+SECTION = """
+<div class="section">
+  <h2>Patient Safety at Sunrise Hospital</h2>
+  <p>Our <b>quality improvement</b> programme cut infections by 30% through continuous improvement.</p>
+  <ul><li>NABH Accreditation renewed in 2023 for all departments</li>
+      <li>Clinical Excellence awards for cardiac care and Quality Care standards</li></ul>
+  <!-- quality assurance (hidden comment) -->
+  <script>var tracking = "patient experience";</script>
+  <table><tr><th>Name</th><th>City</th></tr><tr><td>Sunrise Hospital</td><td>Pune</td></tr></table>
+  <p>Menu &amp; links: home, doctors, careers, blog, contact</p>
+  <p>Wards<!-- reviewed -->follow best practices<?php echo 1; ?> for hand hygiene</p>
+</div>
+"""
+
+
+def _page(sections=1):
+    return f"<html><head><title>Sunrise</title><style>p {{}}</style></head><body>{SECTION * sections}</body></html>"
+
+
+def _legacy_scan(soup, keywords, per_keyword=3):
+    """The old approach: one full-tree search per keyword"""
+    matches = {}
+    text_content = soup.get_text().lower()
+    for keyword in keywords:
+        if keyword in text_content:
+            elements = soup.find_all(string=re.compile(keyword, re.IGNORECASE))
+            # Comments and script text are not page content
+            elements = [e for e in elements if type(e).__name__ == "NavigableString"][:per_keyword]
+            if elements:
+                matches[keyword] = [e.parent.get_text() for e in elements]
+    return matches
+
+
+def test_text_and_keywords_match_legacy():
+    """visible_text and KeywordMatcher.scan give the same results as the BeautifulSoup code they replace"""
+    print("🧪 Testing Text Extraction and Keyword Matching")
+    print("=" * 50)
+
+    html = _page(2)
+    reference = BeautifulSoup(html, "html.parser")
+    assert visible_text(html) == reference.get_text(" ", strip=True)
+    assert visible_text(make_soup(html)) == reference.get_text(" ", strip=True)
+
+    matcher = KeywordMatcher(QUALITY_KEYWORDS)
+    expected = _legacy_scan(reference, QUALITY_KEYWORDS)
+    for doc in (parse_html(html), make_soup(html)):
+        scanned = {k: [node_text(e) for e in v] for k, v in matcher.scan(doc, per_keyword=3).items()}
+        assert scanned == expected, scanned
+    print(f"Keywords found: {list(expected)}")
+    assert "quality assurance" not in expected and "patient experience" not in expected
+    assert "best practices" in expected, "text after a comment is page content"
+
+    # Text following a comment or processing instruction belongs to the enclosing element
+    commented = "<p>x<!-- c -->quality accreditation</p>"
+    assert visible_text(commented) == BeautifulSoup(commented, "html.parser").get_text(" ", strip=True)
+    assert visible_text(commented) == "x quality accreditation"
+    assert {k: [node_text(e) for e in v] for k, v in matcher.scan(parse_html(commented)).items()} == {
+        "accreditation": ["xquality accreditation"]}
+
+    # Overlapping keywords and keywords that start with another are all reported
+    overlap = KeywordMatcher(["quality", "Quality Care", "care", "continuous quality improvement", "quality improvement"])
+    assert overlap.find("Continuous quality improvement and QUALITY CARE") == [
+        "continuous quality improvement", "quality improvement", "quality", "Quality Care", "care"]
+
+    validator = HealthcareDataValidator()
+    from_lxml = validator._extract_initiatives_from_page(parse_html(html), "Sunrise Hospital")
+    from_soup = validator._extract_initiatives_from_page(reference, "Sunrise Hospital")
+    assert from_lxml and from_lxml == from_soup
+    print("✅ Text and keyword matching verified")
+
+
+def test_strained_tables():
+    """Strained soups keep exactly the tags scrapers read"""
+    print("\n🧪 Testing Strained Parsing")
+    print("=" * 50)
+
+    soup = make_soup(_page(3), only("table", "input"))
+    assert len(soup.find_all("table")) == 3 and soup.find("div") is None
+    cells = [td.get_text(strip=True) for td in soup.find("table").find_all("td")]
+    assert cells == ["Sunrise Hospital", "Pune"]
+    print("✅ Strained parsing verified")
+
+
+def test_large_page_timing():
+    """Single-pass lxml matching is much cheaper than a soup search per keyword"""
+    print("\n🧪 Timing a Large Hospital Homepage")
+    print("=" * 50)
+
+    html = _page(400)
+    started = time.perf_counter()
+    legacy = _legacy_scan(BeautifulSoup(html, "html.parser"), QUALITY_KEYWORDS)
+    legacy_seconds = time.perf_counter() - started
+
+    matcher = KeywordMatcher(QUALITY_KEYWORDS)
+    started = time.perf_counter()
+    scanned = {k: [node_text(e) for e in v] for k, v in matcher.scan(parse_html(html), per_keyword=3).items()}
+    new_seconds = time.perf_counter() - started
+
+    print(f"html.parser + per-keyword search: {legacy_seconds:.3f}s, lxml single pass: {new_seconds:.3f}s "
+          f"({legacy_seconds / new_seconds:.1f}x)")
+    assert scanned == legacy
+    assert new_seconds * 3 < legacy_seconds
+    print("✅ Timing verified")
+
+
+if __name__ == "__main__":
+    test_text_and_keywords_match_legacy()
+    test_strained_tables()
+    test_large_page_timing()
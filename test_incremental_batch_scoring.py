@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental batch scoring.
+Checks that only records with a changed fingerprint are rescored, that reused
+results match a full rescore, and that a scoring-config change rescores all
+while edits outside the scoring code do not.
+"""
+
+import sys
+import os
+import copy
+import json
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from batch_scoring_system import (BatchScoringSystem, SCORING_APP_FILE, SCORING_INPUT_FILES,
+                                  record_fingerprint, scoring_config_version)
+
+
+def _scorer(previous_file, organizations, incremental=True):
+    scorer = BatchScoringSystem(incremental=incremental, previous_results_file=previous_file)
+    scorer.organizations = copy.deepcopy(organizations)
+    scorer.scored_calls = []
+    score = scorer.calculate_organization_score
+
+    def counting_score(org_data):
+        scorer.scored_calls.append(org_data['name'])
+        return score(org_data)
+
+    scorer.calculate_organization_score = counting_score
+    return scorer
+
+
+def _run(scorer, previous_file):
+    scorer.process_all_organizations()
+    scorer.add_international_scores()
+    scorer.calculate_unique_rankings()
+    with open(previous_file, 'w', encoding='utf-8') as f:
+        json.dump(scorer.scored_organizations, f)
+    return {org['name']: org for org in scorer.scored_organizations}
+
+
+def test_incremental_rescoring():
+    """Unchanged records are reused; changed and new ones are rescored; ranks cover everything"""
+    print("🧪 Testing Incremental Batch Scoring")
+    print("=" * 50)
+
+    organizations = [
+        {'name': 'Apollo Test Hospital', 'country': 'India',
+         'certifications': [{'name': 'NABH', 'status': 'Active'}]},
+        {'name': 'Fortis Test Hospital', 'country': 'India',
+         'certifications': [{'name': 'JCI', 'status': 'Active'}, {'name': 'NABH', 'status': 'Active'}]},
+        {'name': 'Mayo Test Clinic', 'country': 'United States', 'certifications': []},
+    ]
+    assert record_fingerprint(organizations[0]) == record_fingerprint(dict(organizations[0], last_updated='now'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        previous_file = os.path.join(tmp, 'scored.json')
+        first = _scorer(previous_file, organizations)
+        baseline = _run(first, previous_file)
+        assert len(first.scored_calls) == 3
+
+        # An integrator touches one record and adds another
+        changed = copy.deepcopy(organizations)
+        changed[2]['certifications'] = [{'name': 'JCI', 'status': 'Active'}]
+        changed.append({'name': 'Max Test Hospital', 'country': 'India', 'certifications': []})
+        second = _scorer(previous_file, changed)
+        results = _run(second, previous_file)
+        print(f"Rescored: {second.scored_calls}, stats: {second.incremental_stats}")
+        assert sorted(second.scored_calls) == ['Max Test Hospital', 'Mayo Test Clinic']
+        assert second.incremental_stats == {'total': 4, 'rescored': 2, 'reused': 2}
+
+        # Reused results are identical to what a full rescore produces
+        full = _scorer(os.path.join(tmp, 'none.json'), changed, incremental=False)
+        full.process_all_organizations()
+        full.add_international_scores()
+        full.calculate_unique_rankings()
+        for org in full.scored_organizations:
+            reused = results[org['name']]
+            assert reused['total_score'] == org['total_score']
+            assert reused['overall_rank'] == org['overall_rank']
+            assert reused['international_score'] == org['international_score']
+        assert baseline['Apollo Test Hospital']['last_updated'] == results['Apollo Test Hospital']['last_updated']
+
+        # A new scoring config invalidates every previous result
+        third = _scorer(previous_file, changed)
+        third.config_version = 'changed'
+        third.process_all_organizations()
+        assert len(third.scored_calls) == 4
+    print("✅ Incremental batch scoring verified")
+
+
+def test_config_version_tracks_scoring_code_only():
+    """UI edits in the app module keep the config version; scoring method edits change it"""
+    print("\n🧪 Testing Scoring Config Version")
+    print("=" * 50)
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in SCORING_INPUT_FILES + (SCORING_APP_FILE,):
+            shutil.copy(os.path.join(here, name), tmp)
+        app_file = os.path.join(tmp, SCORING_APP_FILE)
+        with open(app_file, 'r', encoding='utf-8') as f:
+            app_source = f.read()
+        version = scoring_config_version(tmp)
+        assert version == scoring_config_version(here)
+
+        with open(app_file, 'w', encoding='utf-8') as f:
+            f.write(app_source.replace('📄 Download PDF Scorecard', '📄 Download Scorecard') + '\nst.caption("UI tweak")\n')
+        assert scoring_config_version(tmp) == version, "UI edits must not invalidate scores"
+
+        # A helper reached from calculate_quality_score is part of the scoring code
+        helper = 'def _normalize_cert_name(self'
+        assert helper in app_source
+        with open(app_file, 'w', encoding='utf-8') as f:
+            f.write(app_source.replace(helper, helper.replace('(self', '(self, unused=None')))
+        changed = scoring_config_version(tmp)
+        print(f"Version: {version} -> {changed}")
+        assert changed != version
+    print("✅ Config version tracks the scoring code only")
+
+
+if __name__ == "__main__":
+    test_incremental_rescoring()
+    test_config_version_tracks_scoring_code_only()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent upload ingestion queue.
+Covers the approval lifecycle, batch dedupe/scoring, crash recovery from a
+checkpoint, the background workers, and concurrent jobs integrating into the
+same database.
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ingestion_queue import IngestionQueue, STATUS_RUNNING
+
+
+def _records():
+    return [
+        {'name': 'Apollo Hospital Delhi', 'country': 'India', 'city': 'Delhi', 'certifications': 'JCI, NABH'},
+        {'name': 'Fortis Memorial', 'country': 'India', 'city': 'Gurgaon', 'certifications': 'NABH'},
+        {'name': 'apollo hospital, delhi', 'country': 'India', 'city': 'Delhi', 'certifications': 'JCI'},
+        {'name': 'Max Hospital', 'country': 'India', 'city': 'Delhi', 'certifications': ''},
+        {'name': 'Medanta', 'country': 'India', 'city': 'Gurgaon', 'certifications': 'JCI'},
+    ]
+
+
+def _scorer(org):
+    return {'total_score': 10.0 * len(org.get('certifications', []))}
+
+
+def test_approval_lifecycle_and_batches():
+    """Pending jobs wait for approval; approved jobs are deduped and scored in batches"""
+    print("🧪 Testing Ingestion Queue Lifecycle")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = IngestionQueue(os.path.join(tmp, 'queue.db'), scorer=_scorer, batch_size=2)
+        job_id = queue.submit({'records': _records(), 'uploaded_by': 'admin'})
+        rejected_id = queue.submit({'records': _records()[:1]})
+
+        assert queue.run_pending() == 0, "pending jobs must not be processed before approval"
+        assert queue.reject(rejected_id, 'duplicate upload')
+        assert queue.approve(job_id)
+        assert queue.run_pending() == 1
+
+        job = queue.get_job(job_id)
+        print(f"Job status: {job['status']} ({job['progress']}%), created={job['organizations_created']}, "
+              f"duplicates={job['duplicates_skipped']}")
+        assert job['status'] == 'completed'
+        assert job['checkpoint'] == 3
+        assert job['processed_rows'] == 5
+        assert job['organizations_created'] == 4
+        assert job['duplicates_skipped'] == 1
+        assert job['metadata'] == {'uploaded_by': 'admin'}
+        assert queue.get_job(rejected_id)['rejection_reason'] == 'duplicate upload'
+
+        results = queue.get_results(job_id)
+        apollo = results[0]
+        assert apollo['name'] == 'Apollo Hospital Delhi'
+        assert apollo['total_score'] == 20.0
+        print("✅ Approval, batching, dedupe and scoring verified")
+
+
+def test_resume_after_crash():
+    """A job interrupted mid-run resumes from its checkpoint without reprocessing batches"""
+    print("\n🧪 Testing Crash Recovery")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'queue.db')
+        queue = IngestionQueue(db_path, scorer=_scorer, batch_size=2)
+        job_id = queue.submit({'records': _records()}, requires_approval=False)
+
+        # Simulate a worker that committed the first batch and then died
+        claimed = queue._claim_next('crashed-worker')
+        assert claimed['job_id'] == job_id
+        queue._validate(claimed)
+        with queue._connect() as conn:
+            conn.execute('UPDATE ingestion_jobs SET checkpoint = 1, processed_rows = 2, '
+                         'organizations_created = 2 WHERE job_id = ?', (job_id,))
+            conn.execute("INSERT INTO ingestion_results VALUES (?, 0, '[]')", (job_id,))
+        assert queue.get_job(job_id)['status'] == STATUS_RUNNING
+
+        restarted = IngestionQueue(db_path, scorer=_scorer, batch_size=2)
+        assert restarted.recover() == 1
+        assert restarted.run_pending() == 1
+        job = restarted.get_job(job_id)
+        print(f"Resumed job: status={job['status']}, processed_rows={job['processed_rows']}")
+        assert job['status'] == 'completed'
+        assert job['processed_rows'] == 5
+        print("✅ Job resumed from checkpoint")
+
+
+def test_completed_job_integrates_into_database():
+    """A job submitted with a database path merges its results into the unified database"""
+    print("\n🧪 Testing Database Integration")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'unified.json')
+        with open(db_path, 'w', encoding='utf-8') as f:
+            json.dump({'organizations': [{'name': 'Apollo Hospital, Delhi', 'certifications': []}]}, f)
+
+        queue = IngestionQueue(os.path.join(tmp, 'queue.db'), scorer=_scorer, batch_size=2)
+        job_id = queue.submit({'records': _records()}, requires_approval=False, database_path=db_path)
+        assert queue.run_pending() == 1
+
+        job = queue.get_job(job_id)
+        print(f"Integration statistics: {job['statistics']}")
+        assert job['status'] == 'completed'
+        assert job['statistics']['existing_organizations_updated'] == 1
+        assert job['statistics']['new_organizations_added'] == 3
+        with open(db_path, 'r', encoding='utf-8') as f:
+            names = [org['name'] for org in json.load(f)['organizations']]
+        assert names == ['Apollo Hospital, Delhi', 'Fortis Memorial', 'Max Hospital', 'Medanta']
+        print("✅ Completed job integrated into the unified database")
+
+
+def test_background_workers():
+    """Background workers pick up queued jobs while the caller only polls status"""
+    print("\n🧪 Testing Background Workers")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = IngestionQueue(os.path.join(tmp, 'queue.db'), scorer=_scorer, batch_size=2)
+        queue.start_workers(count=2, poll_interval=0.05)
+        try:
+            job_ids = [queue.submit({'records': _records()}, requires_approval=False) for _ in range(3)]
+            deadline = time.time() + 10
+            while time.time() < deadline:
+                statuses = [queue.get_job(j)['status'] for j in job_ids]
+                if all(s == 'completed' for s in statuses):
+                    break
+                time.sleep(0.05)
+            print(f"Job statuses: {statuses}")
+            assert all(s == 'completed' for s in statuses)
+        finally:
+            queue.stop_workers()
+        print("✅ Background workers completed all jobs")
+
+
+def test_concurrent_jobs_share_database():
+    """Two jobs finishing together both land in the database; neither overwrites the other"""
+    print("\n🧪 Testing Concurrent Database Integration")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'unified.json')
+        # A database big enough that load-merge-write takes a while
+        existing = [{'name': f'Existing Hospital {i}', 'certifications': []} for i in range(20000)]
+        with open(db_path, 'w', encoding='utf-8') as f:
+            json.dump({'organizations': existing}, f)
+
+        queue = IngestionQueue(os.path.join(tmp, 'queue.db'), scorer=_scorer, batch_size=2)
+        # Both workers enter the integration at the same moment
+        barrier = threading.Barrier(2)
+        integrate = queue.processor.integrate_with_database
+
+        def integrate_together(organizations, database_path):
+            barrier.wait(10)
+            return integrate(organizations, database_path)
+
+        queue.processor.integrate_with_database = integrate_together
+        uploads = [
+            [{'name': 'Fortis Memorial', 'country': 'India', 'city': 'Gurgaon', 'certifications': 'NABH'}],
+            [{'name': 'Medanta', 'country': 'India', 'city': 'Gurgaon', 'certifications': 'JCI'}],
+        ]
+        job_ids = [queue.submit({'records': records}, requires_approval=False, database_path=db_path)
+                   for records in uploads]
+        queue.start_workers(count=2, poll_interval=0.05)
+        try:
+            deadline = time.time() + 60
+            while time.time() < deadline:
+                statuses = [queue.get_job(j)['status'] for j in job_ids]
+                if all(s == 'completed' for s in statuses):
+                    break
+                time.sleep(0.05)
+        finally:
+            queue.stop_workers()
+        print(f"Job statuses: {statuses}")
+        assert all(s == 'completed' for s in statuses)
+
+        with open(db_path, 'r', encoding='utf-8') as f:
+            names = {org['name'] for org in json.load(f)['organizations']}
+        assert {'Fortis Memorial', 'Medanta'} <= names, "one job's merge was overwritten"
+        assert len(names) == len(existing) + 2
+        assert not os.path.exists(db_path + '.tmp')
+        print("✅ Both jobs integrated into the shared database")
+
+
+if __name__ == "__main__":
+    test_approval_lifecycle_and_batches()
+    test_resume_after_crash()
+    test_completed_job_integrates_into_database()
+    test_background_workers()
+    test_concurrent_jobs_share_database()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled InternationalHealthcareScorer tables and the
+score_many batch API.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from international_scoring_algorithm import InternationalHealthcareScorer
+
+
+def _organizations():
+    return [
+        {'name': 'No Certifications', 'certifications': []},
+        {'name': 'JCI + ISO', 'certifications': [
+            {'name': 'Joint Commission International', 'status': 'Active', 'score_impact': 30},
+            {'name': 'ISO 9001:2015', 'status': 'Active'},
+            {'name': 'CAP', 'status': 'Expired'},
+        ]},
+        {'name': 'US Lab', 'certifications': [
+            {'name': 'Joint Commission', 'status': 'Valid'},
+            {'name': 'College of American Pathologists', 'status': 'Current'},
+        ]},
+        {'name': 'Metrics Only', 'certifications': [{'name': 'NABH', 'status': 'Active'}],
+         'quality_metrics': {'clinical_outcomes': {'composite_score': 80}}},
+    ]
+
+
+def test_compiled_tables():
+    """Equivalency groups are flattened into type -> satisfied mandatory keys"""
+    print("🧪 Testing Compiled Standards Tables")
+    print("=" * 50)
+
+    scorer = InternationalHealthcareScorer()
+    assert scorer._mandatory_satisfied_by['CAP'] == {'ISO_15189_GROUP'}
+    assert scorer._mandatory_satisfied_by['NABL'] == {'ISO_15189_GROUP'}
+    assert scorer._mandatory_satisfied_by['JOINT_COMMISSION_US'] == {'JCI'}
+    assert scorer._mandatory_satisfied_by['JCI'] == {'JCI'}
+    assert 'NABH_INDIA' not in scorer._mandatory_satisfied_by
+    assert scorer._weight_table['JCI'] == (4.0, 35, 1)
+    assert scorer._identify_certification_type('iso 15189 lab') == 'ISO_15189'
+    assert scorer._identify_certification_type('iso 15189 lab') in scorer._type_cache.values()
+    print("✅ Lookup tables compiled")
+
+
+def test_score_many_matches_detailed_scores():
+    """score_many returns the same totals as calculate_international_quality_score"""
+    print("\n🧪 Testing score_many Batch API")
+    print("=" * 50)
+
+    scorer = InternationalHealthcareScorer()
+    orgs = _organizations()
+    batch = scorer.score_many(orgs)
+    expected = [
+        scorer.calculate_international_quality_score(org['certifications'], org.get('quality_metrics'))
+        for org in orgs
+    ]
+    print(f"Batch totals: {batch['total_score']}")
+    assert isinstance(batch['total_score'], np.ndarray)
+    assert np.allclose(batch['total_score'], [e['total_score'] for e in expected])
+    assert np.allclose(batch['certification_score'], [e['certification_score'] for e in expected])
+    assert batch['certification_count'].tolist() == [0, 2, 2, 1]
+    # Joint Commission (US) halves the ISO 9001 penalty and satisfies JCI; CAP covers ISO 15189
+    assert batch['total_penalty'][2] == 6.0
+    print("✅ Batch scores match detailed scores")
+
+
+if __name__ == "__main__":
+    test_compiled_tables()
+    test_score_many_matches_detailed_scores()
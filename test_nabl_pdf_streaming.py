@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming NABL PDF extraction.
+Builds a small PDF, checks that page-parallel streaming to JSONL produces the
+same organizations as process_pdf, and that an interrupted run resumes from
+its checkpoint without re-extracting completed pages (or starts over when the
+checkpoint itself was cut short).
+"""
+
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from nabl_pdf_processor import NABLPDFProcessor
+
+PAGES = [
+    ['Sunrise Diagnostics Centre Delhi', 'Metro Pathology Services Mumbai'],
+    ['Lifeline Medical Centre Chennai', 'Sunrise Diagnostics Centre Delhi'],
+    ['Apex Clinical Institute Pune', 'Green Valley Hospital Jaipur'],
+    ['Metro Pathology Services Mumbai', 'Coastal Diagnostics Centre Kochi'],
+    ['Hilltop Medical Institute Dehradun'],
+]
+
+
+def _write_pdf(path):
+    pdf = canvas.Canvas(path, pagesize=A4)
+    for lines in PAGES:
+        y = 780
+        for line in lines:
+            pdf.drawString(72, y, line)
+            y -= 24
+        pdf.showPage()
+    pdf.save()
+
+
+def _processor(tmp):
+    pdf_path = os.path.join(tmp, 'nabl.pdf')
+    if not os.path.exists(pdf_path):
+        _write_pdf(pdf_path)
+    processor = NABLPDFProcessor(pdf_path)
+    processor.project_root = Path(tmp)
+    return processor
+
+
+def _names(organizations):
+    return [org['organization_name'] for org in organizations]
+
+
+def test_streaming_matches_process_pdf():
+    """Streamed JSONL output equals the single-pass process_pdf output"""
+    print("🧪 Testing Streaming Extraction Equivalence")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        processor = _processor(tmp)
+        expected = processor.process_pdf()
+        assert len(expected) == 7, _names(expected)
+
+        output = os.path.join(tmp, 'streamed.jsonl')
+        stats = processor.process_pdf_streaming(output, workers=2, pages_per_task=2)
+        streamed = list(NABLPDFProcessor.iter_jsonl(output))
+        print(f"process_pdf: {len(expected)} organizations, streamed: {len(streamed)}")
+        assert streamed == expected
+        assert stats['pages_processed'] == len(PAGES) and stats['duplicates_skipped'] == 2
+        assert stats['resumed_from_page'] == 0 and stats['total_organizations'] == len(expected)
+        print("✅ Streamed output matches process_pdf")
+
+
+def test_resume_from_checkpoint():
+    """An interrupted run restarts after its last checkpointed page and yields the same output"""
+    print("\n🧪 Testing Checkpoint Resume")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        processor = _processor(tmp)
+        expected = processor.process_pdf()
+        output = os.path.join(tmp, 'streamed.jsonl')
+
+        # First run dies after two pages, leaving a half-written line behind
+        iter_pages = processor.iter_page_records
+
+        def crash_after_two_pages(start_page, workers=None, pages_per_task=8):
+            for record in iter_pages(start_page, workers, pages_per_task):
+                if record['page'] > 2:
+                    raise KeyboardInterrupt("worker killed")
+                yield record
+
+        processor.iter_page_records = crash_after_two_pages
+        try:
+            processor.process_pdf_streaming(output, workers=2, pages_per_task=1)
+            assert False, "the simulated crash must interrupt the run"
+        except KeyboardInterrupt:
+            pass
+        with open(output + '.checkpoint.json', 'r', encoding='utf-8') as f:
+            assert json.load(f)['last_page'] == 2
+        with open(output, 'a', encoding='utf-8') as f:
+            f.write('{"organization_name": "Apex Cli')
+
+        resumed = _processor(tmp)
+        extracted_pages = []
+        iter_resumed = resumed.iter_page_records
+
+        def record_pages(start_page, workers=None, pages_per_task=8):
+            for record in iter_resumed(start_page, workers, pages_per_task):
+                extracted_pages.append(record['page'])
+                yield record
+
+        resumed.iter_page_records = record_pages
+        stats = resumed.process_pdf_streaming(output, workers=2, pages_per_task=1)
+        streamed = list(NABLPDFProcessor.iter_jsonl(output))
+        print(f"Resumed from page {stats['resumed_from_page']}, extracted pages {extracted_pages}")
+        assert stats['resumed_from_page'] == 2 and extracted_pages == [3, 4, 5]
+        assert stats['organizations_written'] == 4 and stats['duplicates_skipped'] == 1
+        assert streamed == expected
+
+        assert not os.path.exists(output + '.checkpoint.json.tmp')
+
+        # A fresh run (resume=False) starts over and rewrites the same output
+        stats = resumed.process_pdf_streaming(output, workers=1, resume=False)
+        assert stats['resumed_from_page'] == 0 and list(NABLPDFProcessor.iter_jsonl(output)) == expected
+
+        # A checkpoint truncated by a kill mid-write means starting over, not failing
+        with open(output + '.checkpoint.json', 'w', encoding='utf-8') as f:
+            f.write('{"last_page": 3, "parser_st')
+        stats = resumed.process_pdf_streaming(output, workers=1)
+        assert stats['resumed_from_page'] == 0 and stats['pages_processed'] == len(PAGES)
+        assert list(NABLPDFProcessor.iter_jsonl(output)) == expected
+        print("✅ Run resumed from checkpoint without re-extracting completed pages")
+
+
+if __name__ == "__main__":
+    test_streaming_matches_process_pdf()
+    test_resume_from_checkpoint()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the rule-table improvement recommendations.
+Checks the sections each profile compiles to, that organizations with the
+same profile share one compiled entry, and the batch precompute/load cycle.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from recommendation_rules import (KEY_CERTIFICATIONS, Profile, RecommendationEngine, recommendation_profile,
+                                  save_profiles)
+
+KEYS = [key for key, _ in KEY_CERTIFICATIONS]
+
+
+def _active(*names):
+    return [{'name': name, 'status': 'Active'} for name in names]
+
+
+def _gap_names(recommendations):
+    by_name = {info['name']: key for key, info in KEY_CERTIFICATIONS}
+    return [by_name[gap['name']] for gap in recommendations['certification_gaps']]
+
+
+def test_profiles_and_sections():
+    """Gap, band and region bits select the same items the branching code did"""
+    print("🧪 Testing Recommendation Profiles")
+    print("=" * 50)
+
+    engine = RecommendationEngine()
+    low = {'total_score': 42.5, 'certification_score': 30, 'quality_initiatives_score': 10}
+    nabh_only = engine.recommendations('City Hospital Chennai', low, _active('NABH Full Accreditation') +
+                                       [{'name': 'JCI Accreditation', 'status': 'Expired'}])
+    assert _gap_names(nabh_only) == [key for key in KEYS if key != 'NABH']
+    assert [a['action'] for a in nabh_only['priority_actions']] == ['Pursue JCI Accreditation',
+                                                                   'Implement Patient Safety Initiatives']
+    assert len(nabh_only['quality_initiatives']) == 3
+    assert [o['area'] for o in nabh_only['operational_improvements']] == ['Quality Management System',
+                                                                          'Performance Monitoring']
+    assert [s['strategy'] for s in nabh_only['strategic_recommendations']] == ['Quality Transformation Initiative',
+                                                                               'International Expansion Readiness']
+    assert nabh_only['score_potential'] == {'current_score': 42.5, 'maximum_possible': 110,
+                                            'improvement_potential': 67.5, 'certification_potential': 45,
+                                            'quality_initiatives_potential': 25}
+
+    high = {'total_score': 85, 'certification_score': 70, 'quality_initiatives_score': 25}
+    jci_cap = engine.recommendations('Mayo Clinic', high, _active('JCI Gold Seal', 'CAP Laboratory', 'ISO 9001:2015'),
+                                     {'has_branches': True})
+    assert _gap_names(jci_cap) == [key for key in KEYS if key not in ('JCI', 'CAP', 'ISO 9001')]
+    assert jci_cap['priority_actions'] == [] and jci_cap['quality_initiatives'] == []
+    assert [o['area'] for o in jci_cap['operational_improvements']] == ['Multi-location Quality Standardization']
+    assert [s['strategy'] for s in jci_cap['strategic_recommendations']] == ['Excellence Recognition Program']
+
+    # Sections are fresh lists; the items themselves are shared
+    nabh_only['certification_gaps'].clear()
+    again = engine.recommendations('City Hospital Chennai', low, _active('NABH Full Accreditation'))
+    assert len(again['certification_gaps']) == len(KEYS) - 1
+    print("✅ Profiles verified")
+
+
+def test_shared_profiles_are_compiled_once():
+    """Organizations differing only in exact scores or names reuse one compiled profile"""
+    print("\n🧪 Testing Profile Memoization")
+    print("=" * 50)
+
+    engine = RecommendationEngine()
+    for i in range(500):
+        score = {'total_score': 50 + i % 10, 'certification_score': 35, 'quality_initiatives_score': 5}
+        recommendations = engine.recommendations(f'Hospital {i}', score, _active('NABH', 'NABL'))
+        assert recommendations['score_potential']['current_score'] == 50 + i % 10
+    assert engine.table.stats == {'hits': 499, 'compiles': 1}
+    print(f"Table stats: {engine.table.stats}")
+
+    international = [engine.international_recommendations({'total_score': score, 'certification_breakdown': {}})
+                     for score in (10, 29.9, 30, 59, 60, 95)]
+    assert [len(r['certification_opportunities']) for r in international] == [3] * 6
+    assert international[0] == international[1] and international[2] == international[3]
+    assert international[4]['priority_actions'][0] == "Pursue Magnet Recognition for nursing excellence"
+    gold = engine.international_recommendations({'total_score': 70, 'certification_breakdown': {'GLOBAL_GOLD': 40}})
+    assert [c['certification'] for c in gold['certification_opportunities']] == ['ISO 9001 Quality Management',
+                                                                                 'ISO 13485 Medical Devices']
+    assert len(engine.international_table) == 4
+    print("✅ Memoization verified")
+
+
+def test_precompute_save_and_load():
+    """Batch precompute writes every distinct profile; a fresh engine serves them without compiling"""
+    print("\n🧪 Testing Precomputed Profiles")
+    print("=" * 50)
+
+    scored = []
+    for i in range(300):
+        certs = _active(*[['NABH'], ['JCI', 'CAP'], ['NABL'], []][i % 4])
+        scored.append({'name': f'Org {i}', 'certifications': certs,
+                       'score_breakdown': {'total_score': (i * 7) % 100, 'certification_score': (i * 3) % 75,
+                                           'quality_initiatives_score': 0}})
+    scored.append({'name': 'Broken', 'error': 'scoring failed'})
+
+    profiles = RecommendationEngine().precompute(scored)
+    expected = {recommendation_profile(o['name'], o['score_breakdown'], o['certifications']).key for o in scored[:-1]}
+    assert set(profiles) == expected
+    print(f"{len(scored)} organizations -> {len(profiles)} profiles")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'recommendation_profiles.json')
+        save_profiles(profiles, path)
+        engine = RecommendationEngine()
+        assert engine.load_profiles(path) == len(profiles)
+        for org in scored[:-1]:
+            served = engine.recommendations(org['name'], org['score_breakdown'], org['certifications'])
+            assert served == RecommendationEngine().recommendations(org['name'], org['score_breakdown'],
+                                                                    org['certifications'])
+        assert engine.table.stats['compiles'] == 0
+
+        # Profiles written by other rules are ignored
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['rules_version'] = 'older'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        assert RecommendationEngine().load_profiles(path) == 0
+        assert RecommendationEngine().load_profiles(os.path.join(tmp, 'missing.json')) == 0
+    assert Profile.from_key(Profile(5, 3, 1).key) == Profile(5, 3, 1)
+    print("✅ Precomputed profiles verified")
+
+
+if __name__ == "__main__":
+    test_profiles_and_sections()
+    test_shared_profiles_are_compiled_once()
+    test_precompute_save_and_load()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent score and ranking history store.
+Verifies that samples survive store re-opening and that trends are served
+from the precomputed rollups.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from score_history_store import ScoreHistoryStore
+
+
+def test_score_history_persistence():
+    """Scores written by one store instance are visible to a new instance"""
+    print("🧪 Testing Score History Persistence")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'history.db')
+        store = ScoreHistoryStore(db_path)
+        store.record_score('Apollo Hospitals', {'total_score': 60.0, 'certification_score': 40.0})
+        store.record_score('Apollo Hospitals', {'total_score': 64.5, 'certification_score': 42.0})
+
+        reopened = ScoreHistoryStore(db_path)
+        history = reopened.get_score_history('apollo hospitals')
+        print(f"History entries: {len(history)}")
+        assert [h['total_score'] for h in history] == [60.0, 64.5]
+
+        trend = reopened.get_score_trend('Apollo Hospitals')
+        print(f"Score trend: {trend}")
+        assert trend['direction'] == 'up'
+        assert trend['change'] == 4.5
+        assert trend['samples'] == 2
+        assert abs(trend['moving_average'] - 62.25) < 1e-9
+        print("✅ Score history persisted and trend served from rollup")
+
+
+def test_batch_run_rankings():
+    """Batch runs record ranks for every organization and feed ranking trends"""
+    print("\n🧪 Testing Batch Run Ranking History")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ScoreHistoryStore(os.path.join(tmp, 'history.db'))
+        first_run = [
+            {'name': 'Mayo Clinic', 'total_score': 80, 'overall_rank': 2, 'percentile': 50.0},
+            {'name': 'Johns Hopkins Hospital', 'total_score': 85, 'overall_rank': 1, 'percentile': 100.0},
+        ]
+        second_run = [
+            {'name': 'Mayo Clinic', 'total_score': 90, 'overall_rank': 1, 'percentile': 100.0},
+            {'name': 'Johns Hopkins Hospital', 'total_score': 85, 'overall_rank': 2, 'percentile': 50.0},
+        ]
+        store.record_batch_run(first_run)
+        store.record_batch_run(second_run)
+
+        mayo = store.get_ranking_trend('Mayo Clinic')
+        hopkins = store.get_ranking_trend('Johns Hopkins Hospital')
+        print(f"Mayo Clinic trend: {mayo['description']}")
+        print(f"Johns Hopkins trend: {hopkins['description']}")
+        assert mayo['direction'] == 'up' and mayo['rank_change'] == 1
+        assert hopkins['direction'] == 'down' and hopkins['percentile_change'] == -50.0
+        assert len(store.get_ranking_history('Mayo Clinic')) == 2
+        assert store.get_score_trend('Unknown Hospital') is None
+        print("✅ Batch runs recorded and ranking trends computed")
+
+
+def test_batch_run_refreshes_only_written_rollups():
+    """A batch run refreshes the rollup rows of the organizations it wrote and leaves the rest alone"""
+    print("\n🧪 Testing Incremental Rollup Refresh")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ScoreHistoryStore(os.path.join(tmp, 'history.db'))
+        store._MAX_INLINE_KEYS = 2
+        names = [f'Hospital {i}' for i in range(5)]
+        store.record_batch_run([{'name': n, 'total_score': 50, 'overall_rank': i + 1, 'percentile': 50.0}
+                                for i, n in enumerate(names)])
+
+        # Mark every rollup row; rows the next run does not write must keep the mark
+        with store._connect() as conn:
+            conn.execute('UPDATE score_rollups SET moving_average = -1')
+            conn.execute('UPDATE ranking_rollups SET moving_average_percentile = -1')
+        store.record_batch_run([{'name': n, 'total_score': 60, 'overall_rank': 1, 'percentile': 100.0}
+                                for n in names[:3]])
+
+        with store._connect() as conn:
+            scores = dict(conn.execute('SELECT org_key, moving_average FROM score_rollups').fetchall())
+            ranks = dict(conn.execute('SELECT org_key, moving_average_percentile FROM ranking_rollups').fetchall())
+        print(f"Refreshed score rollups: {sorted(k for k, v in scores.items() if v != -1)}")
+        assert [scores[f'hospital {i}'] for i in range(5)] == [55.0, 55.0, 55.0, -1, -1]
+        assert [ranks[f'hospital {i}'] for i in range(5)] == [75.0, 75.0, 75.0, -1, -1]
+        assert store.get_score_trend('Hospital 1')['change'] == 10.0
+        print("✅ Only rollups of organizations written in the run were refreshed")
+
+
+if __name__ == "__main__":
+    test_score_history_persistence()
+    test_batch_run_rankings()
+    test_batch_run_refreshes_only_written_rollups()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the scorecard PDF rendering service.
+Covers concurrent rendering from threads, the content-hash cache, dated
+cache entries and the process-pool batch mode.
+"""
+
+import sys
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scorecard_pdf_service import ScorecardPDFService, scorecard_cache_key
+
+
+def _scored_org(name, score, rank):
+    return {
+        'name': name,
+        'total_score': score,
+        'overall_rank': rank,
+        'last_updated': '2025-01-01T00:00:00',
+        'certifications': [
+            {'name': 'JCI', 'status': 'Active', 'score_impact': 30.0},
+            {'name': 'NABH', 'status': 'In Progress', 'score_impact': 10.0},
+        ],
+        'score_breakdown': {'certification_score': score, 'reputation_bonus': 0, 'location_adjustment': 0},
+    }
+
+
+def test_threaded_render_and_cache():
+    """Concurrent renders succeed and identical score versions are served from cache"""
+    print("🧪 Testing Scorecard PDF Service")
+    print("=" * 50)
+
+    service = ScorecardPDFService(cache_dir=None)
+    orgs = [_scored_org(f"Hospital {i}", 40.0 + i, i + 1) for i in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        pdfs = list(executor.map(lambda org: service.render(org['name'], org), orgs * 2))
+
+    assert all(pdf.startswith(b'%PDF') for pdf in pdfs)
+    print(f"Service stats: {service.stats}")
+    assert service.stats['renders'] + service.stats['memory_hits'] == 8
+
+    # Per-search fields do not change the cache key; score and certification fields do
+    key = scorecard_cache_key(orgs[0]['name'], orgs[0])
+    searched = dict(orgs[0], last_updated='2025-06-01T00:00:00', search_timestamp='2025-06-01 10:00:00',
+                    overall_rank=9, official_site={'website': 'https://example.org'},
+                    certifications=[dict(c, remarks='re-verified') for c in orgs[0]['certifications']],
+                    score_breakdown=dict(orgs[0]['score_breakdown'], calculated_at='2025-06-01'))
+    assert scorecard_cache_key(searched['name'], searched) == key
+    assert service.render(searched['name'], searched) is service.render(orgs[0]['name'], orgs[0])
+    rescored = dict(orgs[0], total_score=75.0)
+    assert scorecard_cache_key(rescored['name'], rescored) != key
+    expired = dict(orgs[0], certifications=[dict(orgs[0]['certifications'][0], status='Expired')])
+    assert scorecard_cache_key(expired['name'], expired) != key
+    print("✅ Threaded rendering and content-hash cache verified")
+
+
+def test_batch_prerender():
+    """Batch mode fills the disk cache so later requests skip rendering"""
+    print("\n🧪 Testing Batch Pre-rendering")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        orgs = [_scored_org(f"Clinic {i}", 50.0 + i, i + 1) for i in range(3)]
+        result = ScorecardPDFService(cache_dir=tmp).render_batch(orgs, workers=2)
+        print(f"First batch: {result}")
+        assert result == {'rendered': 3, 'cached': 0, 'failed': 0}
+        assert ScorecardPDFService(cache_dir=tmp).render_batch(orgs, workers=2)['cached'] == 3
+
+        service = ScorecardPDFService(cache_dir=tmp)
+        assert service.render(orgs[1]['name'], orgs[1]).startswith(b'%PDF')
+        assert service.stats == {'memory_hits': 0, 'disk_hits': 1, 'renders': 0}
+        print("✅ Pre-rendered scorecards served from disk cache")
+
+
+def _pdf_text(pdf_data):
+    import pdfplumber
+    with pdfplumber.open(BytesIO(pdf_data)) as pdf:
+        return '\n'.join(page.extract_text() or '' for page in pdf.pages)
+
+
+def test_cached_pdf_carries_serving_day():
+    """A scorecard cached on one day is re-rendered with the new date and report ID on a later day"""
+    print("\n🧪 Testing Dated Scorecard Cache")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        org = _scored_org("Sunrise Hospital", 61.0, 1)
+        first_day, later_day = datetime(2026, 3, 2, 9, 30), datetime(2026, 3, 20, 14, 5)
+        service = ScorecardPDFService(cache_dir=tmp)
+        first = service.render(org['name'], org, generated_at=first_day)
+        assert service.render(org['name'], org, generated_at=first_day.replace(hour=18)) is first
+        assert 'QXT-20260302-' in _pdf_text(first)
+        open(os.path.join(tmp, 'legacy-undated-entry.pdf'), 'wb').close()
+
+        # A fresh process (e.g. after a batch pre-render) serving the same scorecard weeks later
+        later_service = ScorecardPDFService(cache_dir=tmp)
+        later = later_service.render(org['name'], org, generated_at=later_day)
+        text = _pdf_text(later)
+        assert later_service.stats['renders'] == 1
+        assert 'March 20, 2026' in text and 'QXT-20260320-' in text
+        assert 'March 02, 2026' not in text and 'QXT-20260302-' not in text
+        assert later_service.render(org['name'], org, generated_at=later_day) is later
+
+        # Entries from earlier days (and undated ones) were pruned
+        print(f"Cache files: {sorted(os.listdir(tmp))}")
+        assert [name[:9] for name in os.listdir(tmp)] == ['20260320-']
+    print("✅ Cached scorecards carry the serving day's date")
+
+
+if __name__ == "__main__":
+    test_threaded_render_and_cache()
+    test_batch_prerender()
+    test_cached_pdf_carries_serving_day()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-process scoring backend.
+Checks the memory-mapped dataset snapshot, that the in-process stand-in and a
+real socket server with worker processes score exactly like the analyzer, that
+the server only accepts clients holding its key on a local address, and the
+front end's fallback when the backend is unreachable or has no key.
+"""
+
+import sys
+import os
+import copy
+import socket
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scoring_backend
+from scoring_backend import (AUTHKEY_ENV, BACKEND_ENV, DatasetSnapshot, LocalScoringBackend, ScoringBackendClient,
+                             ScoringBackendError, ScoringBackendServer, get_scoring_backend, parse_address,
+                             ranking_entry, score_organization, write_snapshot)
+
+CERTIFICATIONS = [
+    [{'name': 'Joint Commission International (JCI)', 'status': 'Active'}],
+    [{'name': 'NABH Full Accreditation', 'status': 'accredited'}, {'name': 'NABL', 'status': 'Active'}],
+    [{'name': 'ISO 9001:2015', 'status': 'Active'}, {'name': 'CAP', 'status': 'pending'}],
+    [],
+]
+
+
+def _organizations(count=120):
+    return [{'name': f'Hôpital {i}', 'city': f'City {i % 7}', 'country': ['India', 'France', 'USA'][i % 3],
+             'hospital_type': ['Hospital', 'Clinic'][i % 2], 'certifications': copy.deepcopy(CERTIFICATIONS[i % 4]),
+             'quality_initiatives': [f'Initiative {i}'] if i % 5 == 0 else []}
+            for i in range(count)]
+
+
+def _expected_rankings(organizations):
+    from streamlit_app import HealthcareOrgAnalyzer
+    analyzer = HealthcareOrgAnalyzer.for_scoring()
+    return [ranking_entry(org, score_organization(analyzer, org)) for org in copy.deepcopy(organizations)]
+
+
+def test_snapshot_round_trip():
+    """Records come back from the memory map as written, and name lookups find every duplicate"""
+    print("🧪 Testing Dataset Snapshot")
+    print("=" * 50)
+
+    organizations = _organizations(50) + ['corrupted', {'name': 'hôpital 7', 'country': 'India'}]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'snapshot.jsonl')
+        meta = write_snapshot(organizations, path, manifest_version='v1')
+        snapshot = DatasetSnapshot(path)
+        assert len(snapshot) == meta['count'] == 51 and snapshot.manifest_version == 'v1'
+        assert [snapshot.record(i) for i in range(50)] == organizations[:50]
+        assert snapshot.record(3) is not snapshot.record(3)
+        assert snapshot.positions('  HÔPITAL 7 ') == [7, 50] and snapshot.positions('missing') == []
+        snapshot.close()
+
+        # Offsets that do not belong to the records file are refused
+        with open(path, 'ab') as f:
+            f.write(b'{}\n')
+        try:
+            DatasetSnapshot(path)
+            assert False, "out-of-step snapshot files must be rejected"
+        except ValueError:
+            pass
+
+        write_snapshot([], path)
+        assert len(DatasetSnapshot(path)) == 0
+    print("✅ Snapshot verified")
+
+
+def test_local_backend_matches_analyzer():
+    """The in-process stand-in scores exactly like the analyzer's percentile loop"""
+    print("\n🧪 Testing Local Scoring Backend")
+    print("=" * 50)
+
+    from streamlit_app import HealthcareOrgAnalyzer
+    organizations = _organizations()
+    expected = _expected_rankings(organizations)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'snapshot.jsonl')
+        write_snapshot(organizations, path, manifest_version='v1')
+        backend = LocalScoringBackend(path, HealthcareOrgAnalyzer.for_scoring())
+        assert backend.rankings('v1') == expected
+        assert backend.rankings() == expected and backend.rankings() is not backend.rankings()
+        assert backend.rankings('v2') is None
+        assert backend.score('Hôpital 9') == expected[9] and backend.score('missing') is None
+        assert backend.ping() == {'manifest_version': 'v1', 'organizations': len(organizations), 'workers': 0}
+        backend.close()
+    print(f"✅ {len(expected)} organizations scored identically in-process")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def test_socket_server_with_workers():
+    """A server with two worker processes answers over a local socket like the stand-in"""
+    print("\n🧪 Testing Scoring Backend Server")
+    print("=" * 50)
+
+    organizations = _organizations()
+    expected = _expected_rankings(organizations)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'snapshot.jsonl')
+        write_snapshot(organizations, path, manifest_version='v1')
+        server = ScoringBackendServer(path, ('127.0.0.1', 0), workers=2).start()
+        client = ScoringBackendClient(server.address, server.authkey, timeout=120)
+        try:
+            assert client.ping() == {'manifest_version': 'v1', 'organizations': len(organizations), 'workers': 2}
+            assert client.rankings('v1') == expected
+            assert client.rankings('v1') == expected and client.rankings('v2') is None
+            assert client.score('Hôpital 42') == expected[42] and client.score('missing') is None
+            try:
+                client._call('shutdown')
+                assert False, "unknown operations must be reported"
+            except ScoringBackendError as e:
+                assert 'Unknown operation' in str(e)
+            # The connection survives a server-side error
+            assert client.ping()['workers'] == 2
+
+            # Without the server's (random, per-launch) key nothing is unpickled
+            intruder = ScoringBackendClient(server.address, b'quxat-scoring-backend', timeout=5)
+            try:
+                intruder.ping()
+                assert False, "a client with the wrong key must be rejected"
+            except ScoringBackendError as e:
+                assert 'authkey' in str(e)
+            finally:
+                intruder.close()
+            assert client.ping()['workers'] == 2
+        finally:
+            client.close()
+            server.close()
+        try:
+            ScoringBackendServer(path, ('0.0.0.0', 0), workers=1)
+            assert False, "the server must refuse non-loopback addresses"
+        except ValueError as e:
+            assert 'loopback' in str(e)
+    print(f"✅ Socket server with {server.workers} workers verified")
+
+
+def test_front_end_fallback():
+    """The analyzer scores in-process when the configured backend cannot be reached"""
+    print("\n🧪 Testing Front-End Fallback")
+    print("=" * 50)
+
+    assert parse_address('127.0.0.1:8765') == ('127.0.0.1', 8765)
+    assert parse_address('/run/quxat/scoring.sock') == '/run/quxat/scoring.sock'
+
+    from streamlit_app import HealthcareOrgAnalyzer
+    analyzer = HealthcareOrgAnalyzer.for_scoring()
+    analyzer.unified_database = _organizations(30)
+    analyzer._loaded_manifest_version = 'v1'
+    previous = {name: os.environ.get(name) for name in (BACKEND_ENV, AUTHKEY_ENV)}
+    try:
+        os.environ.pop(BACKEND_ENV, None)
+        os.environ.pop(AUTHKEY_ENV, None)
+        assert get_scoring_backend() is None
+        in_process = analyzer._ranking_entries()
+        assert in_process == _expected_rankings(analyzer.unified_database)
+
+        # A backend without a shared key is never contacted
+        os.environ[BACKEND_ENV] = f'127.0.0.1:{_free_port()}'
+        assert get_scoring_backend() is None
+
+        os.environ[AUTHKEY_ENV] = 'test-secret'
+        backend = get_scoring_backend()
+        assert isinstance(backend, ScoringBackendClient) and get_scoring_backend() is backend
+        assert backend.authkey == b'test-secret'
+        assert analyzer._ranking_entries() == in_process
+    finally:
+        scoring_backend._default_backend = None
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    print("✅ Fallback verified")
+
+
+if __name__ == "__main__":
+    test_snapshot_round_trip()
+    test_local_backend_matches_analyzer()
+    test_socket_server_with_workers()
+    test_front_end_fallback()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-session search result cache.
+Checks hits across callers, copy isolation, LRU bounds, hit-ratio counters
+and invalidation when a dataset file changes.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from search_result_cache import DataVersion, SearchResultCache, dataset_paths
+
+
+def test_hits_and_copies():
+    """A second search for the same organization is served from the cache as a private copy"""
+    print("🧪 Testing Cache Hits")
+    print("=" * 50)
+
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'name': 'Apollo Hospitals', 'total_score': 71.5, 'improvement_recommendations': ['a']}
+
+    cache = SearchResultCache(lambda: 'v1')
+    first = cache.get_or_compute('search', 'Apollo Hospitals', compute)
+    first['improvement_recommendations'].append('mutated by session 1')
+    second = cache.get_or_compute('search', 'apollo  hospitals', compute)
+
+    assert len(calls) == 1
+    assert second['improvement_recommendations'] == ['a'], "sessions must not share mutable payloads"
+    # Same organization with different extra arguments is a separate entry
+    cache.get_or_compute('rankings', 'Apollo Hospitals', lambda: {'overall_rank': 3}, 71.5)
+    assert cache.get('rankings', 'Apollo Hospitals', 80.0) is None
+
+    summary = cache.summary()
+    print(f"Summary: {summary}")
+    assert summary['hits'] == 1 and summary['misses'] == 3
+    assert summary['by_kind']['search'] == {'hits': 1, 'misses': 1}
+    assert abs(summary['hit_ratio'] - 0.25) < 1e-9
+
+    # Failed searches are not cached
+    assert cache.get_or_compute('search', 'Unknown', lambda: None) is None
+    assert cache.get('search', 'Unknown') is None
+    print("✅ Hits, copies and counters verified")
+
+
+def test_lru_bound():
+    """The cache never holds more than max_entries payloads"""
+    print("\n🧪 Testing LRU Bound")
+    print("=" * 50)
+
+    cache = SearchResultCache(lambda: 'v1', max_entries=2)
+    cache.put('search', 'A', {'n': 'A'})
+    cache.put('search', 'B', {'n': 'B'})
+    assert cache.get('search', 'A') is not None  # A becomes most recently used
+    cache.put('search', 'C', {'n': 'C'})
+
+    assert len(cache) == 2
+    assert cache.get('search', 'B') is None
+    assert cache.get('search', 'A') is not None and cache.get('search', 'C') is not None
+    assert cache.summary()['evictions'] == 1
+    print("✅ LRU bound verified")
+
+
+def test_invalidation_on_data_change():
+    """Rewriting the scored file (or adding an external dataset) invalidates every entry"""
+    print("\n🧪 Testing Data-Version Invalidation")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scored = os.path.join(tmp, 'scored_organizations_complete.json')
+        with open(scored, 'w', encoding='utf-8') as f:
+            json.dump([{'name': 'Apollo Hospitals', 'total_score': 70}], f)
+        version = DataVersion(dataset_paths(tmp), min_check_interval=0)
+        cache = SearchResultCache(version.current)
+
+        cache.put('search', 'Apollo Hospitals', {'total_score': 70})
+        assert cache.get('search', 'Apollo Hospitals') == {'total_score': 70}
+
+        with open(scored, 'w', encoding='utf-8') as f:
+            json.dump([{'name': 'Apollo Hospitals', 'total_score': 75.25}], f)
+        assert cache.get('search', 'Apollo Hospitals') is None
+
+        cache.put('search', 'Apollo Hospitals', {'total_score': 75.25})
+        os.makedirs(os.path.join(tmp, 'external_organizations'))
+        with open(os.path.join(tmp, 'external_organizations', 'new.json'), 'w', encoding='utf-8') as f:
+            json.dump([], f)
+        assert cache.get('search', 'Apollo Hospitals') is None
+        assert cache.summary()['invalidations'] == 2
+
+        # Stamps are reused between checks
+        throttled = DataVersion(dataset_paths(tmp), min_check_interval=60)
+        stamp = throttled.current()
+        os.remove(scored)
+        assert throttled.current() == stamp
+        assert throttled.current(force=True) != stamp
+    print("✅ Invalidation verified")
+
+
+if __name__ == "__main__":
+    test_hits_and_copies()
+    test_lru_bound()
+    test_invalidation_on_data_change()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Test script for single-flight lookups.
+Concurrent identical lookups (certification validation, ISO searches, search
+payloads, official-site fetches) must run once, hand every caller the
+result, and leave it in the existing cache for later callers. A leader
+interrupted by control flow (e.g. a Streamlit rerun) must not pass that on.
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from single_flight import SingleFlight
+
+CALLERS = 16
+
+
+def _concurrently(fn, args_list):
+    """Start fn for every args tuple at the same moment; returns results in order"""
+    barrier = threading.Barrier(len(args_list))
+    results = [None] * len(args_list)
+    errors = []
+
+    def run(i, args):
+        barrier.wait()
+        try:
+            results[i] = fn(*args)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i, args)) for i, args in enumerate(args_list)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class _Counter:
+    """Slow stand-in for an expensive call that counts its executions"""
+
+    def __init__(self, result=None, delay=0.2):
+        self.calls = []
+        self.result = result
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, *args):
+        with self._lock:
+            self.calls.append(args)
+        time.sleep(self.delay)
+        return self.result() if callable(self.result) else self.result
+
+
+def test_single_flight():
+    """One execution per key in flight; results and exceptions reach every caller"""
+    print("🧪 Testing SingleFlight")
+    print("=" * 50)
+
+    flights = SingleFlight()
+    work = _Counter(result=lambda: {'value': 42})
+    results, errors = _concurrently(lambda key: flights.do_shared(key, work, key),
+                                    [('a',)] * CALLERS + [('b',)] * 4)
+    assert not errors and sorted(work.calls) == [('a',), ('b',)]
+    assert all(r[0] is results[0][0] for r in results[:CALLERS])
+    assert sorted(shared for _, shared in results[:CALLERS]) == [False] + [True] * (CALLERS - 1)
+    assert flights.stats == {'executions': 2, 'shared': CALLERS + 2} and flights.in_flight() == 0
+
+    # Nothing is remembered after the flight lands
+    assert flights.do('a', lambda: 'again') == 'again'
+
+    def failing():
+        time.sleep(0.1)
+        raise ConnectionError("registry unreachable")
+
+    _, errors = _concurrently(lambda: flights.do('c', failing), [()] * 8)
+    assert len(errors) == 8 and all(isinstance(e, ConnectionError) for e in errors)
+    assert flights.stats['executions'] == 4 and flights.in_flight() == 0
+    print("✅ SingleFlight verified")
+
+
+class _Rerun(BaseException):
+    """Stand-in for Streamlit's RerunException/StopException"""
+
+
+def test_interrupted_leader_is_not_shared():
+    """A leader's BaseException stays with the leader; waiting callers compute the result themselves"""
+    print("\n🧪 Testing Interrupted Leader")
+    print("=" * 50)
+
+    flights = SingleFlight()
+    leader_started = threading.Event()
+    release_leader = threading.Event()
+    work = _Counter(result='fresh', delay=0.05)
+
+    def interrupted():
+        leader_started.set()
+        release_leader.wait(5)
+        raise _Rerun()
+
+    outcomes = {}
+
+    def lead():
+        try:
+            flights.do('k', interrupted)
+        except _Rerun:
+            outcomes['leader'] = 'rerun'
+
+    def follow(i):
+        try:
+            outcomes[i] = flights.do_shared('k', work)
+        except BaseException as e:
+            outcomes[i] = e
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    leader_started.wait(5)
+    followers = [threading.Thread(target=follow, args=(i,)) for i in range(4)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.1)
+    release_leader.set()
+    for thread in [leader] + followers:
+        thread.join()
+
+    print(f"Outcomes: {outcomes}, stats: {flights.stats}")
+    assert outcomes['leader'] == 'rerun'
+    assert all(outcomes[i][0] == 'fresh' for i in range(4)), "followers must not receive the leader's rerun"
+    # One follower takes over the call; the others share its result
+    assert len(work.calls) == 1 and sorted(outcomes[i][1] for i in range(4)) == [False, True, True, True]
+    assert flights.stats == {'executions': 2, 'shared': 3} and flights.in_flight() == 0
+    print("✅ Interrupted leader handled")
+
+
+def test_validation_and_iso_lookups():
+    """Concurrent validations / ISO searches of one organization run once and fill the existing caches"""
+    print("\n🧪 Testing Validator and ISO Scraper Coalescing")
+    print("=" * 50)
+
+    from data_validator import HealthcareDataValidator
+    validator = HealthcareDataValidator()
+    nabh = _Counter(result=lambda: [{'name': 'NABH Accreditation', 'status': 'Active'}])
+    validator._validate_nabh_certification = nabh
+    validator._validate_nabl_certification = validator._validate_jci_certification = lambda name: []
+    validator._validate_iso_certification = lambda name: []
+    validator._detect_organization_branches = lambda name: {'has_branches': False}
+
+    names = [('Apollo Hospitals',), (' apollo hospitals ',)] * (CALLERS // 2) + [('Fortis Healthcare',)]
+    results, errors = _concurrently(validator.validate_organization_certifications, names)
+    assert not errors and len(nabh.calls) == 2 and ('Fortis Healthcare',) in nabh.calls
+    assert all(r is results[0] for r in results[:CALLERS])
+    assert results[0]['certifications'] == [{'name': 'NABH Accreditation', 'status': 'Active'}]
+    assert 'cert_apollo hospitals' in validator.validation_cache
+    assert validator.validate_organization_certifications('APOLLO HOSPITALS') is results[0] and len(nabh.calls) == 2
+    print(f"{len(names)} validations -> {len(nabh.calls)} runs")
+
+    from iso_certification_scraper import ISOCertificationScraper
+    scraper = ISOCertificationScraper()
+    iaf = _Counter(result=list)
+    scraper._search_iaf_certsearch = iaf
+    scraper._search_certification_bodies = scraper._search_iso_survey_data = lambda name, location: []
+
+    results, errors = _concurrently(scraper.get_organization_iso_certifications,
+                                    [('Max Healthcare', 'Delhi')] * CALLERS + [('Max Healthcare', 'Mumbai')])
+    assert not errors and sorted(iaf.calls) == [('Max Healthcare', 'Delhi'), ('Max Healthcare', 'Mumbai')]
+    assert all(r is results[0] for r in results[:CALLERS]) and results[0] is not results[-1]
+    assert scraper.get_organization_iso_certifications('max healthcare', 'delhi') is results[0]
+    assert len(iaf.calls) == 2 and scraper.search_flights.stats['shared'] == CALLERS - 1
+    print("✅ Validator and ISO scraper verified")
+
+
+def test_search_cache_and_site_details():
+    """Concurrent searches share one payload computation but not mutable payloads; site pages are fetched once"""
+    print("\n🧪 Testing Search and Site-Detail Coalescing")
+    print("=" * 50)
+
+    from search_result_cache import SearchResultCache
+    cache = SearchResultCache(lambda: 'v1')
+    search = _Counter(result=lambda: {'name': 'Mayo Clinic', 'total_score': 88.0, 'notes': []})
+    results, errors = _concurrently(lambda: cache.get_or_compute('search', 'Mayo Clinic', search, 'Mayo Clinic'),
+                                    [()] * CALLERS)
+    assert not errors and len(search.calls) == 1
+    results[0]['notes'].append('mutated by one session')
+    assert all(r['notes'] == [] for r in results[1:])
+    assert cache.get('search', 'Mayo Clinic', 'Mayo Clinic')['notes'] == []
+    summary = cache.summary()
+    assert summary['coalesced'] == CALLERS - 1 and summary['misses'] == CALLERS and summary['hits'] == 1
+
+    from streamlit_app import HealthcareOrgAnalyzer
+    analyzer = HealthcareOrgAnalyzer.for_scoring()
+    analyzer._site_details_flights = SingleFlight()
+    analyzer.unified_database = [{'name': 'Mayo Clinic', 'website': 'https://www.mayoclinic.org/'}]
+
+    class _Response:
+        status_code = 200
+        text = '<html><body><p>Contact: info@mayoclinic.org, +1 507 284 2511</p></body></html>'
+
+    fetch = _Counter(result=_Response)
+
+    class _Session:
+        def get(self, url, timeout=None):
+            return fetch(url)
+
+    analyzer.session = _Session()
+    results, errors = _concurrently(analyzer.get_official_site_details, [('Mayo Clinic',)] * CALLERS)
+    assert not errors and fetch.calls == [('https://www.mayoclinic.org/',)]
+    assert all(r == {'website': 'https://www.mayoclinic.org/', 'address': None, 'phone': '+1 507 284 2511',
+                     'email': 'info@mayoclinic.org'} for r in results)
+    assert len({id(r) for r in results}) == CALLERS
+    assert analyzer.get_official_site_details('') == {'website': None, 'address': None, 'phone': None, 'email': None}
+    print("✅ Search and site-detail coalescing verified")
+
+
+if __name__ == "__main__":
+    test_single_flight()
+    test_interrupted_leader_is_not_shared()
+    test_validation_and_iso_lookups()
+    test_search_cache_and_site_details()
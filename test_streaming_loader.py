@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming dataset loader.
+Checks incremental JSON parsing across chunk boundaries, JSON Lines/CSV
+sources, the single-pass dedup reducer and the global integrator's
+streaming scan.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from streaming_loader import DedupReducer, iter_dataset_records, iter_json_records, stream_dedup
+from global_database_integrator import GlobalDatabaseIntegrator
+
+
+def _orgs(count):
+    return [{'name': f'Hospital {i}', 'country': 'India', 'lat': 10.5 + i, 'tags': ['a', {'b': i}],
+             'note': 'brackets ] and braces } inside "strings"'} for i in range(count)]
+
+
+def _write(path, payload):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+
+
+def test_incremental_json_parsing():
+    """Wrapped and bare arrays parse identically to json.load, even with tiny chunks"""
+    print("🧪 Testing Incremental JSON Parsing")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        wrapped = os.path.join(tmp, 'wrapped.json')
+        _write(wrapped, {'metadata': {'source': 'x', 'nested': [1, {'organizations': []}]},
+                         'organizations': _orgs(50), 'trailer': 1})
+        bare = os.path.join(tmp, 'bare.json')
+        _write(bare, [1, 2.5, 12345678, None, True, 'x'])
+        single = os.path.join(tmp, 'single.json')
+        _write(single, {'name': 'Only Hospital', 'city': 'Pune'})
+        empty = os.path.join(tmp, 'empty.json')
+        _write(empty, {'organizations': []})
+
+        for chunk_size in (1, 7, 1 << 20):
+            assert list(iter_json_records(wrapped, chunk_size=chunk_size)) == _orgs(50)
+            assert list(iter_json_records(bare, chunk_size=chunk_size)) == [1, 2.5, 12345678, None, True, 'x']
+        assert list(iter_json_records(single)) == [{'name': 'Only Hospital', 'city': 'Pune'}]
+        assert list(iter_json_records(single, single_object=False)) == []
+        assert list(iter_json_records(empty)) == []
+
+        broken = os.path.join(tmp, 'broken.json')
+        with open(broken, 'w', encoding='utf-8') as f:
+            f.write('[{"name": "A"}, {"name": ')
+        records = iter_json_records(broken, chunk_size=4)
+        assert next(records) == {'name': 'A'}
+        try:
+            next(records)
+            assert False, "truncated JSON must raise"
+        except ValueError:
+            pass
+        print("✅ Incremental JSON parsing verified")
+
+
+def test_dedup_reducer_and_formats():
+    """One pass over JSON, JSON Lines and CSV keeps the richest record per key"""
+    print("\n🧪 Testing Streaming Dedup")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'a.json')
+        _write(json_path, {'organizations': [{'name': 'Apollo', 'city': ''}, {'name': 'Fortis'}, 'junk']})
+        jsonl_path = os.path.join(tmp, 'b.jsonl')
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'name': 'apollo', 'city': 'Chennai'}) + '\n\n')
+            f.write(json.dumps({'name': 'Max'}) + '\n')
+        csv_path = os.path.join(tmp, 'c.csv')
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write('name,city\nFORTIS,\nMedanta,Gurgaon\n')
+
+        assert list(iter_dataset_records(csv_path)) == [{'name': 'FORTIS', 'city': ''}, {'name': 'Medanta', 'city': 'Gurgaon'}]
+        records, stats = stream_dedup([json_path, jsonl_path, csv_path, os.path.join(tmp, 'missing.json')],
+                                      key_func=lambda org: org.get('name', '').lower())
+        print(f"Stats: {stats.summary()}")
+        assert [r['name'] for r in records] == ['apollo', 'Fortis', 'Max', 'Medanta']
+        assert records[0]['city'] == 'Chennai'
+        assert (stats.files, stats.rows, stats.unique, stats.duplicates, stats.skipped) == (3, 7, 4, 2, 1)
+        assert stats.to_dict()['rows_per_sec'] > 0
+
+        reducer = DedupReducer(lambda org: org['name'])
+        assert reducer.add({'name': 'A'}) and not reducer.add({'name': 'A'}) and reducer.add({'name': 'A', 'x': 1})
+        assert len(reducer) == 1
+        print("✅ Streaming dedup verified")
+
+
+def test_global_integrator_streams_sources():
+    """The global integrator merges streamed external records and reports throughput"""
+    print("\n🧪 Testing Global Integrator Streaming Scan")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = os.path.join(tmp, 'external_organizations')
+        os.makedirs(sources)
+        _write(os.path.join(sources, 'wikidata.json'),
+               {'metadata': {}, 'organizations': [{'name': 'Apollo Hospital', 'country': 'India'},
+                                                  {'name': 'City Clinic', 'certifications': ['ISO 9001']}]})
+        with open(os.path.join(sources, 'osm.jsonl'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'name': 'Apollo Hospitals', 'city': 'Chennai'}) + '\n')
+        with open(os.path.join(sources, 'bad.json'), 'w', encoding='utf-8') as f:
+            f.write('{not json')
+
+        integrator = GlobalDatabaseIntegrator(unified_db_file=os.path.join(tmp, 'unified.json'),
+                                              sources_dir=sources, jci_file=os.path.join(tmp, 'jci.json'))
+        assert [name for name, _ in integrator.scan_external_sources()] == ['osm.jsonl', 'wikidata.json']
+
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            updated = integrator.integrate()
+        finally:
+            os.chdir(cwd)
+        names = sorted(org['name'] for org in updated['organizations'])
+        print(f"Integrated: {names}, {integrator.load_stats.summary()}")
+        assert names == ['Apollo Hospitals', 'City Clinic']
+        assert integrator.stats['records_loaded_from_sources'] == 3
+        assert integrator.stats['external_sources_found'] == 2
+        assert integrator.load_stats.failed_files == ['bad.json']
+        assert (integrator.load_stats.unique, integrator.load_stats.duplicates) == (2, 1)
+        assert 'source_rows_per_sec' in integrator.stats
+        print("✅ Global integrator streaming verified")
+
+
+if __name__ == "__main__":
+    test_incremental_json_parsing()
+    test_dedup_reducer_and_formats()
+    test_global_integrator_streams_sources()
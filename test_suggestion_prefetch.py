@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test script for background prefetch of suggestion searches.
+Checks warm hits, waiting on in-flight work, cancellation of abandoned
+selections, TTL expiry and invalidation, and that the app's prefetched
+searches are served as cache hits without writing score history.
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from suggestion_prefetch import SuggestionPrefetcher, suggestion_key
+
+
+class _SlowResolver:
+    """Stand-in for search_organization_info_from_suggestion"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, suggestion):
+        self.gate.wait(5)
+        self.calls.append(suggestion['display_name'])
+        time.sleep(self.delay)
+        return {'name': suggestion['display_name'], 'total_score': 42.0}
+
+
+def _suggestion(name, location='Chennai'):
+    return {'display_name': name, 'full_name': name, 'location': location, 'type': 'Hospital'}
+
+
+def test_prefetch_hits_and_copies():
+    """Shown suggestions are resolved in the background; Search gets a private copy"""
+    print("🧪 Testing Prefetch Hits")
+    print("=" * 50)
+
+    resolver = _SlowResolver(delay=0.05)
+    prefetcher = SuggestionPrefetcher(resolver, max_workers=2)
+    try:
+        keys = prefetcher.prefetch([_suggestion('Apollo Hospital'), _suggestion('Apollo Hospital'),
+                                    _suggestion('Fortis'), _suggestion('Max')], top_n=2, session_id='s1')
+        assert keys == [suggestion_key(_suggestion('Apollo Hospital')), suggestion_key(_suggestion('Fortis'))]
+        assert suggestion_key(_suggestion('apollo-hospital', 'CHENNAI')) == keys[0]
+
+        # Waits for the in-flight search instead of starting a second one
+        result = prefetcher.get(_suggestion('Apollo Hospital'), timeout=5)
+        assert result == {'name': 'Apollo Hospital', 'total_score': 42.0}
+        result['total_score'] = 0
+        time.sleep(0.1)
+        assert prefetcher.get(_suggestion('Apollo Hospital'))['total_score'] == 42.0
+        assert prefetcher.get(_suggestion('Max')) is None
+        assert sorted(resolver.calls) == ['Apollo Hospital', 'Fortis']
+
+        prefetcher.prefetch([_suggestion('Apollo Hospital')], session_id='s2')
+        assert prefetcher.stats['submitted'] == 2, "cached suggestions are not searched again"
+        print(f"Stats: {prefetcher.stats}")
+        print("✅ Prefetch hits verified")
+    finally:
+        prefetcher.shutdown()
+
+
+def test_abandoned_selection_is_cancelled():
+    """Queued work is cancelled when the session moves on, unless another session wants it"""
+    print("\n🧪 Testing Cancellation")
+    print("=" * 50)
+
+    resolver = _SlowResolver()
+    resolver.gate.clear()  # hold the single worker so later work stays queued
+    prefetcher = SuggestionPrefetcher(resolver, max_workers=1)
+    try:
+        prefetcher.prefetch([_suggestion('Blocker')], top_n=1, session_id='other')
+        prefetcher.prefetch([_suggestion('Apollo'), _suggestion('Fortis')], top_n=2, session_id='s1')
+        prefetcher.prefetch([_suggestion('Fortis')], top_n=2, session_id='s2')
+
+        # s1 selects Max: Apollo is abandoned and cancelled, Fortis is still wanted by s2
+        prefetcher.prefetch([_suggestion('Max')], top_n=1, session_id='s1')
+        assert prefetcher.stats['cancelled'] == 1
+        prefetcher.cancel('s2')
+        assert prefetcher.stats['cancelled'] == 2
+
+        resolver.gate.set()
+        assert prefetcher.get(_suggestion('Max'), timeout=5)['name'] == 'Max'
+        assert prefetcher.get(_suggestion('Apollo')) is None
+        print(f"Resolved: {resolver.calls}, stats: {prefetcher.stats}")
+        assert resolver.calls == ['Blocker', 'Max']
+        print("✅ Abandoned selections cancelled")
+    finally:
+        prefetcher.shutdown()
+
+
+def test_ttl_and_invalidation():
+    """Entries expire after the TTL; clear() drops results, including in-flight ones"""
+    print("\n🧪 Testing TTL and Invalidation")
+    print("=" * 50)
+
+    resolver = _SlowResolver()
+    prefetcher = SuggestionPrefetcher(resolver, ttl_seconds=0.2)
+    try:
+        prefetcher.store(_suggestion('Apollo'), {'name': 'Apollo'})
+        assert prefetcher.get(_suggestion('Apollo')) == {'name': 'Apollo'}
+        time.sleep(0.3)
+        assert prefetcher.get(_suggestion('Apollo')) is None
+
+        resolver.gate.clear()
+        prefetcher.prefetch([_suggestion('Fortis')], session_id='s1')
+        prefetcher.clear()
+        resolver.gate.set()
+        time.sleep(0.1)
+        assert len(prefetcher.cache) == 0, "results started before clear() must not be cached"
+        print("✅ TTL and invalidation verified")
+    finally:
+        prefetcher.shutdown()
+
+
+def test_stale_work_after_clear():
+    """Work started before clear() is not handed to callers and does not fill the cache"""
+    print("\n🧪 Testing Stale In-Flight Work")
+    print("=" * 50)
+
+    database = {'version': 'old'}
+    started = threading.Event()
+    release = threading.Event()
+
+    def resolver(suggestion):
+        version = database['version']
+        started.set()
+        release.wait(5)
+        return {'name': suggestion['display_name'], 'database': version}
+
+    prefetcher = SuggestionPrefetcher(resolver, max_workers=2)
+    try:
+        prefetcher.prefetch([_suggestion('Fortis')], session_id='s1')
+        assert started.wait(5)
+        # The database is reloaded while the old search is still running
+        database['version'] = 'new'
+        prefetcher.clear()
+        threading.Timer(0.2, release.set).start()
+        waited_from = time.time()
+        assert prefetcher.get(_suggestion('Fortis'), timeout=5) is None, "stale work must not be served"
+        assert time.time() - waited_from < 0.2, "stale work must not be waited for"
+
+        # A new prefetch resubmits; the old search landing later leaves no trace
+        prefetcher.prefetch([_suggestion('Fortis')], session_id='s1')
+        result = prefetcher.get(_suggestion('Fortis'), timeout=5)
+        time.sleep(0.1)
+        print(f"Result: {result}, stats: {prefetcher.stats}")
+        assert result == {'name': 'Fortis', 'database': 'new'}
+        assert prefetcher.get(_suggestion('Fortis'))['database'] == 'new'
+        assert prefetcher.stats['submitted'] == 2 and prefetcher.stats['completed'] == 2
+        print("✅ Stale in-flight work ignored after clear()")
+    finally:
+        release.set()
+        prefetcher.shutdown()
+
+
+def test_app_prefetch_is_served_as_hit():
+    """The analyzer's background search has no side effects; selecting it is a cache hit that records history"""
+    print("\n🧪 Testing App Prefetch Cache Hit")
+    print("=" * 50)
+
+    import streamlit_app
+
+    history = []
+    record_history = streamlit_app.add_score_to_history
+    streamlit_app.add_score_to_history = lambda org_name, score_data: history.append(
+        (threading.current_thread().name, org_name))
+    try:
+        analyzer = streamlit_app.HealthcareOrgAnalyzer()
+        prefetcher = analyzer.get_suggestion_prefetcher()
+        suggestion = _suggestion('Apollo Hospitals', 'Chennai')
+        prefetcher.prefetch([suggestion], top_n=1, session_id='s1')
+        deadline = time.time() + 120
+        while prefetcher.cache.get(suggestion_key(suggestion)) is None and time.time() < deadline:
+            time.sleep(0.1)
+        assert prefetcher.stats['completed'] == 1 and prefetcher.stats['failed'] == 0
+        assert len(prefetcher.cache) == 1, "the background search must produce a cacheable result"
+        assert history == [], "prefetching must not write score history"
+
+        result = analyzer.search_organization_info_from_suggestion(suggestion)
+        print(f"Stats: {prefetcher.stats}, history: {history}")
+        assert result is not None and result['display_name'] == 'Apollo Hospitals'
+        assert prefetcher.stats['hits'] == 1 and prefetcher.stats['submitted'] == 1
+        assert history == [(threading.current_thread().name, result['name'])]
+        print("✅ Prefetched search served as a cache hit")
+    finally:
+        streamlit_app.add_score_to_history = record_history
+
+
+if __name__ == "__main__":
+    test_prefetch_hits_and_copies()
+    test_abandoned_selection_is_cancelled()
+    test_ttl_and_invalidation()
+    test_stale_work_after_clear()
+    test_app_prefetch_is_served_as_hit()
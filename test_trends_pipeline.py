@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script for the trends page pipeline.
+Checks the pandas aggregates against the loops the page used to run, the
+figures against the page's original data, and that the figure cache builds
+once per file version and is shared across callers.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from trends_pipeline import TRENDS_FILE, TrendsFigureCache, build_aggregates, build_figures, file_hash
+
+TRENDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), TRENDS_FILE)
+
+
+def _load():
+    with open(TRENDS_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_aggregates_match_loops():
+    """Headline metrics, certification totals, cumulative/growth series and yearly totals"""
+    print("🧪 Testing Trends Aggregates")
+    print("=" * 50)
+
+    trends_data = _load()
+    months = trends_data['monthly_accreditations']
+    aggregates = build_aggregates(trends_data)
+    metrics = aggregates.metrics
+
+    total = sum(m['total_accreditations'] for m in months)
+    peak = max(months, key=lambda x: x['total_accreditations'])
+    first, last = months[0]['total_accreditations'], months[-1]['total_accreditations']
+    assert metrics['total_accreditations'] == total
+    assert abs(metrics['growth_rate'] - (last - first) / first * 100) < 1e-9
+    assert metrics['peak_label'] == f"{peak['month_name']} {peak['year']}"
+    assert metrics['peak_accreditations'] == peak['total_accreditations']
+    assert metrics['certification_types'] == len(months[0]['certifications'])
+    print(f"Metrics: {metrics}")
+
+    cert_totals = {}
+    for month in months:
+        for cert_type, info in month['certifications'].items():
+            cert_totals.setdefault(cert_type, 0)
+            cert_totals[cert_type] += info['count']
+    totals = aggregates.certification_totals
+    assert dict(zip(totals['certification'], totals['total'])) == cert_totals
+    assert list(totals['certification']) == list(cert_totals)
+
+    running, previous = 0, None
+    for i, month in enumerate(months):
+        running += month['total_accreditations']
+        assert aggregates.monthly['cumulative_total'].iloc[i] == running
+        if previous:
+            assert abs(aggregates.monthly['growth_rate'].iloc[i] - (running - previous) / previous * 100) < 1e-9
+        previous = running
+
+    yearly = {}
+    for month in months:
+        yearly[month['year']] = yearly.get(month['year'], 0) + month['total_accreditations']
+    summary = aggregates.annual_summary()
+    assert [(year, total) for year, total, _ in summary] == list(yearly.items())
+    assert summary[0][2] is None
+    assert abs(summary[1][2] - (summary[1][1] - summary[0][1]) / summary[0][1] * 100) < 1e-9
+    print("✅ Aggregates match the page's loops")
+
+
+def test_figures():
+    """The page's figures carry the same data the page computed"""
+    print("\n🧪 Testing Trends Figures")
+    print("=" * 50)
+
+    trends_data = _load()
+    months = trends_data['monthly_accreditations']
+    figures = build_figures(build_aggregates(trends_data))
+    assert set(figures) == {'monthly', 'stacked', 'pie', 'bar', 'cumulative', 'growth', 'yearly', 'regional'}
+
+    assert list(figures['monthly'].data[0].y) == [m['total_accreditations'] for m in months]
+    assert len(figures['stacked'].data) == len(months[0]['certifications'])
+    assert sum(figures['pie'].data[0].values) == sum(m['total_accreditations'] for m in months)
+    assert len(figures['growth'].data[0].y) == len(months) - 1
+    years = sorted({m['year'] for m in months})
+    assert [trace.name for trace in figures['yearly'].data] == [str(y) for y in years]
+    assert list(figures['yearly'].data[0].x) == sorted({m['month'] for m in months if m['year'] == years[0]})
+    assert list(figures['regional'].data[0].values) == [28, 24, 22, 15, 7, 4]
+    print("✅ Figures verified")
+
+
+def test_cache_builds_once_per_version():
+    """One build per file hash; unchanged files are not re-hashed; a rewrite gives a new build"""
+    print("\n🧪 Testing Figure Cache")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, TRENDS_FILE)
+        shutil.copy(TRENDS_PATH, path)
+        cache = TrendsFigureCache()
+
+        started = time.perf_counter()
+        view = cache.get(path)
+        build_seconds = time.perf_counter() - started
+        assert view.digest == file_hash(path)
+
+        started = time.perf_counter()
+        for _ in range(20):
+            again = cache.get(path)
+            for name in again.figure_json:
+                again.figure(name)
+        rerun_seconds = (time.perf_counter() - started) / 20
+        print(f"First build: {build_seconds:.3f}s, cached rerun: {rerun_seconds:.3f}s")
+        assert again is view
+        assert cache.stats == {'hits': 20, 'builds': 1, 'hashes': 1}
+        assert rerun_seconds * 10 < build_seconds
+
+        # Figures are shared; copies can be modified without touching the cache
+        assert view.figure('monthly') is again.figure('monthly')
+        fig = view.copy_figure('monthly')
+        fig.update_layout(title="changed")
+        assert view.figure('monthly').layout.title.text == "Monthly Healthcare Accreditations Worldwide"
+
+        trends_data = _load()
+        trends_data['monthly_accreditations'][0]['total_accreditations'] += 1
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trends_data, f)
+        changed = cache.get(path)
+        assert changed.digest != view.digest and cache.stats['builds'] == 2
+        assert changed.metrics['total_accreditations'] == view.metrics['total_accreditations'] + 1
+
+        try:
+            cache.get(os.path.join(tmp, 'missing.json'))
+            assert False, "missing trends file must raise"
+        except FileNotFoundError:
+            pass
+    print("✅ Figure cache verified")
+
+
+if __name__ == "__main__":
+    test_aggregates_match_loops()
+    test_figures()
+    test_cache_builds_once_per_version()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Test script for the columnar validation rule engine.
+Checks that the vectorized rules report exactly what the per-record checks
+report, that issues come out as compact row references, and that a report
+over a large synthetic database stays fast and small.
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from validation_rules import CERTIFICATIONS, ORGANIZATIONS, Rule, RuleEngine, flatten_organizations
+from accreditation_validation_report import AccreditationValidationReporter
+from nabh_data_validator import NABHDataValidator
+from updated_nabh_data_validator import UpdatedNABHDataValidator
+from robust_database_analyzer import analyze_database_comprehensive
+
+CERT_NAMES = ['Joint Commission International (JCI)', 'NABH Full Accreditation', 'NABL Accreditation',
+              'College of American Pathologists (CAP)', 'ISO 9001:2015', '']
+CERT_TYPES = ['JCI Accreditation', 'NABH Accreditation', 'NABL', 'CAP Accreditation', 'ISO Certification', '']
+DATES = ['2021-10-30', '2021-10-30T00:00:00', '30/10/2021', '', None]
+
+
+def _organizations(count, seed=11):
+    rng = random.Random(seed)
+    orgs = []
+    for i in range(count):
+        certs = []
+        for _ in range(rng.randint(0, 3)):
+            certs.append({'name': rng.choice(CERT_NAMES), 'type': rng.choice(CERT_TYPES),
+                          'status': rng.choice(['Active', 'Active', 'Expired', '']),
+                          'accreditation_date': rng.choice(DATES), 'expiry_date': rng.choice(DATES),
+                          'remarks': 'x' * 40, 'source': 'Synthetic'})
+        org = {'name': f'Hospital {i}', 'country': rng.choice(['India', 'USA', 'Germany']), 'certifications': certs}
+        if i % 97 == 0:
+            del org['name']
+        orgs.append(org)
+    return orgs
+
+
+def _reference_issues(orgs):
+    """The per-certification loop the reporter used to run"""
+    issues = []
+    for i, org in enumerate(orgs):
+        for j, cert in enumerate(org.get('certifications', [])):
+            for field, message in (('name', 'Missing certification name'), ('status', 'Missing certification status'),
+                                   ('type', 'Missing certification type')):
+                if not cert.get(field, ''):
+                    issues.append((org.get('name', f'Organization_{i}'), message, i, j))
+            for date_field in ['accreditation_date', 'expiry_date']:
+                if date_field in cert and cert[date_field]:
+                    try:
+                        datetime.strptime(cert[date_field], '%Y-%m-%d')
+                    except (ValueError, TypeError):
+                        issues.append((org.get('name', f'Organization_{i}'), f'Invalid date format in {date_field}', i, j))
+    return issues
+
+
+def _reporter(orgs, directory):
+    path = os.path.join(directory, 'organizations.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(orgs, f)
+    return AccreditationValidationReporter(path)
+
+
+def test_engine_basics():
+    """Masks, compact references and per-row messages"""
+    print("🧪 Testing Rule Engine")
+    print("=" * 50)
+
+    orgs = [{'name': 'A', 'certifications': [{'name': ''}, {'name': 'JCI'}]}, 'corrupted',
+            {'name': 'B', 'certifications': 'not a list'}, {'certifications': [None, {'name': ''}]}]
+    frames = flatten_organizations(orgs, org_fields=('name',), cert_fields=('name',))
+    assert list(frames[ORGANIZATIONS].index) == [0, 2, 3]
+    assert list(frames[ORGANIZATIONS]['cert_count']) == [2, 0, 2]
+    assert list(zip(frames[CERTIFICATIONS]['org'], frames[CERTIFICATIONS]['cert'])) == [(0, 0), (0, 1), (3, 1)]
+
+    engine = RuleEngine([
+        Rule('unnamed_cert', 'Unnamed certification', CERTIFICATIONS, lambda c: c['name'] == ''),
+        Rule('unnamed_org', 'Unnamed organization', ORGANIZATIONS, lambda o: o['name'] == ''),
+    ])
+    results = engine.evaluate(frames)
+    assert results.counts() == {'unnamed_cert': 2, 'unnamed_org': 1}
+    assert results.issues() == [
+        {'organization': 'A', 'issue': 'Unnamed certification', 'org': 0, 'cert': 0},
+        {'organization': '', 'issue': 'Unnamed organization', 'org': 3},
+        {'organization': '', 'issue': 'Unnamed certification', 'org': 3, 'cert': 1},
+    ]
+    assert results.messages_by_row(ORGANIZATIONS) == {3: ['Unnamed organization']}
+
+    try:
+        RuleEngine([Rule('bad', 'Bad', ORGANIZATIONS, lambda o: [True])]).evaluate(frames)
+        assert False, "a mask of the wrong length must be rejected"
+    except ValueError:
+        pass
+    print("✅ Rule engine verified")
+
+
+def test_accreditation_report_matches_loops():
+    """Counts and issues equal the loop-based validation; issues reference rows instead of copying them"""
+    print("\n🧪 Testing Accreditation Validation Report")
+    print("=" * 50)
+
+    orgs = _organizations(600)
+    with tempfile.TemporaryDirectory() as tmp:
+        reporter = _reporter(orgs, tmp)
+        stats = reporter.validate_accreditation_data()
+        issues = [(i['organization'], i['issue'], i['org'], i['cert']) for i in stats['validation_issues']]
+        assert issues == _reference_issues(orgs)
+        assert 'certification' not in stats['validation_issues'][0]
+
+        all_certs = [c for o in orgs for c in o['certifications']]
+        assert stats['total_certifications'] == len(all_certs)
+        assert stats['organizations_with_certifications'] == sum(1 for o in orgs if o['certifications'])
+        assert stats['data_quality_metrics']['complete_certification_data'] == sum(
+            1 for c in all_certs if c['name'] and c['type'] and c['status'])
+        assert dict(stats['certification_types']) == {
+            t: sum(1 for c in all_certs if c['type'] == t) for t in CERT_TYPES if t}
+
+        coverage = reporter.analyze_accreditation_coverage()
+        assert coverage['jci_accreditation']['total_count'] == sum(
+            1 for c in all_certs if 'JCI' in c['name'].upper() or 'JCI ACCREDITATION' in c['type'].upper())
+        assert coverage['cap_accreditation']['total_count'] == sum(1 for c in all_certs if 'CAP' in c['name'].upper())
+        assert dict(coverage['iso_certifications']['iso_types']) == {
+            'ISO 9001': sum(1 for c in all_certs if c['name'].startswith('ISO'))}
+        first = coverage['nabh_accreditation']['organizations'][0]
+        assert orgs[first['org']]['certifications'][first['cert']]['name'] == 'NABH Full Accreditation'
+
+        report = reporter.generate_validation_report()
+        print(f"Issues: {len(issues)}, report size {len(json.dumps(report, default=str)):,} bytes")
+        assert report['data_quality_assessment']['validation_issues_count'] == len(issues)
+    print("✅ Accreditation report verified")
+
+
+def _nabh_hospitals(count, seed=5):
+    rng = random.Random(seed)
+    today = datetime.now()
+    hospitals = []
+    for i in range(count):
+        start = today - timedelta(days=rng.randint(-100, 2000))
+        end = start + timedelta(days=rng.choice([10, 365, 1095, 4000, -5]))
+        hospitals.append({
+            'name': rng.choice([f'Care Hospital {i}', 'AB', '', '12345', 'x' * 205, '  sunrise  clinic ']),
+            'city': rng.choice(['Pune', '', ' Mumbai ']), 'state': rng.choice(['Orissa', 'Kerala', '']),
+            'country': rng.choice(['India', 'india', 'Nepal', '']),
+            'accreditation_number': rng.choice([f'PEH-2023-{i % 10000:04d}', 'PEH-23-1', '', '08 Dec 2014']),
+            'reference_number': rng.choice(['REF-1', '', ' REF-2 ']),
+            'valid_from_parsed': rng.choice([start.strftime('%Y-%m-%d'), '', 'not a date']),
+            'valid_upto_parsed': rng.choice([end.strftime('%Y-%m-%d'), '', '2024/01/01']),
+            'certification_status': rng.choice(['Active', 'Expired', 'Pending', '', ' Active']),
+            'valid_from': rng.choice(['Application Closed', 'Pending review', '']),
+        })
+    return hospitals
+
+
+def test_nabh_validators_match_per_record_checks():
+    """Vectorized NABH rules report what the per-hospital validate_* methods report"""
+    print("\n🧪 Testing NABH Validators")
+    print("=" * 50)
+
+    hospitals = _nabh_hospitals(1500)
+    validator = NABHDataValidator('unused.json')
+    validator.hospitals = hospitals
+    results = validator.validate_and_clean_data()
+
+    expected_found = {}
+    expected = []
+    for hospital in hospitals:
+        issues = (validator.validate_hospital_name(hospital) + validator.validate_location(hospital)
+                  + validator.validate_accreditation_info(hospital) + validator.validate_dates(hospital)
+                  + validator.validate_certification_status(hospital))
+        for issue in issues:
+            expected_found[issue] = expected_found.get(issue, 0) + 1
+        expected.append(issues)
+    # all_hospitals lists the valid hospitals first, each group in input order
+    ordered = sorted(range(len(hospitals)), key=lambda i: bool(expected[i]))
+    assert len(results['valid_hospitals']) == sum(1 for issues in expected if not issues)
+    assert [h['validation_issues'] for h in results['all_hospitals']] == [expected[i] for i in ordered]
+    assert [h['certification_status'] for h in results['all_hospitals']] == [
+        validator.update_certification_status(hospitals[i]) for i in ordered]
+    assert validator.validation_report['issues_found'] == expected_found
+    print(f"Issue types found: {len(expected_found)}")
+
+    updated = UpdatedNABHDataValidator('unused.json')
+    updated.hospitals = hospitals
+    validated = updated.validate_all_hospitals()
+    reference = [updated.validate_hospital(h) for h in hospitals]
+    reference = updated.remove_duplicates([h for h in reference if h])
+    strip = lambda rows: [{k: v for k, v in row.items() if k != 'validation_date'} for row in rows]
+    assert strip(validated) == strip(reference)
+    assert updated.parse_date_strings(['08 Dec 2014', ' 08/12/2014', 'N/A', '31 Feb 2020']) == {
+        'N/A': None, '08 Dec 2014': '2014-12-08', ' 08/12/2014': '2014-12-08', '31 Feb 2020': None}
+    print("✅ NABH validators verified")
+
+
+def test_database_analyzer_categories():
+    """Each certification counts towards the first category its type matches"""
+    print("\n🧪 Testing Database Analyzer")
+    print("=" * 50)
+
+    orgs = [{'country': 'India', 'source': 'updated_nabh_entry', 'certifications': [
+                {'type': 'NABH JCI'}, {'type': 'JCI'}, {'type': 'NABL CAP'}, {'type': 'CAP'}, 'junk']},
+            {'country': 'India', 'data_source': 'Updated_NABH_Portal', 'certifications': [{'type': 'nabh'}]},
+            {'certifications': [{'name': 'untyped'}]}, 'corrupted entry']
+    stats = analyze_database_comprehensive({'organizations': orgs, 'metadata': {}})
+    assert (stats['nabh_hospitals'], stats['updated_nabh_hospitals'], stats['jci_hospitals'],
+            stats['nabl_labs'], stats['cap_labs']) == (2, 2, 1, 1, 1)
+    assert dict(stats['countries']) == {'India': 2, 'Unknown': 1}
+    assert stats['certification_counts']['Unknown'] == 1 and stats['string_entries'] == 1
+    print("✅ Database analyzer verified")
+
+
+def test_large_database_report():
+    """A full report over a large database takes well under a second per pass and stays compact"""
+    print("\n🧪 Timing a Large Validation Report")
+    print("=" * 50)
+
+    orgs = _organizations(40000, seed=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        reporter = _reporter(orgs, tmp)
+        started = time.perf_counter()
+        report = reporter.generate_validation_report()
+        seconds = time.perf_counter() - started
+        size = len(json.dumps(report, default=str))
+        embedded = sum(len(json.dumps(c)) for o in orgs for c in o['certifications']
+                       if 'NABH' in c['name'].upper() or 'JCI' in c['name'].upper())
+        print(f"{len(orgs):,} organizations: report in {seconds:.2f}s, {size:,} bytes "
+              f"(embedding certifications would add {embedded:,} bytes)")
+        assert seconds < 3
+        assert size < embedded
+    print("✅ Large report verified")
+
+
+if __name__ == "__main__":
+    test_engine_basics()
+    test_accreditation_report_matches_loops()
+    test_nabh_validators_match_per_record_checks()
+    test_database_analyzer_categories()
+    test_large_database_report()
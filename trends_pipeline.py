@@ -0,0 +1,346 @@
+"""
+Trends Pipeline for QuXAT Healthcare Quality Grid
+Precomputed aggregates and figures for the Global Healthcare Quality Trends page.
+
+The page used to reopen global_healthcare_trends_2022_2024.json on every
+rerun, recompute totals, peaks and growth with Python loops and rebuild all
+of its plotly figures. This module does that work once per version of the
+file:
+
+- build_aggregates() turns the monthly records into pandas frames (monthly
+  totals with cumulative and growth columns, the per-certification long
+  frame, certification totals and year-by-month totals) plus the headline
+  metrics shown above the tabs
+- build_figures() creates the page's figures from those frames
+- TrendsFigureCache keeps the aggregates and the serialized figure JSON in a
+  process-wide LRU keyed by the SHA-256 of the trends file, so every session
+  and rerun after the first reuses ready-made figures. The file is re-hashed
+  only when its size or modification time changes.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+TRENDS_FILE = 'global_healthcare_trends_2022_2024.json'
+
+# Simulated regional shares shown under the tabs: (region, percentage, color)
+REGIONAL_SHARES = (
+    ('North America', 28, '#FF6B6B'),
+    ('Europe', 24, '#4ECDC4'),
+    ('Asia-Pacific', 22, '#45B7D1'),
+    ('Middle East', 15, '#96CEB4'),
+    ('Latin America', 7, '#FFEAA7'),
+    ('Africa', 4, '#DDA0DD'),
+)
+YEAR_COLORS = ('#667eea', '#764ba2', '#f093fb')
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TrendsAggregates:
+    """Frames and headline metrics derived from the monthly accreditation records"""
+
+    def __init__(self, trends_data: Dict[str, Any]):
+        months = trends_data['monthly_accreditations']
+        if not months:
+            raise ValueError("Trends data has no monthly accreditations")
+
+        monthly = pd.DataFrame(months).drop(columns=['certifications'])
+        monthly['date'] = pd.to_datetime(monthly['date'])
+        monthly['cumulative_total'] = monthly['total_accreditations'].cumsum()
+        previous = monthly['cumulative_total'].shift(1)
+        monthly['growth_rate'] = ((monthly['cumulative_total'] - previous) / previous * 100).where(previous > 0, 0.0)
+        self.monthly = monthly
+
+        # One row per month and certification type, in the order of the records
+        by_certification = pd.DataFrame([
+            {'date': month['date'], 'certification': cert_type, 'count': info['count'], 'full_name': info['name']}
+            for month in months for cert_type, info in month['certifications'].items()
+        ])
+        by_certification['date'] = pd.to_datetime(by_certification['date'])
+        self.by_certification = by_certification
+
+        self.certification_totals = (by_certification
+                                     .groupby('certification', sort=False)
+                                     .agg(name=('full_name', 'first'), total=('count', 'sum'))
+                                     .reset_index())
+
+        # Year x month grid of totals (years in record order, months ascending)
+        self.yearly = (monthly.pivot_table(index='year', columns='month', values='total_accreditations',
+                                           aggfunc='sum', sort=False)
+                       .sort_index(axis=1))
+        yearly_totals = monthly.groupby('year', sort=False)['total_accreditations'].sum()
+        self.yearly_totals = pd.DataFrame({
+            'year': yearly_totals.index,
+            'total': yearly_totals.values,
+            'yoy_growth': (yearly_totals.pct_change() * 100).values,
+        })
+
+        total = int(monthly['total_accreditations'].sum())
+        first, last = monthly['total_accreditations'].iloc[0], monthly['total_accreditations'].iloc[-1]
+        peak = monthly.loc[monthly['total_accreditations'].idxmax()]
+        self.metrics = {
+            'total_accreditations': total,
+            'growth_rate': float((last - first) / first * 100) if first else 0.0,
+            'average_monthly': total / len(monthly),
+            'certification_types': len(months[0]['certifications']),
+            'peak_label': f"{peak['month_name']} {peak['year']}",
+            'peak_accreditations': int(peak['total_accreditations']),
+        }
+
+    def annual_summary(self) -> List[Tuple[int, int, Optional[float]]]:
+        """(year, total, growth % over the previous year or None) per year"""
+        return [(int(row.year), int(row.total), None if pd.isna(row.yoy_growth) else float(row.yoy_growth))
+                for row in self.yearly_totals.itertuples()]
+
+
+def build_aggregates(trends_data: Dict[str, Any]) -> TrendsAggregates:
+    return TrendsAggregates(trends_data)
+
+
+def build_figures(aggregates: TrendsAggregates) -> Dict[str, go.Figure]:
+    """All figures on the trends page, by name"""
+    monthly = aggregates.monthly
+    figures = {}
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=monthly['date'],
+        y=monthly['total_accreditations'],
+        mode='lines+markers',
+        name='Total Accreditations',
+        line=dict(color='#667eea', width=3),
+        marker=dict(size=6, color='#667eea'),
+        hovertemplate='<b>%{x|%B %Y}</b><br>Accreditations: %{y}<extra></extra>'
+    ))
+    fig.update_layout(
+        title="Monthly Healthcare Accreditations Worldwide",
+        xaxis_title="Month",
+        yaxis_title="Number of Accreditations",
+        hovermode='x unified',
+        height=400,
+        showlegend=False
+    )
+    figures['monthly'] = fig
+
+    fig = px.area(
+        aggregates.by_certification,
+        x='date',
+        y='count',
+        color='certification',
+        title="Monthly Accreditations by Certification Type",
+        labels={'count': 'Number of Accreditations', 'date': 'Month'},
+        height=400
+    )
+    fig.update_layout(
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    figures['stacked'] = fig
+
+    totals = aggregates.certification_totals
+    fig = go.Figure(data=[go.Pie(
+        labels=[f"{cert_type}<br>({name})" for cert_type, name in zip(totals['certification'], totals['name'])],
+        values=totals['total'].tolist(),
+        hole=0.4,
+        hovertemplate='<b>%{label}</b><br>Accreditations: %{value}<br>Percentage: %{percent}<extra></extra>'
+    )])
+    fig.update_layout(
+        title="Distribution of Accreditations by Certification Type (2022-2024)",
+        height=500,
+        showlegend=True,
+        legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.05)
+    )
+    figures['pie'] = fig
+
+    fig = px.bar(
+        x=totals['total'].tolist(),
+        y=totals['name'].tolist(),
+        orientation='h',
+        title="Total Accreditations by Certification Type",
+        labels={'x': 'Total Accreditations', 'y': 'Certification Type'},
+        height=400
+    )
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+    figures['bar'] = fig
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=monthly['date'],
+        y=monthly['cumulative_total'],
+        mode='lines+markers',
+        name='Cumulative Accreditations',
+        line=dict(color='#28a745', width=3),
+        marker=dict(size=6, color='#28a745'),
+        fill='tonexty',
+        hovertemplate='<b>%{x|%B %Y}</b><br>Cumulative: %{y:,}<extra></extra>'
+    ))
+    fig.update_layout(
+        title="Cumulative Healthcare Accreditations Growth",
+        xaxis_title="Time",
+        yaxis_title="Cumulative Accreditations",
+        height=400,
+        showlegend=False
+    )
+    figures['cumulative'] = fig
+
+    fig = px.line(
+        monthly.iloc[1:],
+        x='date',
+        y='growth_rate',
+        title="Monthly Growth Rate (%)",
+        labels={'growth_rate': 'Growth Rate (%)', 'date': 'Month'},
+        height=300
+    )
+    figures['growth'] = fig
+
+    fig = go.Figure()
+    for i, (year, row) in enumerate(aggregates.yearly.iterrows()):
+        row = row.dropna()
+        fig.add_trace(go.Scatter(
+            x=[int(month) for month in row.index],
+            y=[int(value) for value in row.values],
+            mode='lines+markers',
+            name=f'{year}',
+            line=dict(color=YEAR_COLORS[i % len(YEAR_COLORS)], width=3),
+            marker=dict(size=8)
+        ))
+    fig.update_layout(
+        title="Year-over-Year Monthly Comparison",
+        xaxis_title="Month",
+        yaxis_title="Accreditations",
+        height=400,
+        xaxis=dict(tickmode='linear', tick0=1, dtick=1)
+    )
+    figures['yearly'] = fig
+
+    total = aggregates.metrics['total_accreditations']
+    fig = go.Figure(data=[go.Pie(
+        labels=[region for region, _, _ in REGIONAL_SHARES],
+        values=[share for _, share, _ in REGIONAL_SHARES],
+        marker_colors=[color for _, _, color in REGIONAL_SHARES],
+        hole=0.4,
+        hovertemplate='<b>%{label}</b><br>Percentage: %{value}%<br>Estimated Accreditations: %{customdata}<extra></extra>',
+        customdata=[int(total * share / 100) for _, share, _ in REGIONAL_SHARES]
+    )])
+    fig.update_layout(
+        title="Regional Distribution of Healthcare Accreditations",
+        height=400,
+        showlegend=True
+    )
+    figures['regional'] = fig
+    return figures
+
+
+class TrendsView:
+    """One version of the trends page: aggregates plus serialized figures"""
+
+    def __init__(self, digest: str, aggregates: TrendsAggregates, figure_json: Dict[str, str]):
+        self.digest = digest
+        self.aggregates = aggregates
+        self.metrics = aggregates.metrics
+        self.figure_json = figure_json
+        self._figures: Dict[str, go.Figure] = {}
+        self._lock = threading.Lock()
+
+    def figure(self, name: str) -> go.Figure:
+        """
+        Figure deserialized from the cached JSON, shared by every caller
+
+        st.plotly_chart copies figures before rendering, so the page passes
+        them straight through; use copy_figure() to modify one.
+        """
+        with self._lock:
+            fig = self._figures.get(name)
+            if fig is None:
+                fig = self._figures[name] = pio.from_json(self.figure_json[name])
+            return fig
+
+    def copy_figure(self, name: str) -> go.Figure:
+        return pio.from_json(self.figure_json[name])
+
+
+class TrendsFigureCache:
+    """Thread-safe LRU of trends views keyed by the trends file's SHA-256"""
+
+    def __init__(self, max_entries: int = 4):
+        self.max_entries = max_entries
+        self._views: 'OrderedDict[str, TrendsView]' = OrderedDict()
+        # path -> ((size, mtime_ns), digest), so unchanged files are not re-hashed
+        self._digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'builds': 0, 'hashes': 0}
+
+    def _digest(self, path: str) -> str:
+        st = os.stat(path)
+        stamp = (st.st_size, st.st_mtime_ns)
+        known = self._digests.get(path)
+        if known and known[0] == stamp:
+            return known[1]
+        digest = file_hash(path)
+        self.stats['hashes'] += 1
+        self._digests[path] = (stamp, digest)
+        return digest
+
+    def get(self, path: str = TRENDS_FILE) -> TrendsView:
+        """
+        View for the current contents of path, built on first use
+
+        Raises FileNotFoundError if the file is missing and ValueError if it
+        is not valid trends data.
+        """
+        with self._lock:
+            digest = self._digest(path)
+            view = self._views.get(digest)
+            if view is not None:
+                self._views.move_to_end(digest)
+                self.stats['hits'] += 1
+                return view
+
+            with open(path, 'r', encoding='utf-8') as f:
+                trends_data = json.load(f)
+            try:
+                aggregates = build_aggregates(trends_data)
+            except (KeyError, TypeError) as e:
+                raise ValueError(f"Invalid trends data in {path}: {e}") from e
+            figure_json = {name: fig.to_json() for name, fig in build_figures(aggregates).items()}
+            view = TrendsView(digest, aggregates, figure_json)
+            self.stats['builds'] += 1
+            self._views[digest] = view
+            while len(self._views) > self.max_entries:
+                self._views.popitem(last=False)
+            return view
+
+    def clear(self) -> None:
+        with self._lock:
+            self._views.clear()
+            self._digests.clear()
+
+
+_default_cache: Optional[TrendsFigureCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_trends_cache() -> TrendsFigureCache:
+    """Return the process-wide trends figure cache"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TrendsFigureCache()
+        return _default_cache
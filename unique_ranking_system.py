@@ -246,6 +246,11 @@ class UniqueRankingSystem:
                        f"{org.get('percentile', 0):.2f},{org.get('certification_count', 0)}\n")
         files_created['csv'] = csv_file
         
+        if output_prefix == 'unique_rankings':
+            # Mark the unique_ranks stage fresh in the data manifest (see data_manifest.py)
+            from data_manifest import record_stage_run
+            record_stage_run('unique_ranks')
+        
         logger.info(f"Saved unique rankings to {len(files_created)} files")
         return files_created
 
@@ -4,10 +4,31 @@ from datetime import datetime
 from typing import Dict, List, Optional
 import re
 
+import pandas as pd
+
+from validation_rules import ORGANIZATIONS, Rule, RuleEngine, flatten_records
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Application date formats, tried in order
+DATE_FORMATS = [
+    '%d %b %Y',      # 08 Dec 2014
+    '%d %B %Y',      # 08 December 2014
+    '%d/%m/%Y',      # 08/12/2014
+    '%d-%m-%Y',      # 08-12-2014
+    '%Y-%m-%d',      # 2014-12-08
+    '%d.%m.%Y',      # 08.12.2014
+]
+
+# Required fields; hospitals failing any of these are dropped before cleaning
+REQUIRED_FIELD_RULES = RuleEngine([
+    Rule('invalid_name', "Invalid hospital name", ORGANIZATIONS, lambda h: h['name'].str.strip().str.len() < 3),
+    Rule('missing_reference_number', "Missing reference number", ORGANIZATIONS, lambda h: h['reference_number'] == ''),
+])
+
+
 class UpdatedNABHDataValidator:
     def __init__(self, input_file: str):
         self.input_file = input_file
@@ -39,26 +60,35 @@ class UpdatedNABHDataValidator:
     def validate_hospital(self, hospital: Dict) -> Optional[Dict]:
         """Validate and clean individual hospital data"""
         try:
-            # Create a copy for validation
-            validated = hospital.copy()
-            
             # 1. Validate required fields
-            if not validated.get('name') or len(validated['name'].strip()) < 3:
-                logger.debug(f"Invalid hospital name: {validated.get('name', 'None')}")
+            if not hospital.get('name') or len(hospital['name'].strip()) < 3:
+                logger.debug(f"Invalid hospital name: {hospital.get('name', 'None')}")
+                return None
+            
+            if not hospital.get('reference_number'):
+                logger.debug(f"Missing reference number for: {hospital['name']}")
                 return None
+        except Exception as e:
+            logger.debug(f"Error validating hospital {hospital.get('name', 'Unknown')}: {e}")
+            return None
+        
+        return self.clean_validated_hospital(hospital)
+
+    def clean_validated_hospital(self, hospital: Dict,
+                                 parsed_dates: Optional[Dict[str, Optional[str]]] = None) -> Optional[Dict]:
+        """Clean and enrich a hospital that has its required fields; None if the data is unusable"""
+        try:
+            # Create a copy for validation
+            validated = hospital.copy()
             
             # 2. Clean and standardize name
             validated['name'] = self.clean_hospital_name(validated['name'])
             
-            # 3. Validate and clean reference number
-            if not validated.get('reference_number'):
-                logger.debug(f"Missing reference number for: {validated['name']}")
-                return None
-            
+            # 3. Clean reference number
             validated['reference_number'] = validated['reference_number'].strip()
             
             # 4. Parse and validate dates from the data structure
-            validated = self.parse_application_dates(validated)
+            validated = self.parse_application_dates(validated, parsed_dates)
             
             # 5. Determine proper certification status
             validated['certification_status'] = self.determine_proper_status(validated)
@@ -107,15 +137,18 @@ class UpdatedNABHDataValidator:
         
         return name
 
-    def parse_application_dates(self, hospital: Dict) -> Dict:
-        """Parse application dates from the scraped data"""
+    def parse_application_dates(self, hospital: Dict, parsed_dates: Optional[Dict[str, Optional[str]]] = None) -> Dict:
+        """Parse application dates from the scraped data (parsed_dates: results of parse_date_strings())"""
         # The scraped data has dates in 'accreditation_number' field and status in 'valid_from'
         date_field = hospital.get('accreditation_number', '')
         status_field = hospital.get('valid_from', '')
         
         # Parse application date
         if date_field and date_field not in ['', 'N/A', 'Unknown']:
-            parsed_date = self.parse_date_string(date_field)
+            if parsed_dates is not None and isinstance(date_field, str) and date_field in parsed_dates:
+                parsed_date = parsed_dates[date_field]
+            else:
+                parsed_date = self.parse_date_string(date_field)
             if parsed_date:
                 hospital['application_date'] = parsed_date
                 hospital['application_date_original'] = date_field
@@ -131,17 +164,7 @@ class UpdatedNABHDataValidator:
         if not date_str or date_str.lower() in ['na', 'n/a', '', 'unknown']:
             return None
         
-        # Common date formats
-        date_formats = [
-            '%d %b %Y',      # 08 Dec 2014
-            '%d %B %Y',      # 08 December 2014
-            '%d/%m/%Y',      # 08/12/2014
-            '%d-%m-%Y',      # 08-12-2014
-            '%Y-%m-%d',      # 2014-12-08
-            '%d.%m.%Y',      # 08.12.2014
-        ]
-        
-        for fmt in date_formats:
+        for fmt in DATE_FORMATS:
             try:
                 parsed_date = datetime.strptime(date_str.strip(), fmt)
                 return parsed_date.strftime('%Y-%m-%d')
@@ -151,6 +174,27 @@ class UpdatedNABHDataValidator:
         logger.debug(f"Could not parse date: {date_str}")
         return None
 
+    def parse_date_strings(self, values: List[str]) -> Dict[str, Optional[str]]:
+        """parse_date_string() for many values: each distinct string is parsed once, format by format"""
+        remaining = pd.Series(pd.unique(pd.Series([v for v in values if isinstance(v, str)], dtype=object)),
+                              dtype=object)
+        skipped = remaining.str.lower().isin(['na', 'n/a', '', 'unknown'])
+        results: Dict[str, Optional[str]] = dict.fromkeys(remaining[skipped])
+        remaining = remaining[~skipped]
+        
+        for fmt in DATE_FORMATS:
+            if remaining.empty:
+                break
+            parsed = pd.to_datetime(remaining.str.strip(), format=fmt, errors='coerce')
+            ok = parsed.notna()
+            results.update(zip(remaining[ok], parsed[ok].dt.strftime('%Y-%m-%d')))
+            remaining = remaining[~ok]
+        
+        # Dates pandas cannot parse (or represent) go through the scalar parser
+        for value in remaining:
+            results[value] = self.parse_date_string(value)
+        return results
+
     def determine_proper_status(self, hospital: Dict) -> str:
         """Determine proper certification status based on available data"""
         application_status = hospital.get('application_status', '').lower()
@@ -301,8 +345,20 @@ class UpdatedNABHDataValidator:
         
         validated = []
         
+        # Required-field checks for every hospital at once
+        frame = flatten_records(self.hospitals, ('name', 'reference_number'))
+        results = REQUIRED_FIELD_RULES.evaluate(frame)
+        rejected = set(frame.index[results.mask('invalid_name') | results.mask('missing_reference_number')])
+        for rule_id, entry in results.summary().items():
+            logger.debug(f"{entry['issue']}: {entry['count']} hospitals")
+        parsed_dates = self.parse_date_strings(
+            [hospital.get('accreditation_number') for hospital in self.hospitals if isinstance(hospital, dict)])
+        
         for i, hospital in enumerate(self.hospitals):
-            validated_hospital = self.validate_hospital(hospital)
+            if i in rejected or not isinstance(hospital, dict):
+                validated_hospital = None
+            else:
+                validated_hospital = self.clean_validated_hospital(hospital, parsed_dates)
             
             if validated_hospital:
                 validated.append(validated_hospital)
@@ -1,5 +1,6 @@
 import requests
 from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import json
 import csv
 import logging
@@ -46,7 +47,7 @@ class UpdatedNABHEntryLevelScraper:
                 logger.error(f"Failed to access portal: HTTP {response.status_code}")
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Extract ViewState and other ASP.NET form data
             self.viewstate = self.extract_form_data(soup)
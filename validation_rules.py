@@ -0,0 +1,244 @@
+"""
+Validation Rules for QuXAT Healthcare Quality Grid
+Declarative, columnar validation shared by the accreditation report, the NABH
+validators and the database analyzer.
+
+Records are flattened once into pandas frames: one row per organization (or
+hospital record) and one row per certification, with text fields normalized
+to strings ('' for missing values). A Rule is a vectorized check over one of
+those frames that returns a boolean mask; RuleEngine evaluates every rule in
+a single pass and RuleResults reports the rows each rule flagged as compact
+references (organization index, certification index) instead of copies of
+the offending records.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+ORGANIZATIONS = 'organizations'
+CERTIFICATIONS = 'certifications'
+
+Frames = Dict[str, pd.DataFrame]
+Fields = Union[Sequence[str], Mapping[str, Any]]
+
+
+def _text(value: Any) -> str:
+    """String form of a field value; '' for anything falsy (None, '', 0, [])"""
+    if isinstance(value, str):
+        return value
+    return str(value) if value else ''
+
+
+def _text_column(rows: List[dict], field: str, default: Any) -> pd.Series:
+    values = [row.get(field, default) for row in rows]
+    # Nearly every value is already a string; only the rest go through _text()
+    return pd.Series([v if v.__class__ is str else _text(v) for v in values], dtype=str)
+
+
+def _field_defaults(fields: Fields) -> Dict[str, Any]:
+    if isinstance(fields, Mapping):
+        return dict(fields)
+    return {field: '' for field in fields}
+
+
+def flatten_records(records: Iterable[Any], fields: Fields) -> pd.DataFrame:
+    """
+    One row per dict record with the given text fields
+
+    fields is a list of names or a {name: default} mapping (the default is
+    used when the key is absent). The frame index is each record's position
+    in records; non-dict records are left out.
+    """
+    defaults = _field_defaults(fields)
+    positions, rows = [], []
+    for position, record in enumerate(records):
+        if isinstance(record, dict):
+            positions.append(position)
+            rows.append(record)
+    columns = {field: _text_column(rows, field, default) for field, default in defaults.items()}
+    return pd.DataFrame(columns).set_axis(pd.Index(positions, name='org'))
+
+
+def flatten_organizations(organizations: Iterable[Any], org_fields: Fields, cert_fields: Fields) -> Frames:
+    """
+    Organizations and their certifications as two frames
+
+    The organizations frame is flatten_records() plus a cert_count column.
+    The certifications frame has one row per dict certification with 'org'
+    (the organization's position) and 'cert' (position in its list) columns
+    followed by cert_fields.
+    """
+    organizations = list(organizations)
+    orgs = flatten_records(organizations, org_fields)
+    cert_defaults = _field_defaults(cert_fields)
+
+    org_positions, cert_positions, certs, counts = [], [], [], []
+    for position in orgs.index:
+        certifications = organizations[position].get('certifications')
+        if not isinstance(certifications, list):
+            counts.append(0)
+            continue
+        counts.append(len(certifications))
+        for cert_position, cert in enumerate(certifications):
+            if isinstance(cert, dict):
+                org_positions.append(position)
+                cert_positions.append(cert_position)
+                certs.append(cert)
+    orgs['cert_count'] = np.asarray(counts, dtype=np.int64)
+
+    columns = {'org': np.asarray(org_positions, dtype=np.int64), 'cert': np.asarray(cert_positions, dtype=np.int64)}
+    for field, default in cert_defaults.items():
+        columns[field] = _text_column(certs, field, default)
+    return {ORGANIZATIONS: orgs, CERTIFICATIONS: pd.DataFrame(columns)}
+
+
+def org_values(frames: Frames, column: str, orgs: Optional[Iterable[int]] = None) -> np.ndarray:
+    """
+    An organizations column looked up by organization position
+
+    Aligned with the certification rows unless orgs (positions) is given.
+    """
+    frame = frames[ORGANIZATIONS]
+    if orgs is None:
+        orgs = frames[CERTIFICATIONS]['org']
+    return frame[column].to_numpy()[frame.index.get_indexer(np.asarray(orgs))]
+
+
+def parse_dates(values: pd.Series, date_format: str = '%Y-%m-%d') -> pd.Series:
+    """Datetimes for values in date_format; NaT for empty or malformed values"""
+    return pd.to_datetime(values, format=date_format, errors='coerce')
+
+
+def first_seen_counts(values: Union[pd.Series, np.ndarray]) -> Dict[Any, int]:
+    """Value counts in order of first appearance (like filling a dict in a loop)"""
+    series = pd.Series(values)
+    return {key: int(count) for key, count in series.groupby(series, sort=False).size().items()}
+
+
+class Rule:
+    """One vectorized check: rows of frame for which check(frame) is True have the issue"""
+
+    def __init__(self, rule_id: str, message: str, frame: str, check: Callable[[pd.DataFrame], Any]):
+        self.rule_id = rule_id
+        self.message = message
+        self.frame = frame
+        self.check = check
+
+    def __repr__(self) -> str:
+        return f"Rule({self.rule_id!r}, frame={self.frame!r})"
+
+
+class RuleResults:
+    """Masks produced by RuleEngine.evaluate(), with compact issue reporting"""
+
+    def __init__(self, rules: List[Rule], frames: Frames, masks: Dict[str, np.ndarray]):
+        self.rules = rules
+        self.frames = frames
+        self.masks = masks
+        self._by_id = {rule.rule_id: rule for rule in rules}
+
+    def mask(self, rule_id: str) -> np.ndarray:
+        return self.masks[rule_id]
+
+    def count(self, rule_id: str) -> int:
+        return int(self.masks[rule_id].sum())
+
+    def counts(self) -> Dict[str, int]:
+        return {rule.rule_id: self.count(rule.rule_id) for rule in self.rules}
+
+    def rows(self, rule_id: str) -> pd.DataFrame:
+        """The flagged rows of the rule's frame"""
+        frame = self.frames[self._by_id[rule_id].frame]
+        return frame[self.masks[rule_id]]
+
+    def _references(self, frame_name: str, positions: np.ndarray) -> Dict[str, np.ndarray]:
+        frame = self.frames[frame_name]
+        if frame_name == CERTIFICATIONS:
+            return {'org': frame['org'].to_numpy()[positions], 'cert': frame['cert'].to_numpy()[positions]}
+        return {'org': frame.index.to_numpy()[positions]}
+
+    def issues(self, rule_ids: Optional[Iterable[str]] = None, label: Optional[str] = 'name',
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Flagged rows as compact issue dicts, ordered by row and then rule order
+
+        Each issue is {'organization': <label column of the organization>,
+        'issue': message, 'org': position[, 'cert': position]}; the full
+        records stay in the dataset and can be looked up by position.
+        """
+        wanted = [rule for rule in self.rules if rule_ids is None or rule.rule_id in set(rule_ids)]
+        orgs = self.frames.get(ORGANIZATIONS)
+        has_labels = orgs is not None and label in orgs
+
+        parts = []
+        for order, rule in enumerate(wanted):
+            positions = np.flatnonzero(self.masks[rule.rule_id])
+            if not len(positions):
+                continue
+            refs = self._references(rule.frame, positions)
+            parts.append((rule, refs, np.full(len(positions), order)))
+        if not parts:
+            return []
+
+        org = np.concatenate([refs['org'] for _, refs, _ in parts])
+        cert = np.concatenate([refs.get('cert', np.full(len(refs['org']), -1)) for _, refs, _ in parts])
+        order = np.concatenate([orders for _, _, orders in parts])
+        sequence = np.lexsort((order, cert, org))
+        if limit is not None:
+            sequence = sequence[:limit]
+        names = org_values(self.frames, label, org[sequence]) if has_labels else [None] * len(sequence)
+
+        issues = []
+        for position, name in zip(sequence, names):
+            rule = wanted[order[position]]
+            issue = {'organization': name, 'issue': rule.message, 'org': int(org[position])}
+            if cert[position] >= 0:
+                issue['cert'] = int(cert[position])
+            issues.append(issue)
+        return issues
+
+    def messages_by_row(self, frame_name: str) -> Dict[Any, List[str]]:
+        """{frame index label: [messages in rule order]} for rows with at least one issue"""
+        index = self.frames[frame_name].index
+        messages: Dict[Any, List[str]] = {}
+        for rule in self.rules:
+            if rule.frame != frame_name:
+                continue
+            for label in index[self.masks[rule.rule_id]]:
+                messages.setdefault(label, []).append(rule.message)
+        return {label: messages[label] for label in index if label in messages}
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """{rule_id: {'issue': message, 'count': flagged rows}}"""
+        return {rule.rule_id: {'issue': rule.message, 'count': self.count(rule.rule_id)} for rule in self.rules}
+
+
+class RuleEngine:
+    """Evaluates a fixed list of rules over flattened frames"""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = list(rules)
+        ids = [rule.rule_id for rule in self.rules]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Rule ids must be unique")
+
+    def evaluate(self, frames: Union[Frames, pd.DataFrame]) -> RuleResults:
+        """
+        Run every rule once over its frame
+
+        A single DataFrame is accepted for rules that all use the
+        ORGANIZATIONS frame (flat record datasets).
+        """
+        if isinstance(frames, pd.DataFrame):
+            frames = {ORGANIZATIONS: frames}
+        masks = {}
+        for rule in self.rules:
+            frame = frames[rule.frame]
+            mask = rule.check(frame)
+            mask = np.asarray(mask.fillna(False) if isinstance(mask, pd.Series) else mask, dtype=bool)
+            if mask.shape != (len(frame),):
+                raise ValueError(f"Rule {rule.rule_id} returned {mask.shape} for a frame of {len(frame)} rows")
+            masks[rule.rule_id] = mask
+        return RuleResults(self.rules, frames, masks)
@@ -5,26 +5,31 @@ Extracts organization data from healthcare websites for QuXAT scoring
 
 import requests
 from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import re
 from urllib.parse import urljoin, urlparse
 from typing import Dict, List, Optional, Any
 import logging
 from datetime import datetime
-import time
 import json
 
+from crawl_engine import CrawlPlugin, CrawlRequest, crawl
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class HealthcareWebsiteScraper:
+class HealthcareWebsiteScraper(CrawlPlugin):
     """Scrapes healthcare organization websites to extract relevant data for QuXAT scoring"""
     
+    crawl_name = 'website_scraper'
+    
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        self.crawl_headers = dict(self.session.headers)
         
         # Common certification patterns
         self.certification_patterns = {
@@ -138,7 +143,7 @@ class HealthcareWebsiteScraper:
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             return soup
             
         except Exception as e:
@@ -392,24 +397,27 @@ class HealthcareWebsiteScraper:
                     relevant_links.append(full_url)
                     break
         
-        # Limit to first 3 additional pages to avoid overloading
-        for url in relevant_links[:3]:
-            try:
-                time.sleep(1)  # Be respectful to the server
-                page_soup = self._fetch_page_content(url)
-                if page_soup:
-                    page_certs = self._extract_certifications(page_soup)
-                    page_initiatives = self._extract_quality_initiatives(page_soup)
-                    
-                    additional_data['certifications'].extend(page_certs)
-                    additional_data['quality_initiatives'].extend(page_initiatives)
-                    
-            except Exception as e:
-                logger.warning(f"Failed to scrape additional page {url}: {str(e)}")
-                continue
+        # Limit to first 3 additional pages to avoid overloading; the crawl
+        # engine paces them per domain instead of sleeping between fetches
+        seeds = [CrawlRequest(url, callback='parse_additional_page') for url in dict.fromkeys(relevant_links[:3])]
+        for page_data in crawl(self, seeds, state_dir=None, rate_per_sec=1.0, max_retries=1, timeout=10):
+            additional_data['certifications'].extend(page_data['certifications'])
+            additional_data['quality_initiatives'].extend(page_data['quality_initiatives'])
         
         return additional_data
     
+    def parse_additional_page(self, response) -> List[Dict[str, Any]]:
+        """Certifications and quality initiatives found on one additional page"""
+        page_soup = response.soup()
+        return [{
+            'certifications': self._extract_certifications(page_soup),
+            'quality_initiatives': self._extract_quality_initiatives(page_soup)
+        }]
+    
+    def on_crawl_error(self, request, error):
+        logger.warning(f"Failed to scrape additional page {request.url}: {str(error)}")
+        return []
+    
     def _clean_extracted_data(self, org_data: Dict[str, Any]) -> Dict[str, Any]:
         """Clean and deduplicate extracted data"""
         